@@ -0,0 +1,39 @@
+"""
+Benchmark: float, Decimal and Fraction backends on a batch workload.
+
+Operands are decimal strings, as they arrive from batch files. Run from
+the repository root:
+    python benchmarks/bench_backends.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.calculator.backends import get_backend
+from src.calculator.batch import apply_many
+
+ROWS = 20_000
+OPERATIONS = ('add', 'subtract', 'multiply', 'divide')
+
+
+def run() -> None:
+    """Time every backend on every operation and print rows per second."""
+    xs = [f"{i}.{i % 100:02d}" for i in range(1, ROWS + 1)]
+    ys = [f"{(i % 97) + 1}.25" for i in range(ROWS)]
+    backends = [get_backend('float'), get_backend('decimal'), get_backend('decimal', precision=50),
+                get_backend('fraction')]
+
+    print(f"{'backend':28s}" + "".join(f"{name:>14s}" for name in OPERATIONS) + "   (rows/sec)")
+    for backend in backends:
+        rates = []
+        for operation in OPERATIONS:
+            start = time.perf_counter()
+            apply_many(operation, xs, ys, backend=backend)
+            rates.append(ROWS / (time.perf_counter() - start))
+        print(f"{backend!r:28s}" + "".join(f"{rate:14,.0f}" for rate in rates))
+
+
+if __name__ == "__main__":
+    run()
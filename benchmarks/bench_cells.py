@@ -0,0 +1,68 @@
+"""
+Benchmark: incremental cell updates versus recomputing the whole sheet.
+
+Builds sheets of increasing size made of independent pricing chains (one
+input and DEPTH formula cells each), then changes one input and reads the
+end of its chain. Prints, per sheet size, the time of an incremental
+update, the time of recomputing every formula, and the number of cells
+each recomputes. The incremental time stays flat as the sheet grows,
+because only the DEPTH cells of the affected chain are dirty.
+
+Run from the repository root:
+    python benchmarks/bench_cells.py [DEPTH]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from src.calculator.cells import Sheet
+
+SIZES = (1_000, 10_000, 100_000)
+DEPTH = 10
+UPDATES = 200
+
+
+def build(cells: int, depth: int) -> Sheet:
+    """A sheet of ``cells`` formula cells in chains of ``depth``."""
+    sheet = Sheet()
+    for chain in range(cells // depth):
+        sheet.set(f"p{chain}", 100.0 + chain)
+        previous = f"p{chain}"
+        for step in range(depth):
+            name = f"c{chain}_{step}"
+            sheet.define(name, f"{previous} * 1.01 + p{chain} % 7")
+            previous = name
+    sheet.recalculate()
+    return sheet
+
+
+def run(depth: int) -> None:
+    """Run the benchmark and print the results."""
+    print(f"chains of {depth} formula cells, {UPDATES} updates per size")
+    for cells in SIZES:
+        sheet = build(cells, depth)
+        chains = cells // depth
+        tail = f"c{{}}_{depth - 1}"
+
+        before = sheet.recomputed
+        start = time.perf_counter()
+        for i in range(UPDATES):
+            chain = (i * 7919) % chains
+            sheet.set(f"p{chain}", float(i))
+            sheet.get(tail.format(chain))
+        incremental = (time.perf_counter() - start) / UPDATES
+        per_update = (sheet.recomputed - before) / UPDATES
+
+        # Recompute everything, as without dependency tracking
+        start = time.perf_counter()
+        full_cells = sheet.recalculate(everything=True)
+        full = time.perf_counter() - start
+
+        print(f"  {cells:>7,} cells: incremental {incremental * 1e6:8.1f} us ({per_update:.0f} cells), "
+              f"full {full * 1e3:8.1f} ms ({full_cells:,} cells), {full / incremental:8,.0f}x")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else DEPTH)
@@ -0,0 +1,73 @@
+"""
+Benchmark: text (CSV) versus columnar batch evaluation.
+
+Generates a job file with a mix of operations, converts it to the columnar
+format, then times
+- the streaming CSV path (read, parse every operand, evaluate),
+- the columnar path (memory-map, evaluate straight from the columns),
+- both end to end through their writers,
+and prints rows/sec and file sizes.
+
+Run from the repository root:
+    python benchmarks/bench_columnar.py [ROWS]
+"""
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from src.calculator.columnar import csv_to_columnar, evaluate_table, read_table, write_table
+from src.calculator.streaming import evaluate_records, read_records, write_records
+
+ROWS = 200_000
+OPERATIONS = ['add', 'subtract', 'multiply', 'divide', 'power', 'integer_divide', 'modulo']
+
+
+def _timed(function) -> float:
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def run(rows: int) -> None:
+    """Run the benchmark and print the results."""
+    with tempfile.TemporaryDirectory() as directory:
+        csv_path = os.path.join(directory, "jobs.csv")
+        columnar_path = os.path.join(directory, "jobs.ccol")
+        with open(csv_path, 'w') as f:
+            f.write("op,x,y\n")
+            for i in range(rows):
+                f.write(f"{OPERATIONS[i % len(OPERATIONS)]},{i * 0.37 + 1:.6f},{i % 11 + 0.5}\n")
+        with open(csv_path) as f:
+            csv_to_columnar(f, columnar_path)
+
+        def csv_evaluate():
+            with open(csv_path) as f:
+                for _ in evaluate_records(read_records(f)):
+                    pass
+
+        def columnar_evaluate():
+            with read_table(columnar_path) as jobs:
+                evaluate_table(jobs)
+
+        def csv_end_to_end():
+            with open(csv_path) as f:
+                write_records(evaluate_records(read_records(f)), io.StringIO(), "csv")
+
+        def columnar_end_to_end():
+            with read_table(columnar_path) as jobs:
+                write_table(io.BytesIO(), evaluate_table(jobs))
+
+        print(f"{rows} rows: CSV {os.path.getsize(csv_path) / 1e6:.1f} MB, "
+              f"columnar {os.path.getsize(columnar_path) / 1e6:.1f} MB")
+        for name, function in [("csv evaluate", csv_evaluate), ("columnar evaluate", columnar_evaluate),
+                               ("csv -> csv", csv_end_to_end), ("columnar -> columnar", columnar_end_to_end)]:
+            seconds = min(_timed(function) for _ in range(3))
+            print(f"  {name:22s} {seconds * 1e3:8.1f} ms  {rows / seconds:12,.0f} rows/s")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else ROWS)
@@ -0,0 +1,82 @@
+"""
+Benchmark: strict operations per row versus over validated columns.
+
+Applies the strict add, divide and power to a million float rows (and add
+to int rows) four ways and prints the cost per row:
+
+- the old ``core`` implementation: ``_validate_inputs`` on every call;
+- ``core`` per row: the kernel's strict function, whose type check is a
+  single ``type()`` lookup per operand;
+- ``strict_many`` on plain lists, which validates and builds the columns
+  as part of the call;
+- ``strict_many`` on prebuilt ``Float64Column``/``IntColumn`` operands,
+  with no validation at all.
+
+The time to build the columns once is printed separately.
+
+Run from the repository root:
+    python benchmarks/bench_columns.py [ROWS]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from src.calculator import core
+from src.calculator.columns import Float64Column, IntColumn, strict_many
+from src.calculator.kernel import _validate_inputs
+
+ROWS = 1_000_000
+
+
+def validated(operation: str):
+    """``operation`` with the old per-call validation of ``core``."""
+    function = getattr(core, operation)
+
+    def call(x, y):
+        _validate_inputs(x, y)
+        return function(x, y)
+    return call
+
+
+def per_row(function, xs, ys) -> list:
+    return [function(x, y) for x, y in zip(xs, ys)]
+
+
+def timed(function, *args) -> float:
+    """Seconds taken by one call of ``function(*args)``."""
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+def run(rows: int) -> None:
+    """Run the benchmark and print the results."""
+    rng = random.Random(5)
+    floats = ([rng.uniform(-1e6, 1e6) for _ in range(rows)], [rng.uniform(1.0, 4.0) for _ in range(rows)])
+    ints = ([rng.randrange(-10 ** 9, 10 ** 9) for _ in range(rows)], [rng.randrange(1, 10 ** 6) for _ in range(rows)])
+    build = timed(lambda: (Float64Column(floats[0]), Float64Column(floats[1])))
+    print(f"{rows:,} rows; building two Float64Columns: {build / rows * 1e9:.1f} ns/row")
+
+    print(f"  {'case':<14} {'validated':>10} {'core':>8} {'lists':>8} {'columns':>8}  ns/row")
+    for label, operation, (xs, ys), column in (
+        ("add float", 'add', floats, Float64Column),
+        ("divide float", 'divide', floats, Float64Column),
+        ("power float", 'power', (floats[1], floats[1]), Float64Column),
+        ("add int", 'add', ints, IntColumn),
+    ):
+        columns = (column(xs), column(ys))
+        times = (
+            timed(per_row, validated(operation), xs, ys),
+            timed(per_row, getattr(core, operation), xs, ys),
+            timed(strict_many, operation, xs, ys),
+            timed(strict_many, operation, *columns),
+        )
+        assert strict_many(operation, *columns) == per_row(getattr(core, operation), xs, ys)
+        print(f"  {label:<14} " + " ".join(f"{t / rows * 1e9:{w}.1f}" for t, w in zip(times, (10, 8, 8, 8))))
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else ROWS)
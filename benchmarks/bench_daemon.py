@@ -0,0 +1,64 @@
+"""
+Benchmark: cold CLI invocations versus round trips to a warm daemon.
+
+Starts ``calculator serve`` on a temporary socket, then times
+- a fresh ``python -m src.calculator.cli`` process per calculation,
+- a fresh ``python -m src.calculator.client`` process per calculation,
+- requests over one persistent daemon connection.
+
+Run from the repository root:
+    python benchmarks/bench_daemon.py
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from src.calculator.client import DaemonClient
+
+COLD_CALLS = 20
+WARM_CALLS = 5_000
+
+
+def _time_processes(module: str, env: dict) -> float:
+    """Return seconds per call for spawning ``module`` once per calculation."""
+    start = time.perf_counter()
+    for i in range(COLD_CALLS):
+        subprocess.run([sys.executable, '-m', module, 'add', str(i), '2'],
+                       cwd=ROOT, env=env, capture_output=True, check=True)
+    return (time.perf_counter() - start) / COLD_CALLS
+
+
+def run() -> None:
+    """Run the benchmark and print per-call latencies."""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "calculator.sock")
+        env = dict(os.environ, CALCULATOR_SOCKET=path)
+        daemon = subprocess.Popen([sys.executable, '-m', 'src.calculator.cli', 'serve', '--socket', path],
+                                  cwd=ROOT, stdout=subprocess.PIPE)
+        try:
+            daemon.stdout.readline()  # wait for "listening"
+            cold_cli = _time_processes('src.calculator.cli', env)
+            cold_client = _time_processes('src.calculator.client', env)
+
+            with DaemonClient(path) as client:
+                start = time.perf_counter()
+                for i in range(WARM_CALLS):
+                    client.call(['add', str(i), '2'])
+                warm = (time.perf_counter() - start) / WARM_CALLS
+        finally:
+            daemon.terminate()
+            daemon.wait()
+
+    print(f"cold CLI process:        {cold_cli * 1e3:10.3f} ms/call")
+    print(f"client process + daemon: {cold_client * 1e3:10.3f} ms/call")
+    print(f"persistent connection:   {warm * 1e3:10.3f} ms/call")
+    print(f"speedup (connection vs cold CLI): {cold_cli / warm:.0f}x")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,41 @@
+"""
+Benchmark: parse-once/evaluate-many versus re-parsing every evaluation.
+
+Run from the repository root:
+    python benchmarks/bench_expression.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.calculator.expression import CompiledExpression, compile_expression
+
+EXPRESSION = "(a + b) * c ^ 2 // d - a % 3"
+ROWS = 50_000
+
+
+def run() -> None:
+    """Time both strategies and print rows per second."""
+    rows = [{'a': float(i), 'b': 2.5, 'c': 3.0, 'd': 7.0} for i in range(ROWS)]
+
+    start = time.perf_counter()
+    for row in rows:
+        CompiledExpression(EXPRESSION)(**row)
+    reparse = time.perf_counter() - start
+
+    start = time.perf_counter()
+    compiled = compile_expression(EXPRESSION)
+    for row in rows:
+        compiled(**row)
+    cached = time.perf_counter() - start
+
+    print(f"expression: {EXPRESSION}")
+    print(f"re-parse each row: {ROWS / reparse:12,.0f} rows/sec")
+    print(f"parse once:        {ROWS / cached:12,.0f} rows/sec")
+    print(f"speedup:           {reparse / cached:12.1f}x")
+
+
+if __name__ == "__main__":
+    run()
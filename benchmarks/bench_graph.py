@@ -0,0 +1,59 @@
+"""
+Benchmark: expression tree versus DAG with shared subexpressions.
+
+Evaluates a formula that repeats ``power(x, 2)`` and ``x * y`` several
+times, once compiled as a tree (``expression.compile_expression``, every
+occurrence recomputed) and once as an ``ExpressionGraph`` (each distinct
+subterm computed once per row), and prints rows/sec and the graph's
+elimination report.
+
+Run from the repository root:
+    python benchmarks/bench_graph.py [ROWS]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from src.calculator.expression import compile_expression
+from src.calculator.graph import ExpressionGraph
+
+FORMULA = ("power(x, 2) * 3 + power(x, 2) / (x * y + 1) - (x * y) % 7 "
+           "+ power(x, 2) ^ 0.5 * (2 ^ 10 - 24) + x * y")
+ROWS = 100_000
+
+
+def _timed(function) -> float:
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def run(rows: int) -> None:
+    """Time both strategies and print the results."""
+    data = [{'x': i * 0.01 + 1.0, 'y': (i % 13) + 0.5} for i in range(rows)]
+    tree = compile_expression(FORMULA)
+    graph = ExpressionGraph()
+    compiled = graph.compile(graph.parse(FORMULA))
+    assert all(tree(**row) == compiled(**row) for row in data[:1000])
+
+    def tree_rows():
+        for row in data:
+            tree(**row)
+
+    def graph_rows():
+        for _ in compiled.evaluate_rows(data):
+            pass
+
+    print(f"formula: {FORMULA}")
+    print(f"report:  {compiled.report}")
+    seconds = {}
+    for name, function in [("tree", tree_rows), ("graph", graph_rows)]:
+        seconds[name] = min(_timed(function) for _ in range(3))
+        print(f"  {name:6s} {seconds[name] * 1e3:8.1f} ms  {rows / seconds[name]:12,.0f} rows/s")
+    print(f"  speedup {seconds['tree'] / seconds['graph']:.2f}x")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else ROWS)
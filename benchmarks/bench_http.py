@@ -0,0 +1,147 @@
+"""
+Load generator for the HTTP/JSON server.
+
+Starts ``calculator serve --http 0`` in a subprocess (or targets a running
+server with ``--port``), opens several keep-alive connections and keeps a
+fixed number of pipelined requests in flight on each. Reports requests/sec
+and latency percentiles. With ``--heavy N``, N huge ``power`` requests are
+sent at the start on their own connection, to show that light requests are
+not held up while they run in the process pool.
+
+Run from the repository root:
+    python benchmarks/bench_http.py
+    python benchmarks/bench_http.py --connections 8 --pipeline 16 --requests 50000
+    python benchmarks/bench_http.py --batch 100 --heavy 2
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+HEAVY_REQUEST = {"operation": "power", "operands": [3, 5_000_000]}
+
+
+def _encode(path: str, payload: dict) -> bytes:
+    body = json.dumps(payload).encode()
+    return (f"POST {path} HTTP/1.1\r\nHost: bench\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body)
+
+
+async def _read_response(reader: asyncio.StreamReader) -> int:
+    """Read one response and return its status."""
+    head = await reader.readuntil(b"\r\n\r\n")
+    status = int(head.split(b" ", 2)[1])
+    length = 0
+    for line in head.split(b"\r\n"):
+        if line.lower().startswith(b"content-length:"):
+            length = int(line.split(b":", 1)[1])
+    await reader.readexactly(length)
+    return status
+
+
+def _make_requests(count: int, batch: int) -> list:
+    """Build a mix of cheap calculations as raw requests."""
+    operations = ['add', 'subtract', 'multiply', 'divide', 'power', 'integer_divide', 'modulo']
+    requests = []
+    for i in range(count):
+        operation = operations[i % len(operations)]
+        item = {"operation": operation, "operands": [i % 97 + 0.5, i % 13 + 1]}
+        if batch > 1:
+            requests.append(_encode('/batch', {"requests": [item] * batch}))
+        else:
+            requests.append(_encode('/calculate', item))
+    return requests
+
+
+async def _connection(host: str, port: int, requests: list, pipeline: int, latencies: list) -> None:
+    """Send ``requests`` with up to ``pipeline`` outstanding, recording latencies."""
+    reader, writer = await asyncio.open_connection(host, port)
+    sent_at = []
+    sent = received = 0
+    while received < len(requests):
+        while sent < len(requests) and sent - received < pipeline:
+            writer.write(requests[sent])
+            sent_at.append(time.perf_counter())
+            sent += 1
+        await writer.drain()
+        status = await _read_response(reader)
+        if status >= 500:
+            raise RuntimeError(f"server error {status}")
+        latencies.append(time.perf_counter() - sent_at[received])
+        received += 1
+    writer.close()
+
+
+async def _heavy(host: str, port: int, count: int) -> float:
+    """Send ``count`` heavy requests, returning the time until all answered."""
+    start = time.perf_counter()
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(b"".join(_encode('/calculate', HEAVY_REQUEST) for _ in range(count)))
+    for _ in range(count):
+        await _read_response(reader)
+    writer.close()
+    return time.perf_counter() - start
+
+
+def _percentile(values: list, percent: float) -> float:
+    return values[max(1, math.ceil(percent / 100 * len(values))) - 1]
+
+
+async def run(host: str, port: int, connections: int, pipeline: int, total: int, batch: int, heavy: int) -> None:
+    """Run the load and print the report."""
+    per_connection = total // connections
+    latencies = []
+    heavy_task = asyncio.ensure_future(_heavy(host, port, heavy)) if heavy else None
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        _connection(host, port, _make_requests(per_connection, batch), pipeline, latencies)
+        for _ in range(connections)
+    ))
+    elapsed = time.perf_counter() - start
+    heavy_time = await heavy_task if heavy_task else None
+
+    latencies.sort()
+    requests = len(latencies)
+    print(f"{requests} requests over {connections} connections, pipeline depth {pipeline}"
+          + (f", {batch} calculations per batch" if batch > 1 else ""))
+    print(f"  {requests / elapsed:10.0f} requests/s  ({requests * batch / elapsed:.0f} calculations/s)")
+    for percent in (50, 90, 99, 100):
+        print(f"  p{percent:<3d} {_percentile(latencies, percent) * 1e3:8.3f} ms")
+    if heavy_time is not None:
+        print(f"  {heavy} heavy power requests answered after {heavy_time:.2f} s")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Load-test the calculator HTTP server")
+    parser.add_argument('--port', type=int, help="Port of a running server; starts one if omitted")
+    parser.add_argument('--host', default="127.0.0.1")
+    parser.add_argument('--connections', type=int, default=4)
+    parser.add_argument('--pipeline', type=int, default=8, help="Outstanding requests per connection")
+    parser.add_argument('--requests', type=int, default=20_000, help="Total requests")
+    parser.add_argument('--batch', type=int, default=1, help="Calculations per request (uses /batch when > 1)")
+    parser.add_argument('--heavy', type=int, default=0, help="Huge power requests sent alongside the load")
+    options = parser.parse_args()
+
+    server = None
+    port = options.port
+    if port is None:
+        server = subprocess.Popen([sys.executable, '-m', 'src.calculator.cli', 'serve', '--http', '0'],
+                                  cwd=ROOT, stdout=subprocess.PIPE, text=True)
+        port = int(server.stdout.readline().rsplit(':', 1)[1])
+    try:
+        asyncio.run(run(options.host, port, options.connections, options.pipeline,
+                        options.requests, options.batch, options.heavy))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
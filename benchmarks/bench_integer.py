@@ -0,0 +1,75 @@
+"""
+Benchmark: the integer backend versus the float backend on int workloads.
+
+Times add, multiply, divide and power on small and large int operands with
+both backends, and checks how many float results differ from the exact
+answer. The integer backend skips the float backend's special-value
+checks, and on large ints its divide and power results stay exact where
+float mode rounds (or overflows to inf).
+
+Run from the repository root:
+    python benchmarks/bench_integer.py [REPEAT]
+"""
+import os
+import sys
+import time
+from fractions import Fraction
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from src.calculator.backends import get_backend
+
+REPEAT = 20_000
+
+# (label, operation, operands) with int operands only
+CASES = [
+    ("add small", 'add', [(i, i + 7) for i in range(100)]),
+    ("add 200-digit", 'add', [(10 ** 200 + i, 10 ** 199 + i) for i in range(100)]),
+    ("multiply 200-digit", 'multiply', [(10 ** 200 + i, 3 ** 400 + i) for i in range(100)]),
+    ("divide exact", 'divide', [(i * 12, 12) for i in range(1, 101)]),
+    ("divide 40-digit", 'divide', [(10 ** 40 + i, 7) for i in range(100)]),
+    ("power 2**k", 'power', [(2, 60 + i) for i in range(100)]),
+    ("power 7**k", 'power', [(7, 300 + i) for i in range(100)]),
+]
+
+
+def time_case(function, operands, repeat: int) -> float:
+    """Seconds per call of ``function`` over ``operands``."""
+    rounds = max(1, repeat // len(operands))
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for a, b in operands:
+            function(a, b)
+    return (time.perf_counter() - start) / (rounds * len(operands))
+
+
+def inexact(function, operation: str, operands) -> int:
+    """How many results of ``function`` differ from the exact answer."""
+    exact = get_backend('fraction')
+    count = 0
+    for a, b in operands:
+        try:
+            if Fraction(function(a, b)) != exact.calculate(operation, a, b):
+                count += 1
+        except (OverflowError, ValueError):  # float overflow or inf result
+            count += 1
+    return count
+
+
+def run(repeat: int) -> None:
+    """Run the benchmark and print the results."""
+    float_backend = get_backend('float')
+    integer_backend = get_backend('integer')
+    print(f"{'case':<20} {'float ns':>10} {'integer ns':>11} {'speedup':>8}  float inexact")
+    for label, operation, operands in CASES:
+        float_function = float_backend.operation(operation)
+        integer_function = integer_backend.operation(operation)
+        float_time = time_case(float_function, operands, repeat)
+        integer_time = time_case(integer_function, operands, repeat)
+        wrong = inexact(float_function, operation, operands)
+        print(f"{label:<20} {float_time * 1e9:10.0f} {integer_time * 1e9:11.0f} "
+              f"{float_time / integer_time:7.2f}x  {wrong}/{len(operands)}")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else REPEAT)
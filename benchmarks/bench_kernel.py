@@ -0,0 +1,68 @@
+"""
+Benchmark: the ieee, strict and raw semantics profiles side by side.
+
+Times every built-in operation in each profile on finite float operands
+and on operands that include ints, zeros and special values, and counts
+how many results of the strict and raw profiles differ from the ieee
+result (a different value, or an exception where ieee returns one). The
+differences are what each profile's speed buys or costs.
+
+Run from the repository root:
+    python benchmarks/bench_kernel.py [REPEAT]
+"""
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from src.calculator.conformance import outcome
+from src.calculator.kernel import PROFILES
+
+REPEAT = 50_000
+
+OPERATIONS = ('add', 'subtract', 'multiply', 'divide', 'power', 'integer_divide', 'modulo')
+
+
+def workloads():
+    """(label, operand pairs) for the two workloads."""
+    rng = random.Random(3)
+    finite = [(rng.uniform(0.5, 100.0), rng.uniform(0.5, 4.0)) for _ in range(200)]
+    specials = [0, 1, -3, 2.5, -0.0, 1e308, math.inf, -math.inf, math.nan]
+    mixed = [(a, b) for a in specials for b in specials]
+    return [("finite", finite), ("mixed", mixed)]
+
+
+def time_calls(function, operands, repeat: int) -> float:
+    """Seconds per call of ``function`` over ``operands``; raising calls are timed too."""
+    rounds = max(1, repeat // len(operands))
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for a, b in operands:
+            try:
+                function(a, b)
+            except Exception:
+                pass
+    return (time.perf_counter() - start) / (rounds * len(operands))
+
+
+def run(repeat: int) -> None:
+    """Run the benchmark and print the results."""
+    for label, operands in workloads():
+        print(f"{label} operands ({len(operands)} pairs)")
+        print(f"  {'operation':<16} {'ieee ns':>8} {'strict ns':>10} {'raw ns':>8}  differ from ieee (strict, raw)")
+        for operation in OPERATIONS:
+            times = [time_calls(PROFILES[name][operation], operands, repeat) for name in ('ieee', 'strict', 'raw')]
+            expected = [outcome(PROFILES['ieee'][operation], a, b) for a, b in operands]
+            differ = [
+                sum(outcome(PROFILES[name][operation], a, b) != e for (a, b), e in zip(operands, expected))
+                for name in ('strict', 'raw')
+            ]
+            print(f"  {operation:<16} {times[0] * 1e9:8.0f} {times[1] * 1e9:10.0f} {times[2] * 1e9:8.0f}"
+                  f"  {differ[0]:>4} {differ[1]:>4}")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else REPEAT)
@@ -0,0 +1,45 @@
+"""
+Benchmark: cost of per-operation metrics.
+
+Times calls through the registry with metrics disabled (the registry holds
+the plain functions) and enabled (every call is counted and timed), and
+prints ns per call and the overhead.
+
+Run from the repository root:
+    python benchmarks/bench_metrics.py [CALLS]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from src.calculator.metrics import OperationMetrics, disable_metrics, enable_metrics
+from src.calculator.registry import get_operation
+
+CALLS = 500_000
+CASES = [('add', 1.5, 2.25), ('power', 3, 40), ('divide', float('inf'), 2.0)]
+
+
+def _time_calls(name: str, a, b, calls: int) -> float:
+    function = get_operation(name).function
+    start = time.perf_counter()
+    for _ in range(calls):
+        function(a, b)
+    return (time.perf_counter() - start) / calls
+
+
+def run(calls: int) -> None:
+    """Run the benchmark and print the results."""
+    for name, a, b in CASES:
+        disable_metrics()
+        plain = min(_time_calls(name, a, b, calls) for _ in range(3))
+        enable_metrics([name], OperationMetrics())
+        counted = min(_time_calls(name, a, b, calls) for _ in range(3))
+        disable_metrics()
+        print(f"{name}({a}, {b}): disabled {plain * 1e9:7.1f} ns, enabled {counted * 1e9:7.1f} ns "
+              f"(+{(counted - plain) * 1e9:.1f} ns)")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else CALLS)
@@ -0,0 +1,44 @@
+"""
+Micro-benchmark: nanoseconds per call for each registered two-operand operation.
+
+Each operation is timed on finite floats (the fast path), ints, and
+special values (NaN/inf operands). Run from the repository root:
+    python benchmarks/bench_operations.py
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.calculator.registry import OPERATIONS
+
+INPUTS = {
+    'float': (7.5, 2.25),
+    'int': (7, 3),
+    'special': (2.5, float('inf')),
+}
+
+NUMBER = 200_000
+REPEAT = 5
+
+
+def time_call(function, a, b) -> float:
+    """Return the best time per call in nanoseconds."""
+    timer = timeit.Timer(lambda: function(a, b))
+    return min(timer.repeat(REPEAT, NUMBER)) / NUMBER * 1e9
+
+
+def run() -> None:
+    """Print a table of ns/call per operation and input class."""
+    print(f"{'operation':16s}" + "".join(f"{name:>12s}" for name in INPUTS) + "   (ns/call)")
+    for name, entry in OPERATIONS.items():
+        if entry.arity != 2:
+            print(f"{name:16s}  skipped: takes {entry.arity} operands")
+            continue
+        timings = [time_call(entry.function, a, b) for a, b in INPUTS.values()]
+        print(f"{name:16s}" + "".join(f"{t:12.1f}" for t in timings))
+
+
+if __name__ == "__main__":
+    run()
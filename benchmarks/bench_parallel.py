@@ -0,0 +1,54 @@
+"""
+Benchmark: parallel evaluator scaling from 1 to N worker processes.
+
+The workload mixes cheap operations with big-integer ``power`` calls that
+take milliseconds each. Run from the repository root:
+    python benchmarks/bench_parallel.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.calculator.parallel import ParallelEvaluator
+
+TASK_COUNT = 4_000
+
+
+def make_tasks():
+    """Build the mixed operation workload."""
+    tasks = []
+    for i in range(TASK_COUNT):
+        kind = i % 4
+        if kind == 0:
+            tasks.append(('power', 3, 40_000 + i))
+        elif kind == 1:
+            tasks.append(('add', float(i), 0.5))
+        elif kind == 2:
+            tasks.append(('divide', float(i), 7.0))
+        else:
+            tasks.append(('modulo', i, 13))
+    return tasks
+
+
+def run() -> None:
+    """Time the workload for each worker count and print the speedup."""
+    tasks = make_tasks()
+    cpus = os.cpu_count() or 1
+    worker_counts = sorted({1, 2, 4, cpus} & set(range(1, cpus + 1)))
+
+    baseline = None
+    for workers in worker_counts:
+        with ParallelEvaluator(workers=workers) as evaluator:
+            evaluator.evaluate(tasks[:workers])  # start the worker processes
+            start = time.perf_counter()
+            evaluator.evaluate(tasks)
+            elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f"{workers:3d} workers: {elapsed:8.3f}s  {TASK_COUNT / elapsed:10,.0f} tasks/sec  "
+              f"speedup {baseline / elapsed:5.2f}x")
+
+
+if __name__ == "__main__":
+    run()
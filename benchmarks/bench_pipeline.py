@@ -0,0 +1,64 @@
+"""
+Benchmark: fused pipelines versus chained batch operations.
+
+Evaluates a two-step pipeline, ``divide(add(x, y), z)``, and a five-step
+one over the same columns twice: fused into one generated loop, and step
+by step with ``apply_many`` building every intermediate column. Prints the
+time per row and the peak memory of both (measured with ``tracemalloc``),
+and checks that the results are identical.
+
+Run from the repository root:
+    python benchmarks/bench_pipeline.py [ROWS]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from src.calculator.pipeline import Pipeline, measure_memory
+
+ROWS = 500_000
+
+
+def pipelines():
+    """(label, fused pipeline) for each benchmarked chain."""
+    short = Pipeline()
+    short.divide(short.add('x', 'y'), 'z')
+
+    long = Pipeline()
+    total = long.add('x', 'y')
+    scaled = long.multiply(total, 'z')
+    shifted = long.subtract(scaled, 1.5)
+    squared = long.power(shifted, 2)
+    long.divide(squared, total)
+    return [("divide(add(x, y), z)", short.compile()), ("5 steps", long.compile())]
+
+
+def timed(function, columns) -> float:
+    """Seconds taken by one evaluation."""
+    start = time.perf_counter()
+    function('nan', **columns)
+    return time.perf_counter() - start
+
+
+def run(rows: int) -> None:
+    """Run the benchmark and print the results."""
+    rng = random.Random(9)
+    columns = {name: [rng.uniform(-100.0, 100.0) for _ in range(rows)] for name in 'xyz'}
+    print(f"{rows:,} rows")
+    print(f"  {'pipeline':<22} {'fused ns':>9} {'stepwise ns':>12} {'fused MB':>9} {'stepwise MB':>12} {'saved':>6}")
+    for label, fused in pipelines():
+        needed = {name: columns[name] for name in fused.columns}
+        assert fused('nan', **needed) == fused.evaluate_stepwise('nan', **needed)
+        fused_time = timed(fused, needed)
+        stepwise_time = timed(fused.evaluate_stepwise, needed)
+        memory = measure_memory(fused, **needed)
+        print(f"  {label:<22} {fused_time / rows * 1e9:9.0f} {stepwise_time / rows * 1e9:12.0f} "
+              f"{memory['fused_peak'] / 1e6:9.1f} {memory['stepwise_peak'] / 1e6:12.1f} "
+              f"{memory['saved'] / memory['stepwise_peak']:6.0%}")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else ROWS)
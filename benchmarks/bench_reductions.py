@@ -0,0 +1,67 @@
+"""
+Benchmark: n-ary reductions versus a loop of binary ``add`` calls.
+
+Sums operands spanning forty orders of magnitude with a loop of ``add``,
+with ``sum_many`` and with ``sum_many(deterministic=True)``, and prints the
+time per operand and the error against the correctly rounded sum in
+units in the last place. It also checks that the deterministic sum is the
+same for several chunkings.
+
+Run from the repository root:
+    python benchmarks/bench_reductions.py [COUNT]
+"""
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from src.calculator import add
+from src.calculator.reductions import SumAccumulator, sum_many
+
+COUNT = 1_000_000
+
+
+def add_loop(values) -> float:
+    """Sum with the binary operation, as callers had to before."""
+    total = 0.0
+    for value in values:
+        total = add(total, value)
+    return total
+
+
+def ulps(result: float, exact: float) -> float:
+    """Distance between result and exact in units in the last place of exact."""
+    return abs(result - exact) / math.ulp(exact)
+
+
+def run(count: int) -> None:
+    """Run the benchmark and print the results."""
+    rng = random.Random(1)
+    values = [rng.uniform(-1, 1) * 10 ** rng.randint(-20, 20) for _ in range(count)]
+    exact = math.fsum(values)
+    print(f"{count:,} operands")
+    for label, function in (
+        ("add loop", add_loop),
+        ("sum_many", sum_many),
+        ("sum_many deterministic", lambda v: sum_many(v, deterministic=True)),
+    ):
+        start = time.perf_counter()
+        result = function(values)
+        elapsed = time.perf_counter() - start
+        print(f"  {label:<24} {elapsed / count * 1e9:8.1f} ns/operand   error {ulps(result, exact):,.0f} ulp")
+
+    results = set()
+    for size in (1_000, 4_096, 50_000):
+        total = SumAccumulator(deterministic=True)
+        for i in range(len(values) - size, -1, -size):  # merged back to front
+            total.merge(SumAccumulator(deterministic=True).update(values[i:i + size]))
+        total.update(values[:len(values) % size])
+        results.add(total.result())
+    print(f"  deterministic results over 3 chunkings: {len(results)} distinct")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else COUNT)
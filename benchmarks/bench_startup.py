@@ -0,0 +1,120 @@
+"""
+Benchmark: CLI cold-start latency and import cost.
+
+Times fresh ``python -m src.calculator.cli`` processes for
+- the plain ``op x y`` fast path, which never builds the argument parser,
+- an invocation with an option, which goes through argparse,
+- ``--help``,
+against a bare ``python -c pass`` interpreter start, and breaks the import
+time of the fast path down by module using ``python -X importtime``.
+
+Run from the repository root:
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --output startup.json
+    python benchmarks/bench_startup.py --baseline startup.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+RUNS = 30
+TOP_MODULES = 10
+THRESHOLD = 0.10
+
+COMMANDS = {
+    'python': ['-c', 'pass'],
+    'fast_path': ['-m', 'src.calculator.cli', 'add', '1', '2'],
+    'parser_path': ['-m', 'src.calculator.cli', '--backend', 'float', 'add', '1', '2'],
+    'help': ['-m', 'src.calculator.cli', '--help'],
+}
+
+# Modules the fast path is expected not to import
+HEAVY_MODULES = ('argparse', 'typing', 'importlib.metadata')
+
+
+def time_command(arguments: list, runs: int) -> dict:
+    """Return min and median wall time in ms of ``runs`` fresh processes."""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *arguments], cwd=ROOT, stdout=subprocess.DEVNULL, check=False)
+        times.append((time.perf_counter() - start) * 1e3)
+    return {'min_ms': min(times), 'median_ms': statistics.median(times)}
+
+
+def import_times(arguments: list) -> list:
+    """Return ``(module, self_us, cumulative_us)`` for every import of one run."""
+    process = subprocess.run([sys.executable, '-X', 'importtime', *arguments], cwd=ROOT,
+                             stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    modules = []
+    for line in process.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        modules.append((name.strip(), int(self_us), int(cumulative_us)))
+    return modules
+
+
+def run(runs: int) -> dict:
+    """Run the benchmark and return the report."""
+    report = {name: time_command(arguments, runs) for name, arguments in COMMANDS.items()}
+    modules = import_times(COMMANDS['fast_path'])
+    imported = {name for name, _, _ in modules}
+    report['fast_path_imports'] = {
+        'total_us': sum(self_us for _, self_us, _ in modules),
+        'modules': len(modules),
+        'heavy': [name for name in HEAVY_MODULES if name in imported],
+        'top': [{'module': name, 'self_us': self_us}
+                for name, self_us, _ in sorted(modules, key=lambda m: m[1], reverse=True)[:TOP_MODULES]],
+    }
+    return report
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--runs', type=int, default=RUNS, help="Processes per command")
+    parser.add_argument('--output', metavar='FILE', help="Save the report as JSON")
+    parser.add_argument('--baseline', metavar='FILE', help="Compare median times with a saved report")
+    parser.add_argument('--threshold', type=float, default=THRESHOLD, help="Allowed slowdown (default: 0.10)")
+    options = parser.parse_args()
+
+    report = run(options.runs)
+    python_ms = report['python']['median_ms']
+    for name in COMMANDS:
+        timing = report[name]
+        overhead = timing['median_ms'] - python_ms
+        print(f"{name:12s} min {timing['min_ms']:7.2f} ms  median {timing['median_ms']:7.2f} ms  "
+              f"(+{overhead:6.2f} ms over bare python)")
+
+    imports = report['fast_path_imports']
+    print(f"\nfast path: {imports['modules']} modules imported, {imports['total_us'] / 1e3:.2f} ms in imports")
+    print(f"heavy modules imported: {', '.join(imports['heavy']) or 'none'}")
+    for entry in imports['top']:
+        print(f"  {entry['self_us']:7d} us  {entry['module']}")
+
+    if options.output:
+        with open(options.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    if not options.baseline:
+        return 0
+    with open(options.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+    regressed = False
+    for name in COMMANDS:
+        ratio = report[name]['median_ms'] / baseline[name]['median_ms']
+        if ratio > 1 + options.threshold:
+            regressed = True
+            print(f"REGRESSION {name}: {baseline[name]['median_ms']:.2f} ms -> "
+                  f"{report[name]['median_ms']:.2f} ms ({ratio:.2f}x)", file=sys.stderr)
+    return 1 if regressed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,16 @@
+"""
+Full benchmark suite, the same as ``calculator bench``.
+
+Run from the repository root, e.g.:
+    python benchmarks/bench_suite.py --output baseline.json
+    python benchmarks/bench_suite.py --baseline baseline.json --threshold 0.10
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.calculator.bench import bench_main
+
+if __name__ == "__main__":
+    sys.exit(bench_main(sys.argv[1:]))
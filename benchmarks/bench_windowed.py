@@ -0,0 +1,86 @@
+"""
+Benchmark: peak memory of windowed versus whole-table columnar evaluation.
+
+Writes a large columnar job file in chunks, then evaluates it in child
+processes
+- whole table: map the job file, evaluate into in-memory result arrays and
+  write the result table (``evaluate_table`` + ``write_table``),
+- windowed: ``evaluate_file`` with the given window size,
+and prints wall time, rows/sec and each child's peak resident set size.
+
+Run from the repository root:
+    python benchmarks/bench_windowed.py [ROWS] [WINDOW]
+"""
+import array
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from src.calculator.columnar import column_layout, encode_header
+
+ROWS = 20_000_000
+WINDOW = 1 << 18
+CHUNK = 1 << 20
+OPERATIONS = ['add', 'subtract', 'multiply', 'divide', 'power', 'integer_divide', 'modulo']
+
+CHILD = """
+import resource, sys, time
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+if {mode!r} == "whole":
+    from src.calculator.columnar import evaluate_table, read_table, write_table
+    with read_table({jobs!r}) as jobs:
+        write_table({output!r}, evaluate_table(jobs))
+else:
+    from src.calculator.windowed import evaluate_file
+    evaluate_file({jobs!r}, {output!r}, window={window})
+print(time.perf_counter() - start, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+
+def write_jobs(path: str, rows: int) -> None:
+    """Write a job table of ``rows`` rows without holding it in memory."""
+    column_types = [('op', 'B'), ('x', 'd'), ('y', 'd')]
+    prefix = encode_header(rows, column_types, OPERATIONS)
+    layout = column_layout(rows, column_types, len(prefix))
+    with open(path, 'wb') as f:
+        f.write(prefix)
+        for name, (offset, typecode, size) in layout.items():
+            f.seek(offset)
+            for first in range(0, rows, CHUNK):
+                indices = range(first, min(first + CHUNK, rows))
+                if name == 'op':
+                    chunk = array.array('B', (i % len(OPERATIONS) for i in indices))
+                elif name == 'x':
+                    chunk = array.array('d', (i * 0.37 + 1 for i in indices))
+                else:
+                    chunk = array.array('d', (i % 11 + 0.5 for i in indices))
+                chunk.tofile(f)
+        end = max(offset + size for offset, _, size in layout.values())
+        f.truncate(end + (-end % 8))
+
+
+def run(rows: int, window: int) -> None:
+    """Run the benchmark and print the results."""
+    with tempfile.TemporaryDirectory() as directory:
+        jobs = os.path.join(directory, "jobs.ccol")
+        write_jobs(jobs, rows)
+        print(f"{rows} rows, job file {os.path.getsize(jobs) / 1e6:.0f} MB, window {window} rows")
+        for mode in ("whole", "windowed"):
+            output = os.path.join(directory, f"{mode}.ccol")
+            code = CHILD.format(root=ROOT, mode=mode, jobs=jobs, output=output, window=window)
+            seconds, peak_kb = subprocess.run([sys.executable, "-c", code], check=True,
+                                              capture_output=True, text=True).stdout.split()
+            seconds = float(seconds)
+            print(f"  {mode:9s} {seconds:8.2f} s  {rows / seconds:12,.0f} rows/s  "
+                  f"peak RSS {int(peak_kb) / 1024:8.1f} MB")
+            os.remove(output)
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else ROWS,
+        int(sys.argv[2]) if len(sys.argv) > 2 else WINDOW)
@@ -8,27 +8,8 @@ import sys
 from typing import Union, Optional, NoReturn
 import operator
 
-
-def add(x: float, y: float) -> float:
-    """Add two numbers."""
-    return x + y
-
-
-def subtract(x: float, y: float) -> float:
-    """Subtract two numbers."""
-    return x - y
-
-
-def multiply(x: float, y: float) -> float:
-    """Multiply two numbers."""
-    return x * y
-
-
-def divide(x: float, y: float) -> float:
-    """Divide two numbers."""
-    if y == 0:
-        raise ZeroDivisionError("Cannot divide by zero")
-    return x / y
+# The raw profile of the kernel: plain operators (see kernel.py)
+from .kernel import raw_add as add, raw_subtract as subtract, raw_multiply as multiply, raw_divide as divide
 
 
 def calculate(operation: str, x: float, y: float) -> float:
@@ -0,0 +1,649 @@
+"""
+Numeric backends for the calculator.
+
+A backend decides which number type operands are parsed into and how the
+built-in operations compute on it:
+
+- ``float``: binary floating point, the default; uses the registry
+  functions (so plugins and the result cache apply). With a semantics
+  profile other than ieee (see kernel.py), the built-in operations come
+  from that profile instead.
+- ``decimal``: ``decimal.Decimal`` in a configurable context (precision).
+  NaN and infinite operands follow exactly the same special-case rules as
+  the float backend; finite results are exact up to the context precision.
+- ``fraction``: ``fractions.Fraction``, exact rational arithmetic. Fractions
+  cannot be NaN or infinite, so such operands are rejected with ValueError.
+  ``power`` with a non-integer exponent is irrational and returns a float.
+- ``integer``: int-only operands stay int, with no float conversion and no
+  special-value checks. Division that is not exact returns a Fraction, as
+  does a negative integer exponent. Operands that are not ints or
+  Fractions (floats, NaN, inf) use the float backend unchanged. Results
+  differ from the float backend only where the float backend rounds or
+  overflows; see ``IntegerBackend``.
+
+For all backends ``integer_divide`` returns an int and rounds toward
+negative infinity, and ``modulo`` takes the sign of the divisor, like the
+float backend. ``power_mod`` takes three integral operands and returns an
+int in every backend.
+"""
+import decimal
+import math
+from abc import ABC, abstractmethod
+import operator
+import sys
+from decimal import Decimal
+from fractions import Fraction
+from typing import Callable, Dict, Optional, Union
+
+from . import power_mod
+from .kernel import DEFAULT_PROFILE, get_profile
+from .registry import get_operation
+
+BACKENDS = ("float", "decimal", "fraction", "integer")
+
+# Largest int power result the integer backend computes, in bits (about
+# five million decimal digits); bigger results raise OverflowError
+MAX_INTEGER_BITS = 1 << 24
+
+# Bits per decimal digit, for the int-to-text limit below
+_BITS_PER_DIGIT = math.log2(10)
+
+# Ints of up to this many bits always print: Python's int-to-text limit is
+# at least 640 digits unless it is switched off
+_PRINTABLE_BITS = int(640 * _BITS_PER_DIGIT)
+
+
+def _max_result_bits() -> int:
+    """
+    The largest exact result, in bits, that can still be printed.
+
+    Python refuses to convert ints of more than
+    ``sys.get_int_max_str_digits()`` decimal digits to text (4300 by
+    default, 0 for no limit), so exact results are capped there as well as
+    at ``MAX_INTEGER_BITS``.
+    """
+    digits = sys.get_int_max_str_digits() if hasattr(sys, 'get_int_max_str_digits') else 0
+    if not digits:
+        return MAX_INTEGER_BITS
+    # ints below 2 ** bits are below 10 ** digits
+    return min(MAX_INTEGER_BITS, int(digits * _BITS_PER_DIGIT))
+
+
+def _printable(value):
+    """
+    Return an exact result unchanged if it can be printed.
+
+    Raises:
+        OverflowError: If an int or Fraction result has more digits than
+            Python converts to text
+    """
+    kind = type(value)
+    if kind is int:
+        bits = value.bit_length()
+    elif kind is Fraction:
+        bits = max(value.numerator.bit_length(), value.denominator.bit_length())
+    else:
+        return value
+    if bits > _PRINTABLE_BITS:
+        limit = _max_result_bits()
+        if bits > limit:
+            raise OverflowError(f"Result exceeds {limit} bits, the most that can be printed")
+    return value
+
+
+class Backend(ABC):
+    """Base class for numeric backends."""
+
+    name = ""
+
+    @abstractmethod
+    def parse(self, value: str):
+        """
+        Parse a command-line or file operand.
+
+        Raises:
+            ValueError: If the text is not a number this backend supports
+        """
+
+    @abstractmethod
+    def convert(self, value):
+        """Convert a Python number (or numeric string) to this backend's type."""
+
+    @abstractmethod
+    def operation(self, name: str) -> Optional[Callable]:
+        """Return the function for operation ``name``, or None if unsupported."""
+
+    def calculate(self, operation: str, x, y):
+        """
+        Convert both operands and apply an operation.
+
+        Raises:
+            ValueError: If the operation is not supported by this backend
+        """
+        function = self.operation(operation)
+        if function is None:
+            raise ValueError(f"Invalid operation for the {self.name} backend: {operation}")
+        return function(self.convert(x), self.convert(y))
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}()"
+
+
+class FloatBackend(Backend):
+    """Binary floating point using the registered operations."""
+
+    name = "float"
+
+    def __init__(self, profile: str = DEFAULT_PROFILE) -> None:
+        """
+        Create a float backend.
+
+        Args:
+            profile: Semantics profile of the built-in operations: 'ieee'
+                (the registry functions), 'strict' or 'raw'
+
+        Raises:
+            ValueError: If the profile is unknown
+        """
+        self.profile = profile
+        self._operations = {} if profile == DEFAULT_PROFILE else get_profile(profile)
+
+    def __repr__(self) -> str:
+        if self.profile == DEFAULT_PROFILE:
+            return "FloatBackend()"
+        return f"FloatBackend(profile={self.profile!r})"
+
+    def parse(self, value: str) -> float:
+        try:
+            return float(value)
+        except ValueError:
+            raise ValueError(f"Invalid number format: '{value}'")
+
+    def convert(self, value) -> float:
+        if isinstance(value, str):
+            return self.parse(value)
+        return value
+
+    def operation(self, name: str) -> Optional[Callable]:
+        function = self._operations.get(name)
+        if function is not None:
+            return function
+        entry = get_operation(name)
+        return entry.function if entry is not None else None
+
+
+def _representative(value: Decimal) -> float:
+    """
+    Convert a Decimal to a float for the special-case rules.
+
+    The rules only look at NaN/inf, the sign, zero and the magnitude
+    relative to 1, so finite values that would overflow, underflow or round
+    to +-1 are nudged to the nearest float that keeps those properties.
+    """
+    result = float(value)
+    if not value.is_finite() or value == 0:
+        return result
+    sign = -1.0 if value < 0 else 1.0
+    if math.isinf(result):
+        return sign * sys.float_info.max
+    if result == 0:
+        return sign * math.ulp(0.0)
+    if abs(result) == 1 and abs(value) != 1:
+        return math.nextafter(result, sign * (math.inf if abs(value) > 1 else 0.0))
+    return result
+
+
+class DecimalBackend(Backend):
+    """``decimal.Decimal`` arithmetic in a fixed context."""
+
+    name = "decimal"
+
+    def __init__(self, precision: Optional[int] = None, context: Optional[decimal.Context] = None) -> None:
+        """
+        Create a Decimal backend.
+
+        Args:
+            precision: Significant digits, overriding the context's precision
+            context: Base context, a copy of the default context if omitted
+
+        Raises:
+            ValueError: If precision is less than 1
+        """
+        if precision is not None and precision < 1:
+            raise ValueError(f"precision must be at least 1, got {precision}")
+        context = (context or decimal.DefaultContext).copy()
+        if precision is not None:
+            context.prec = precision
+        # Overflow gives Infinity like the float backend instead of raising
+        context.traps[decimal.Overflow] = False
+        self.context = context
+        self._operations: Dict[str, Callable] = {
+            'add': self.add,
+            'subtract': self.subtract,
+            'multiply': self.multiply,
+            'divide': self.divide,
+            'power': self.power,
+            'integer_divide': self.integer_divide,
+            'modulo': self.modulo,
+            'power_mod': power_mod,
+        }
+
+    def __repr__(self) -> str:
+        return f"DecimalBackend(precision={self.context.prec})"
+
+    def parse(self, value: str) -> Decimal:
+        try:
+            return Decimal(value.strip())
+        except decimal.InvalidOperation:
+            raise ValueError(f"Invalid number format: '{value}'")
+
+    def convert(self, value) -> Decimal:
+        if isinstance(value, Decimal):
+            return value
+        if isinstance(value, str):
+            return self.parse(value)
+        if isinstance(value, Fraction):
+            return self.context.divide(Decimal(value.numerator), Decimal(value.denominator))
+        return Decimal(value)  # exact value of ints and floats
+
+    def operation(self, name: str) -> Optional[Callable]:
+        return self._operations.get(name)
+
+    @staticmethod
+    def _special(name: str, a: Decimal, b: Decimal):
+        """
+        Apply the float backend's special-case rules to non-finite operands.
+
+        Returns the result converted back to Decimal, or None when both
+        operands are finite.
+        """
+        if a.is_finite() and b.is_finite():
+            return None
+        if name == 'modulo' and a.is_finite() and b.is_infinite():
+            return a  # finite % inf is the (exact) finite operand
+        result = get_operation(name).function(_representative(a), _representative(b))
+        return Decimal(result) if isinstance(result, float) else result
+
+    def add(self, a: Decimal, b: Decimal) -> Decimal:
+        """Add two Decimals."""
+        special = self._special('add', a, b)
+        return special if special is not None else self.context.add(a, b)
+
+    def subtract(self, a: Decimal, b: Decimal) -> Decimal:
+        """Subtract b from a."""
+        special = self._special('subtract', a, b)
+        return special if special is not None else self.context.subtract(a, b)
+
+    def multiply(self, a: Decimal, b: Decimal) -> Decimal:
+        """Multiply two Decimals."""
+        special = self._special('multiply', a, b)
+        return special if special is not None else self.context.multiply(a, b)
+
+    def divide(self, a: Decimal, b: Decimal) -> Decimal:
+        """Divide a by b."""
+        if not b.is_nan() and b == 0:
+            raise ZeroDivisionError("Cannot divide by zero")
+        special = self._special('divide', a, b)
+        return special if special is not None else self.context.divide(a, b)
+
+    def power(self, a: Decimal, b: Decimal) -> Decimal:
+        """Raise a to the power of b."""
+        special = self._special('power', a, b)
+        if special is not None:
+            return special
+        if a == 0 and b < 0:
+            raise ZeroDivisionError("0.0 cannot be raised to a negative power")
+        try:
+            return self.context.power(a, b)
+        except decimal.InvalidOperation:
+            raise ValueError(f"Invalid operation: {a} ** {b} is not a real number")
+
+    def _floor_divmod(self, a: Decimal, b: Decimal):
+        """
+        divmod rounding toward negative infinity (Decimal's divmod truncates).
+
+        Decimal raises DivisionImpossible when the integer quotient has more
+        digits than the precision (1e30 // 1 has 31), so the division runs
+        in a wider copy of the context when the operand exponents call for
+        it. The quotient is exact; the remainder is rounded to the precision.
+        """
+        context = self.context
+        exponent = min(a.as_tuple().exponent, b.as_tuple().exponent)
+        digits = max(a.adjusted() - b.adjusted(), b.adjusted() - exponent) + 2
+        if digits > context.prec:
+            context = context.copy()
+            context.prec = digits
+        quotient, remainder = context.divmod(a, b)
+        if remainder != 0 and (remainder < 0) != (b < 0):
+            quotient = context.subtract(quotient, 1)
+            remainder = context.add(remainder, b)
+        return quotient, self.context.plus(remainder)
+
+    def integer_divide(self, a: Decimal, b: Decimal) -> int:
+        """Floor-divide a by b."""
+        if not b.is_nan() and b == 0:
+            raise ZeroDivisionError("Cannot divide by zero")
+        special = self._special('integer_divide', a, b)
+        if special is not None:
+            return special
+        return _printable(int(self._floor_divmod(a, b)[0]))
+
+    def modulo(self, a: Decimal, b: Decimal) -> Decimal:
+        """Remainder of a divided by b, with the sign of b."""
+        if not b.is_nan() and b == 0:
+            raise ZeroDivisionError("Cannot divide by zero")
+        special = self._special('modulo', a, b)
+        if special is not None:
+            return special
+        return self._floor_divmod(a, b)[1]
+
+
+class FractionBackend(Backend):
+    """Exact rational arithmetic with ``fractions.Fraction``."""
+
+    name = "fraction"
+
+    def parse(self, value: str) -> Fraction:
+        try:
+            return Fraction(value.strip())
+        except (ValueError, ZeroDivisionError):
+            raise ValueError(f"Invalid number format: '{value}'")
+
+    def convert(self, value) -> Fraction:
+        if isinstance(value, Fraction):
+            return value
+        if isinstance(value, str):
+            return self.parse(value)
+        if isinstance(value, float) and (value != value or value in (float('inf'), float('-inf'))):
+            raise ValueError(f"The fraction backend cannot represent {value}")
+        if isinstance(value, Decimal) and not value.is_finite():
+            raise ValueError(f"The fraction backend cannot represent {value}")
+        return Fraction(value)
+
+    def operation(self, name: str) -> Optional[Callable]:
+        return _FRACTION_CHECKED.get(name)
+
+
+def _fraction_divide(a: Fraction, b: Fraction) -> Fraction:
+    """Divide a by b exactly."""
+    if b == 0:
+        raise ZeroDivisionError("Cannot divide by zero")
+    return a / b
+
+
+def _check_power(a, b, base: int, exponent: int) -> None:
+    """
+    Refuse an exact power before computing it if the result cannot be printed.
+
+    Args:
+        a, b: The operands, for the message
+        base: Largest absolute integer the result raises to ``exponent``
+            (the base, or the bigger of its numerator and denominator)
+        exponent: Absolute integer exponent
+
+    Raises:
+        OverflowError: If ``base ** exponent`` has more bits than
+            ``_max_result_bits()``
+    """
+    if exponent > 1 and base > 1:
+        bits = (base.bit_length() - 1) * exponent  # a lower bound of the result's bits
+        if bits > _PRINTABLE_BITS:
+            limit = _max_result_bits()
+            if bits > limit:
+                raise OverflowError(f"Result of {a} ** {b} exceeds {limit} bits")
+
+
+def _fraction_power(a: Fraction, b: Fraction) -> Union[Fraction, float]:
+    """Raise a to the power of b; exact for integer exponents."""
+    if a == 0 and b < 0:
+        raise ZeroDivisionError("0.0 cannot be raised to a negative power")
+    if b.denominator == 1:
+        _check_power(a, b, max(abs(a.numerator), a.denominator), abs(b.numerator))
+        return a ** b.numerator
+    result = a ** b  # irrational in general, Fraction returns a float or complex
+    if isinstance(result, complex):
+        raise ValueError(f"Invalid operation: {a} ** {b} is not a real number")
+    return result
+
+
+def _fraction_integer_divide(a: Fraction, b: Fraction) -> int:
+    """Floor-divide a by b."""
+    if b == 0:
+        raise ZeroDivisionError("Cannot divide by zero")
+    return a // b
+
+
+def _fraction_modulo(a: Fraction, b: Fraction) -> Fraction:
+    """Remainder of a divided by b, with the sign of b."""
+    if b == 0:
+        raise ZeroDivisionError("Cannot divide by zero")
+    return a % b
+
+
+_FRACTION_OPERATIONS = {
+    'add': lambda a, b: a + b,
+    'subtract': lambda a, b: a - b,
+    'multiply': lambda a, b: a * b,
+    'divide': _fraction_divide,
+    'power': _fraction_power,
+    'integer_divide': _fraction_integer_divide,
+    'modulo': _fraction_modulo,
+    'power_mod': power_mod,
+}
+
+
+def _checked(function: Callable) -> Callable:
+    """Wrap an exact operation so that results too large to print raise OverflowError."""
+    def operation(*operands):
+        return _printable(function(*operands))
+
+    operation.__name__ = function.__name__
+    return operation
+
+
+_FRACTION_CHECKED = {name: _checked(function) for name, function in _FRACTION_OPERATIONS.items()}
+
+
+def _integer_divide_exact(a: int, b: int) -> Union[int, Fraction]:
+    """Divide ints: an int when the division is exact, otherwise a Fraction."""
+    if b == 0:
+        raise ZeroDivisionError("Cannot divide by zero")
+    quotient, remainder = divmod(a, b)
+    return quotient if not remainder else Fraction(a, b)
+
+
+def _integer_power(a: int, b: int) -> Union[int, Fraction]:
+    """Raise an int to an int power exactly; a Fraction for negative exponents."""
+    exponent = -b if b < 0 else b
+    _check_power(a, b, abs(a), exponent)
+    if b >= 0:
+        return a ** b
+    if a == 0:
+        raise ZeroDivisionError("0 cannot be raised to a negative power")
+    return Fraction(1, a ** exponent)
+
+
+def _integer_floor_divide(a: int, b: int) -> int:
+    """Floor-divide ints."""
+    if b == 0:
+        raise ZeroDivisionError("Cannot divide by zero")
+    return a // b
+
+
+def _integer_modulo(a: int, b: int) -> int:
+    """Remainder of ints, with the sign of b."""
+    if b == 0:
+        raise ZeroDivisionError("Cannot divide by zero")
+    return a % b
+
+
+_INTEGER_EXACT = {
+    'add': operator.add,
+    'subtract': operator.sub,
+    'multiply': operator.mul,
+    'divide': _integer_divide_exact,
+    'power': _integer_power,
+    'integer_divide': _integer_floor_divide,
+    'modulo': _integer_modulo,
+}
+
+
+# Integer operations whose results can have more digits than their operands
+_GROWING = frozenset(('add', 'subtract', 'multiply', 'power'))
+
+
+def _integer_operation(name: str) -> Callable:
+    """Build the integer backend's function for one operation."""
+    exact = _INTEGER_EXACT[name]
+    rational = _FRACTION_OPERATIONS[name]
+    growing = name in _GROWING
+
+    def operation(a, b):
+        # type() rather than isinstance: the int path must not take bools
+        kind_a = type(a)
+        kind_b = type(b)
+        if kind_a is int and kind_b is int:
+            result = exact(a, b)
+            if not growing or (type(result) is int and result.bit_length() <= _PRINTABLE_BITS):
+                return result
+            return _printable(result)
+        if (kind_a is int or kind_a is Fraction) and (kind_b is int or kind_b is Fraction):
+            return _printable(rational(a, b))
+        return get_operation(name).function(a, b)
+
+    operation.__name__ = name
+    return operation
+
+
+class IntegerBackend(Backend):
+    """
+    Exact integer arithmetic, falling back to floats for non-integer operands.
+
+    Where results differ from the float backend, for int operands:
+
+    - ``divide`` returns an int when the division is exact (``6 / 3`` is
+      ``2``, not ``2.0``) and a Fraction otherwise (``1 / 3``), instead of
+      a rounded float. Quotients of huge ints do not overflow.
+    - ``power`` returns an int (``2 ** 100`` exactly) and a Fraction for a
+      negative exponent (``2 ** -2`` is ``Fraction(1, 4)``). A result that
+      would be larger than ``MAX_INTEGER_BITS`` raises OverflowError, where
+      the float backend returns inf.
+    - Every exact result must also fit Python's int-to-text limit
+      (``sys.get_int_max_str_digits()``, 4300 digits by default), so it can
+      always be printed; larger results raise OverflowError too.
+    - ``add``, ``subtract``, ``multiply``, ``integer_divide`` and ``modulo``
+      already give ints in the float backend; they only skip its checks.
+
+    Fraction operands (e.g. a previous division result, or ``"1/3"`` on the
+    command line) use the fraction backend's exact rules. Float operands,
+    including NaN and inf, use the float backend, so mixed ``int`` and
+    ``float`` operands give the float result.
+    """
+
+    name = "integer"
+
+    def __init__(self) -> None:
+        self._operations: Dict[str, Callable] = {name: _integer_operation(name) for name in _INTEGER_EXACT}
+        self._operations['power_mod'] = power_mod
+
+    def parse(self, value: str) -> Union[int, Fraction, float]:
+        text = value.strip()
+        try:
+            return int(text)
+        except ValueError:
+            pass
+        try:
+            return Fraction(text) if '/' in text else float(text)
+        except (ValueError, ZeroDivisionError):
+            raise ValueError(f"Invalid number format: '{value}'")
+
+    def convert(self, value) -> Union[int, Fraction, float]:
+        if isinstance(value, str):
+            return self.parse(value)
+        if isinstance(value, Decimal):
+            if not value.is_finite():
+                return float(value)
+            value = Fraction(value)
+            return value.numerator if value.denominator == 1 else value
+        return value
+
+    def operation(self, name: str) -> Optional[Callable]:
+        return self._operations.get(name)
+
+
+_FLOAT_BACKEND = FloatBackend()
+_PROFILE_BACKENDS = {DEFAULT_PROFILE: _FLOAT_BACKEND}
+_FRACTION_BACKEND = FractionBackend()
+_INTEGER_BACKEND = IntegerBackend()
+
+
+def get_backend(name: Union[str, Backend, None] = None, precision: Optional[int] = None,
+                profile: Optional[str] = None) -> Backend:
+    """
+    Look up a backend by name.
+
+    Args:
+        name: 'float', 'decimal', 'fraction', 'integer', a Backend instance (returned
+            as is) or None for 'decimal' when a precision is given and
+            'float' otherwise
+        precision: Significant digits for the decimal backend
+        profile: Semantics profile for the float backend ('ieee', 'strict'
+            or 'raw'), ieee if omitted
+
+    Returns:
+        The backend
+
+    Raises:
+        ValueError: If the name or profile is unknown, a precision is given
+            for a backend other than decimal, or a profile other than ieee
+            for a backend other than float
+    """
+    if isinstance(name, Backend):
+        if profile not in (None, getattr(name, 'profile', DEFAULT_PROFILE)):
+            raise ValueError(f"Cannot apply profile {profile} to the backend instance {name!r}")
+        return name
+    if name is None:
+        name = "decimal" if precision is not None else "float"
+    if precision is not None and name != "decimal":
+        raise ValueError(f"precision is only supported by the decimal backend, not {name}")
+    if profile is not None:
+        get_profile(profile)  # unknown profiles raise ValueError
+    if profile is not None and profile != DEFAULT_PROFILE and name != "float":
+        raise ValueError(f"The {profile} profile is only supported by the float backend, not {name}")
+    if name == "float":
+        if profile is None:
+            return _FLOAT_BACKEND
+        backend = _PROFILE_BACKENDS.get(profile)
+        if backend is None:
+            backend = _PROFILE_BACKENDS[profile] = FloatBackend(profile)
+        return backend
+    if name == "decimal":
+        return DecimalBackend(precision)
+    if name == "fraction":
+        return _FRACTION_BACKEND
+    if name == "integer":
+        return _INTEGER_BACKEND
+    raise ValueError(f"Invalid backend: {name}. Valid backends are: {', '.join(BACKENDS)}")
+
+
+def calculate(operation: str, x, y, backend: Union[str, Backend, None] = None, profile: Optional[str] = None):
+    """
+    Apply an operation using a numeric backend.
+
+    Args:
+        operation: Operation name
+        x: First operand (number or numeric string)
+        y: Second operand (number or numeric string)
+        backend: Backend name or instance, float if omitted
+        profile: Semantics profile of the float backend, ieee if omitted
+
+    Returns:
+        The result in the backend's number type
+    """
+    return get_backend(backend, profile=profile).calculate(operation, x, y)
+
+
+__all__ = [
+    'Backend', 'FloatBackend', 'DecimalBackend', 'FractionBackend', 'IntegerBackend',
+    'BACKENDS', 'MAX_INTEGER_BITS', 'get_backend', 'calculate',
+]
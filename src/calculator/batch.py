@@ -0,0 +1,233 @@
+"""
+Batch (element-wise) versions of the calculator operations.
+
+Each ``*_many`` function applies one operation to two equally sized
+sequences of operands and keeps the exact special-case semantics of the
+scalar functions in ``src.calculator`` (NaN propagation, inf - inf -> NaN,
+inf * 0 -> NaN, finite / inf -> signed zero, ...).
+
+When NumPy is installed and an operand is a NumPy array (or a floating
+point ``array.array``), the whole batch is computed in one vectorized
+pass. Only the rows where NumPy and the scalar functions could disagree
+(non-finite operands or results, zero divisors) are re-evaluated with the
+scalar function, so the results are identical to calling it per row.
+Without NumPy a pure-Python loop is used and a list is returned.
+
+``profile`` selects the semantics of the built-in operations ('ieee', the
+default, 'strict' or 'raw'; see kernel.py). The vectorized path is used
+for every profile: on rows with finite operands and results NumPy agrees
+with all three, and the other rows are re-evaluated with the profile's
+scalar function. With the strict profile, operands that are validated
+columns (``columns.Float64Column``, ``columns.IntColumn``) skip the
+per-row type checks.
+"""
+import array
+from typing import Any, Callable, List, Sequence, Union
+
+from .registry import get_operation
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional
+    np = None
+
+
+# Error policies for rows whose scalar operation raises
+ERRORS_RAISE = "raise"  # re-raise the first failing row's exception
+ERRORS_NAN = "nan"      # store NaN for the failing row and continue
+ERRORS_MASK = "mask"    # like "nan", and also return a per-row failure mask
+ERROR_POLICIES = (ERRORS_RAISE, ERRORS_NAN, ERRORS_MASK)
+
+# Exceptions a single row may raise (ZeroDivisionError, OverflowError from
+# int(inf), TypeError from complex powers, ...)
+ELEMENT_ERRORS = (ArithmeticError, TypeError, ValueError)
+
+Operands = Union[Sequence[float], "array.array[float]", Any]
+
+# NumPy ufuncs computing the IEEE result of each built-in operation; other
+# (plugin) operations always take the pure-Python path
+_NUMPY_UFUNCS = {
+    'add': 'add',
+    'subtract': 'subtract',
+    'multiply': 'multiply',
+    'divide': 'true_divide',
+    'power': 'power',
+    'integer_divide': 'floor_divide',
+    'modulo': 'remainder',
+}
+
+# Operations whose scalar version raises when the divisor is zero
+_ZERO_DIVISOR_OPERATIONS = frozenset({'divide', 'integer_divide', 'modulo'})
+
+
+def _use_numpy(xs: Operands, ys: Operands) -> bool:
+    """Return True when the batch should take the vectorized NumPy path."""
+    if np is None:
+        return False
+    for operand in (xs, ys):
+        if isinstance(operand, np.ndarray):
+            return True
+        if isinstance(operand, array.array) and operand.typecode in ('d', 'f'):
+            return True
+    return False
+
+
+def _apply_python(func: Callable, xs: Operands, ys: Operands, errors: str):
+    """Apply ``func`` row by row in pure Python."""
+    results: List[Any] = []
+    failed: List[bool] = []
+    append = results.append
+    for x, y in zip(xs, ys):
+        try:
+            append(func(x, y))
+            failed.append(False)
+        except ELEMENT_ERRORS:
+            if errors == ERRORS_RAISE:
+                raise
+            append(float('nan'))
+            failed.append(True)
+    if errors == ERRORS_MASK:
+        return results, failed
+    return results
+
+
+def _numpy_kernel(name: str, x, y):
+    """Vectorized IEEE version of operation ``name``."""
+    return getattr(np, _NUMPY_UFUNCS[name])(x, y)
+
+
+def _apply_numpy(name: str, func: Callable, xs: Operands, ys: Operands, errors: str):
+    """Apply operation ``name`` in one vectorized pass, fixing up special rows."""
+    x = np.asarray(xs, dtype=np.float64)
+    y = np.asarray(ys, dtype=np.float64)
+
+    with np.errstate(all='ignore'):
+        out = _numpy_kernel(name, x, y)
+    out = np.asarray(out, dtype=np.float64)
+
+    # Rows where the vectorized result may differ from the scalar function
+    special = ~(np.isfinite(x) & np.isfinite(y) & np.isfinite(out))
+    if name in _ZERO_DIVISOR_OPERATIONS:
+        special |= (y == 0)
+
+    failed = np.zeros(out.shape, dtype=bool)
+    for i in np.flatnonzero(special):
+        try:
+            out[i] = func(float(x[i]), float(y[i]))
+        except ELEMENT_ERRORS:
+            if errors == ERRORS_RAISE:
+                raise
+            out[i] = np.nan
+            failed[i] = True
+
+    if errors == ERRORS_MASK:
+        return out, failed
+    return out
+
+
+def _apply_backend(function: Callable, backend, xs: Operands, ys: Operands, errors: str):
+    """Convert every operand to the backend's number type, then apply ``function``."""
+    convert = backend.convert
+    return _apply_python(lambda x, y: function(convert(x), convert(y)), xs, ys, errors)
+
+
+def apply_many(operation: str, xs: Operands, ys: Operands, errors: str = ERRORS_RAISE, backend=None,
+               profile=None):
+    """
+    Apply an operation element-wise to two operand sequences.
+
+    Args:
+        operation: Name of a registered two-operand operation ('add',
+            'subtract', 'multiply', 'divide', 'power', ...)
+        xs: First operands (sequence, array.array or NumPy array)
+        ys: Second operands, same length as ``xs``
+        errors: What to do when a row raises: 'raise' re-raises the first
+            failure, 'nan' stores NaN for failed rows, 'mask' does the same
+            and also returns a boolean failure mask
+        backend: Numeric backend name ('float', 'decimal', 'fraction',
+            'integer') or instance from ``backends.get_backend``; float if
+            omitted
+        profile: Semantics profile of the float backend ('ieee', 'strict'
+            or 'raw'); ieee if omitted
+
+    Returns:
+        A NumPy float64 array on the vectorized path, otherwise a list.
+        With ``errors='mask'`` a ``(results, failed)`` tuple is returned.
+
+    Raises:
+        ValueError: If the operation, error policy or profile is unknown, or
+            the operand lengths differ
+        ZeroDivisionError: With ``errors='raise'``, for the first row that
+            divides by zero (other per-row errors are raised the same way)
+    """
+    entry = get_operation(operation)
+    if entry is None or entry.arity != 2:
+        raise ValueError(f"Invalid operation: {operation}")
+    function = entry.function
+
+    if profile == 'strict' and backend is None:
+        from .columns import TypedColumn, strict_many
+        if isinstance(xs, TypedColumn) and isinstance(ys, TypedColumn) and operation in _NUMPY_UFUNCS:
+            return strict_many(operation, xs, ys, errors)  # validated once, when the columns were built
+
+    if backend is not None or profile is not None:
+        from .backends import get_backend
+        backend = get_backend(backend, profile=profile)
+        if backend.name == "float" and _use_numpy(xs, ys):
+            function = backend.operation(operation)
+            backend = None  # arrays are already float
+    if errors not in ERROR_POLICIES:
+        raise ValueError(f"Invalid error policy: {errors}. Valid policies are: {', '.join(ERROR_POLICIES)}")
+    if len(xs) != len(ys):
+        raise ValueError(f"Operand lengths differ: {len(xs)} != {len(ys)}")
+
+    if backend is not None:
+        function = backend.operation(operation)
+        if function is None:
+            raise ValueError(f"Invalid operation for the {backend.name} backend: {operation}")
+        return _apply_backend(function, backend, xs, ys, errors)
+    if operation in _NUMPY_UFUNCS and _use_numpy(xs, ys):
+        return _apply_numpy(operation, function, xs, ys, errors)
+    return _apply_python(function, xs, ys, errors)
+
+
+def add_many(xs: Operands, ys: Operands, errors: str = ERRORS_RAISE, backend=None, profile=None):
+    """Element-wise ``add``. See ``apply_many`` for arguments and return value."""
+    return apply_many('add', xs, ys, errors, backend, profile)
+
+
+def subtract_many(xs: Operands, ys: Operands, errors: str = ERRORS_RAISE, backend=None, profile=None):
+    """Element-wise ``subtract``. See ``apply_many`` for arguments and return value."""
+    return apply_many('subtract', xs, ys, errors, backend, profile)
+
+
+def multiply_many(xs: Operands, ys: Operands, errors: str = ERRORS_RAISE, backend=None, profile=None):
+    """Element-wise ``multiply``. See ``apply_many`` for arguments and return value."""
+    return apply_many('multiply', xs, ys, errors, backend, profile)
+
+
+def divide_many(xs: Operands, ys: Operands, errors: str = ERRORS_RAISE, backend=None, profile=None):
+    """Element-wise ``divide``. See ``apply_many`` for arguments and return value."""
+    return apply_many('divide', xs, ys, errors, backend, profile)
+
+
+def power_many(xs: Operands, ys: Operands, errors: str = ERRORS_RAISE, backend=None, profile=None):
+    """Element-wise ``power``. See ``apply_many`` for arguments and return value."""
+    return apply_many('power', xs, ys, errors, backend, profile)
+
+
+def integer_divide_many(xs: Operands, ys: Operands, errors: str = ERRORS_RAISE, backend=None, profile=None):
+    """Element-wise ``integer_divide``. See ``apply_many`` for arguments and return value."""
+    return apply_many('integer_divide', xs, ys, errors, backend, profile)
+
+
+def modulo_many(xs: Operands, ys: Operands, errors: str = ERRORS_RAISE, backend=None, profile=None):
+    """Element-wise ``modulo``. See ``apply_many`` for arguments and return value."""
+    return apply_many('modulo', xs, ys, errors, backend, profile)
+
+
+__all__ = [
+    'apply_many', 'add_many', 'subtract_many', 'multiply_many', 'divide_many',
+    'power_many', 'integer_divide_many', 'modulo_many',
+    'ERRORS_RAISE', 'ERRORS_NAN', 'ERRORS_MASK', 'ERROR_POLICIES',
+]
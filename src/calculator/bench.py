@@ -0,0 +1,268 @@
+"""
+Built-in benchmark suite (``calculator bench``).
+
+Measures every operation on int, float, special-value and large-int
+operands, the CLI ``main()`` path end to end, and the batch modes. Results
+are emitted as JSON with mean/p50/p99 time per operation and ops/sec, and
+can be compared against a saved baseline to flag regressions::
+
+    calculator bench --output baseline.json
+    ... change code ...
+    calculator bench --baseline baseline.json --threshold 0.10
+
+Regressions are judged on the p50 time, which is less sensitive to noise
+from other processes than the mean.
+"""
+import argparse
+import contextlib
+import io
+import json
+import math
+import platform
+import sys
+import time
+from typing import Callable, Dict, List, NamedTuple
+
+from .registry import OPERATIONS
+
+FORMAT_VERSION = 1
+DEFAULT_THRESHOLD = 0.10
+DEFAULT_REPEAT = 20
+QUICK_REPEAT = 5
+SAMPLE_TIME = 0.002  # seconds per sample after calibration
+
+_INPUTS = {
+    'int': (7, 3),
+    'float': (7.5, 2.25),
+    'special': (2.5, float('inf')),
+    'large_int': (3 ** 200, 7 ** 150),
+}
+
+# power(3 ** 200, 7 ** 150) would never finish; use an exponent that
+# overflows float instead
+_POWER_LARGE_INT = (3, 5000)
+
+BATCH_ROWS = 1000
+
+
+class Benchmark(NamedTuple):
+    """
+    One benchmark case.
+
+    Attributes:
+        name: Unique name, e.g. 'operation/add/float'
+        function: Callable run once per measured call
+        operations: Operations performed by one call (rows for batch cases)
+    """
+    name: str
+    function: Callable[[], object]
+    operations: int = 1
+
+
+def _operation_benchmarks() -> List[Benchmark]:
+    cases = []
+    for name, entry in OPERATIONS.items():
+        # The inputs are operand pairs; operations of another arity, such as
+        # power_mod, are skipped
+        if entry.arity != 2:
+            continue
+        function = entry.function
+        for kind, (a, b) in _INPUTS.items():
+            if name == 'power' and kind == 'large_int':
+                a, b = _POWER_LARGE_INT
+            cases.append(Benchmark(f"operation/{name}/{kind}", lambda f=function, a=a, b=b: f(a, b)))
+    return cases
+
+
+def _cli_benchmarks() -> List[Benchmark]:
+    from .cli import main
+
+    def run_cli() -> None:
+        with contextlib.redirect_stdout(io.StringIO()):
+            main(['add', '5', '3'])
+
+    return [Benchmark("cli/main", run_cli)]
+
+
+def _batch_benchmarks() -> List[Benchmark]:
+    from .batch import apply_many
+    from .streaming import evaluate_records
+
+    xs = [float(i) + 0.5 for i in range(BATCH_ROWS)]
+    ys = [float(i % 97) + 1.25 for i in range(BATCH_ROWS)]
+    records = [(i, ['multiply', str(x), str(y)]) for i, (x, y) in enumerate(zip(xs, ys), 1)]
+
+    def run_streaming() -> None:
+        for _ in evaluate_records(records):
+            pass
+
+    return [
+        Benchmark("batch/add_many", lambda: apply_many('add', xs, ys), BATCH_ROWS),
+        Benchmark("batch/divide_many", lambda: apply_many('divide', xs, ys), BATCH_ROWS),
+        Benchmark("batch/streaming", run_streaming, BATCH_ROWS),
+    ]
+
+
+def default_benchmarks() -> List[Benchmark]:
+    """Return the full benchmark suite."""
+    return _operation_benchmarks() + _cli_benchmarks() + _batch_benchmarks()
+
+
+def _percentile(sorted_values: List[float], percent: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    rank = max(1, math.ceil(percent / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def measure(benchmark: Benchmark, repeat: int = DEFAULT_REPEAT, sample_time: float = SAMPLE_TIME) -> Dict[str, float]:
+    """
+    Time one benchmark.
+
+    The number of calls per sample is calibrated so each sample takes about
+    ``sample_time`` seconds; ``repeat`` samples are taken.
+
+    Args:
+        benchmark: The case to run
+        repeat: Number of samples
+        sample_time: Target duration of one sample in seconds
+
+    Returns:
+        Dict with mean_ns, p50_ns and p99_ns per operation, ops_per_sec
+        and the number of samples
+    """
+    function = benchmark.function
+    timer = time.perf_counter
+
+    # Calibrate: double the calls per sample until a sample is long enough
+    number = 1
+    while True:
+        start = timer()
+        for _ in range(number):
+            function()
+        if timer() - start >= sample_time:
+            break
+        number *= 2
+
+    samples = []
+    for _ in range(repeat):
+        start = timer()
+        for _ in range(number):
+            function()
+        elapsed = timer() - start
+        samples.append(elapsed / (number * benchmark.operations) * 1e9)
+
+    samples.sort()
+    mean = sum(samples) / len(samples)
+    return {
+        'mean_ns': mean,
+        'p50_ns': _percentile(samples, 50),
+        'p99_ns': _percentile(samples, 99),
+        'ops_per_sec': 1e9 / mean,
+        'samples': len(samples),
+    }
+
+
+def run_benchmarks(benchmarks: List[Benchmark], repeat: int = DEFAULT_REPEAT,
+                   sample_time: float = SAMPLE_TIME) -> Dict[str, object]:
+    """
+    Run benchmarks and build the JSON-serializable report.
+
+    Args:
+        benchmarks: Cases to run
+        repeat: Samples per case
+        sample_time: Target duration of one sample in seconds
+
+    Returns:
+        Report with format version, Python version and per-case results
+    """
+    return {
+        'version': FORMAT_VERSION,
+        'python': platform.python_version(),
+        'results': {benchmark.name: measure(benchmark, repeat, sample_time) for benchmark in benchmarks},
+    }
+
+
+def compare(report: Dict[str, object], baseline: Dict[str, object],
+            threshold: float = DEFAULT_THRESHOLD) -> List[Dict[str, object]]:
+    """
+    Find cases that got slower than the baseline.
+
+    Args:
+        report: Current report from ``run_benchmarks``
+        baseline: Saved report to compare against
+        threshold: Allowed slowdown as a fraction (0.10 = 10%)
+
+    Returns:
+        One entry per regression with name, baseline_ns, current_ns and ratio
+    """
+    regressions = []
+    baseline_results = baseline.get('results', {})
+    for name, result in report['results'].items():
+        previous = baseline_results.get(name)
+        if previous is None:
+            continue
+        ratio = result['p50_ns'] / previous['p50_ns']
+        if ratio > 1 + threshold:
+            regressions.append({
+                'name': name,
+                'baseline_ns': previous['p50_ns'],
+                'current_ns': result['p50_ns'],
+                'ratio': ratio,
+            })
+    return regressions
+
+
+def bench_main(args: List[str]) -> int:
+    """Entry point for ``calculator bench``."""
+    parser = argparse.ArgumentParser(
+        prog="calculator bench",
+        description="Benchmark the calculator and optionally compare with a baseline",
+    )
+    parser.add_argument('--output', metavar='FILE', help="Write the JSON report to FILE instead of stdout")
+    parser.add_argument('--baseline', metavar='FILE', help="Compare against a saved JSON report")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Allowed slowdown before flagging a regression (default: {DEFAULT_THRESHOLD})")
+    parser.add_argument('--filter', metavar='TEXT', help="Only run benchmarks whose name contains TEXT")
+    parser.add_argument('--repeat', type=int, default=None, help="Samples per benchmark")
+    parser.add_argument('--quick', action='store_true', help="Take fewer samples")
+    try:
+        options = parser.parse_args(args)
+    except SystemExit as e:
+        return e.code if isinstance(e.code, int) else 0
+
+    baseline = None
+    if options.baseline:
+        try:
+            with open(options.baseline, encoding='utf-8') as f:
+                baseline = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Error: Cannot read baseline '{options.baseline}': {e}", file=sys.stderr)
+            return 1
+
+    benchmarks = default_benchmarks()
+    if options.filter:
+        benchmarks = [b for b in benchmarks if options.filter in b.name]
+    repeat = options.repeat or (QUICK_REPEAT if options.quick else DEFAULT_REPEAT)
+    report = run_benchmarks(benchmarks, repeat)
+
+    text = json.dumps(report, indent=2)
+    if options.output:
+        with open(options.output, 'w', encoding='utf-8') as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if baseline is None:
+        return 0
+    regressions = compare(report, baseline, options.threshold)
+    for regression in regressions:
+        print(f"REGRESSION {regression['name']}: {regression['baseline_ns']:.1f} ns -> "
+              f"{regression['current_ns']:.1f} ns ({regression['ratio']:.2f}x)", file=sys.stderr)
+    if not regressions:
+        print(f"No regressions above {options.threshold:.0%}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+__all__ = [
+    'Benchmark', 'default_benchmarks', 'measure', 'run_benchmarks', 'compare', 'bench_main',
+]
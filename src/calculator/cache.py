@@ -0,0 +1,256 @@
+"""
+Opt-in result cache for expensive operations.
+
+Results are memoized per operation and operands. Keys keep apart values
+that compare equal in Python but can give different results: ``1``,
+``1.0`` and ``True`` have different types, ``0.0`` and ``-0.0`` have
+different signs, and every NaN maps to the same key (``nan != nan`` would
+otherwise make NaN operands uncacheable).
+
+Two eviction policies are available:
+
+- ``"lru"``: when full, the least recently used entry is evicted.
+- ``"ttl"``: entries expire ``ttl`` seconds after they were stored; when
+  full, the oldest entry is evicted.
+
+Both policies bound the number of entries and, optionally, the estimated
+memory held by keys and results. Exceptions are never cached.
+
+Caching is enabled for registered operations with ``enable_cache`` and
+then applies to every caller that goes through the registry in this
+process (CLI, streaming mode, pure-Python batch path)::
+
+    from src.calculator.cache import enable_cache
+    cache = enable_cache(['power'], max_entries=10_000)
+    ...
+    cache.stats()  # {'hits': ..., 'misses': ..., 'evictions': ..., ...}
+"""
+import sys
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+from . import registry
+
+POLICY_LRU = "lru"
+POLICY_TTL = "ttl"
+POLICIES = (POLICY_LRU, POLICY_TTL)
+
+
+def make_key(name: str, args: Tuple) -> Hashable:
+    """
+    Build the cache key for an operation call.
+
+    Args:
+        name: Operation name
+        args: Operands
+
+    Returns:
+        A hashable key that distinguishes operand types, signed zeros and NaN
+    """
+    parts = [name]
+    for arg in args:
+        if type(arg) is float:
+            # float.hex() keeps the sign of zero and gives every NaN one spelling
+            parts.append((float, arg.hex()))
+        else:
+            parts.append((type(arg), arg))
+    return tuple(parts)
+
+
+def _estimate_size(key: Hashable, value: object) -> int:
+    """Rough number of bytes held by one cache entry."""
+    size = sys.getsizeof(key) + sys.getsizeof(value)
+    for part in key[1:]:
+        size += sys.getsizeof(part[1])
+    return size
+
+
+class ResultCache:
+    """
+    A bounded cache of operation results with hit/miss/eviction counters.
+
+    Attributes:
+        hits: Lookups answered from the cache
+        misses: Lookups that had to compute the result
+        evictions: Entries removed to respect max_entries or max_memory
+        expirations: Entries removed because their TTL elapsed
+    """
+
+    def __init__(self, max_entries: int = 1024, max_memory: Optional[int] = None,
+                 policy: str = POLICY_LRU, ttl: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        """
+        Create an empty cache.
+
+        Args:
+            max_entries: Maximum number of cached results
+            max_memory: Maximum estimated bytes of keys and results, None for no limit
+            policy: 'lru' or 'ttl'
+            ttl: Seconds an entry stays valid; required for the 'ttl' policy
+            clock: Time source in seconds, for testing
+
+        Raises:
+            ValueError: If the policy is unknown or a limit is invalid
+        """
+        if policy not in POLICIES:
+            raise ValueError(f"Invalid cache policy: {policy}. Valid policies are: {', '.join(POLICIES)}")
+        if max_entries < 1:
+            raise ValueError(f"max_entries must be at least 1, got {max_entries}")
+        if max_memory is not None and max_memory < 1:
+            raise ValueError(f"max_memory must be at least 1, got {max_memory}")
+        if policy == POLICY_TTL and (ttl is None or ttl <= 0):
+            raise ValueError("The 'ttl' policy requires a positive ttl")
+
+        self.max_entries = max_entries
+        self.max_memory = max_memory
+        self.policy = policy
+        self.ttl = ttl
+        self._clock = clock
+        # key -> (value, expiry time or None, estimated size)
+        self._entries: "OrderedDict[Hashable, Tuple[object, Optional[float], int]]" = OrderedDict()
+        self.memory = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, key: Hashable) -> None:
+        _, _, size = self._entries.pop(key)
+        self.memory -= size
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], object]) -> object:
+        """
+        Return the cached result for ``key``, computing and storing it on a miss.
+
+        Args:
+            key: Cache key from ``make_key``
+            compute: Called without arguments to produce the result
+
+        Returns:
+            The cached or freshly computed result
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            expiry = entry[1]
+            if expiry is None or self._clock() < expiry:
+                self.hits += 1
+                if self.policy == POLICY_LRU:
+                    self._entries.move_to_end(key)
+                return entry[0]
+            self._remove(key)
+            self.expirations += 1
+
+        self.misses += 1
+        value = compute()
+        self._store(key, value)
+        return value
+
+    def _store(self, key: Hashable, value: object) -> None:
+        expiry = self._clock() + self.ttl if self.policy == POLICY_TTL else None
+        size = _estimate_size(key, value)
+        if self.max_memory is not None and size > self.max_memory:
+            return  # would evict everything and still not fit
+        self._entries[key] = (value, expiry, size)
+        self.memory += size
+        while len(self._entries) > self.max_entries or (
+                self.max_memory is not None and self.memory > self.max_memory):
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Remove all entries; the counters are kept."""
+        self._entries.clear()
+        self.memory = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Return the counters and current size for monitoring."""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'entries': len(self._entries),
+            'memory': self.memory,
+        }
+
+
+def cached(name: str, function: Callable, cache: ResultCache) -> Callable:
+    """
+    Wrap an operation function so its results go through ``cache``.
+
+    Args:
+        name: Operation name, part of the cache key
+        function: The operation function
+        cache: Cache to store results in
+
+    Returns:
+        A function with the same signature as ``function``
+    """
+    def cached_function(*args):
+        return cache.get_or_compute(make_key(name, args), lambda: function(*args))
+
+    cached_function.__name__ = getattr(function, '__name__', name)
+    cached_function.__doc__ = function.__doc__
+    cached_function.__wrapped__ = function
+    cached_function.cache = cache
+    return cached_function
+
+
+def _is_cached(function: Callable) -> bool:
+    """Return True for functions created by ``cached``."""
+    return isinstance(getattr(function, 'cache', None), ResultCache)
+
+
+def enable_cache(names: Iterable[str] = ('power',), cache: Optional[ResultCache] = None,
+                 **cache_options) -> ResultCache:
+    """
+    Route registered operations through a result cache.
+
+    Args:
+        names: Operations to cache; cheap operations are usually faster uncached
+        cache: Cache to use, a new ``ResultCache(**cache_options)`` if omitted
+        **cache_options: Options for the new cache (max_entries, max_memory,
+            policy, ttl)
+
+    Returns:
+        The cache, for reading its statistics
+
+    Raises:
+        ValueError: If an operation name is not registered
+    """
+    if cache is None:
+        cache = ResultCache(**cache_options)
+    for name in names:
+        operation = registry.get_operation(name)
+        if operation is None:
+            raise ValueError(f"Invalid operation: {name}")
+        function = operation.function
+        if _is_cached(function):
+            function = function.__wrapped__
+        registry.OPERATIONS[name] = operation._replace(function=cached(name, function, cache))
+    return cache
+
+
+def disable_cache(names: Optional[Iterable[str]] = None) -> None:
+    """
+    Restore the uncached functions of registered operations.
+
+    Args:
+        names: Operations to restore, all cached operations if omitted
+    """
+    if names is None:
+        names = list(registry.OPERATIONS)
+    for name in names:
+        operation = registry.OPERATIONS.get(name)
+        if operation is not None and _is_cached(operation.function):
+            registry.OPERATIONS[name] = operation._replace(function=operation.function.__wrapped__)
+
+
+__all__ = [
+    'ResultCache', 'make_key', 'cached', 'enable_cache', 'disable_cache',
+    'POLICY_LRU', 'POLICY_TTL', 'POLICIES',
+]
@@ -0,0 +1,270 @@
+"""
+Spreadsheet-style cells with incremental recomputation.
+
+A ``Sheet`` holds input cells (plain values) and formula cells (infix
+expressions over other cells, compiled by the ``expression`` module).
+Dependencies are tracked in both directions:
+- Setting an input marks only the cells downstream of it as dirty.
+- Reading a cell recomputes its dirty dependencies first, in topological
+  order, and leaves clean cells alone.
+
+The cost of an update is therefore proportional to the part of the sheet
+it affects, not to the size of the sheet::
+
+    sheet = Sheet()
+    sheet.set('price', 100.0)
+    sheet.set('quantity', 3)
+    sheet.define('net', "price * quantity")
+    sheet.define('gross', "net * 1.2")
+    sheet['gross']            # 360.0
+    sheet.set('quantity', 4)  # marks net and gross dirty
+    sheet['gross']            # 480.0, recomputes two cells
+
+Cells hold ``Result`` values. A formula that raises, or that references a
+failed or undefined cell, stores the failure, and its dependents inherit
+it. Reading a failed cell with ``sheet[name]`` re-raises the error, while
+``sheet.result(name)`` returns the ``Result``. Defining a formula that
+would make a cycle raises ValueError and leaves the sheet unchanged.
+"""
+import math
+from typing import Dict, Iterable, List, Set, Tuple, Union
+
+from .expression import CompiledExpression, compile_expression
+from .result import Result
+
+
+def _same(old: Result, value: object) -> bool:
+    """True if setting ``value`` over ``old`` cannot change any formula result."""
+    if not old.ok or type(old.value) is not type(value) or old.value != value:
+        return False
+    # 0.0 == -0.0, but they divide differently
+    return not isinstance(value, float) or math.copysign(1.0, value) == math.copysign(1.0, old.value)
+
+
+class Sheet:
+    """
+    A set of named input and formula cells.
+
+    Attributes:
+        recomputed: Number of formula evaluations so far, for measuring how
+            much work updates cause
+    """
+
+    def __init__(self) -> None:
+        self.recomputed = 0
+        self._values: Dict[str, Result] = {}
+        self._formulas: Dict[str, CompiledExpression] = {}
+        self._dependencies: Dict[str, Tuple[str, ...]] = {}
+        self._dependents: Dict[str, Set[str]] = {}
+        # Invariant: every dependent of a dirty cell is dirty too
+        self._dirty: Set[str] = set()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._values or name in self._formulas
+
+    def __len__(self) -> int:
+        return len(self._values.keys() | self._formulas.keys())
+
+    def __getitem__(self, name: str) -> object:
+        return self.get(name)
+
+    def __setitem__(self, name: str, value: object) -> None:
+        self.set(name, value)
+
+    def set(self, name: str, value: object) -> None:
+        """
+        Set an input cell, turning a formula cell into an input if needed.
+
+        Cells downstream of ``name`` are marked dirty; nothing is recomputed
+        until they are read. Setting the value a cell already has does nothing.
+        """
+        if name in self._formulas:
+            self._unlink(name)
+            self._dirty.discard(name)
+        else:
+            old = self._values.get(name)
+            if old is not None and _same(old, value):
+                return
+        self._values[name] = Result.success(value)
+        self._invalidate(name)
+
+    def define(self, name: str, formula: Union[str, CompiledExpression]) -> None:
+        """
+        Make ``name`` a formula cell.
+
+        Args:
+            name: Cell name; a valid variable name so formulas can use it
+            formula: Expression text such as ``"price * quantity"``, or a
+                compiled expression; its variables are the cells it reads
+
+        Raises:
+            ValueError: If the formula cannot be parsed or would create a
+                cycle; the sheet is left unchanged
+        """
+        compiled = compile_expression(formula) if isinstance(formula, str) else formula
+        dependencies = compiled.variables
+        cycle = self._find_cycle(name, dependencies)
+        if cycle is not None:
+            raise ValueError(f"Formula for '{name}' creates a cycle: {' -> '.join(cycle)}")
+
+        self._unlink(name)
+        self._formulas[name] = compiled
+        self._dependencies[name] = dependencies
+        for dependency in dependencies:
+            self._dependents.setdefault(dependency, set()).add(name)
+        self._values.pop(name, None)
+        self._dirty.add(name)
+        self._invalidate(name)
+
+    def remove(self, name: str) -> None:
+        """
+        Delete a cell. Formulas that read it will fail until it is defined again.
+
+        Raises:
+            KeyError: If the cell does not exist
+        """
+        if name not in self:
+            raise KeyError(f"Unknown cell '{name}'")
+        self._unlink(name)
+        self._values.pop(name, None)
+        self._dirty.discard(name)
+        self._invalidate(name)
+
+    def get(self, name: str) -> object:
+        """
+        Read a cell's value, recomputing its dirty dependencies first.
+
+        Raises:
+            KeyError: If the cell does not exist
+            Exception: The error stored in a failed cell
+        """
+        return self.result(name).unwrap()
+
+    def result(self, name: str) -> Result:
+        """
+        Read a cell as a ``Result``, recomputing its dirty dependencies first.
+
+        Raises:
+            KeyError: If the cell does not exist
+        """
+        if name in self._dirty:
+            self._recompute([name])
+        result = self._values.get(name)
+        if result is None:
+            raise KeyError(f"Unknown cell '{name}'")
+        return result
+
+    def recalculate(self, everything: bool = False) -> int:
+        """
+        Recompute every dirty cell now.
+
+        Args:
+            everything: Recompute every formula cell, dirty or not
+
+        Returns:
+            Number of cells recomputed
+        """
+        if everything:
+            self._dirty.update(self._formulas)
+        before = self.recomputed
+        self._recompute(list(self._dirty))
+        return self.recomputed - before
+
+    def is_dirty(self, name: str) -> bool:
+        """True if the cell will be recomputed on its next read."""
+        return name in self._dirty
+
+    def dependencies(self, name: str) -> Tuple[str, ...]:
+        """Cells that the formula in ``name`` reads, empty for inputs."""
+        return self._dependencies.get(name, ())
+
+    def dependents(self, name: str) -> Set[str]:
+        """Formula cells that read ``name`` directly."""
+        return set(self._dependents.get(name, ()))
+
+    def _unlink(self, name: str) -> None:
+        """Drop the formula of ``name`` and its dependency edges."""
+        self._formulas.pop(name, None)
+        for dependency in self._dependencies.pop(name, ()):
+            dependents = self._dependents.get(dependency)
+            if dependents is not None:
+                dependents.discard(name)
+                if not dependents:
+                    del self._dependents[dependency]
+
+    def _invalidate(self, name: str) -> None:
+        """Mark everything downstream of ``name`` dirty."""
+        dirty = self._dirty
+        pending = list(self._dependents.get(name, ()))
+        while pending:
+            cell = pending.pop()
+            if cell not in dirty:  # a dirty cell's dependents are already dirty
+                dirty.add(cell)
+                pending.extend(self._dependents.get(cell, ()))
+
+    def _find_cycle(self, name: str, dependencies: Iterable[str]) -> Union[List[str], None]:
+        """
+        Return the cells of the loop that reading ``dependencies`` from ``name`` would close.
+
+        Searches downstream from ``name``, which is cheap for the common case
+        of a new cell that nothing reads yet.
+        """
+        targets = set(dependencies)
+        if name in targets:
+            return [name, name]
+        children: Dict[str, str] = {name: name}
+        pending = [name]
+        while pending:
+            cell = pending.pop()
+            for dependent in self._dependents.get(cell, ()):
+                if dependent in children:
+                    continue
+                children[dependent] = cell
+                if dependent in targets:
+                    path = [name, dependent]  # name reads dependent, which reads ... name
+                    while path[-1] != name:
+                        path.append(children[path[-1]])
+                    return path
+                pending.append(dependent)
+        return None
+
+    def _recompute(self, targets: List[str]) -> None:
+        """Recompute the dirty cells ``targets`` need, dependencies first."""
+        dirty = self._dirty
+        order = []
+        seen = set()
+        # Iterative post-order walk, so long chains cannot hit the recursion limit
+        stack = [(target, False) for target in targets]
+        while stack:
+            cell, expanded = stack.pop()
+            if expanded:
+                order.append(cell)
+                continue
+            if cell in seen or cell not in dirty:
+                continue
+            seen.add(cell)
+            stack.append((cell, True))
+            for dependency in self._dependencies[cell]:
+                if dependency in dirty and dependency not in seen:
+                    stack.append((dependency, False))
+        for cell in order:
+            self._values[cell] = self._evaluate(cell)
+            dirty.discard(cell)
+        self.recomputed += len(order)
+
+    def _evaluate(self, name: str) -> Result:
+        arguments = {}
+        for dependency in self._dependencies[name]:
+            result = self._values.get(dependency)
+            if result is None:
+                return Result.failure(ValueError(f"Cell '{name}' reads undefined cell '{dependency}'"))
+            if not result.ok:
+                return result  # dependents inherit the failure
+            arguments[dependency] = result.value
+        try:
+            return Result.success(self._formulas[name](**arguments))
+        except Exception as e:
+            return Result.failure(e)
+
+
+__all__ = ['Sheet']
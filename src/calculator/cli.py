@@ -2,12 +2,25 @@
 Command Line Interface for the calculator application.
 
 This module provides a CLI that supports basic arithmetic operations.
+
+The common ``calculator <operation> <operands...>`` invocation is answered
+without building the argument parser: argparse is imported only for
+options, help and errors, so a plain calculation starts as fast as
+possible.
 """
-import argparse
+from __future__ import annotations
+
 import sys
-from typing import Union, Optional, NoReturn, List
-import operator
-from . import add, subtract, multiply, divide, power, integer_divide, modulo  # Import our calculator functions
+
+from .registry import OPERATIONS, get_operation, operation_names
+from .result import (
+    CODE_DIVISION, CODE_OPERATION, CODE_OVERFLOW, CODE_TYPE, CODE_UNEXPECTED, CODE_VALUE, Result,
+)
+
+TYPE_CHECKING = False  # typing.TYPE_CHECKING without importing typing
+if TYPE_CHECKING:
+    import argparse
+    from typing import NoReturn
 
 
 def parse_number(value: str) -> float:
@@ -21,78 +34,132 @@ def parse_number(value: str) -> float:
         raise ValueError(f"Invalid number format: '{value}'")
 
 
-def safe_calculate(operation: str, x: str, y: str) -> Optional[float]:
-    """Safely perform calculation with error handling."""
+# Operations whose operands must be integers; their integer operand text is
+# parsed with int(), so it is not rounded through a float
+INTEGER_OPERATIONS = frozenset(('power_mod',))
+
+
+def parse_integer(value: str, parse=parse_number):
+    """
+    Parse an operand of an integer operation exactly.
+
+    Integer text becomes an int; anything else (``"2.0"``, ``"inf"``) is
+    left to ``parse``, so the operation reports non-integral operands.
+    """
     try:
-        num_x = parse_number(x)
-        num_y = parse_number(y)
-        
-        if operation == "add":
-            return add(num_x, num_y)
-        elif operation == "subtract":
-            return subtract(num_x, num_y)
-        elif operation == "multiply":
-            return multiply(num_x, num_y)
-        elif operation == "divide":
-            return divide(num_x, num_y)
-        elif operation == "power":
-            return power(num_x, num_y)
-        elif operation == "integer_divide":
-            return integer_divide(num_x, num_y)
-        elif operation == "modulo":
-            return modulo(num_x, num_y)
-        else:
-            print(f"Error: Unknown operation '{operation}'")
-            return None
-            
-    except ValueError as e:
-        print(f"Value Error: {e}")
-        return None
-    except ZeroDivisionError as e:
-        print(f"Division Error: {e}")
-        return None
-    except TypeError as e:
-        print(f"Type Error: {e}")
-        return None
-    except OverflowError as e:
-        print(f"Overflow Error: {e}")
-        return None
+        return int(value)
+    except ValueError:
+        return parse(value)
+
+
+def try_calculate(operation: str, *operands: str, backend=None) -> Result:
+    """
+    Parse the operands and perform a calculation without printing or raising.
+
+    Args:
+        operation: The name of a registered operation
+        *operands: Operands as text
+        backend: Numeric backend from ``backends.get_backend``, float if omitted
+
+    Returns:
+        A ``Result`` with the value, or the error code and message
+    """
+    if len(operands) > 2:
+        from .reductions import NARY_OPERATIONS
+        if operation in NARY_OPERATIONS:
+            return _try_reduce(NARY_OPERATIONS[operation], operation, operands, backend)
+    if backend is None:
+        entry = get_operation(operation)
+        function = entry.function if entry is not None else None
+        parse = parse_number
+    else:
+        function = backend.operation(operation)
+        parse = backend.parse
+    if function is None:
+        return Result(None, CODE_OPERATION, f"Unknown operation '{operation}'")
+    try:
+        if operation in INTEGER_OPERATIONS:
+            return Result(function(*[parse_integer(value, parse) for value in operands]))
+        return Result(function(*[parse(value) for value in operands]))
     except Exception as e:
-        print(f"Unexpected error: {e}")
-        return None
+        return Result.failure(e)
+
+
+def _try_reduce(reduction: str, operation: str, operands, backend) -> Result:
+    """``try_calculate`` for add or multiply with more than two operands."""
+    try:
+        if backend is None:
+            from .reductions import apply_reduction
+            return Result(apply_reduction(reduction, [parse_number(value) for value in operands]))
+        function = backend.operation(operation)
+        values = [backend.parse(value) for value in operands]
+        result = values[0]
+        for value in values[1:]:
+            result = function(result, value)
+        return Result(result)
+    except Exception as e:
+        return Result.failure(e)
+
 
+def _takes(entry, count: int) -> bool:
+    """True if operation ``entry`` accepts ``count`` operands."""
+    if count == entry.arity:
+        return True
+    if count > 2 and entry.arity == 2:
+        from .reductions import NARY_OPERATIONS
+        return entry.name in NARY_OPERATIONS
+    return False
 
-def calculate(operation: str, x: float, y: float) -> float:
+
+# How safe_calculate prints each kind of failure
+_ERROR_PREFIXES = {
+    CODE_OPERATION: "Error: ",
+    CODE_VALUE: "Value Error: ",
+    CODE_DIVISION: "Division Error: ",
+    CODE_TYPE: "Type Error: ",
+    CODE_OVERFLOW: "Overflow Error: ",
+    CODE_UNEXPECTED: "Unexpected error: ",
+}
+
+
+def safe_calculate(operation: str, *operands: str, backend=None) -> float | None:
+    """Safely perform calculation with error handling, using the float backend unless another is given."""
+    result = try_calculate(operation, *operands, backend=backend)
+    if not result.ok:
+        print(f"{_ERROR_PREFIXES[result.code]}{result.message}")
+    return result.value
+
+
+def calculate(operation: str, *operands: float) -> float:
     """
-    Perform the specified operation on two numbers.
+    Perform the specified operation on its operands.
     
     Args:
-        operation: The operation to perform ('add', 'subtract', 'multiply', 'divide')
-        x: The first operand
-        y: The second operand
+        operation: The name of a registered operation ('add', 'subtract', 'multiply', ...)
+        *operands: As many operands as the operation takes (two, or three
+            for 'power_mod')
         
     Returns:
         The result of the operation
         
     Raises:
-        ValueError: If the operation is not supported
+        ValueError: If the operation is not supported, or gets the wrong
+            number of operands
         ZeroDivisionError: If division by zero is attempted
     """
-    operations = {
-        'add': add,
-        'subtract': subtract,
-        'multiply': multiply,
-        'divide': divide
-    }
-    
-    if operation not in operations:
+    entry = get_operation(operation)
+    if entry is None:
         raise ValueError(f"Invalid operation: {operation}")
+    if len(operands) != entry.arity:
+        raise ValueError(f"Expected {entry.arity} operands for {operation}, got {len(operands)}")
     
-    return operations[operation](x, y)
+    return entry.function(*operands)
 
 
 def create_parser() -> argparse.ArgumentParser:
     """Create and configure the argument parser."""
+    import argparse
+
     # Don't auto-exit on help by using add_help=False and handling it manually
     parser = argparse.ArgumentParser(
         description="Calculator CLI - Perform arithmetic operations with error handling",
@@ -107,6 +174,18 @@ Examples:
   calculator divide 15 3
   calculator power 2 3
   calculator modulo 10 3
+  calculator add 1 2 3 4
+  calculator --reduce sum --batch numbers.txt
+  calculator --precision 50 divide 1 3
+  calculator --backend fraction add 1/3 1/6
+  calculator --backend integer power 3 100
+  calculator --batch jobs.csv
+  calculator --batch jobs.csv --stats summary.json > results.csv
+  calculator --batch jobs.ccol --format binary > results.ccol
+  calculator --batch huge.ccol --format binary --output results.ccol --resume
+  calculator serve --stdin
+  calculator bench --baseline baseline.json
+  calculator stats --format prometheus
   calculator --help
         """.strip()
     )
@@ -114,7 +193,7 @@ Examples:
     parser.add_argument(
         'operation',
         nargs='?',
-        choices=["add", "subtract", "multiply", "divide", "power", "integer_divide", "modulo"],
+        choices=operation_names(),
         help="Operation to perform"
     )
     
@@ -124,6 +203,94 @@ Examples:
         help="Operands for the operation"
     )
     
+    parser.add_argument(
+        '--batch',
+        metavar='FILE',
+        help="Evaluate op,x,y records from FILE ('-' for stdin), one result record per line"
+    )
+    
+    parser.add_argument(
+        '--format',
+        choices=["csv", "jsonl", "binary"],
+        default="csv",
+        help="Output format for --batch results; binary writes a columnar result table (default: csv)"
+    )
+    
+    parser.add_argument(
+        '--output',
+        metavar='FILE',
+        help="Write --batch results to FILE instead of stdout; columnar jobs with --format binary "
+             "are evaluated window by window into a preallocated result table"
+    )
+    
+    parser.add_argument(
+        '--window',
+        type=int,
+        metavar='ROWS',
+        help="Rows per window for --output with columnar jobs (default: 1048576)"
+    )
+    
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help="Continue an interrupted --output run from its last completed window"
+    )
+    
+    parser.add_argument(
+        '--metrics',
+        metavar='FILE',
+        help="Record per-operation metrics during --batch and write them to FILE "
+             "(Prometheus text for .prom files, JSON otherwise)"
+    )
+    
+    parser.add_argument(
+        '--stats',
+        nargs='?',
+        const='-',
+        metavar='FILE',
+        help="Summarize --batch results in one pass (count, errors, NaN/inf, mean, variance, "
+             "min/max, quantiles) as JSON to FILE, or to stderr without FILE"
+    )
+    
+    parser.add_argument(
+        '--reduce',
+        choices=["sum", "product", "min", "max"],
+        help="Reduce the numbers in --batch FILE (default: stdin), separated by commas or whitespace, "
+             "to one result"
+    )
+    
+    parser.add_argument(
+        '--skip-nan',
+        action='store_true',
+        help="Ignore NaN operands in --reduce"
+    )
+    
+    parser.add_argument(
+        '--deterministic',
+        action='store_true',
+        help="Sum exactly in --reduce, so the result does not depend on chunking"
+    )
+    
+    parser.add_argument(
+        '--backend',
+        choices=["float", "decimal", "fraction", "integer"],
+        help="Numeric backend (default: float, or decimal when --precision is given)"
+    )
+    
+    parser.add_argument(
+        '--precision',
+        type=int,
+        metavar='DIGITS',
+        help="Significant digits for the decimal backend"
+    )
+    
+    parser.add_argument(
+        '--profile',
+        choices=["ieee", "strict", "raw"],
+        help="Semantics of the float operations: ieee special values (default), strict "
+             "type checks and errors, or raw Python operators"
+    )
+    
     parser.add_argument(
         '--version',
         action='store_true',
@@ -151,41 +318,129 @@ def print_help(parser: argparse.ArgumentParser) -> NoReturn:
     sys.exit(0)
 
 
-def main(args: List[str] = None) -> int:
+def _print_help_text(parser: argparse.ArgumentParser) -> None:
+    """Print the help text through ``print`` (so it can be captured) without exiting."""
+    print(parser.format_help(), end='')
+
+
+def _is_negative_number(value: str) -> bool:
+    """Return True if argparse would treat an argument starting with '-' as a negative number."""
+    # Mirrors argparse's '^-\d+$|^-\d*\.\d+$' without importing re
+    whole, dot, fraction = value[1:].partition('.')
+    if dot:
+        return fraction.isdigit() and (not whole or whole.isdigit())
+    return whole.isdigit()
+
+
+def _fast_main(args: list[str]) -> int | None:
+    """
+    Run ``<operation> <operands...>`` without building the argument parser.
+
+    Returns:
+        The exit code, or None if the arguments need the full parser
+        (options, help, unknown operations or a wrong operand count)
+    """
+    if not args:
+        return None
+    entry = OPERATIONS.get(args[0])
+    if entry is None or not _takes(entry, len(args) - 1):
+        return None
+    for operand in args[1:]:
+        if operand[:1] == '-' and not _is_negative_number(operand):
+            return None
+    return _print_result(safe_calculate(args[0], *args[1:]))
+
+
+def _print_result(result) -> int:
+    """Print a calculation result and return the exit code."""
+    if result is not None:
+        print(f"Result: {result}")
+        return 0
+    else:
+        print("Operation failed.")
+        return 1
+
+
+def _run_batch(options, backend, stats=None) -> int:
+    """Run ``--batch`` with the parsed options, through the streaming, columnar or windowed path."""
+    from .columnar import is_columnar, run_columnar
+    columnar = options.format == "binary" or is_columnar(options.batch)
+    # Binary columns hold float64/int64 operands only
+    if columnar and backend is not None and backend.name != "float":
+        print(f"Error: The columnar batch format only supports the float backend, not {backend.name}")
+        return 1
+    if columnar and getattr(backend, 'profile', "ieee") != "ieee":
+        print(f"Error: The columnar batch format only supports the ieee profile, not {backend.profile}")
+        return 1
+    if options.window is not None and options.window < 1:
+        print(f"Error: --window must be at least 1, got {options.window}")
+        return 1
+    if options.output is None:
+        if options.resume:
+            print("Error: --resume needs --output")
+            return 1
+        if columnar:
+            return run_columnar(options.batch, options.format, stats=stats)
+        from .streaming import run_batch
+        return run_batch(options.batch, options.format, backend=backend, stats=stats)
+    if (options.format == "binary" and options.batch != "-"
+            and is_columnar(options.batch)):
+        from .windowed import DEFAULT_WINDOW, run_windowed
+        return run_windowed(options.batch, options.output,
+                            options.window or DEFAULT_WINDOW, options.resume, stats=stats)
+    if options.resume:
+        print("Error: --resume needs columnar jobs and --format binary")
+        return 1
+    try:
+        if options.format == "binary":
+            output = open(options.output, 'wb')
+        else:
+            output = open(options.output, 'w', newline='', encoding='utf-8')
+    except OSError as e:
+        print(f"Error: Cannot write '{options.output}': {e}")
+        return 1
+    with output:
+        if columnar:
+            return run_columnar(options.batch, options.format, output, stats=stats)
+        from .streaming import run_batch
+        return run_batch(options.batch, options.format, output, backend=backend, stats=stats)
+
+
+def main(args: list[str] | None = None) -> int:
     """Main entry point for the calculator CLI."""
     if args is None:
         args = sys.argv[1:]
     
+    # "calculator serve" starts the persistent daemon (see daemon.py)
+    if args and args[0] == "serve":
+        from .daemon import serve_main
+        return serve_main(args[1:])
+    
+    # "calculator bench" runs the benchmark suite (see bench.py)
+    if args and args[0] == "bench":
+        from .bench import bench_main
+        return bench_main(args[1:])
+    
+    # "calculator stats" prints operation metrics (see metrics.py)
+    if args and args[0] == "stats":
+        from .metrics import stats_main
+        return stats_main(args[1:])
+    
+    # Plain calculations skip argparse entirely
+    code = _fast_main(args)
+    if code is not None:
+        return code
+    
     parser = create_parser()
     
     # Check for help before parsing to avoid exit
     if '--help' in args or '-h' in args:
-        # Capture help text to print using Python's print function
-        import io
-        import sys as sys_module
-        old_stdout = sys_module.stdout
-        sys_module.stdout = captured_output = io.StringIO()
-        try:
-            parser.print_help()
-            help_text = captured_output.getvalue()
-        finally:
-            sys_module.stdout = old_stdout
-        print(help_text, end='')  # Use Python's print function to output help
+        _print_help_text(parser)
         sys.exit(0)
     
     # If no arguments provided (other than the script name), show help
     if len(args) == 0:
-        # Capture help text to print using Python's print function
-        import io
-        import sys as sys_module
-        old_stdout = sys_module.stdout
-        sys_module.stdout = captured_output = io.StringIO()
-        try:
-            parser.print_help()
-            help_text = captured_output.getvalue()
-        finally:
-            sys_module.stdout = old_stdout
-        print(help_text, end='')  # Use Python's print function to output help
+        _print_help_text(parser)
         sys.exit(0)
     
     try:
@@ -200,53 +455,81 @@ def main(args: List[str] = None) -> int:
         print_version()
         return 0
     
+    # Select the numeric backend; the default float path needs no backend object
+    backend = None
+    if (args_parsed.backend is not None or args_parsed.precision is not None
+            or args_parsed.profile is not None):
+        from .backends import get_backend
+        try:
+            backend = get_backend(args_parsed.backend, args_parsed.precision, args_parsed.profile)
+        except ValueError as e:
+            print(f"Error: {e}")
+            return 1
+    
+    # Reduce a stream of numbers to one result (see reductions.py)
+    if args_parsed.reduce is not None:
+        if backend is not None and backend.name != "float":
+            print(f"Error: --reduce only supports the float backend, not {backend.name}")
+            return 1
+        if args_parsed.profile not in (None, "ieee"):
+            print(f"Error: --reduce only supports the ieee profile, not {args_parsed.profile}")
+            return 1
+        from .reductions import run_reduce
+        return run_reduce(args_parsed.batch or "-", args_parsed.reduce,
+                          args_parsed.skip_nan, args_parsed.deterministic)
+    
+    # Handle streaming batch mode
+    if args_parsed.batch is not None:
+        stats = None
+        if args_parsed.stats is not None:
+            from .streamstats import ResultStats
+            stats = ResultStats()
+        if args_parsed.metrics is None:
+            code = _run_batch(args_parsed, backend, stats)
+        else:
+            from .metrics import OperationMetrics, disable_metrics, enable_metrics, write_snapshot
+            metrics = enable_metrics(metrics=OperationMetrics())
+            try:
+                code = _run_batch(args_parsed, backend, stats)
+            finally:
+                disable_metrics()
+            try:
+                write_snapshot(args_parsed.metrics, metrics.snapshot())
+            except OSError as e:
+                print(f"Error: Cannot write '{args_parsed.metrics}': {e}")
+                return 1
+        if stats is not None:
+            from .streamstats import write_summary
+            try:
+                write_summary(args_parsed.stats, stats)
+            except OSError as e:
+                print(f"Error: Cannot write '{args_parsed.stats}': {e}")
+                return 1
+        return code
+    
     # Handle operation and operands
     if not args_parsed.operation:
         print("Error: Operation is required")
-        # Capture help text to print using Python's print function
-        import io
-        import sys as sys_module
-        old_stdout = sys_module.stdout
-        sys_module.stdout = captured_output = io.StringIO()
-        try:
-            parser.print_help()
-            help_text = captured_output.getvalue()
-        finally:
-            sys_module.stdout = old_stdout
-        print(help_text, end='')  # Use Python's print function to output help
+        _print_help_text(parser)
         return 1
     
     # Validate operation name - must be case-sensitive
-    valid_operations = ["add", "subtract", "multiply", "divide", "power", "integer_divide", "modulo"]
+    valid_operations = operation_names()
     if args_parsed.operation not in valid_operations:  # Case-sensitive check
         print(f"Error: Invalid operation '{args_parsed.operation}'. Valid operations are: {', '.join(valid_operations)}")
         return 1
     
-    # Check number of operands
-    if len(args_parsed.operands) != 2:
-        print(f"Error: Expected 2 operands for {args_parsed.operation}, got {len(args_parsed.operands)}")
-        # Capture help text to print using Python's print function
-        import io
-        import sys as sys_module
-        old_stdout = sys_module.stdout
-        sys_module.stdout = captured_output = io.StringIO()
-        try:
-            parser.print_help()
-            help_text = captured_output.getvalue()
-        finally:
-            sys_module.stdout = old_stdout
-        print(help_text, end='')  # Use Python's print function to output help
+    # Check number of operands; add and multiply also take more than two
+    entry = get_operation(args_parsed.operation)
+    arity = entry.arity
+    if not _takes(entry, len(args_parsed.operands)):
+        print(f"Error: Expected {arity} operands for {args_parsed.operation}, got {len(args_parsed.operands)}")
+        _print_help_text(parser)
         return 1
     
     # Perform calculation with error handling
-    result = safe_calculate(args_parsed.operation, args_parsed.operands[0], args_parsed.operands[1])
-    
-    if result is not None:
-        print(f"Result: {result}")
-        return 0
-    else:
-        print("Operation failed.")
-        return 1
+    result = safe_calculate(args_parsed.operation, *args_parsed.operands, backend=backend)
+    return _print_result(result)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,141 @@
+"""
+Thin client for the calculator daemon.
+
+Forwards CLI arguments and the working directory to a running
+``calculator serve`` process and prints its response. When no daemon is
+listening, or the command reads its input from stdin (which the daemon
+cannot see), the command runs in this process instead, so the client can
+always be used in place of the CLI:
+
+    python -m src.calculator.client add 5 3
+
+Only the standard library pieces needed for the socket round trip are
+imported up front; the CLI itself is imported only for the fallback.
+"""
+import json
+import os
+import socket
+import sys
+import tempfile
+from typing import List, Optional, Tuple
+
+SOCKET_ENV_VAR = "CALCULATOR_SOCKET"
+
+
+def default_socket_path() -> str:
+    """Return the socket path, honoring the CALCULATOR_SOCKET environment variable."""
+    path = os.environ.get(SOCKET_ENV_VAR)
+    if path:
+        return path
+    user = os.getuid() if hasattr(os, 'getuid') else os.getpid()
+    return os.path.join(tempfile.gettempdir(), f"calculator-{user}.sock")
+
+
+def reads_stdin(args: List[str]) -> bool:
+    """
+    Return True if CLI arguments make the command read its input from stdin.
+
+    That is ``--batch -``, or ``--reduce`` without ``--batch``. Option
+    abbreviations (``--bat``) and ``--option=value`` forms are recognized.
+    """
+    batch = None
+    reduce = False
+    for index, arg in enumerate(args):
+        name, equals, value = arg.partition('=')
+        if len(name) >= 5 and '--batch'.startswith(name):
+            if not equals:
+                value = args[index + 1] if index + 1 < len(args) else None
+            batch = value
+        elif len(name) >= 5 and '--reduce'.startswith(name):
+            reduce = True
+    return batch == "-" or (reduce and batch is None)
+
+
+class DaemonClient:
+    """
+    A persistent connection to the calculator daemon.
+
+    Reusing one connection for many requests avoids the connect cost per
+    calculation.
+    """
+
+    def __init__(self, socket_path: Optional[str] = None, timeout: Optional[float] = None) -> None:
+        """
+        Connect to the daemon.
+
+        Args:
+            socket_path: Path of the daemon socket, the default path if omitted
+            timeout: Socket timeout in seconds, None to block
+
+        Raises:
+            OSError: If no daemon is listening on the socket
+        """
+        if not hasattr(socket, 'AF_UNIX'):
+            raise OSError("Unix domain sockets are not supported on this platform")
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._socket.settimeout(timeout)
+        try:
+            self._socket.connect(socket_path or default_socket_path())
+        except OSError:
+            self._socket.close()
+            raise
+        self._reader = self._socket.makefile('rb')
+
+    def call(self, args: List[str], cwd: Optional[str] = None) -> Tuple[int, str, str]:
+        """
+        Run one command on the daemon.
+
+        Args:
+            args: CLI arguments, e.g. ``['add', '5', '3']``
+            cwd: Directory the daemon resolves relative paths against, this
+                process's working directory if omitted
+
+        Returns:
+            Tuple of (exit code, stdout text, stderr text)
+
+        Raises:
+            OSError: If the connection fails
+        """
+        # JSON keeps arguments that contain whitespace intact
+        request = {"args": args, "cwd": os.getcwd() if cwd is None else cwd}
+        self._socket.sendall(json.dumps(request).encode('utf-8') + b"\n")
+        line = self._reader.readline()
+        if not line:
+            raise ConnectionError("Calculator daemon closed the connection")
+        response = json.loads(line)
+        return response["code"], response["stdout"], response["stderr"]
+
+    def close(self) -> None:
+        """Close the connection."""
+        self._reader.close()
+        self._socket.close()
+
+    def __enter__(self) -> "DaemonClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def main(args: List[str] = None, socket_path: Optional[str] = None) -> int:
+    """Forward a command to the daemon, falling back to in-process execution."""
+    if args is None:
+        args = sys.argv[1:]
+    if reads_stdin(args):
+        from .cli import main as cli_main
+        return cli_main(args)
+
+    try:
+        with DaemonClient(socket_path) as client:
+            code, out, err = client.call(args)
+    except OSError:
+        from .cli import main as cli_main
+        return cli_main(args)
+
+    sys.stdout.write(out)
+    sys.stderr.write(err)
+    return code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,795 @@
+"""
+Binary columnar format for batch jobs.
+
+Text batch files spend most of their time in ``float(text)`` per operand.
+A columnar file stores the same jobs as raw machine numbers, so they are
+evaluated without any per-row string parsing:
+
+- a job table has an ``op`` column of uint8 opcodes (indices into the
+  table's list of operation names) and ``x``/``y`` operand columns of
+  float64 or int64;
+- a result table has a float64 ``result`` column and a uint8 ``error``
+  column holding the ``result.CODE_*`` error code of each row.
+
+File layout (all numbers in the byte order recorded in the header)::
+
+    b"CALCCOL1"                      magic
+    uint32 little-endian             length of the JSON header
+    JSON header                      {"rows", "byteorder", "operations", "columns"}
+    padding to a multiple of 8
+    column 0, padded to 8 bytes      rows * itemsize bytes, raw array data
+    column 1, ...
+
+``read_table`` memory-maps the file and exposes every column as a
+``memoryview`` cast to its type, so reading is zero-copy. Columns are
+written straight from ``array.array`` buffers. Converters to and from the
+``op,x,y`` CSV format are available from Python and as::
+
+    python -m src.calculator.columnar to-columnar jobs.csv jobs.ccol [--int]
+    python -m src.calculator.columnar to-csv results.ccol results.csv [--jobs jobs.ccol]
+
+The CLI evaluates columnar files directly: ``calculator --batch jobs.ccol``
+writes CSV/JSONL results, ``--format binary`` a result table.
+"""
+import array
+import argparse
+import itertools
+import json
+import math
+import mmap
+import struct
+import sys
+import time
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, TextIO, Tuple, Union
+
+from .registry import get_operation
+from .result import CODE_FORMAT, CODE_OK, CODE_OPERATION, CODE_VALUE, ERROR_KINDS, error_code
+
+MAGIC = b"CALCCOL1"
+VERSION = 1
+ALIGNMENT = 8
+
+# Supported column types (array/struct typecodes)
+TYPE_UINT8 = 'B'
+TYPE_INT64 = 'q'
+TYPE_FLOAT64 = 'd'
+COLUMN_TYPES = (TYPE_UINT8, TYPE_INT64, TYPE_FLOAT64)
+OPERAND_TYPES = (TYPE_INT64, TYPE_FLOAT64)
+
+MAX_OPERATIONS = 256  # opcodes are uint8
+
+# Range of int64 operands
+_INT64_MIN = -(1 << 63)
+_INT64_MAX = (1 << 63) - 1
+
+# Columns of a result table
+RESULT_COLUMNS = (('result', TYPE_FLOAT64), ('error', TYPE_UINT8))
+
+# Rows of op,x,y text input that are encoded and evaluated at a time
+TEXT_CHUNK_ROWS = 1 << 16
+
+_HEADER_LENGTH = struct.Struct('<I')
+
+Column = Union["array.array", memoryview]
+
+
+def _parse_int64(text: str) -> int:
+    """Parse an int64 operand, rejecting values the column cannot store."""
+    value = int(text)
+    if not _INT64_MIN <= value <= _INT64_MAX:
+        raise ValueError(f"{text} is outside the int64 range")
+    return value
+
+
+def _padding(size: int) -> int:
+    return -size % ALIGNMENT
+
+
+def _typecode(column: Column) -> str:
+    typecode = column.typecode if isinstance(column, array.array) else column.format
+    if typecode not in COLUMN_TYPES:
+        raise ValueError(f"Unsupported column type '{typecode}'. Valid types are: {', '.join(COLUMN_TYPES)}")
+    return typecode
+
+
+def encode_header(rows: int, column_types: Sequence[Tuple[str, str]], operations: Sequence[str] = ()) -> bytes:
+    """
+    Build the magic, header and padding that precede the column data.
+
+    Args:
+        rows: Number of rows
+        column_types: ``(name, typecode)`` pairs in file order
+        operations: Operation names the ``op`` column indexes into
+
+    Returns:
+        The file prefix; its length is a multiple of 8
+
+    Raises:
+        ValueError: If there are more than 256 operations or a type is unsupported
+    """
+    if len(operations) > MAX_OPERATIONS:
+        raise ValueError(f"At most {MAX_OPERATIONS} operations fit in a uint8 opcode, got {len(operations)}")
+    for name, typecode in column_types:
+        if typecode not in COLUMN_TYPES:
+            raise ValueError(f"Unsupported column type '{typecode}' for column '{name}'")
+    header = json.dumps({
+        "version": VERSION,
+        "rows": rows,
+        "byteorder": sys.byteorder,
+        "operations": list(operations),
+        "columns": [[name, typecode] for name, typecode in column_types],
+    }).encode('utf-8')
+    prefix = MAGIC + _HEADER_LENGTH.pack(len(header)) + header
+    return prefix + b"\0" * _padding(len(prefix))
+
+
+def column_layout(rows: int, column_types: Sequence[Tuple[str, str]],
+                  data_offset: int) -> Dict[str, Tuple[int, str, int]]:
+    """
+    Compute where each column lives in a file.
+
+    Args:
+        rows: Number of rows
+        column_types: ``(name, typecode)`` pairs in file order
+        data_offset: Length of the file prefix
+
+    Returns:
+        Column name to ``(offset, typecode, size in bytes)``
+    """
+    layout = {}
+    offset = data_offset
+    for name, typecode in column_types:
+        size = rows * struct.calcsize(typecode)
+        layout[name] = (offset, typecode, size)
+        offset += size + _padding(size)
+    return layout
+
+
+def write_table(output: Union[str, BinaryIO], columns: Dict[str, Column], operations: Sequence[str] = ()) -> None:
+    """
+    Write a columnar table.
+
+    Args:
+        output: Path or binary stream
+        columns: Column name to ``array.array`` (or cast ``memoryview``) of
+            type 'B', 'q' or 'd'; all columns must have the same length
+        operations: Operation names the ``op`` column indexes into
+
+    Raises:
+        ValueError: If the columns differ in length, have an unsupported
+            type, or there are more than 256 operations
+    """
+    lengths = {len(column) for column in columns.values()}
+    if len(lengths) > 1:
+        raise ValueError(f"Columns differ in length: {sorted(lengths)}")
+    prefix = encode_header(lengths.pop() if lengths else 0,
+                           [(name, _typecode(column)) for name, column in columns.items()], operations)
+
+    if isinstance(output, str):
+        with open(output, 'wb') as stream:
+            write_table(stream, columns, operations)
+        return
+    output.write(prefix)
+    for column in columns.values():
+        data = memoryview(column).cast('B')
+        output.write(data)  # straight from the array buffer
+        output.write(b"\0" * _padding(len(data)))
+
+
+class ColumnarTable:
+    """
+    A set of equally long columns with the operation names of the ``op`` column.
+
+    Tables read from files hold ``memoryview`` columns over the
+    (memory-mapped) file, cast to their type; indexing them yields Python
+    ints and floats. Use as a context manager, or call ``close``, to
+    release the mapping.
+
+    Attributes:
+        rows: Number of rows
+        operations: Operation names for the ``op`` column
+        columns: Column name to memoryview or array
+    """
+
+    def __init__(self, columns: Dict[str, Column], operations: Sequence[str] = (),
+                 owner: Optional[mmap.mmap] = None) -> None:
+        """
+        Wrap existing columns.
+
+        Args:
+            columns: Column name to array or cast memoryview
+            operations: Operation names the ``op`` column indexes into
+            owner: Memory mapping to close with the table, if any
+        """
+        self.columns: Dict[str, Column] = dict(columns)
+        self.operations: List[str] = list(operations)
+        self.rows: int = len(next(iter(self.columns.values()))) if self.columns else 0
+        self._owner = owner
+
+    def __getitem__(self, name: str) -> Column:
+        return self.columns[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.columns
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def close(self) -> None:
+        """Release the column views and the memory mapping."""
+        for column in self.columns.values():
+            if isinstance(column, memoryview):
+                column.release()
+        self.columns = {}
+        if self._owner is not None:
+            self._owner.close()
+            self._owner = None
+
+    def __enter__(self) -> "ColumnarTable":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        columns = ", ".join(f"{name}:{_typecode(column)}" for name, column in self.columns.items())
+        return f"ColumnarTable(rows={self.rows}, columns=[{columns}])"
+
+
+def decode_header(prefix) -> Tuple[dict, int]:
+    """
+    Parse the magic and JSON header at the start of a file.
+
+    Args:
+        prefix: Bytes-like object starting at the beginning of the file
+
+    Returns:
+        Tuple of (header dict, offset of the first column)
+
+    Raises:
+        ValueError: If the data is not a valid columnar table
+    """
+    view = memoryview(prefix)
+    if bytes(view[:len(MAGIC)]) != MAGIC:
+        raise ValueError("Not a columnar batch file (bad magic)")
+    start = len(MAGIC) + _HEADER_LENGTH.size
+    if len(view) < start:
+        raise ValueError("Columnar file is truncated in the header")
+    (header_length,) = _HEADER_LENGTH.unpack_from(view, len(MAGIC))
+    try:
+        header = json.loads(bytes(view[start:start + header_length]))
+    except ValueError as e:
+        raise ValueError(f"Invalid columnar header: {e}")
+    if header.get("version") != VERSION:
+        raise ValueError(f"Unsupported columnar format version: {header.get('version')}")
+    for name, typecode in header["columns"]:
+        if typecode not in COLUMN_TYPES:
+            raise ValueError(f"Unsupported column type '{typecode}' for column '{name}'")
+    offset = start + header_length
+    return header, offset + _padding(offset)
+
+
+def _parse_table(buffer, owner: Optional[mmap.mmap] = None) -> ColumnarTable:
+    """
+    Parse a table from the whole file contents without copying columns.
+
+    Raises:
+        ValueError: If the data is not a valid columnar table
+    """
+    view = memoryview(buffer)
+    header, data_offset = decode_header(view)
+    rows = header["rows"]
+    columns: Dict[str, Column] = {}
+    for name, (offset, typecode, size) in column_layout(rows, header["columns"], data_offset).items():
+        if offset + size > len(view):
+            raise ValueError(f"Columnar file is truncated in column '{name}'")
+        data = view[offset:offset + size]
+        if header["byteorder"] == sys.byteorder:
+            columns[name] = data.cast(typecode)
+        else:
+            swapped = array.array(typecode, data)  # the one case that copies
+            swapped.byteswap()
+            columns[name] = swapped
+    table = ColumnarTable(columns, header["operations"], owner)
+    table.rows = rows
+    return table
+
+
+def read_table(source: Union[str, bytes, bytearray, memoryview], use_mmap: bool = True) -> ColumnarTable:
+    """
+    Open a columnar table.
+
+    Args:
+        source: Path of the file, or the file contents
+        use_mmap: Memory-map the file instead of reading it into memory
+
+    Returns:
+        The table; close it (or use ``with``) when done
+
+    Raises:
+        ValueError: If the data is not a valid columnar table
+        OSError: If the file cannot be read
+    """
+    if not isinstance(source, str):
+        return _parse_table(source)
+    with open(source, 'rb') as f:
+        if not use_mmap:
+            return _parse_table(f.read())
+        try:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):  # pipes and empty files cannot be mapped
+            return _parse_table(f.read())
+    try:
+        return _parse_table(mapping, owner=mapping)
+    except ValueError:
+        mapping.close()
+        raise
+
+
+def is_columnar(path: str) -> bool:
+    """Return True if the file at ``path`` (or stdin for '-') starts with the columnar magic."""
+    if path == "-":
+        peek = getattr(sys.stdin.buffer, 'peek', None)
+        return peek is not None and peek(len(MAGIC))[:len(MAGIC)] == MAGIC
+    try:
+        with open(path, 'rb') as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def _binary_function(name: str) -> Optional[Callable]:
+    """Return the registered two-operand function ``name``, or None."""
+    entry = get_operation(name)
+    return entry.function if entry is not None and entry.arity == 2 else None
+
+
+def encode_records(records: Iterable[Tuple[int, List[str]]], operand_type: str = TYPE_FLOAT64,
+                   errors: Optional["array.array"] = None) -> Tuple[Dict[str, "array.array"], List[str]]:
+    """
+    Parse text records into job columns.
+
+    Args:
+        records: ``(line number, fields)`` records from ``streaming.read_records``
+        operand_type: 'd' for float64 or 'q' for int64 operand columns
+        errors: uint8 array that receives one ``result.CODE_*`` code per
+            row. When given, a record that cannot be encoded does not raise
+            but becomes a row with zero operands and the code the streaming
+            batch mode reports for it (format, operation or value); other
+            rows get CODE_OK. Unknown operations then take no opcode.
+
+    Returns:
+        Tuple of ({'op', 'x', 'y'} columns, operation names)
+
+    Raises:
+        ValueError: If there are more than 256 operations, or, without
+            ``errors``, a record does not have three fields or an operand
+            cannot be parsed
+    """
+    if operand_type not in OPERAND_TYPES:
+        raise ValueError(f"Invalid operand type '{operand_type}'. Valid types are: {', '.join(OPERAND_TYPES)}")
+    parse = float if operand_type == TYPE_FLOAT64 else _parse_int64
+    opcodes: Dict[str, int] = {}
+    ops = array.array(TYPE_UINT8)
+    xs = array.array(operand_type)
+    ys = array.array(operand_type)
+    for line_number, fields in records:
+        failure = CODE_OK
+        if len(fields) != 3:
+            failure, message = CODE_FORMAT, f"expected 3 fields (op,x,y), got {len(fields)}"
+        else:
+            operation, x, y = fields
+            code = opcodes.get(operation)
+            if code is None and errors is not None and _binary_function(operation) is None:
+                failure, message = CODE_OPERATION, f"Unknown operation '{operation}'"
+            else:
+                try:
+                    values = parse(x), parse(y)
+                except (ValueError, OverflowError) as e:
+                    failure, message = CODE_VALUE, str(e)
+        if failure:
+            if errors is None:
+                raise ValueError(f"Line {line_number}: {message}")
+            ops.append(0)
+            xs.append(0)
+            ys.append(0)
+            errors.append(failure)
+            continue
+        if code is None:
+            if len(opcodes) == MAX_OPERATIONS:
+                raise ValueError(f"Line {line_number}: more than {MAX_OPERATIONS} distinct operations")
+            code = opcodes[operation] = len(opcodes)
+        ops.append(code)
+        xs.append(values[0])
+        ys.append(values[1])
+        if errors is not None:
+            errors.append(CODE_OK)
+    return {'op': ops, 'x': xs, 'y': ys}, list(opcodes)
+
+
+def csv_to_columnar(lines: Iterable[str], output: Union[str, BinaryIO], operand_type: str = TYPE_FLOAT64) -> int:
+    """
+    Convert ``op,x,y`` text records to a columnar job table.
+
+    Args:
+        lines: Input lines in any format ``streaming.read_records`` accepts
+        output: Path or binary stream for the table
+        operand_type: 'd' for float64 or 'q' for int64 operands
+
+    Returns:
+        Number of rows written
+    """
+    from .streaming import read_records
+
+    columns, operations = encode_records(read_records(lines), operand_type)
+    write_table(output, columns, operations)
+    return len(columns['op'])
+
+
+def _decode(name: str, value: object, operations: Sequence[str]) -> object:
+    if name == 'op':
+        return operations[value] if value < len(operations) else value
+    if name == 'error':
+        return ERROR_KINDS[value] if value < len(ERROR_KINDS) else value
+    return value
+
+
+def columnar_to_csv(table: ColumnarTable, output: TextIO, jobs: Optional[ColumnarTable] = None) -> int:
+    """
+    Write a columnar table as CSV with a header row.
+
+    Opcodes are written as operation names and error codes as error kinds
+    (empty for success).
+
+    Args:
+        table: Table to convert
+        output: Text stream
+        jobs: Job table to put in front of a result table's columns
+
+    Returns:
+        Number of rows written
+
+    Raises:
+        ValueError: If ``jobs`` has a different number of rows
+    """
+    import csv
+
+    sources = []
+    if jobs is not None:
+        if jobs.rows != table.rows:
+            raise ValueError(f"Job table has {jobs.rows} rows, result table has {table.rows}")
+        sources.append(jobs)
+    sources.append(table)
+    names, columns, operations = [], [], []
+    for source in sources:
+        for name, column in source.columns.items():
+            names.append(name)
+            columns.append(column)
+            operations.append(source.operations)
+
+    writer = csv.writer(output, lineterminator='\n')
+    writer.writerow(['operation' if name == 'op' else name for name in names])
+    for row in zip(*columns):
+        writer.writerow([_decode(name, value, ops) for name, value, ops in zip(names, row, operations)])
+    return table.rows
+
+
+def evaluate_columns(ops: Column, xs: Column, ys: Column, operations: Sequence[str],
+                     results: Optional["array.array"] = None, errors: Optional["array.array"] = None,
+                     start: int = 0, stop: Optional[int] = None) -> Tuple["array.array", "array.array"]:
+    """
+    Evaluate job columns row by row with the registered operations.
+
+    Args:
+        ops: uint8 opcodes indexing ``operations``
+        xs: First operands
+        ys: Second operands
+        operations: Operation names
+        results: float64 output column (array or writable memoryview) to
+            fill, allocated if omitted
+        errors: uint8 error-code output column to fill, allocated if omitted
+        start: First row to evaluate
+        stop: Row to stop before, the end if omitted
+
+    Returns:
+        Tuple of (results, errors); failed rows get NaN and their
+        ``result.CODE_*`` error code
+    """
+    rows = len(ops)
+    if results is None:
+        results = array.array(TYPE_FLOAT64, bytes(8 * rows))
+    if errors is None:
+        errors = array.array(TYPE_UINT8, bytes(rows))
+    if stop is None:
+        stop = rows
+
+    functions = [_binary_function(name) for name in operations]
+    opcode_count = len(functions)
+    nan = math.nan
+
+    # memoryview slices share the buffer instead of copying the rows
+    window = zip(memoryview(ops)[start:stop], memoryview(xs)[start:stop], memoryview(ys)[start:stop])
+    for i, (op, x, y) in enumerate(window, start):
+        if op >= opcode_count:
+            results[i] = nan
+            errors[i] = CODE_FORMAT
+            continue
+        function = functions[op]
+        if function is None:
+            results[i] = nan
+            errors[i] = CODE_OPERATION
+            continue
+        try:
+            results[i] = function(x, y)
+            errors[i] = CODE_OK
+        except Exception as e:  # includes int results too large for float64
+            results[i] = nan
+            errors[i] = error_code(e)
+    return results, errors
+
+
+def evaluate_table(jobs: ColumnarTable) -> Dict[str, "array.array"]:
+    """
+    Evaluate a job table.
+
+    Returns:
+        Result columns {'result': float64, 'error': uint8}, ready for ``write_table``
+
+    Raises:
+        ValueError: If the table lacks the op, x or y column
+    """
+    missing = [name for name in ('op', 'x', 'y') if name not in jobs]
+    if missing:
+        raise ValueError(f"Not a job table, missing column(s): {', '.join(missing)}")
+    results, errors = evaluate_columns(jobs['op'], jobs['x'], jobs['y'], jobs.operations)
+    return {'result': results, 'error': errors}
+
+
+def _operation_name(operations: Sequence[str], op: int) -> str:
+    return operations[op] if op < len(operations) else str(op)
+
+
+def _error_message(operations: Sequence[str], op: int, x, y) -> str:
+    """Rebuild the message of a failed row; only codes are kept while evaluating."""
+    if op >= len(operations):
+        return f"Invalid opcode {op}"
+    entry = get_operation(operations[op])
+    if entry is None or entry.arity != 2:
+        return f"Unknown operation '{operations[op]}'"
+    try:
+        result = entry.function(x, y)
+        float(result)
+    except Exception as e:
+        return str(e)
+    return ""
+
+
+def evaluate_text(lines: Iterable[str], chunk_rows: int = TEXT_CHUNK_ROWS) -> Iterator[Tuple["array.array", "array.array"]]:
+    """
+    Evaluate ``op,x,y`` text records a chunk of rows at a time.
+
+    Only one chunk of text, job columns and results is held at once.
+    Records that cannot be encoded become failed rows with the error code
+    the streaming batch mode reports for them, instead of aborting.
+
+    Args:
+        lines: Input lines in any format ``streaming.read_records`` accepts
+        chunk_rows: Rows per chunk
+
+    Yields:
+        Tuple of (float64 results, uint8 error codes) for each chunk
+    """
+    from .streaming import read_records
+
+    records = read_records(lines)
+    while True:
+        codes = array.array(TYPE_UINT8)
+        columns, operations = encode_records(itertools.islice(records, chunk_rows), errors=codes)
+        if not codes:
+            return
+        results, errors = evaluate_columns(columns['op'], columns['x'], columns['y'], operations)
+        if codes.count(CODE_OK) != len(codes):
+            for i, code in enumerate(codes):
+                if code:
+                    results[i] = math.nan
+                    errors[i] = code
+        yield results, errors
+
+
+class _InputError(Exception):
+    """Reading the batch input failed; wraps the original error."""
+
+
+def _spool_text(chunks: Iterator[Tuple["array.array", "array.array"]], spools: Sequence[BinaryIO],
+                stats=None) -> Tuple[int, int]:
+    """
+    Append the result and error columns of each chunk to two spool files.
+
+    Returns:
+        Tuple of (rows, failed rows)
+
+    Raises:
+        _InputError: If reading the input fails
+    """
+    rows = failures = 0
+    while True:
+        try:
+            chunk = next(chunks, None)
+        except (OSError, UnicodeDecodeError, ValueError) as e:
+            raise _InputError(e)
+        if chunk is None:
+            return rows, failures
+        for spool, column in zip(spools, chunk):
+            spool.write(memoryview(column).cast('B'))
+        rows += len(chunk[1])
+        failures += len(chunk[1]) - chunk[1].count(CODE_OK)
+        if stats is not None:
+            stats.update_columns(*chunk)
+
+
+def _copy_result_table(rows: int, spools: Sequence[BinaryIO], output: BinaryIO) -> None:
+    """Write a result table whose columns were spooled by ``_spool_text``."""
+    import shutil
+
+    output.write(encode_header(rows, RESULT_COLUMNS))
+    for spool in spools:
+        size = spool.tell()
+        spool.seek(0)
+        shutil.copyfileobj(spool, output)
+        output.write(b"\0" * _padding(size))
+    output.flush()
+
+
+def run_columnar(source: str, output_format: str = "csv", output=None, report: Optional[TextIO] = None,
+                 stats=None) -> int:
+    """
+    Evaluate a batch through the columnar path (``calculator --batch``).
+
+    ``op,x,y`` text input is encoded and evaluated ``TEXT_CHUNK_ROWS`` rows
+    at a time; a record that cannot be parsed becomes a failed row, as in
+    the streaming batch mode. With a text output format such input goes
+    through ``streaming.run_batch`` instead.
+
+    Args:
+        source: Columnar job file or ``op,x,y`` text file, '-' for stdin
+        output_format: 'binary' for a result table, or 'csv'/'jsonl' text
+        output: Binary stream for 'binary', text stream otherwise; stdout
+            by default
+        report: Where the throughput summary is written, stderr by default
+        stats: ``streamstats.ResultStats`` that every result is added to
+
+    Returns:
+        0 if every row succeeded, 1 if any row failed or the input could
+        not be read
+    """
+    from .streaming import run_batch, write_records
+
+    if report is None:
+        report = sys.stderr
+    if not is_columnar(source):
+        if output_format != "binary":
+            return run_batch(source, output_format, output, report, stats=stats)
+        return _run_text(source, output if output is not None else sys.stdout.buffer, report, stats)
+
+    start = time.perf_counter()
+    try:
+        jobs = read_table(source if source != "-" else sys.stdin.buffer.read())
+    except (OSError, ValueError) as e:
+        print(f"Error: Cannot read batch input '{source}': {e}", file=report)
+        return 1
+
+    with jobs:
+        results = evaluate_table(jobs)  # row numbers below count data rows, not input lines
+        failures = len(results['error']) - results['error'].count(CODE_OK)
+        if stats is not None:
+            stats.update_columns(results['result'], results['error'])
+        if output_format == "binary":
+            write_table(output if output is not None else sys.stdout.buffer, results)
+        else:
+            records = (
+                (i + 1, _operation_name(jobs.operations, op), x, y, None if code else result,
+                 ERROR_KINDS[code], _error_message(jobs.operations, op, x, y) if code else "")
+                for i, (op, x, y, result, code)
+                in enumerate(zip(jobs['op'], jobs['x'], jobs['y'], results['result'], results['error']))
+            )
+            write_records(records, output if output is not None else sys.stdout, output_format)
+        rows = jobs.rows
+    return _report(rows, failures, start, report)
+
+
+def _run_text(source: str, output: BinaryIO, report: TextIO, stats=None) -> int:
+    """Evaluate ``op,x,y`` text input into a binary result table."""
+    import io
+    import tempfile
+
+    start = time.perf_counter()
+    try:
+        if source == "-":
+            # newline='' as for files; the wrapper is detached, not closed, below
+            stream = io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8', newline='')
+        else:
+            stream = open(source, newline='', encoding='utf-8')
+    except OSError as e:
+        print(f"Error: Cannot read batch input '{source}': {e}", file=report)
+        return 1
+    # The header holds the row count, so the columns are spooled until the
+    # input is exhausted
+    with tempfile.TemporaryFile() as results, tempfile.TemporaryFile() as errors:
+        try:
+            rows, failures = _spool_text(evaluate_text(stream), (results, errors), stats)
+            _copy_result_table(rows, (results, errors), output)
+        except _InputError as e:
+            print(f"Error: Cannot read batch input '{source}': {e.args[0]}", file=report)
+            return 1
+        except OSError as e:
+            print(f"Error: Cannot write results: {e}", file=report)
+            return 1
+        finally:
+            if source == "-":
+                stream.detach()
+            else:
+                stream.close()
+    return _report(rows, failures, start, report)
+
+
+def _report(rows: int, failures: int, start: float, report: TextIO) -> int:
+    """Print the throughput summary; return the batch exit status."""
+    elapsed = time.perf_counter() - start
+    rate = rows / elapsed if elapsed > 0 else 0.0
+    print(f"Processed {rows} rows ({failures} errors) in {elapsed:.3f}s: {rate:,.0f} rows/sec", file=report)
+    return 0 if failures == 0 else 1
+
+
+def main(args: Optional[List[str]] = None) -> int:
+    """Entry point for the CSV converters."""
+    parser = argparse.ArgumentParser(prog="python -m src.calculator.columnar",
+                                     description="Convert batch files between CSV and the columnar format")
+    commands = parser.add_subparsers(dest='command', required=True)
+    to_columnar = commands.add_parser('to-columnar', help="op,x,y text records to a columnar job table")
+    to_columnar.add_argument('source', help="Text file, '-' for stdin")
+    to_columnar.add_argument('output', help="Columnar file to write")
+    to_columnar.add_argument('--int', action='store_true', help="Store operands as int64 instead of float64")
+    to_csv = commands.add_parser('to-csv', help="Columnar table to CSV")
+    to_csv.add_argument('source', help="Columnar file")
+    to_csv.add_argument('output', help="CSV file to write, '-' for stdout")
+    to_csv.add_argument('--jobs', help="Job table to join with a result table")
+    options = parser.parse_args(args)
+
+    try:
+        if options.command == 'to-columnar':
+            operand_type = TYPE_INT64 if options.int else TYPE_FLOAT64
+            if options.source == "-":
+                rows = csv_to_columnar(sys.stdin, options.output, operand_type)
+            else:
+                with open(options.source, newline='', encoding='utf-8') as stream:
+                    rows = csv_to_columnar(stream, options.output, operand_type)
+        else:
+            jobs = read_table(options.jobs) if options.jobs else None
+            try:
+                with read_table(options.source) as table:
+                    if options.output == "-":
+                        rows = columnar_to_csv(table, sys.stdout, jobs)
+                    else:
+                        with open(options.output, 'w', newline='', encoding='utf-8') as stream:
+                            rows = columnar_to_csv(table, stream, jobs)
+            finally:
+                if jobs is not None:
+                    jobs.close()
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    print(f"Converted {rows} rows", file=sys.stderr)
+    return 0
+
+
+__all__ = [
+    'ColumnarTable', 'read_table', 'write_table', 'is_columnar',
+    'encode_header', 'decode_header', 'column_layout',
+    'encode_records', 'csv_to_columnar', 'columnar_to_csv',
+    'evaluate_columns', 'evaluate_table', 'evaluate_text', 'run_columnar',
+    'MAGIC', 'RESULT_COLUMNS', 'TEXT_CHUNK_ROWS', 'COLUMN_TYPES', 'OPERAND_TYPES', 'TYPE_UINT8', 'TYPE_INT64', 'TYPE_FLOAT64',
+]
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,143 @@
+"""
+Conformance harness for the semantics profiles in ``kernel``.
+
+Before the kernel existed, the operations were implemented separately by
+several modules, each with its own semantics. Every one of those modules
+now takes its functions from a kernel profile:
+
+- ``calculator`` (the package) and ``calculator.math_operations``: ieee
+- ``calculator.core``: strict
+- ``calculator.__main__`` and Python's ``operator`` module: raw
+
+``record`` evaluates each source over a grid of operands (signed zeros,
+extremes, subnormals, infinities, NaN, big ints, bools and, for strict,
+non-numbers) and returns the outcome of every call: the result's type and
+repr, or the exception's type and message. ``compare`` evaluates the
+kernel profiles over the same grid and lists every call whose outcome
+differs from a recording. The recording made from the modules before they
+became aliases is kept in ``tests/conformance_golden.json``; regenerate
+it with::
+
+    python -m src.calculator.conformance FILE
+"""
+import importlib
+import json
+import math
+import sys
+from typing import Callable, Dict, Iterator, List, Tuple
+
+from .kernel import get_profile
+
+# Operands every source is evaluated with
+NUMBERS = (0, 1, -3, 2 ** 64, 0.0, -0.0, 0.5, -2.5, 1e308, 5e-324, math.inf, -math.inf, math.nan, True)
+
+# Non-numbers, only for sources that validate their operand types
+OTHERS = ('2', None, 1j)
+
+# (label, module relative to this package or absolute, {function: operation}, profile, operands)
+SOURCES = (
+    ('calculator', '.', {name: name for name in (
+        'add', 'subtract', 'multiply', 'divide', 'power', 'integer_divide', 'modulo')}, 'ieee', NUMBERS),
+    ('calculator.math_operations', '.math_operations', {'multiply': 'multiply'}, 'ieee', NUMBERS),
+    ('calculator.core', '.core', {name: name for name in (
+        'add', 'subtract', 'multiply', 'divide', 'power', 'integer_divide', 'modulo')}, 'strict', NUMBERS + OTHERS),
+    ('calculator.__main__', '.__main__', {name: name for name in (
+        'add', 'subtract', 'multiply', 'divide')}, 'raw', NUMBERS),
+    ('operator', 'operator', {'pow': 'power', 'floordiv': 'integer_divide', 'mod': 'modulo'}, 'raw', NUMBERS),
+)
+
+
+def _feasible(operation: str, a, b) -> bool:
+    """False for int powers too large to compute, which the grid skips."""
+    return not (operation == 'power' and type(a) is int and type(b) is int
+                and abs(a) > 1 and b > 1024)
+
+
+def pairs(operation: str, operands) -> Iterator[Tuple[object, object]]:
+    """Every pair of grid operands ``operation`` is evaluated with."""
+    for a in operands:
+        for b in operands:
+            if _feasible(operation, a, b):
+                yield a, b
+
+
+def outcome(function: Callable, a, b) -> List[str]:
+    """
+    What ``function(a, b)`` does: ``[type, repr]`` of the result, or
+    ``['!' + exception type, message]``.
+    """
+    try:
+        result = function(a, b)
+    except Exception as e:
+        return ['!' + type(e).__name__, str(e)]
+    return [type(result).__name__, repr(result)]
+
+
+def _module(name: str):
+    return importlib.import_module(name, __package__) if name.startswith('.') else importlib.import_module(name)
+
+
+def record() -> Dict[str, Dict[str, List[str]]]:
+    """
+    Evaluate every source module over the grid.
+
+    Returns:
+        ``{source label: {operation: [outcome of each pair]}}``, the pairs
+        in the order ``pairs`` yields them
+    """
+    recording = {}
+    for label, module_name, functions, _, operands in SOURCES:
+        module = _module(module_name)
+        recording[label] = {
+            operation: [outcome(getattr(module, function_name), a, b) for a, b in pairs(operation, operands)]
+            for function_name, operation in functions.items()
+        }
+    return recording
+
+
+def compare(recording: Dict[str, Dict[str, List[str]]]) -> List[str]:
+    """
+    Evaluate the kernel profiles over the grid and compare with a recording
+    made by ``record``.
+
+    Returns:
+        One line per call whose outcome differs, empty if every profile
+        matches every source it replaces
+    """
+    mismatches = []
+    for label, _, functions, profile_name, operands in SOURCES:
+        profile = get_profile(profile_name)
+        for operation in functions.values():
+            expected = recording[label][operation]
+            for (a, b), recorded in zip(pairs(operation, operands), expected):
+                actual = outcome(profile[operation], a, b)
+                if actual != recorded:
+                    mismatches.append(f"{label} {operation}({a!r}, {b!r}): "
+                                      f"expected {recorded}, {profile_name} gives {actual}")
+    return mismatches
+
+
+def main(args: List[str]) -> int:
+    """Write a recording of the current source modules to the file ``args[0]``."""
+    if len(args) != 1:
+        print("Usage: python -m src.calculator.conformance FILE")
+        return 1
+    recording = record()
+    with open(args[0], 'w', encoding='utf-8') as f:
+        # One outcome per line keeps the file diffable
+        f.write("{\n")
+        for i, (label, operations) in enumerate(recording.items()):
+            f.write(f" {json.dumps(label)}: {{\n")
+            for j, (operation, outcomes) in enumerate(operations.items()):
+                lines = ",\n".join(f"   {json.dumps(o)}" for o in outcomes)
+                f.write(f"  {json.dumps(operation)}: [\n{lines}\n  ]{',' if j < len(operations) - 1 else ''}\n")
+            f.write(f" }}{',' if i < len(recording) - 1 else ''}\n")
+        f.write("}\n")
+    return 0
+
+
+__all__ = ['NUMBERS', 'OTHERS', 'SOURCES', 'pairs', 'outcome', 'record', 'compare']
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
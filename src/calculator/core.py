@@ -1,68 +1,25 @@
-"""Basic calculator implementation with error handling."""
-from typing import Union
-
-Number = Union[int, float]
-
-def _validate_inputs(*args) -> None:
-    """Validate that all inputs are numeric and not complex or boolean."""
-    for arg in args:
-        # Explicitly check for booleans first since they are a subclass of int
-        if isinstance(arg, bool):
-            raise TypeError(f"Boolean values are not allowed. Got {type(arg).__name__}: {arg}")
-        if not isinstance(arg, (int, float)):
-            # Raise error for complex numbers, strings, lists, etc.
-            raise TypeError(f"Only int and float values allowed. Got {type(arg).__name__}: {arg}")
-        # Check for complex numbers (they're technically float but we need special handling)
-        if isinstance(arg, complex):
-            raise TypeError(f"Complex numbers are not supported. Got {type(arg).__name__}: {arg}")
-
-def add(x: Number, y: Number) -> float:
-    """Add two numbers."""
-    _validate_inputs(x, y)
-    return float(x + y)
-
-def subtract(x: Number, y: Number) -> float:
-    """Subtract y from x."""
-    _validate_inputs(x, y)
-    return float(x - y)
-
-def multiply(x: Number, y: Number) -> float:
-    """Multiply two numbers."""
-    _validate_inputs(x, y)
-    return float(x * y)
-
-def divide(x: Number, y: Number) -> float:
-    """Divide x by y."""
-    _validate_inputs(x, y)
-    if y == 0:
-        raise ZeroDivisionError("Cannot divide by zero")
-    return float(x / y)
-
-def power(x: Number, y: Number) -> float:
-    """Raise x to the power of y."""
-    _validate_inputs(x, y)
-    if x == 0 and y < 0:
-        raise ZeroDivisionError("Raising zero to a negative power is undefined")
-    try:
-        result = x ** y
-        if isinstance(result, complex):
-            raise TypeError("Result is complex, which is not supported")
-        return float(result)
-    except OverflowError:
-        raise OverflowError(f"Result of {x} ** {y} is too large to represent")
-    except (ValueError, TypeError) as e:
-        raise TypeError(f"Invalid operation: {x} ** {y}") from e
-
-def integer_divide(x: Number, y: Number) -> int:
-    """Perform integer division of x by y."""
-    _validate_inputs(x, y)
-    if y == 0:
-        raise ZeroDivisionError("Cannot divide by zero")
-    return int(x // y)
-
-def modulo(x: Number, y: Number) -> float:
-    """Calculate x modulo y."""
-    _validate_inputs(x, y)
-    if y == 0:
-        raise ZeroDivisionError("Cannot perform modulo with zero")
-    return float(x % y)
\ No newline at end of file
+"""Basic calculator implementation with error handling.
+
+The operations are the strict profile of the kernel (see kernel.py):
+operands must be ints or floats, results are floats, and errors raise.
+For batches, build a ``Float64Column`` or ``IntColumn`` once and apply an
+operation to whole columns with ``strict_many``, which skips the per-row
+type checks (see columns.py).
+"""
+from .kernel import (
+    Number,
+    _validate_inputs,
+    strict_add as add,
+    strict_subtract as subtract,
+    strict_multiply as multiply,
+    strict_divide as divide,
+    strict_power as power,
+    strict_integer_divide as integer_divide,
+    strict_modulo as modulo,
+)
+from .columns import Float64Column, IntColumn, strict_many
+
+__all__ = [
+    'add', 'subtract', 'multiply', 'divide', 'power', 'integer_divide', 'modulo',
+    'Float64Column', 'IntColumn', 'strict_many',
+]
@@ -0,0 +1,267 @@
+"""
+Persistent calculator process ("calculator serve").
+
+A warm process that answers calculator commands without paying interpreter
+startup, module import and parser construction for every calculation.
+
+Two front-ends are available:
+
+- A Unix domain socket server. Each request is one line holding the CLI
+  arguments as a JSON list (``["add", "5", "3"]``), so arguments may
+  contain spaces, or a JSON object with the arguments and the client's
+  working directory (``{"args": ["--batch", "jobs.csv"], "cwd": "/home/me"}``),
+  which relative file paths are resolved against; a plain line of
+  whitespace separated arguments (``add 5 3``) is accepted too. Each
+  response is one JSON line
+  ``{"code": 0, "stdout": "Result: 8.0\\n", "stderr": ""}``. A connection may
+  send any number of requests. See ``client.py`` for the matching client.
+- A ``--stdin`` line protocol: every input line is executed as a command and
+  its plain CLI output is written to stdout.
+
+Commands are executed by ``cli.main``, so their output and exit codes are
+identical to one-shot CLI calls. Requests are served one at a time.
+Commands that read their input from stdin (``--batch -``, or ``--reduce``
+without ``--batch``) are refused: the daemon's stdin is not the caller's.
+
+``calculator serve --http PORT`` starts the HTTP/JSON server from
+``http_server.py`` instead, for services that want structured results.
+
+With ``--metrics`` the daemon records per-operation metrics (see
+``metrics.py``); the ``stats`` request returns them as JSON.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import socket
+import socketserver
+import stat
+import sys
+from typing import List, Optional, TextIO, Tuple
+
+from .cli import main as cli_main
+from .client import default_socket_path, reads_stdin
+
+
+def execute(args: List[str], cwd: Optional[str] = None) -> Tuple[int, str, str]:
+    """
+    Run one CLI command in this process and capture its output.
+
+    Args:
+        args: CLI arguments, e.g. ``['add', '5', '3']``
+        cwd: Directory relative paths in the arguments are resolved
+            against, the daemon's own if omitted
+
+    Returns:
+        Tuple of (exit code, stdout text, stderr text)
+    """
+    if args and args[0] == "serve":
+        return 1, "", "Error: 'serve' cannot be run through the daemon\n"
+    if reads_stdin(args):
+        return 1, "", "Error: stdin input cannot be read through the daemon, run the CLI directly\n"
+    if args and args[0] == "stats":
+        # Answered with this process's counters; "calculator stats" asks here
+        from .metrics import snapshot
+        return 0, json.dumps(snapshot()) + "\n", ""
+
+    previous = None
+    if cwd is not None:
+        try:
+            previous = os.getcwd()
+            os.chdir(cwd)  # safe: requests are served one at a time
+        except OSError as e:
+            return 1, "", f"Error: Cannot change to directory '{cwd}': {e}\n"
+
+    stdout = io.StringIO()
+    stderr = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            try:
+                code = cli_main(args)
+            except SystemExit as e:
+                # Help output exits through sys.exit
+                code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    finally:
+        if previous is not None:
+            os.chdir(previous)
+    return code, stdout.getvalue(), stderr.getvalue()
+
+
+def parse_request(line: bytes) -> Tuple[List[str], Optional[str]]:
+    """
+    Parse one socket request line into CLI arguments.
+
+    Args:
+        line: A JSON list of strings, a JSON object with an ``args`` list
+            and an optional ``cwd`` string, or whitespace separated arguments
+
+    Returns:
+        Tuple of (CLI arguments, working directory or None)
+
+    Raises:
+        ValueError: If the line is not UTF-8 or not one of the JSON forms
+    """
+    text = line.decode('utf-8')
+    if not text.lstrip().startswith(('[', '{')):
+        return text.split(), None
+    request = json.loads(text)
+    cwd = None
+    if isinstance(request, dict):
+        args = request.get("args")
+        cwd = request.get("cwd")
+        if cwd is not None and not isinstance(cwd, str):
+            raise ValueError("'cwd' must be a string")
+    else:
+        args = request
+    if not isinstance(args, list) or not all(isinstance(arg, str) for arg in args):
+        raise ValueError("a request must be a JSON list of strings")
+    return args, cwd
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Answer each request line on a connection with one JSON response line."""
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            try:
+                args, cwd = parse_request(line)
+            except ValueError as e:
+                code, out, err = 1, "", f"Error: Invalid request: {e}\n"
+            else:
+                code, out, err = execute(args, cwd)
+            response = json.dumps({"code": code, "stdout": out, "stderr": err})
+            self.wfile.write(response.encode('utf-8') + b"\n")
+            self.wfile.flush()
+
+
+def _remove_stale_socket(socket_path: str) -> None:
+    """
+    Remove a socket file left behind by a daemon that is no longer running.
+
+    Raises:
+        OSError: If the path exists but is not a socket, or a process still
+            accepts connections on it
+    """
+    try:
+        mode = os.stat(socket_path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise OSError("already in use: not a socket")
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(socket_path)
+    except ConnectionRefusedError:
+        os.unlink(socket_path)  # nothing listens: stale
+        return
+    finally:
+        probe.close()
+    raise OSError("already in use by a running daemon")
+
+
+def create_server(socket_path: Optional[str] = None) -> socketserver.BaseServer:
+    """
+    Create (but do not start) the Unix domain socket server.
+
+    A stale socket file left behind by a previous daemon is replaced; any
+    other file, or the socket of a daemon that is still running, is not.
+
+    Args:
+        socket_path: Path of the socket, ``default_socket_path()`` if omitted
+
+    Returns:
+        The bound server; call ``serve_forever()`` to start it
+
+    Raises:
+        OSError: If Unix domain sockets are unavailable, the path is already
+            in use or binding fails
+    """
+    if not hasattr(socket, 'AF_UNIX'):
+        raise OSError("Unix domain sockets are not supported on this platform")
+    if socket_path is None:
+        socket_path = default_socket_path()
+    _remove_stale_socket(socket_path)
+    return socketserver.UnixStreamServer(socket_path, _RequestHandler)
+
+
+def serve_socket(socket_path: Optional[str] = None) -> int:
+    """Serve requests on a Unix domain socket until interrupted."""
+    if socket_path is None:
+        socket_path = default_socket_path()
+    try:
+        server = create_server(socket_path)
+    except OSError as e:
+        print(f"Error: Cannot listen on {socket_path}: {e}")
+        return 1
+    print(f"Calculator daemon listening on {socket_path}")
+    sys.stdout.flush()
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+    return 0
+
+
+def serve_stream(input_stream: TextIO, output_stream: TextIO) -> int:
+    """
+    Execute one command per input line, writing plain CLI output.
+
+    Args:
+        input_stream: Lines such as ``add 5 3``; blank lines are skipped
+        output_stream: Where the command output is written
+
+    Returns:
+        0 if every command succeeded, otherwise 1
+    """
+    status = 0
+    for line in input_stream:
+        args = line.split()
+        if not args:
+            continue
+        code, out, err = execute(args)
+        output_stream.write(out)
+        output_stream.write(err)
+        output_stream.flush()
+        if code != 0:
+            status = 1
+    return status
+
+
+def serve_main(args: List[str]) -> int:
+    """Entry point for ``calculator serve [--socket PATH] [--stdin] [--http PORT]``."""
+    parser = argparse.ArgumentParser(
+        prog="calculator serve",
+        description="Keep a warm calculator process running",
+    )
+    parser.add_argument('--socket', default=None, help="Unix socket path to listen on")
+    parser.add_argument('--stdin', action='store_true',
+                        help="Read commands from stdin instead of a socket")
+    parser.add_argument('--http', type=int, default=None, metavar='PORT',
+                        help="Serve JSON over HTTP on PORT instead of a socket (0 for any free port)")
+    parser.add_argument('--host', default="127.0.0.1", help="Interface for --http (default: 127.0.0.1)")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Processes for heavy --http requests (default: one per CPU)")
+    parser.add_argument('--metrics', action='store_true',
+                        help="Record per-operation metrics, read with 'calculator stats' or GET /metrics")
+    try:
+        options = parser.parse_args(args)
+    except SystemExit as e:
+        return e.code if isinstance(e.code, int) else 0
+
+    if options.metrics:
+        from .metrics import enable_metrics
+        enable_metrics()
+    if options.http is not None:
+        from .http_server import serve_http
+        return serve_http(options.host, options.http, options.workers)
+    if options.stdin:
+        return serve_stream(sys.stdin, sys.stdout)
+    return serve_socket(options.socket)
+
+
+__all__ = ['default_socket_path', 'execute', 'parse_request', 'create_server', 'serve_socket', 'serve_stream', 'serve_main']
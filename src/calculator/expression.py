@@ -0,0 +1,293 @@
+"""
+Expression compiler for the calculator.
+
+Infix formulas such as ``(a + b) * c ^ 2 // d`` are parsed once and
+compiled to a generated Python function that calls the calculator
+operations directly, so every evaluation keeps their special-case
+semantics. Compiled expressions are cached by their text, which makes
+re-evaluating the same formula with new variables cost only the calls.
+
+Supported syntax (highest precedence first):
+
+- numbers, variable names, parentheses and calls of registered
+  operations by name, e.g. ``power(x, 2)``
+- ``^`` or ``**`` (power, right-associative)
+- unary ``-`` and ``+``
+- ``*``, ``/``, ``//`` (integer_divide) and ``%`` (modulo)
+- ``+`` and ``-``
+"""
+import keyword
+import re
+from functools import lru_cache
+from typing import Callable, Dict, List, Tuple
+
+from . import add, subtract, multiply, divide, power, integer_divide, modulo
+from .registry import get_operation
+
+
+# Operation functions as seen by the generated code. Variable names must
+# start with a letter, so they can never shadow these underscore names.
+_NAMESPACE = {
+    '_add': add,
+    '_subtract': subtract,
+    '_multiply': multiply,
+    '_divide': divide,
+    '_power': power,
+    '_integer_divide': integer_divide,
+    '_modulo': modulo,
+}
+
+_BINARY_OPERATORS = {
+    '+': 'add',
+    '-': 'subtract',
+    '*': 'multiply',
+    '/': 'divide',
+    '//': 'integer_divide',
+    '%': 'modulo',
+    '^': 'power',
+    '**': 'power',
+}
+
+_TOKEN_PATTERN = re.compile(
+    r"\s*(?:"
+    r"(?P<number>(?:\d+\.\d*|\.\d+|\d+)(?:[eE][+-]?\d+)?)"
+    r"|(?P<name>[A-Za-z][A-Za-z0-9_]*)"
+    r"|(?P<operator>\*\*|//|[-+*/^%(),])"
+    r")"
+)
+
+CACHE_SIZE = 256
+
+
+def tokenize(text: str) -> List[Tuple[str, str]]:
+    """
+    Split an expression into ``(kind, value)`` tokens.
+
+    Args:
+        text: The expression text
+
+    Returns:
+        List of tokens, where kind is 'number', 'name' or 'operator'
+
+    Raises:
+        ValueError: If the text contains an unexpected character
+    """
+    tokens = []
+    position = 0
+    end = len(text.rstrip())
+    while position < end:
+        match = _TOKEN_PATTERN.match(text, position)
+        if match is None or match.end() == position:
+            raise ValueError(f"Invalid expression: unexpected character at position {position} in '{text}'")
+        kind = match.lastgroup
+        tokens.append((kind, match.group(kind)))
+        position = match.end()
+    return tokens
+
+
+class _Parser:
+    """
+    Recursive-descent parser that emits Python source for an expression.
+
+    The grammar methods build their output only through ``_number``,
+    ``_variable``, ``_operator`` and ``_call_operation``, so a subclass can
+    override those to build something other than source text.
+    """
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self.tokens = tokenize(text)
+        self.position = 0
+        self.variables: Dict[str, None] = {}  # insertion-ordered set
+        self.functions: Dict[str, Callable] = {}  # operations called by name
+        self.constants: Dict[str, float] = {}  # literals without a source form
+
+    def _peek(self) -> Tuple[str, str]:
+        if self.position < len(self.tokens):
+            return self.tokens[self.position]
+        return ('end', '')
+
+    def _next(self) -> Tuple[str, str]:
+        token = self._peek()
+        self.position += 1
+        return token
+
+    def _error(self, message: str) -> ValueError:
+        return ValueError(f"Invalid expression '{self.text}': {message}")
+
+    def parse(self) -> str:
+        if not self.tokens:
+            raise self._error("expression is empty")
+        source = self._expression()
+        kind, value = self._peek()
+        if kind != 'end':
+            raise self._error(f"unexpected '{value}'")
+        return source
+
+    def _number(self, number):
+        if number - number != 0:  # 1e999 is inf, whose repr is not valid source
+            name = f"_c{len(self.constants)}"
+            self.constants[name] = number
+            return name
+        return repr(number)
+
+    def _variable(self, name: str):
+        # The generated function takes the variables as parameters
+        if keyword.iskeyword(name):
+            raise self._error(f"'{name}' is a reserved word and cannot be a variable")
+        self.variables[name] = None
+        return name
+
+    def _operator(self, operation: str, left, right):
+        """Apply one of the built-in operations bound in ``_NAMESPACE``."""
+        return f"_{operation}({left}, {right})"
+
+    def _call_operation(self, entry, arguments: List):
+        """Apply a registered operation called by name."""
+        self.functions[f"_fn_{entry.name}"] = entry.function
+        return f"_fn_{entry.name}({', '.join(arguments)})"
+
+    def _expression(self) -> str:
+        left = self._term()
+        while self._peek() in (('operator', '+'), ('operator', '-')):
+            _, operator = self._next()
+            left = self._operator(_BINARY_OPERATORS[operator], left, self._term())
+        return left
+
+    def _term(self) -> str:
+        left = self._unary()
+        while self._peek() in (('operator', '*'), ('operator', '/'), ('operator', '//'), ('operator', '%')):
+            _, operator = self._next()
+            left = self._operator(_BINARY_OPERATORS[operator], left, self._unary())
+        return left
+
+    def _unary(self) -> str:
+        if self._peek() == ('operator', '-'):
+            self._next()
+            # multiply by -1 keeps signed zeros and infinities correct
+            return self._operator('multiply', self._number(-1), self._unary())
+        if self._peek() == ('operator', '+'):
+            self._next()
+            return self._unary()
+        return self._power()
+
+    def _power(self) -> str:
+        base = self._atom()
+        if self._peek() in (('operator', '^'), ('operator', '**')):
+            self._next()
+            # The exponent may itself be negated and is right-associative
+            return self._operator('power', base, self._unary())
+        return base
+
+    def _atom(self) -> str:
+        kind, value = self._next()
+        if kind == 'number':
+            return self._number(float(value) if any(c in value for c in '.eE') else int(value))
+        if kind == 'name':
+            if self._peek() == ('operator', '('):
+                return self._call(value)
+            return self._variable(value)
+        if (kind, value) == ('operator', '('):
+            inner = self._expression()
+            if self._next() != ('operator', ')'):
+                raise self._error("missing ')'")
+            return inner
+        if kind == 'end':
+            raise self._error("unexpected end of expression")
+        raise self._error(f"unexpected '{value}'")
+
+    def _call(self, name: str) -> str:
+        entry = get_operation(name)
+        if entry is None:
+            raise self._error(f"unknown operation '{name}'")
+        self._next()  # '('
+        arguments = []
+        if self._peek() != ('operator', ')'):
+            arguments.append(self._expression())
+            while self._peek() == ('operator', ','):
+                self._next()
+                arguments.append(self._expression())
+        if self._next() != ('operator', ')'):
+            raise self._error("missing ')'")
+        if len(arguments) != entry.arity:
+            raise self._error(f"{name} expects {entry.arity} arguments, got {len(arguments)}")
+        return self._call_operation(entry, arguments)
+
+
+class CompiledExpression:
+    """
+    A parsed expression ready for repeated evaluation.
+
+    Attributes:
+        text: The original expression text
+        variables: Names of the variables, in order of first appearance
+        source: The generated Python source of the evaluation function
+    """
+
+    __slots__ = ('text', 'variables', 'source', '_function')
+
+    def __init__(self, text: str) -> None:
+        parser = _Parser(text)
+        body = parser.parse()
+        self.text = text
+        self.variables = tuple(parser.variables)
+        parameters = f"*, {', '.join(self.variables)}" if self.variables else ""
+        self.source = f"def _expression({parameters}):\n    return {body}\n"
+        namespace = dict(_NAMESPACE)
+        namespace.update(parser.functions)
+        namespace.update(parser.constants)
+        exec(compile(self.source, f"<expression {text!r}>", 'exec'), namespace)
+        self._function = namespace['_expression']
+
+    def __call__(self, **variables):
+        """
+        Evaluate the expression.
+
+        Args:
+            **variables: A value for every name in ``variables``
+
+        Returns:
+            The result of the expression
+
+        Raises:
+            TypeError: If a variable is missing or unknown
+            ZeroDivisionError: If the expression divides by zero
+        """
+        return self._function(**variables)
+
+    def __repr__(self) -> str:
+        return f"CompiledExpression({self.text!r})"
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def compile_expression(text: str) -> CompiledExpression:
+    """
+    Compile an expression, reusing the cached result for repeated text.
+
+    Args:
+        text: The expression text, e.g. ``"(a + b) * c ^ 2 // d"``
+
+    Returns:
+        The compiled expression
+
+    Raises:
+        ValueError: If the expression cannot be parsed
+    """
+    return CompiledExpression(text)
+
+
+def evaluate(text: str, **variables):
+    """
+    Compile (or fetch from the cache) and evaluate an expression.
+
+    Args:
+        text: The expression text
+        **variables: Values for the variables used in the expression
+
+    Returns:
+        The result of the expression
+    """
+    return compile_expression(text)(**variables)
+
+
+__all__ = ['CompiledExpression', 'compile_expression', 'evaluate', 'tokenize']
@@ -0,0 +1,308 @@
+"""
+Expression graphs with common-subexpression elimination.
+
+An ``ExpressionGraph`` builds formulas as a DAG of calculator operations
+instead of a tree. Every node is hash-consed: applying the same operation
+to the same operand nodes returns the existing node, so ``power(x, 2)``
+written three times is computed once per row. Subtrees whose operands are
+all constants are folded at build time by calling the operation itself,
+so the folded value has exactly the NaN/inf semantics of a run-time call.
+A subtree whose folding raises (e.g. ``divide(1, 0)``) is kept and raises
+on evaluation, as it would without the graph.
+
+Compiling a set of output nodes generates one Python function that
+evaluates every live node once, in dependency order::
+
+    graph = ExpressionGraph()
+    area = graph.parse("power(r, 2) * 3.14159")
+    volume = graph.parse("power(r, 2) * 3.14159 * h")  # reuses area
+    shape = graph.compile([area, volume])
+    shape(r=2.0, h=10.0)   # (12.56636, 125.6636)
+    shape.report           # {'requested': 5, 'reused': 2, ...}
+
+Only the built-in operations are folded. Operations registered by plugins
+are assumed to be impure and are always evaluated at run time, though
+identical calls are still shared.
+"""
+import keyword
+from typing import Callable, Dict, Iterable, Iterator, List, Mapping, Sequence, Tuple, Union
+
+from .expression import _NAMESPACE, _Parser
+from .registry import get_operation
+
+# Operations that are pure functions of their operands and safe to fold
+_FOLDABLE = frozenset(_NAMESPACE.values())
+
+_CONSTANT = 'constant'
+_VARIABLE = 'variable'
+
+
+class Node:
+    """
+    Handle for a node of an ``ExpressionGraph``.
+
+    Attributes:
+        graph: The graph the node belongs to
+        index: Position of the node in the graph; operands always have a
+            smaller index than the nodes using them
+    """
+
+    __slots__ = ('graph', 'index')
+
+    def __init__(self, graph: "ExpressionGraph", index: int) -> None:
+        self.graph = graph
+        self.index = index
+
+    def __repr__(self) -> str:
+        return f"Node({self.graph.describe(self)})"
+
+
+class _GraphParser(_Parser):
+    """Expression parser that adds nodes to a graph instead of emitting source."""
+
+    def __init__(self, text: str, graph: "ExpressionGraph") -> None:
+        super().__init__(text)
+        self.graph = graph
+
+    def _number(self, number):
+        return self.graph.constant(number)
+
+    def _variable(self, name: str):
+        return self.graph.variable(name)
+
+    def _operator(self, operation: str, left, right):
+        return self.graph.apply(_NAMESPACE[f"_{operation}"], left, right, name=operation)
+
+    def _call_operation(self, entry, arguments: List):
+        return self.graph.apply(entry.function, *arguments, name=entry.name)
+
+
+class ExpressionGraph:
+    """
+    Builder for a DAG of calculator operations.
+
+    Attributes:
+        fold_constants: Whether constant subtrees are evaluated at build time
+        requested: Operation applications requested so far
+        reused: Requests answered with an existing node
+        folded: Requests replaced by a constant
+    """
+
+    def __init__(self, fold_constants: bool = True) -> None:
+        self.fold_constants = fold_constants
+        self.requested = 0
+        self.reused = 0
+        self.folded = 0
+        # Per node: (kind, payload, operand indexes) where kind is _CONSTANT,
+        # _VARIABLE or the operation name, and payload is the value, the
+        # variable name or the operation function
+        self._nodes: List[Tuple[str, object, Tuple[int, ...]]] = []
+        self._index: Dict[tuple, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def _intern(self, key: tuple, node: Tuple[str, object, Tuple[int, ...]]) -> Node:
+        index = self._index.get(key)
+        if index is None:
+            index = len(self._nodes)
+            self._nodes.append(node)
+            self._index[key] = index
+        return Node(self, index)
+
+    def constant(self, value) -> Node:
+        """
+        Return the node for a constant.
+
+        Constants are keyed by type and ``repr``, so ``1`` and ``1.0``, and
+        ``0.0`` and ``-0.0``, stay distinct while every NaN is one node.
+        """
+        return self._intern((_CONSTANT, type(value), repr(value)), (_CONSTANT, value, ()))
+
+    def variable(self, name: str) -> Node:
+        """
+        Return the node for a variable.
+
+        Raises:
+            ValueError: If the name is not a valid variable name
+        """
+        if not name.isidentifier() or name.startswith('_') or keyword.iskeyword(name):
+            raise ValueError(f"Invalid variable name '{name}'")
+        return self._intern((_VARIABLE, name), (_VARIABLE, name, ()))
+
+    def apply(self, operation: Union[str, Callable], *operands, name: str = "") -> Node:
+        """
+        Return the node applying an operation to operands.
+
+        Args:
+            operation: Registered operation name, or the operation function
+            *operands: Nodes of this graph or plain numbers (made constants)
+            name: Display name when ``operation`` is a function
+
+        Returns:
+            A constant node if the application was folded, the existing
+            node if the same application was requested before, or a new node
+
+        Raises:
+            ValueError: If the operation is unknown, the operand count does
+                not match its arity, or an operand belongs to another graph
+        """
+        if isinstance(operation, str):
+            entry = get_operation(operation)
+            if entry is None:
+                raise ValueError(f"Unknown operation '{operation}'")
+            if len(operands) != entry.arity:
+                raise ValueError(f"{operation} expects {entry.arity} operands, got {len(operands)}")
+            function, name = entry.function, operation
+        else:
+            function, name = operation, name or getattr(operation, '__name__', 'operation')
+
+        indexes = []
+        for operand in operands:
+            if not isinstance(operand, Node):
+                operand = self.constant(operand)
+            elif operand.graph is not self:
+                raise ValueError("Operand node belongs to a different graph")
+            indexes.append(operand.index)
+        indexes = tuple(indexes)
+        self.requested += 1
+
+        key = (function, indexes)
+        index = self._index.get(key)
+        if index is not None:
+            self.reused += 1
+            return Node(self, index)
+
+        if self.fold_constants and function in _FOLDABLE and all(
+                self._nodes[i][0] == _CONSTANT for i in indexes):
+            try:
+                value = function(*(self._nodes[i][1] for i in indexes))
+            except Exception:
+                pass  # keep the node so the error is raised on evaluation
+            else:
+                self.folded += 1
+                node = self.constant(value)
+                self._index[key] = node.index  # later identical requests count as reuse
+                return node
+
+        return self._intern(key, (name, function, indexes))
+
+    def parse(self, text: str) -> Node:
+        """
+        Add an infix expression (the ``expression`` module syntax) to the graph.
+
+        Returns:
+            The node of the whole expression
+
+        Raises:
+            ValueError: If the expression cannot be parsed
+        """
+        return _GraphParser(text, self).parse()
+
+    def describe(self, node: Node) -> str:
+        """Return the expression a node stands for, e.g. ``add(power(x, 2), 1)``."""
+        kind, payload, operands = self._nodes[node.index]
+        if kind == _CONSTANT:
+            return repr(payload)
+        if kind == _VARIABLE:
+            return payload
+        return f"{kind}({', '.join(self.describe(Node(self, i)) for i in operands)})"
+
+    def compile(self, outputs: Union[Node, Sequence[Node]]) -> "CompiledGraph":
+        """
+        Generate the evaluation function for the given output nodes.
+
+        Args:
+            outputs: One node, or a sequence of nodes
+
+        Returns:
+            The compiled graph; called with one node it returns a single
+            value, called with a sequence it returns a tuple
+        """
+        return CompiledGraph(self, outputs)
+
+
+class CompiledGraph:
+    """
+    The live part of an ``ExpressionGraph``, compiled for repeated evaluation.
+
+    Attributes:
+        variables: Names of the variables the outputs depend on
+        source: The generated Python source of the evaluation function
+        report: Dict with the graph's ``requested``, ``reused`` and
+            ``folded`` counts, the live ``operations`` evaluated per row,
+            the ``dead`` operation nodes no output needs, and
+            ``eliminated`` (requested minus evaluated per row)
+    """
+
+    __slots__ = ('variables', 'source', 'report', '_function')
+
+    def __init__(self, graph: ExpressionGraph, outputs: Union[Node, Sequence[Node]]) -> None:
+        single = isinstance(outputs, Node)
+        outputs = [outputs] if single else list(outputs)
+        for output in outputs:
+            if output.graph is not graph:
+                raise ValueError("Output node belongs to a different graph")
+
+        # Operands precede their users, so ascending index order is a topological order
+        live = set()
+        pending = [output.index for output in outputs]
+        while pending:
+            index = pending.pop()
+            if index not in live:
+                live.add(index)
+                pending.extend(graph._nodes[index][2])
+
+        namespace = {}
+        names = {}
+        lines = []
+        variables = []
+        for index in sorted(live):
+            kind, payload, operands = graph._nodes[index]
+            if kind == _CONSTANT:
+                names[index] = f"_c{index}"
+                namespace[names[index]] = payload  # repr of nan/inf is not valid source
+            elif kind == _VARIABLE:
+                names[index] = payload
+                variables.append(payload)
+            else:
+                names[index] = f"_t{index}"
+                namespace[f"_f{index}"] = payload
+                lines.append(f"    _t{index} = _f{index}({', '.join(names[i] for i in operands)})")
+        result = names[outputs[0].index] if single else f"({', '.join(names[o.index] for o in outputs)},)"
+        parameters = f"*, {', '.join(variables)}" if variables else ""
+        self.source = f"def _graph({parameters}):\n" + "".join(line + "\n" for line in lines) \
+            + f"    return {result}\n"
+        exec(compile(self.source, "<expression graph>", 'exec'), namespace)
+        self._function = namespace['_graph']
+        self.variables = tuple(variables)
+
+        operations = len(lines)
+        dead = sum(1 for kind, _, _ in graph._nodes if kind not in (_CONSTANT, _VARIABLE)) - operations
+        self.report = {
+            'requested': graph.requested,
+            'reused': graph.reused,
+            'folded': graph.folded,
+            'operations': operations,
+            'dead': dead,
+            'eliminated': graph.requested - operations,
+        }
+
+    def __call__(self, **variables):
+        """
+        Evaluate the outputs for one set of variable values.
+
+        Raises:
+            TypeError: If a variable is missing or unknown
+            ZeroDivisionError: If a live node divides by zero
+        """
+        return self._function(**variables)
+
+    def evaluate_rows(self, rows: Iterable[Mapping[str, object]]) -> Iterator:
+        """Evaluate the outputs for every row of variable values, lazily."""
+        function = self._function
+        for row in rows:
+            yield function(**row)
+
+
+__all__ = ['ExpressionGraph', 'CompiledGraph', 'Node']
@@ -0,0 +1,507 @@
+"""
+HTTP/JSON front-end for the calculator ("calculator serve --http PORT").
+
+An ``asyncio`` server, standard library only, that exposes the operation
+registry to other services without spawning a CLI process per call:
+
+- ``POST /calculate`` with ``{"operation": "add", "operands": [5, 3]}``
+  answers ``{"result": 8}``. Optional ``"backend"`` and ``"precision"``
+  fields select a numeric backend as on the command line.
+- ``POST /batch`` with ``{"requests": [{...}, ...]}`` answers
+  ``{"results": [...], "errors": {...}}``, one entry per request in the
+  same order plus the number of failures of each error kind.
+- ``GET /operations`` lists the registered operations, ``GET /health``
+  answers ``{"status": "ok"}``.
+- ``GET /metrics`` returns the per-operation metrics snapshot of
+  ``metrics.py`` (``{"enabled": false, ...}`` unless the server runs
+  with ``--metrics``).
+
+Operands may be JSON numbers, which are used as given, or strings, which
+are parsed like command-line operands (``"inf"``, ``"1/3"`` with the
+fraction backend). Results that JSON cannot represent exactly (NaN, inf,
+Decimal, Fraction) are returned as strings. A failed calculation answers
+``{"error": kind, "message": ...}`` using the error kinds of the streaming
+batch mode; a single request then gets status 422, a batch reports the
+error in place of that result.
+
+Connections are HTTP/1.1 keep-alive by default and requests may be
+pipelined; responses are sent in request order. Calculations on huge
+integers, exact powers with a large exponent (``power(3, 1e7)`` with the
+fraction backend), Decimal calculations with a high precision and large
+batches run in a process pool, so one expensive request never stalls the
+event loop for the others. Precisions above ``MAX_PRECISION`` are
+rejected. A response that cannot be serialised is answered with a JSON
+error (status 500) instead of a dropped connection.
+"""
+import asyncio
+import json
+import math
+import sys
+from concurrent.futures import Executor, ProcessPoolExecutor
+from fractions import Fraction
+from typing import Dict, List, Optional, Tuple
+
+from .backends import get_backend
+from .cli import INTEGER_OPERATIONS, parse_integer, parse_number
+from .registry import get_operation, operation_names
+from .result import CODE_FORMAT, CODE_OPERATION, Result, error_counts
+from .streaming import json_value
+
+ERROR_REQUEST = "request"  # malformed HTTP body or JSON request
+
+DEFAULT_HOST = "127.0.0.1"
+MAX_HEADER_BYTES = 16 * 1024
+MAX_BODY_BYTES = 1024 * 1024
+KEEPALIVE_TIMEOUT = 60.0  # seconds an idle connection is kept open
+
+# Integer work above this many result bits runs in the process pool
+HEAVY_BITS = 1 << 16
+# Decimal work above this precision runs in the process pool; a Decimal
+# power takes about a second at 3000 digits and grows quickly beyond
+HEAVY_PRECISION = 500
+# Requests asking for a higher precision are rejected
+MAX_PRECISION = 10_000
+# Batches with more requests than this run in the process pool
+INLINE_BATCH_LIMIT = 256
+
+_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    408: "Request Timeout",
+    411: "Length Required",
+    413: "Payload Too Large",
+    422: "Unprocessable Entity",
+    431: "Request Header Fields Too Large",
+    500: "Internal Server Error",
+    501: "Not Implemented",
+}
+
+Response = Tuple[int, Dict[str, object]]
+
+
+class RequestError(ValueError):
+    """A request that cannot be evaluated (bad JSON, missing fields)."""
+
+
+def _convert_operand(value: object, backend, integer: bool = False) -> object:
+    """Convert one JSON operand for the selected backend; ``integer`` keeps integer text exact."""
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        raise ValueError(f"Invalid number format: {json.dumps(value)}")
+    if integer and isinstance(value, str):
+        return parse_integer(value, parse_number if backend is None else backend.parse)
+    if backend is not None:
+        return backend.convert(value)
+    return parse_number(value) if isinstance(value, str) else value
+
+
+def evaluate(operation: str, operands: List[object], backend: Optional[str] = None,
+             precision: Optional[int] = None) -> Result:
+    """
+    Evaluate one calculation request without raising.
+
+    Module-level so process-pool workers can run it.
+
+    Args:
+        operation: Operation name
+        operands: JSON operands (numbers or numeric strings)
+        backend: Backend name, float if omitted
+        precision: Significant digits for the decimal backend
+
+    Returns:
+        The result or the error code and message
+    """
+    entry = get_operation(operation)
+    if entry is None:
+        return Result(None, CODE_OPERATION, f"Unknown operation '{operation}'")
+    if len(operands) != entry.arity:
+        return Result(None, CODE_FORMAT, f"Expected {entry.arity} operands for {operation}, got {len(operands)}")
+    try:
+        if backend is None and precision is None:
+            selected = None
+            function = entry.function
+        else:
+            selected = get_backend(backend, precision)
+            function = selected.operation(operation)
+            if function is None:
+                return Result(None, CODE_OPERATION, f"Invalid operation for the {selected.name} backend: {operation}")
+        integer = operation in INTEGER_OPERATIONS
+        return Result(function(*[_convert_operand(value, selected, integer) for value in operands]))
+    except Exception as e:
+        return Result.failure(e)
+
+
+def evaluate_many(requests: List[Tuple]) -> List[Result]:
+    """Evaluate ``(operation, operands, backend, precision)`` tuples in order."""
+    return [evaluate(*request) for request in requests]
+
+
+def to_json(result: Result) -> Dict[str, object]:
+    """Return ``{"result": value}`` or ``{"error": kind, "message": text}``."""
+    if result.ok:
+        return {"result": json_value(result.value)}
+    return {"error": result.kind, "message": result.message}
+
+
+def calculate(operation: str, operands: List[object], backend: Optional[str] = None,
+              precision: Optional[int] = None) -> Dict[str, object]:
+    """
+    Evaluate one calculation request into its JSON response payload.
+
+    See ``evaluate`` for the arguments.
+    """
+    return to_json(evaluate(operation, operands, backend, precision))
+
+
+def parse_request(item: object) -> Tuple[str, List[object], Optional[str], Optional[int]]:
+    """
+    Validate one JSON calculation request.
+
+    Args:
+        item: Decoded JSON object with 'operation', 'operands' and
+            optionally 'backend' and 'precision'
+
+    Returns:
+        Tuple of (operation, operands, backend, precision)
+
+    Raises:
+        RequestError: If a field is missing or has the wrong type, or the
+            precision is above MAX_PRECISION
+    """
+    if not isinstance(item, dict):
+        raise RequestError("A request must be a JSON object")
+    operation = item.get("operation")
+    operands = item.get("operands")
+    backend = item.get("backend")
+    precision = item.get("precision")
+    if not isinstance(operation, str):
+        raise RequestError("'operation' must be a string")
+    if not isinstance(operands, list):
+        raise RequestError("'operands' must be a list")
+    if backend is not None and not isinstance(backend, str):
+        raise RequestError("'backend' must be a string")
+    if precision is not None and (isinstance(precision, bool) or not isinstance(precision, int)):
+        raise RequestError("'precision' must be an integer")
+    if precision is not None and precision > MAX_PRECISION:
+        raise RequestError(f"'precision' must be at most {MAX_PRECISION}")
+    return operation, operands, backend, precision
+
+
+def _exact_bits(value: object) -> int:
+    """Bits of the exact form of a JSON operand: its int, or its numerator or denominator."""
+    if isinstance(value, int):
+        return value.bit_length()
+    if isinstance(value, float):
+        if not math.isfinite(value):
+            return 0
+        numerator, denominator = value.as_integer_ratio()
+        return max(abs(numerator).bit_length(), denominator.bit_length())
+    if isinstance(value, str):
+        return len(value) * 4  # ~3.3 bits per decimal digit, rounded up
+    return 0
+
+
+def _magnitude(value: object) -> float:
+    """The absolute value of a JSON operand as a float, inf if too large, 0.0 if not a number."""
+    try:
+        if isinstance(value, str):
+            text = value.strip()
+            value = Fraction(text) if '/' in text else float(text)
+        if isinstance(value, bool) or not isinstance(value, (int, float, Fraction)):
+            return 0.0
+        return abs(float(value))
+    except OverflowError:
+        return math.inf
+    except (ValueError, ZeroDivisionError):
+        return 0.0
+
+
+def is_heavy(operation: str, operands: List[object], precision: Optional[int] = None) -> bool:
+    """
+    Return True if a request may take long enough to stall the event loop.
+
+    Float arithmetic is bounded; exact integer and rational arithmetic is
+    not, and Decimal arithmetic grows with the precision, so requests with
+    huge integer operands, powers whose exact result would be huge or a
+    precision above HEAVY_PRECISION are considered heavy. The exponent
+    counts by its numeric value whether it is sent as an int, a float
+    (``1e7``) or a string (``"1e7"``).
+    """
+    if precision is not None and precision > HEAVY_PRECISION:
+        return True
+    bits = 0
+    for value in operands:
+        if isinstance(value, (int, str)) and not isinstance(value, bool):
+            bits = max(bits, _exact_bits(value))
+    if bits > HEAVY_BITS:
+        return True
+    if operation == 'power' and len(operands) == 2:
+        base, exponent = operands
+        # the exact result has about |exponent| * bits(base) bits
+        return _magnitude(exponent) * max(_exact_bits(base), 1) > HEAVY_BITS
+    return False
+
+
+class CalculatorService:
+    """
+    Request handling for the HTTP server, independent of the transport.
+
+    Attributes:
+        executor: Pool that runs heavy requests, created on first use if
+            not given
+        workers: Worker processes for the default pool
+    """
+
+    def __init__(self, executor: Optional[Executor] = None, workers: Optional[int] = None) -> None:
+        self.executor = executor
+        self.workers = workers
+        self._owns_executor = executor is None
+
+    def _get_executor(self) -> Executor:
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self.executor
+
+    async def _offload(self, function, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), function, *args)
+
+    async def handle(self, method: str, path: str, body: bytes) -> Response:
+        """
+        Answer one HTTP request.
+
+        Args:
+            method: HTTP method
+            path: Request path, the query string is ignored
+            body: Request body
+
+        Returns:
+            Tuple of (HTTP status, JSON payload)
+        """
+        path = path.split('?', 1)[0]
+        routes = {
+            '/calculate': ('POST', self._calculate),
+            '/batch': ('POST', self._batch),
+            '/operations': ('GET', self._operations),
+            '/health': ('GET', self._health),
+            '/metrics': ('GET', self._metrics),
+        }
+        if path not in routes:
+            return 404, {"error": ERROR_REQUEST, "message": f"Unknown path '{path}'"}
+        allowed, handler = routes[path]
+        if method != allowed:
+            return 405, {"error": ERROR_REQUEST, "message": f"{path} only supports {allowed}"}
+        try:
+            return await handler(body)
+        except RequestError as e:
+            return 400, {"error": ERROR_REQUEST, "message": str(e)}
+
+    @staticmethod
+    def _decode(body: bytes) -> object:
+        try:
+            return json.loads(body)
+        except (UnicodeDecodeError, ValueError) as e:
+            raise RequestError(f"Invalid JSON body: {e}")
+
+    async def _calculate(self, body: bytes) -> Response:
+        request = parse_request(self._decode(body))
+        if is_heavy(request[0], request[1], request[3]):
+            result = await self._offload(evaluate, *request)
+        else:
+            result = evaluate(*request)
+        return (200 if result.ok else 422), to_json(result)
+
+    async def _batch(self, body: bytes) -> Response:
+        data = self._decode(body)
+        if not isinstance(data, dict) or not isinstance(data.get("requests"), list):
+            raise RequestError("A batch must be a JSON object with a 'requests' list")
+        requests = [parse_request(item) for item in data["requests"]]
+        if len(requests) > INLINE_BATCH_LIMIT or any(is_heavy(r[0], r[1], r[3]) for r in requests):
+            results = await self._offload(evaluate_many, requests)
+        else:
+            results = evaluate_many(requests)
+        return 200, {"results": [to_json(result) for result in results], "errors": error_counts(results)}
+
+    async def _operations(self, body: bytes) -> Response:
+        operations = []
+        for name in operation_names():
+            entry = get_operation(name)
+            operations.append({"name": name, "arity": entry.arity, "description": entry.description})
+        return 200, {"operations": operations}
+
+    async def _health(self, body: bytes) -> Response:
+        return 200, {"status": "ok"}
+
+    async def _metrics(self, body: bytes) -> Response:
+        from .metrics import snapshot
+        return 200, snapshot()
+
+    def close(self) -> None:
+        """Shut down the process pool if this service created it."""
+        if self._owns_executor and self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+
+def format_response(status: int, payload: Dict[str, object], keep_alive: bool) -> bytes:
+    """Serialize a JSON response with status line and headers."""
+    body = json.dumps(payload).encode('utf-8')
+    head = (
+        f"HTTP/1.1 {status} {_REASONS.get(status, 'Unknown')}\r\n"
+        f"Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+        f"\r\n"
+    )
+    return head.encode('ascii') + body
+
+
+class _ProtocolError(Exception):
+    """An HTTP-level error after which the connection is closed."""
+
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+async def _read_request(reader: asyncio.StreamReader):
+    """
+    Read one request from a connection.
+
+    Returns:
+        ``(method, path, version, headers, body)``, or None at the end of
+        the stream or when an idle keep-alive connection times out
+
+    Raises:
+        _ProtocolError: If the request cannot be read
+    """
+    try:
+        head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), KEEPALIVE_TIMEOUT)
+    except asyncio.IncompleteReadError as e:
+        if not e.partial.strip():
+            return None
+        raise _ProtocolError(400, "Incomplete request")
+    except asyncio.LimitOverrunError:
+        raise _ProtocolError(431, "Request headers are too large")
+    except asyncio.TimeoutError:
+        return None
+
+    lines = head.decode('latin-1').split("\r\n")
+    parts = lines[0].split()
+    if len(parts) != 3 or not parts[2].startswith("HTTP/"):
+        raise _ProtocolError(400, f"Malformed request line: {lines[0]!r}")
+    method, path, version = parts
+    headers = {}
+    for line in lines[1:]:
+        if not line:
+            continue
+        name, separator, value = line.partition(":")
+        if not separator:
+            raise _ProtocolError(400, f"Malformed header: {line!r}")
+        headers[name.strip().lower()] = value.strip()
+
+    if 'transfer-encoding' in headers:
+        raise _ProtocolError(501, "Transfer-Encoding is not supported, send Content-Length")
+    length = headers.get('content-length', '0' if method in ('GET', 'HEAD') else None)
+    if length is None:
+        raise _ProtocolError(411, "Content-Length is required")
+    if not length.isdigit():
+        raise _ProtocolError(400, f"Invalid Content-Length: {length!r}")
+    if int(length) > MAX_BODY_BYTES:
+        raise _ProtocolError(413, f"Request body exceeds {MAX_BODY_BYTES} bytes")
+    try:
+        body = await reader.readexactly(int(length))
+    except asyncio.IncompleteReadError:
+        raise _ProtocolError(400, "Incomplete request body")
+    return method, path, version, headers, body
+
+
+def _keep_alive(version: str, headers: Dict[str, str]) -> bool:
+    connection = headers.get('connection', '').lower()
+    if version == "HTTP/1.0":
+        return connection == 'keep-alive'
+    return connection != 'close'
+
+
+async def handle_connection(service: CalculatorService, reader: asyncio.StreamReader,
+                            writer: asyncio.StreamWriter) -> None:
+    """Serve requests on one connection until it closes or asks to close."""
+    try:
+        while True:
+            try:
+                request = await _read_request(reader)
+            except _ProtocolError as e:
+                writer.write(format_response(e.status, {"error": ERROR_REQUEST, "message": str(e)}, False))
+                await writer.drain()
+                break
+            if request is None:
+                break
+            method, path, version, headers, body = request
+            keep_alive = _keep_alive(version, headers)
+            try:
+                status, payload = await service.handle(method, path, body)
+                response = format_response(status, payload, keep_alive)
+            except Exception as e:  # keep serving other connections, even if the payload cannot be serialised
+                response = format_response(500, {"error": "unexpected", "message": str(e)}, keep_alive)
+            writer.write(response)
+            await writer.drain()
+            if not keep_alive:
+                break
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+async def create_http_server(host: str = DEFAULT_HOST, port: int = 0,
+                             service: Optional[CalculatorService] = None) -> asyncio.AbstractServer:
+    """
+    Create and start listening (but do not block serving).
+
+    Args:
+        host: Interface to bind
+        port: TCP port, 0 picks a free one
+        service: Request handler, a new ``CalculatorService`` if omitted
+
+    Returns:
+        The listening server; its sockets give the bound port
+    """
+    if service is None:
+        service = CalculatorService()
+    return await asyncio.start_server(
+        lambda reader, writer: handle_connection(service, reader, writer),
+        host, port, limit=MAX_HEADER_BYTES,
+    )
+
+
+async def _serve(host: str, port: int, service: CalculatorService) -> None:
+    server = await create_http_server(host, port, service)
+    bound_host, bound_port = server.sockets[0].getsockname()[:2]
+    print(f"Calculator HTTP server listening on http://{bound_host}:{bound_port}")
+    sys.stdout.flush()
+    async with server:
+        await server.serve_forever()
+
+
+def serve_http(host: str = DEFAULT_HOST, port: int = 0, workers: Optional[int] = None) -> int:
+    """Serve HTTP requests until interrupted."""
+    service = CalculatorService(workers=workers)
+    try:
+        asyncio.run(_serve(host, port, service))
+    except KeyboardInterrupt:
+        pass
+    except OSError as e:
+        print(f"Error: Cannot listen on {host}:{port}: {e}")
+        return 1
+    finally:
+        service.close()
+    return 0
+
+
+__all__ = [
+    'CalculatorService', 'RequestError', 'evaluate', 'evaluate_many', 'calculate', 'to_json',
+    'parse_request', 'is_heavy',
+    'format_response', 'handle_connection', 'create_http_server', 'serve_http',
+    'ERROR_REQUEST',
+]
@@ -0,0 +1,544 @@
+"""
+The arithmetic kernel: every implementation of the seven operations.
+
+The operations come in three semantics profiles, each a table mapping
+operation names to functions:
+
+- ``ieee`` (the default): IEEE 754 special values. NaN propagates,
+  inf - inf and inf * 0 are NaN, overflow gives +-inf, and ints stay ints
+  where Python keeps them. These are the functions the package exports and
+  the registry uses.
+- ``strict``: operands must be ints or floats (not bools), results are
+  floats (ints for ``integer_divide``), and overflow, complex results and
+  0 ** -n raise instead of returning a special value.
+- ``raw``: Python's operators with no checks beyond a divide-by-zero
+  message; the fastest profile, for callers that know their operands.
+
+Select a profile per call with ``calculate(operation, x, y, profile)``,
+per batch with ``apply_many(..., profile=...)`` or on the command line
+with ``--profile``. The modules that used to carry their own copies
+(``core``, ``math_operations`` and ``__main__``) now re-export the
+functions of their profile, so calling them costs nothing extra;
+``conformance`` checks every profile against what those modules did.
+"""
+import math
+import operator
+
+# A plain union instead of typing.Union keeps typing out of the import path
+Number = int | float
+
+# Special-value classes of an operand
+_FINITE = 0
+_NAN = 1
+_POS_INF = 2
+_NEG_INF = 3
+
+
+def _classify(x: Number) -> int:
+    """Classify a number as finite, NaN, +inf or -inf."""
+    # x - x is 0 for every finite number and NaN for NaN and infinities
+    if x - x == 0:
+        return _FINITE
+    if x != x:
+        return _NAN
+    return _POS_INF if x > 0 else _NEG_INF
+
+
+def add(a: Number, b: Number) -> Number:
+    """
+    Add two numbers together.
+
+    Args:
+        a: First number (int or float)
+        b: Second number (int or float)
+
+    Returns:
+        The sum of a and b
+    """
+    # Handle special float cases (infinity and NaN)
+    if isinstance(a, float) and isinstance(b, float):
+        # Fast path: both operands are finite
+        if (a - a) + (b - b) == 0:
+            return a + b
+        kind_a = _classify(a)
+        kind_b = _classify(b)
+        # If either value is NaN, result should be NaN
+        if kind_a == _NAN or kind_b == _NAN:
+            return float('nan')
+        # If one is infinity and the other is negative infinity, result is NaN
+        if kind_a != _FINITE and kind_b != _FINITE and kind_a != kind_b:
+            return float('nan')
+        # If either value is infinity, return infinity
+        if kind_a != _FINITE:
+            return a
+        return b
+
+    # Perform the addition
+    return a + b
+
+def subtract(a: Number, b: Number) -> Number:
+    """
+    Subtract two numbers.
+
+    Args:
+        a: First number (minuend)
+        b: Second number (subtrahend)
+
+    Returns:
+        The difference of a and b (a - b)
+    """
+    # Handle special float cases (infinity and NaN)
+    if isinstance(a, float) and isinstance(b, float):
+        # Fast path: both operands are finite
+        if (a - a) + (b - b) == 0:
+            return a - b
+        kind_a = _classify(a)
+        kind_b = _classify(b)
+        # If either value is NaN, result should be NaN
+        if kind_a == _NAN or kind_b == _NAN:
+            return float('nan')
+        # If we have inf - inf or -inf - (-inf), it's indeterminate (NaN)
+        if kind_a == kind_b:
+            return float('nan')
+        # If a is infinity, return a
+        if kind_a != _FINITE:
+            return a
+        # If b is infinity, return -a if a is also infinite with same sign,
+        # otherwise return the infinity with the appropriate sign
+        return -b if a == 0 else (float('inf') if (a > 0) != (b > 0) else float('-inf'))
+
+    # Perform the subtraction
+    return a - b
+
+def multiply(a: Number, b: Number) -> Number:
+    """
+    Multiply two numbers.
+
+    Args:
+        a: First number (multiplicand)
+        b: Second number (multiplier)
+
+    Returns:
+        The product of a and b (a * b)
+    """
+    # Handle special float cases (infinity and NaN)
+    if (isinstance(a, float) or isinstance(b, float)) and (a - a) + (b - b) != 0:
+        kind_a = _classify(a)
+        kind_b = _classify(b)
+        # If either value is NaN, result should be NaN
+        if kind_a == _NAN or kind_b == _NAN:
+            return float('nan')
+        # Handle infinity cases
+        if kind_a != _FINITE and b == 0:
+            return float('nan')
+        elif kind_b != _FINITE and a == 0:
+            return float('nan')
+        elif kind_a != _FINITE:
+            # inf * non-zero = (+/-) inf
+            return a if b > 0 else -a
+        else:
+            # non-zero * inf = (+/-) inf
+            return b if a > 0 else -b
+
+    # Perform the multiplication
+    return a * b
+
+def divide(a: Number, b: Number) -> float:
+    """
+    Divide two numbers.
+
+    Args:
+        a: Dividend
+        b: Divisor
+
+    Returns:
+        The quotient of a and b (a / b)
+
+    Raises:
+        ZeroDivisionError: If b is zero
+    """
+    if b == 0:
+        raise ZeroDivisionError("Cannot divide by zero")
+
+    # Handle special float cases (infinity and NaN)
+    if (isinstance(a, float) or isinstance(b, float)) and (a - a) + (b - b) != 0:
+        kind_a = _classify(a)
+        kind_b = _classify(b)
+        # If either value is NaN, result should be NaN
+        if kind_a == _NAN or kind_b == _NAN:
+            return float('nan')
+        # Handle infinity cases
+        if kind_b == _FINITE:
+            # inf / finite = (+/-) inf
+            return a if (b > 0) == (a > 0) else -a
+        elif kind_a == _FINITE:
+            # finite / inf = 0 (with proper sign)
+            return 0.0 if (a > 0) == (b > 0) else -0.0
+        else:
+            # inf / inf = indeterminate (NaN)
+            return float('nan')
+
+    # Perform the division
+    return float(a / b)
+
+def _power_by_magnitude(a: Number, b: Number) -> float:
+    """
+    Work out a ** b for finite operands from the magnitude of the result.
+
+    Used when an int operand is too large to convert to float, as in
+    (10 ** 400) ** 0.0, and when computing a ** b raises OverflowError.
+    The result is only +-inf (or +-0.0) when log2|a ** b| = b * log2|a| is
+    out of float range.
+    """
+    if b == 0:
+        return 1.0
+    if a < 0 and b % 1 != 0:
+        return float('nan')  # a negative base to a non-integral power
+    if a == 0:
+        if b < 0:
+            raise ZeroDivisionError("0.0 cannot be raised to a negative power")
+        return math.copysign(0.0, a) if b % 2 == 1 else 0.0
+    sign = -1.0 if a < 0 and b % 2 == 1 else 1.0
+    if abs(a) == 1:
+        return sign
+    # log2|a| is not 0 here, so an exponent beyond float range can be
+    # taken as infinite
+    exponent = b if abs(b) < 2 ** 1023 else (math.inf if b > 0 else -math.inf)
+    magnitude = exponent * math.log2(abs(a))
+    if magnitude >= 1024:
+        return sign * math.inf
+    if magnitude < -1075:
+        return sign * 0.0  # below half the smallest subnormal
+    # The result fits a float although an operand does not, such as
+    # (10 ** 400) ** 0.5; Decimal computes it without converting to float
+    from decimal import Decimal, localcontext
+    with localcontext() as context:
+        context.prec = 30
+        return sign * float(Decimal(abs(a)) ** Decimal(b))
+
+
+def power(a: Number, b: Number) -> float:
+    """
+    Raise a number to the power of another number.
+
+    Args:
+        a: Base number
+        b: Exponent
+
+    Returns:
+        The result of a raised to the power of b (a ** b)
+    """
+    # Handle special float cases (infinity and NaN)
+    if (isinstance(a, float) or isinstance(b, float)) and (a - a) + (b - b) != 0:
+        kind_a = _classify(a)
+        kind_b = _classify(b)
+        # If either value is NaN, result should be NaN
+        if kind_a == _NAN or kind_b == _NAN:
+            return float('nan')
+        # Handle infinity cases
+        if kind_b != _FINITE and a == 1:
+            return 1.0  # 1^inf = 1
+        if kind_b != _FINITE and abs(a) > 1:
+            return float('inf') if b > 0 else 0.0
+        if kind_b != _FINITE and abs(a) < 1:
+            return 0.0 if b > 0 else float('inf')
+        if kind_a != _FINITE and b > 0:
+            return a if (b > 0) else 0.0
+        if kind_a != _FINITE and b < 0:
+            return 0.0
+
+    # Int results of 2 ** 1024 or more overflow float. |a| ** b is at least
+    # 2 ** ((bit_length(|a|) - 1) * b), so such overflows are detected from
+    # the magnitude instead of computing a huge a ** b first. Otherwise (an
+    # int with a float, or a negative int exponent) a ** b converts the
+    # ints to float, so an int beyond float range is worked out from the
+    # magnitude b * log2|a| up front
+    if isinstance(a, int):
+        if isinstance(b, int) and b >= 0:
+            if b > 1 and (abs(a).bit_length() - 1) * b >= 1024:
+                return float('inf') if (a > 0 or b % 2 == 0) else float('-inf')
+        elif a.bit_length() > 1023 or (isinstance(b, int) and b.bit_length() > 1023):
+            return _power_by_magnitude(a, b)
+    elif isinstance(b, int) and b.bit_length() > 1023:
+        return _power_by_magnitude(a, b)
+
+    # Perform the exponentiation
+    try:
+        return float(a ** b)
+    except OverflowError:
+        return _power_by_magnitude(a, b)
+
+
+def _integral(x: Number, role: str) -> int:
+    """Return x as an int, accepting integral floats such as 5.0."""
+    if isinstance(x, int):
+        return x
+    if isinstance(x, (str, bytes)):
+        raise TypeError(f"The {role} must be a number, got {type(x).__name__}")
+    try:
+        value = int(x)
+    except (ValueError, OverflowError):
+        raise ValueError(f"The {role} must be an integer, got {x}")
+    if value != x:
+        raise ValueError(f"The {role} must be an integer, got {x}")
+    return value
+
+
+def power_mod(a: Number, b: Number, m: Number) -> int:
+    """
+    Raise a number to the power of another, modulo a third.
+
+    Uses three-argument ``pow``, so intermediate results stay below m
+    instead of materializing a ** b.
+
+    Args:
+        a: Base (an integer; integral floats are accepted)
+        b: Exponent; a negative exponent uses the inverse of a modulo m
+        m: Modulus
+
+    Returns:
+        (a ** b) % m, an int with the sign of m
+
+    Raises:
+        ZeroDivisionError: If m is zero
+        ValueError: If an operand is not an integer, or b is negative and
+            a has no inverse modulo m
+    """
+    a = _integral(a, "base")
+    b = _integral(b, "exponent")
+    m = _integral(m, "modulus")
+    if m == 0:
+        raise ZeroDivisionError("Cannot reduce modulo zero")
+    return pow(a, b, m)
+
+def integer_divide(a: Number, b: Number) -> int:
+    """
+    Perform integer division of two numbers.
+
+    Args:
+        a: Dividend
+        b: Divisor
+
+    Returns:
+        The integer result of a divided by b (a // b)
+
+    Raises:
+        ZeroDivisionError: If b is zero
+    """
+    if b == 0:
+        raise ZeroDivisionError("Cannot divide by zero")
+
+    # Handle special cases
+    if (isinstance(a, float) or isinstance(b, float)) and (a - a) + (b - b) != 0:
+        kind_a = _classify(a)
+        kind_b = _classify(b)
+        if kind_a == _NAN or kind_b == _NAN:
+            return float('nan')
+        if kind_b == _FINITE:
+            # inf // finite number
+            return int(a)
+        elif kind_a == _FINITE:
+            # finite // inf = 0
+            return 0
+        else:
+            # inf // inf is indeterminate
+            return float('nan')
+
+    # Perform integer division
+    return int(a // b)
+
+def modulo(a: Number, b: Number) -> Number:
+    """
+    Calculate the remainder of division of two numbers.
+
+    Args:
+        a: Dividend
+        b: Divisor
+
+    Returns:
+        The remainder of a divided by b (a % b)
+
+    Raises:
+        ZeroDivisionError: If b is zero
+    """
+    if b == 0:
+        raise ZeroDivisionError("Cannot divide by zero")
+
+    # Handle special cases
+    if (isinstance(a, float) or isinstance(b, float)) and (a - a) + (b - b) != 0:
+        kind_a = _classify(a)
+        kind_b = _classify(b)
+        if kind_a == _NAN or kind_b == _NAN:
+            return float('nan')
+        if kind_b == _FINITE:
+            # inf % finite number is undefined but we return nan
+            return float('nan')
+        elif kind_a == _FINITE:
+            # finite % inf is the finite number
+            return a
+
+    # Perform modulo operation
+    return a % b
+
+
+
+def _validate_inputs(*args) -> None:
+    """Validate that all inputs are numeric and not complex or boolean."""
+    for arg in args:
+        # Explicitly check for booleans first since they are a subclass of int
+        if isinstance(arg, bool):
+            raise TypeError(f"Boolean values are not allowed. Got {type(arg).__name__}: {arg}")
+        if not isinstance(arg, (int, float)):
+            # Raise error for complex numbers, strings, lists, etc.
+            raise TypeError(f"Only int and float values allowed. Got {type(arg).__name__}: {arg}")
+
+
+# Operand types the strict profile accepts without calling _validate_inputs
+_PLAIN = frozenset({int, float})
+
+
+def strict_add(x: Number, y: Number) -> float:
+    """Add two numbers."""
+    if type(x) not in _PLAIN or type(y) not in _PLAIN:
+        _validate_inputs(x, y)
+    return float(x + y)
+
+def strict_subtract(x: Number, y: Number) -> float:
+    """Subtract y from x."""
+    if type(x) not in _PLAIN or type(y) not in _PLAIN:
+        _validate_inputs(x, y)
+    return float(x - y)
+
+def strict_multiply(x: Number, y: Number) -> float:
+    """Multiply two numbers."""
+    if type(x) not in _PLAIN or type(y) not in _PLAIN:
+        _validate_inputs(x, y)
+    return float(x * y)
+
+def strict_divide(x: Number, y: Number) -> float:
+    """Divide x by y."""
+    if type(x) not in _PLAIN or type(y) not in _PLAIN:
+        _validate_inputs(x, y)
+    if y == 0:
+        raise ZeroDivisionError("Cannot divide by zero")
+    return float(x / y)
+
+def strict_power(x: Number, y: Number) -> float:
+    """Raise x to the power of y."""
+    if type(x) not in _PLAIN or type(y) not in _PLAIN:
+        _validate_inputs(x, y)
+    if x == 0 and y < 0:
+        raise ZeroDivisionError("Raising zero to a negative power is undefined")
+    try:
+        result = x ** y
+        if isinstance(result, complex):
+            raise TypeError("Result is complex, which is not supported")
+        return float(result)
+    except OverflowError:
+        raise OverflowError(f"Result of {x} ** {y} is too large to represent")
+    except (ValueError, TypeError) as e:
+        raise TypeError(f"Invalid operation: {x} ** {y}") from e
+
+def strict_integer_divide(x: Number, y: Number) -> int:
+    """Perform integer division of x by y."""
+    if type(x) not in _PLAIN or type(y) not in _PLAIN:
+        _validate_inputs(x, y)
+    if y == 0:
+        raise ZeroDivisionError("Cannot divide by zero")
+    return int(x // y)
+
+def strict_modulo(x: Number, y: Number) -> float:
+    """Calculate x modulo y."""
+    if type(x) not in _PLAIN or type(y) not in _PLAIN:
+        _validate_inputs(x, y)
+    if y == 0:
+        raise ZeroDivisionError("Cannot perform modulo with zero")
+    return float(x % y)
+
+
+def raw_divide(x: Number, y: Number) -> float:
+    """Divide two numbers."""
+    if y == 0:
+        raise ZeroDivisionError("Cannot divide by zero")
+    return x / y
+
+
+# Python's operators are the raw profile, except for the division message
+raw_add = operator.add
+raw_subtract = operator.sub
+raw_multiply = operator.mul
+raw_power = operator.pow
+raw_integer_divide = operator.floordiv
+raw_modulo = operator.mod
+
+# Operation name -> function, per profile
+PROFILES = {
+    'ieee': {
+        'add': add,
+        'subtract': subtract,
+        'multiply': multiply,
+        'divide': divide,
+        'power': power,
+        'integer_divide': integer_divide,
+        'modulo': modulo,
+    },
+    'strict': {
+        'add': strict_add,
+        'subtract': strict_subtract,
+        'multiply': strict_multiply,
+        'divide': strict_divide,
+        'power': strict_power,
+        'integer_divide': strict_integer_divide,
+        'modulo': strict_modulo,
+    },
+    'raw': {
+        'add': raw_add,
+        'subtract': raw_subtract,
+        'multiply': raw_multiply,
+        'divide': raw_divide,
+        'power': raw_power,
+        'integer_divide': raw_integer_divide,
+        'modulo': raw_modulo,
+    },
+}
+
+DEFAULT_PROFILE = 'ieee'
+
+
+def get_profile(name: str = DEFAULT_PROFILE) -> dict:
+    """
+    Return the operation table of a semantics profile.
+
+    Raises:
+        ValueError: If the profile is unknown
+    """
+    try:
+        return PROFILES[name]
+    except KeyError:
+        raise ValueError(f"Invalid profile: {name}. Valid profiles are: {', '.join(PROFILES)}") from None
+
+
+def calculate(operation: str, x: Number, y: Number, profile: str = DEFAULT_PROFILE) -> Number:
+    """
+    Apply a built-in operation with the semantics of a profile.
+
+    Args:
+        operation: 'add', 'subtract', 'multiply', 'divide', 'power',
+            'integer_divide' or 'modulo'
+        x: First operand
+        y: Second operand
+        profile: 'ieee', 'strict' or 'raw'
+
+    Raises:
+        ValueError: If the operation or profile is unknown
+    """
+    function = get_profile(profile).get(operation)
+    if function is None:
+        raise ValueError(f"Invalid operation: {operation}")
+    return function(x, y)
+
+
+__all__ = [
+    'add', 'subtract', 'multiply', 'divide', 'power', 'power_mod', 'integer_divide', 'modulo',
+    'PROFILES', 'DEFAULT_PROFILE', 'get_profile', 'calculate',
+]
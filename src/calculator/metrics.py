@@ -0,0 +1,391 @@
+"""
+Opt-in per-operation metrics.
+
+``enable_metrics`` wraps registered operations, like ``enable_cache``
+does. Every caller that goes through the registry in this process (CLI,
+streaming and columnar batches, the daemons) then records, per operation:
+- calls;
+- errors, by exception type;
+- calls that took a NaN/inf special-value branch (a non-finite float
+  operand), and calls that returned NaN or inf;
+- a latency histogram with power-of-two buckets from 64 ns to about 1 s.
+
+While metrics are disabled the registry holds the plain functions, so
+there is no cost at all::
+
+    from src.calculator.metrics import enable_metrics, format_prometheus, snapshot
+    enable_metrics()
+    ...
+    snapshot()                     # JSON-ready dict
+    format_prometheus(snapshot())  # Prometheus text exposition format
+
+Calls that bypass the registry, such as the operators of compiled
+expressions, are not counted. Heavy HTTP requests run in worker processes
+and are not counted either.
+
+``calculator stats`` prints the metrics of the running daemon (started
+with ``calculator serve --metrics``) or of a batch run::
+
+    calculator stats --format prometheus
+    calculator stats --batch jobs.csv --output metrics.json
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+from . import registry
+
+FORMAT_JSON = "json"
+FORMAT_PROMETHEUS = "prometheus"
+FORMATS = (FORMAT_JSON, FORMAT_PROMETHEUS)
+
+# Latency buckets are powers of two nanoseconds, so a call's bucket is the
+# bit length of its duration: 64 ns (2**6) up to about 1.07 s (2**30)
+_MIN_BITS = 6
+_MAX_BITS = 30
+LATENCY_BUCKETS = tuple((1 << bits) / 1e9 for bits in range(_MIN_BITS, _MAX_BITS + 1))
+
+_PROMETHEUS_PREFIX = "calculator_operation"
+
+
+class OperationStats:
+    """
+    Counters of one operation.
+
+    Attributes:
+        calls: Calls, including failed ones
+        errors: Failed calls by exception type name
+        special_operands: Calls with a NaN or infinite float operand
+        special_results: Calls that returned NaN or an infinite float
+        buckets: Calls by the bit length of their duration in nanoseconds
+            (not cumulative); the last entry counts calls slower than the
+            largest bucket
+        total_ns: Total time spent in the operation, in nanoseconds
+    """
+
+    __slots__ = ('calls', 'errors', 'special_operands', 'special_results', 'buckets', 'total_ns')
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.errors: Dict[str, int] = {}
+        self.special_operands = 0
+        self.special_results = 0
+        self.buckets = [0] * (_MAX_BITS + 2)
+        self.total_ns = 0
+
+    def snapshot(self) -> Dict[str, object]:
+        """Return the counters as a JSON-ready dict with cumulative buckets."""
+        cumulative = []
+        count = sum(self.buckets[:_MIN_BITS])  # faster than the first bucket
+        for bound, calls in zip(LATENCY_BUCKETS + ("+Inf",), self.buckets[_MIN_BITS:]):
+            count += calls
+            cumulative.append([bound, count])
+        return {
+            'calls': self.calls,
+            'errors': dict(self.errors),
+            'special_operands': self.special_operands,
+            'special_results': self.special_results,
+            'latency': {'buckets': cumulative, 'sum_seconds': self.total_ns / 1e9, 'count': count},
+        }
+
+
+class OperationMetrics:
+    """Per-operation counters for every instrumented operation."""
+
+    def __init__(self) -> None:
+        self.operations: Dict[str, OperationStats] = {}
+        self.started = time.time()
+
+    def stats(self, name: str) -> OperationStats:
+        """Return the counters of an operation, creating them on first use."""
+        stats = self.operations.get(name)
+        if stats is None:
+            stats = self.operations[name] = OperationStats()
+        return stats
+
+    def reset(self) -> None:
+        """Zero every counter."""
+        for name in self.operations:
+            self.operations[name] = OperationStats()
+        self.started = time.time()
+
+    def snapshot(self) -> Dict[str, object]:
+        """Return all counters as a JSON-ready dict."""
+        return {
+            'enabled': True,
+            'since': self.started,
+            'operations': {name: stats.snapshot() for name, stats in sorted(self.operations.items())},
+        }
+
+
+def instrumented(name: str, function: Callable, metrics: OperationMetrics, arity: int = 2) -> Callable:
+    """
+    Wrap an operation function so its calls are recorded in ``metrics``.
+
+    Args:
+        name: Operation name
+        function: The operation function
+        metrics: Where the counters are kept
+        arity: Number of operands; two-operand functions get a faster wrapper
+
+    Returns:
+        A function with the same signature as ``function``
+    """
+    stats = metrics.stats(name)
+    buckets = stats.buckets
+    errors = stats.errors
+    top = _MAX_BITS + 1
+    clock = time.perf_counter_ns
+
+    def record_error(error: Exception, elapsed: int) -> None:
+        kind = type(error).__name__
+        errors[kind] = errors.get(kind, 0) + 1
+        stats.calls += 1
+        stats.total_ns += elapsed
+        buckets[min(elapsed.bit_length(), top)] += 1
+
+    if arity == 2:
+        def instrumented_function(a, b):
+            # x - x is NaN exactly for NaN and the infinities
+            if type(a) is float and a - a != 0 or type(b) is float and b - b != 0:
+                stats.special_operands += 1
+            start = clock()
+            try:
+                result = function(a, b)
+            except Exception as e:
+                record_error(e, clock() - start)
+                raise
+            elapsed = clock() - start
+            stats.calls += 1
+            stats.total_ns += elapsed
+            bits = elapsed.bit_length()
+            buckets[bits if bits < top else top] += 1
+            if type(result) is float and result - result != 0:
+                stats.special_results += 1
+            return result
+    else:
+        def instrumented_function(*args):
+            for arg in args:
+                if type(arg) is float and arg - arg != 0:
+                    stats.special_operands += 1
+                    break
+            start = clock()
+            try:
+                result = function(*args)
+            except Exception as e:
+                record_error(e, clock() - start)
+                raise
+            elapsed = clock() - start
+            stats.calls += 1
+            stats.total_ns += elapsed
+            bits = elapsed.bit_length()
+            buckets[bits if bits < top else top] += 1
+            if type(result) is float and result - result != 0:
+                stats.special_results += 1
+            return result
+
+    instrumented_function.__name__ = getattr(function, '__name__', name)
+    instrumented_function.__qualname__ = getattr(function, '__qualname__', name)
+    instrumented_function.__doc__ = function.__doc__
+    instrumented_function.__wrapped__ = function
+    instrumented_function.metrics = metrics
+    return instrumented_function
+
+
+def _is_instrumented(function: Callable) -> bool:
+    """Return True for functions created by ``instrumented``."""
+    return isinstance(getattr(function, 'metrics', None), OperationMetrics)
+
+
+_active: Optional[OperationMetrics] = None
+
+
+def enable_metrics(names: Optional[Iterable[str]] = None,
+                   metrics: Optional[OperationMetrics] = None) -> OperationMetrics:
+    """
+    Record metrics for registered operations.
+
+    Args:
+        names: Operations to instrument, all registered operations if omitted
+        metrics: Counters to record into; the active counters, or new ones,
+            if omitted
+
+    Returns:
+        The counters, which ``snapshot()`` reports from now on
+
+    Raises:
+        ValueError: If an operation name is not registered
+    """
+    global _active
+    if metrics is None:
+        metrics = _active if _active is not None else OperationMetrics()
+    if names is None:
+        names = registry.operation_names()
+    for name in names:
+        operation = registry.get_operation(name)
+        if operation is None:
+            raise ValueError(f"Invalid operation: {name}")
+        function = operation.function
+        if _is_instrumented(function):
+            function = function.__wrapped__
+        registry.OPERATIONS[name] = operation._replace(
+            function=instrumented(name, function, metrics, operation.arity))
+    _active = metrics
+    return metrics
+
+
+def disable_metrics(names: Optional[Iterable[str]] = None) -> None:
+    """
+    Restore the uninstrumented functions of registered operations.
+
+    Args:
+        names: Operations to restore, all instrumented operations if omitted;
+            the counters stay readable until metrics are enabled again
+    """
+    if names is None:
+        names = list(registry.OPERATIONS)
+    for name in names:
+        operation = registry.OPERATIONS.get(name)
+        if operation is not None and _is_instrumented(operation.function):
+            registry.OPERATIONS[name] = operation._replace(function=operation.function.__wrapped__)
+
+
+def snapshot() -> Dict[str, object]:
+    """Return the active counters as a JSON-ready dict; ``enabled`` is False if there are none."""
+    if _active is None:
+        return {'enabled': False, 'operations': {}}
+    return _active.snapshot()
+
+
+def _label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def format_prometheus(data: Dict[str, object]) -> str:
+    """
+    Render a snapshot in the Prometheus text exposition format.
+
+    Args:
+        data: A dict from ``snapshot()``
+
+    Returns:
+        The metrics text, ending with a newline
+    """
+    operations = data.get('operations', {})
+    calls = f"{_PROMETHEUS_PREFIX}_calls_total"
+    errors = f"{_PROMETHEUS_PREFIX}_errors_total"
+    special = f"{_PROMETHEUS_PREFIX}_special_values_total"
+    duration = f"{_PROMETHEUS_PREFIX}_duration_seconds"
+    lines = [
+        f"# HELP {calls} Operation calls, including failed ones.",
+        f"# TYPE {calls} counter",
+    ]
+    for name, stats in operations.items():
+        lines.append(f'{calls}{{operation="{_label(name)}"}} {stats["calls"]}')
+    lines += [f"# HELP {errors} Failed operation calls by exception type.", f"# TYPE {errors} counter"]
+    for name, stats in operations.items():
+        for kind, count in sorted(stats['errors'].items()):
+            lines.append(f'{errors}{{operation="{_label(name)}",error="{_label(kind)}"}} {count}')
+    lines += [f"# HELP {special} Calls with NaN/inf operands or results.", f"# TYPE {special} counter"]
+    for name, stats in operations.items():
+        lines.append(f'{special}{{operation="{_label(name)}",where="operand"}} {stats["special_operands"]}')
+        lines.append(f'{special}{{operation="{_label(name)}",where="result"}} {stats["special_results"]}')
+    lines += [f"# HELP {duration} Operation latency.", f"# TYPE {duration} histogram"]
+    for name, stats in operations.items():
+        label = _label(name)
+        latency = stats['latency']
+        for bound, count in latency['buckets']:
+            lines.append(f'{duration}_bucket{{operation="{label}",le="{bound}"}} {count}')
+        lines.append(f'{duration}_sum{{operation="{label}"}} {latency["sum_seconds"]!r}')
+        lines.append(f'{duration}_count{{operation="{label}"}} {latency["count"]}')
+    return "\n".join(lines) + "\n"
+
+
+def render(data: Dict[str, object], output_format: str = FORMAT_JSON) -> str:
+    """Render a snapshot as JSON or Prometheus text."""
+    if output_format == FORMAT_PROMETHEUS:
+        return format_prometheus(data)
+    return json.dumps(data, indent=2) + "\n"
+
+
+def write_snapshot(path: str, data: Optional[Dict[str, object]] = None,
+                   output_format: Optional[str] = None) -> None:
+    """
+    Write a snapshot to a file, replacing it atomically.
+
+    Args:
+        path: Output file; scrapers may read it at any time
+        data: Snapshot to write, the active counters if omitted
+        output_format: 'json' or 'prometheus'; by default Prometheus for
+            ``.prom`` files and JSON otherwise
+    """
+    if data is None:
+        data = snapshot()
+    if output_format is None:
+        output_format = FORMAT_PROMETHEUS if path.endswith(".prom") else FORMAT_JSON
+    temporary = f"{path}.tmp"
+    with open(temporary, 'w', encoding='utf-8') as f:
+        f.write(render(data, output_format))
+    os.replace(temporary, path)
+
+
+def stats_main(args: List[str]) -> int:
+    """Entry point for ``calculator stats``."""
+    parser = argparse.ArgumentParser(
+        prog="calculator stats",
+        description="Print per-operation metrics of the running daemon, or of a batch run",
+    )
+    parser.add_argument('--format', choices=FORMATS, default=FORMAT_JSON, dest='output_format',
+                        help="Output format (default: json)")
+    parser.add_argument('--output', metavar='FILE', help="Write the metrics to FILE instead of stdout")
+    parser.add_argument('--socket', default=None, help="Unix socket of the daemon")
+    parser.add_argument('--batch', metavar='FILE',
+                        help="Run a batch file in this process with metrics enabled, discarding "
+                             "its results, instead of asking the daemon")
+    try:
+        options = parser.parse_args(args)
+    except SystemExit as e:
+        return e.code if isinstance(e.code, int) else 0
+
+    if options.batch is not None:
+        from .streaming import run_batch
+        metrics = enable_metrics(metrics=OperationMetrics())
+        try:
+            with open(os.devnull, 'w') as discard:
+                run_batch(options.batch, output=discard)
+        finally:
+            disable_metrics()
+        data = metrics.snapshot()
+    else:
+        from .client import DaemonClient
+        try:
+            with DaemonClient(options.socket) as client:
+                code, out, err = client.call(["stats"])
+        except OSError as e:
+            print(f"Error: No calculator daemon is listening ({e}); start one with 'calculator serve --metrics'",
+                  file=sys.stderr)
+            return 1
+        if code != 0:
+            sys.stderr.write(err or out)
+            return code
+        data = json.loads(out)
+
+    if options.output is not None:
+        try:
+            write_snapshot(options.output, data, options.output_format)
+        except OSError as e:
+            print(f"Error: Cannot write '{options.output}': {e}", file=sys.stderr)
+            return 1
+    else:
+        sys.stdout.write(render(data, options.output_format))
+    return 0
+
+
+__all__ = [
+    'OperationMetrics', 'OperationStats', 'instrumented', 'enable_metrics', 'disable_metrics',
+    'snapshot', 'format_prometheus', 'render', 'write_snapshot', 'stats_main',
+    'LATENCY_BUCKETS', 'FORMATS', 'FORMAT_JSON', 'FORMAT_PROMETHEUS',
+]
@@ -0,0 +1,152 @@
+"""
+Process-pool evaluation of large batches of calculations.
+
+A batch of ``(operation, x, y)`` tasks is split into chunks and evaluated
+on a ``ProcessPoolExecutor``. Sending whole chunks instead of single tasks
+amortizes the pickling and inter-process overhead, and results come back
+in input order.
+
+Per-task exceptions (ZeroDivisionError, OverflowError, ...) are caught in
+the worker and shipped back as values, so one bad task never breaks the
+pool; the ``errors`` policy decides what the caller sees.
+
+Operations are looked up in the registry inside the workers, so only
+built-in operations and plugins registered through entry points are
+available there.
+"""
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from .batch import ERRORS_MASK, ERRORS_NAN, ERRORS_RAISE
+from .registry import get_operation
+
+ERRORS_RETURN = "return"  # put the exception object in place of the result
+ERROR_POLICIES = (ERRORS_RAISE, ERRORS_NAN, ERRORS_MASK, ERRORS_RETURN)
+
+# Chunks per worker; more than one keeps workers busy when chunks differ in cost
+CHUNKS_PER_WORKER = 4
+
+Task = Tuple[str, float, float]
+
+
+def _evaluate_chunk(chunk: Sequence[Task]) -> List[Tuple[bool, object]]:
+    """Evaluate one chunk in a worker, returning ``(ok, result or exception)`` pairs."""
+    results = []
+    for operation, x, y in chunk:
+        try:
+            entry = get_operation(operation)
+            if entry is None:
+                raise ValueError(f"Invalid operation: {operation}")
+            results.append((True, entry.function(x, y)))
+        except Exception as e:
+            results.append((False, e))
+    return results
+
+
+def default_chunksize(task_count: int, workers: int) -> int:
+    """Return the chunk size that gives every worker ``CHUNKS_PER_WORKER`` chunks."""
+    return max(1, math.ceil(task_count / (workers * CHUNKS_PER_WORKER)))
+
+
+class ParallelEvaluator:
+    """
+    A reusable process pool for evaluating batches of calculations.
+
+    Use as a context manager so the worker processes are shut down::
+
+        with ParallelEvaluator(workers=4) as evaluator:
+            results = evaluator.evaluate([('power', 3, 50000), ('add', 1, 2)])
+    """
+
+    def __init__(self, workers: Optional[int] = None, chunksize: Optional[int] = None) -> None:
+        """
+        Start the worker pool.
+
+        Args:
+            workers: Number of worker processes, ``os.cpu_count()`` if omitted
+            chunksize: Tasks per chunk, chosen per batch if omitted
+
+        Raises:
+            ValueError: If workers or chunksize is less than 1
+        """
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers < 1:
+            raise ValueError(f"workers must be at least 1, got {workers}")
+        if chunksize is not None and chunksize < 1:
+            raise ValueError(f"chunksize must be at least 1, got {chunksize}")
+        self.workers = workers
+        self.chunksize = chunksize
+        self._executor = ProcessPoolExecutor(max_workers=workers)
+
+    def evaluate(self, tasks: Iterable[Task], errors: str = ERRORS_RAISE):
+        """
+        Evaluate tasks in parallel.
+
+        Args:
+            tasks: ``(operation, x, y)`` tuples
+            errors: 'raise' re-raises the first failing task's exception in
+                input order (the pool stays usable), 'nan' stores NaN,
+                'mask' stores NaN and also returns a failure mask, 'return'
+                stores the exception object itself
+
+        Returns:
+            Results in input order; ``(results, failed)`` for 'mask'
+
+        Raises:
+            ValueError: If the error policy is unknown
+        """
+        if errors not in ERROR_POLICIES:
+            raise ValueError(f"Invalid error policy: {errors}. Valid policies are: {', '.join(ERROR_POLICIES)}")
+
+        tasks = list(tasks)
+        chunksize = self.chunksize or default_chunksize(len(tasks), self.workers)
+        chunks = [tasks[i:i + chunksize] for i in range(0, len(tasks), chunksize)]
+
+        results: List[object] = []
+        failed: List[bool] = []
+        for chunk_results in self._executor.map(_evaluate_chunk, chunks):
+            for ok, value in chunk_results:
+                failed.append(not ok)
+                if ok:
+                    results.append(value)
+                elif errors == ERRORS_RAISE:
+                    raise value
+                elif errors == ERRORS_RETURN:
+                    results.append(value)
+                else:
+                    results.append(float('nan'))
+
+        if errors == ERRORS_MASK:
+            return results, failed
+        return results
+
+    def close(self) -> None:
+        """Shut down the worker processes."""
+        self._executor.shutdown()
+
+    def __enter__(self) -> "ParallelEvaluator":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def evaluate_parallel(tasks: Iterable[Task], workers: Optional[int] = None,
+                      chunksize: Optional[int] = None, errors: str = ERRORS_RAISE):
+    """
+    Evaluate tasks on a temporary process pool.
+
+    See ``ParallelEvaluator.evaluate`` for the arguments and return value.
+    Create a ``ParallelEvaluator`` directly to reuse the pool across batches.
+    """
+    with ParallelEvaluator(workers, chunksize) as evaluator:
+        return evaluator.evaluate(tasks, errors)
+
+
+__all__ = [
+    'ParallelEvaluator', 'evaluate_parallel', 'default_chunksize',
+    'ERRORS_RETURN', 'ERROR_POLICIES',
+]
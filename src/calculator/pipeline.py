@@ -0,0 +1,432 @@
+"""
+Fused evaluation of multi-step batch pipelines.
+
+Chaining batch operations, e.g. ``divide_many(add_many(x, y), z)``,
+materializes a full intermediate column per step. A ``Pipeline`` records
+the chain instead, and compiling it generates one loop that takes each
+row through every step before moving to the next row, so no
+intermediate column is ever built::
+
+    pipeline = Pipeline()
+    total = pipeline.add('x', 'y')
+    pipeline.divide(total, 'z')
+    fused = pipeline.compile()
+    fused(x=[1.0, 2.0], y=[3.0, 4.0], z=[2.0, 0.0], errors='nan')   # [2.0, nan]
+
+Every step calls the same scalar function ``apply_many`` would (the
+registered operation, or the function of a kernel ``profile``), so each
+step keeps its special-case semantics. With ``errors='nan'`` or
+``'mask'`` a row where any step raises gets NaN and is marked as failed;
+step-by-step evaluation would instead feed the NaN into the later steps.
+
+When NumPy is installed and a column is a NumPy array, the pipeline runs
+as one ufunc per step writing into preallocated ``out=`` buffers, each
+reused as soon as its intermediate is no longer needed. The rows where
+NumPy and the scalar functions could disagree are re-evaluated through
+the fused row function, as in ``batch``.
+
+``measure_memory`` compares the peak memory of the fused and the
+step-by-step evaluation of the same columns.
+"""
+import keyword
+import math
+import tracemalloc
+from typing import Dict, List, Optional, Tuple, Union
+
+from .batch import (
+    ELEMENT_ERRORS, ERROR_POLICIES, ERRORS_MASK, ERRORS_NAN, ERRORS_RAISE,
+    _NUMPY_UFUNCS, _ZERO_DIVISOR_OPERATIONS, apply_many,
+)
+from .registry import get_operation
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional
+    np = None
+
+# Kinds of step operands
+_STEP = 'step'
+_COLUMN = 'column'
+_CONSTANT = 'constant'
+
+
+class Step:
+    """A handle on the result of one pipeline step, usable as an operand of later steps."""
+
+    __slots__ = ('pipeline', 'index')
+
+    def __init__(self, pipeline: "Pipeline", index: int) -> None:
+        self.pipeline = pipeline
+        self.index = index
+
+    def __repr__(self) -> str:
+        return f"Step({self.pipeline.describe(self)})"
+
+
+Operand = Union[str, Step, int, float]
+
+
+class Pipeline:
+    """
+    A chain of two-operand operations over named columns.
+
+    Operands of a step are column names (str), earlier ``Step`` handles or
+    constant numbers.
+    """
+
+    def __init__(self, profile: Optional[str] = None) -> None:
+        """
+        Create an empty pipeline.
+
+        Args:
+            profile: Semantics profile of the built-in operations ('ieee',
+                'strict' or 'raw', see kernel.py); the registered
+                operations if omitted
+
+        Raises:
+            ValueError: If the profile is unknown
+        """
+        if profile is not None:
+            from .kernel import get_profile
+            get_profile(profile)  # unknown profiles raise ValueError
+        self.profile = profile
+        self._steps: List[Tuple[str, Operand, Operand]] = []
+
+    def __len__(self) -> int:
+        return len(self._steps)
+
+    def step(self, operation: str, a: Operand, b: Operand) -> Step:
+        """
+        Append ``operation(a, b)`` and return its handle.
+
+        Raises:
+            ValueError: If the operation is not a registered two-operand
+                operation, a column name is not a valid identifier, or a
+                step belongs to another pipeline
+        """
+        entry = get_operation(operation)
+        if entry is None or entry.arity != 2:
+            raise ValueError(f"Invalid operation: {operation}")
+        for operand in (a, b):
+            if isinstance(operand, Step):
+                if operand.pipeline is not self:
+                    raise ValueError("Step belongs to a different pipeline")
+            elif isinstance(operand, str):
+                # Generated code uses underscore names for its own variables
+                if not operand.isidentifier() or keyword.iskeyword(operand) or operand.startswith('_'):
+                    raise ValueError(f"Invalid column name: {operand!r}")
+        self._steps.append((operation, a, b))
+        return Step(self, len(self._steps) - 1)
+
+    def add(self, a: Operand, b: Operand) -> Step:
+        return self.step('add', a, b)
+
+    def subtract(self, a: Operand, b: Operand) -> Step:
+        return self.step('subtract', a, b)
+
+    def multiply(self, a: Operand, b: Operand) -> Step:
+        return self.step('multiply', a, b)
+
+    def divide(self, a: Operand, b: Operand) -> Step:
+        return self.step('divide', a, b)
+
+    def power(self, a: Operand, b: Operand) -> Step:
+        return self.step('power', a, b)
+
+    def integer_divide(self, a: Operand, b: Operand) -> Step:
+        return self.step('integer_divide', a, b)
+
+    def modulo(self, a: Operand, b: Operand) -> Step:
+        return self.step('modulo', a, b)
+
+    def describe(self, step: Step) -> str:
+        """Return the expression a step stands for, e.g. ``divide(add(x, y), z)``."""
+        operation, a, b = self._steps[step.index]
+        operands = [self.describe(o) if isinstance(o, Step) else str(o) for o in (a, b)]
+        return f"{operation}({', '.join(operands)})"
+
+    def compile(self, output: Optional[Step] = None) -> "FusedPipeline":
+        """
+        Generate the fused evaluation of ``output``, the last step if omitted.
+
+        Raises:
+            ValueError: If the pipeline is empty
+        """
+        if not self._steps:
+            raise ValueError("Cannot compile an empty pipeline")
+        return FusedPipeline(self, output or Step(self, len(self._steps) - 1))
+
+
+class FusedPipeline:
+    """
+    A compiled pipeline.
+
+    Attributes:
+        columns: Names of the columns the output depends on
+        source: The generated Python source of the per-row function
+        report: Dict with the live ``steps``, the ``intermediates``
+            step-by-step evaluation materializes, and the ``buffers`` the
+            NumPy path allocates for them and the output
+    """
+
+    __slots__ = ('columns', 'source', 'report', '_profile', '_steps', '_body', '_namespace', '_loops', '_row')
+
+    def __init__(self, pipeline: Pipeline, output: Step) -> None:
+        if output.pipeline is not pipeline:
+            raise ValueError("Output step belongs to a different pipeline")
+
+        live = set()
+        pending = [output.index]
+        while pending:
+            index = pending.pop()
+            if index not in live:
+                live.add(index)
+                pending.extend(o.index for o in pipeline._steps[index][1:] if isinstance(o, Step))
+        position = {index: i for i, index in enumerate(sorted(live))}  # operands precede their users
+
+        if pipeline.profile is None:
+            def lookup(name):
+                return get_operation(name).function
+        else:
+            from .backends import get_backend
+            lookup = get_backend(profile=pipeline.profile).operation
+
+        columns: List[str] = []
+        namespace: Dict[str, object] = {'_ERRORS': ELEMENT_ERRORS, '_nan': math.nan}
+        steps = []  # (operation, ((kind, payload), (kind, payload)))
+        body = []
+        for i, index in enumerate(sorted(live)):
+            operation, a, b = pipeline._steps[index]
+            operands = []
+            names = []
+            for j, operand in enumerate((a, b)):
+                if isinstance(operand, Step):
+                    operands.append((_STEP, position[operand.index]))
+                    names.append(f"_t{position[operand.index]}")
+                elif isinstance(operand, str):
+                    operands.append((_COLUMN, operand))
+                    names.append(operand)
+                    if operand not in columns:
+                        columns.append(operand)
+                else:
+                    operands.append((_CONSTANT, operand))
+                    names.append(f"_c{i}_{j}")
+                    namespace[names[-1]] = operand  # repr of nan/inf is not valid source
+            namespace[f"_f{i}"] = lookup(operation)
+            steps.append((operation, tuple(operands)))
+            body.append(f"_t{i} = _f{i}({names[0]}, {names[1]})")
+
+        self.columns = tuple(columns)
+        self._profile = pipeline.profile
+        self._steps = steps
+        self._body = body
+        self._namespace = namespace
+        self._loops: Dict[str, object] = {}
+        self.source = f"def _row({', '.join(columns)}):\n" + "".join(f"    {line}\n" for line in body) \
+            + f"    return _t{len(steps) - 1}\n"
+        exec(compile(self.source, "<pipeline>", 'exec'), namespace)
+        self._row = namespace['_row']
+        self.report = {
+            'steps': len(steps),
+            'intermediates': len(steps) - 1,
+            'buffers': max(self._plan_buffers()) + 1,
+        }
+
+    def __repr__(self) -> str:
+        return f"FusedPipeline(steps={len(self._steps)}, columns={list(self.columns)})"
+
+    def _loop(self, errors: str):
+        """The generated loop over all rows for an error policy, built on first use."""
+        loop = self._loops.get(errors)
+        if loop is not None:
+            return loop
+        lines = ["def _loop(_columns, _rows):",
+                 "    _results = []",
+                 "    _append = _results.append"]
+        if errors == ERRORS_MASK:
+            lines += ["    _failed = []",
+                      "    _fail = _failed.append"]
+        if self.columns:
+            lines.append(f"    for {', '.join(self.columns)}, in zip(*_columns):")
+        else:
+            lines.append("    for _ in range(_rows):")
+        if errors == ERRORS_RAISE:
+            lines += [f"        {line}" for line in self._body]
+        else:
+            lines.append("        try:")
+            lines += [f"            {line}" for line in self._body]
+            lines += ["        except _ERRORS:",
+                      "            _append(_nan)"]
+            if errors == ERRORS_MASK:
+                lines.append("            _fail(True)")
+            lines.append("            continue")
+            if errors == ERRORS_MASK:
+                lines.append("        _fail(False)")
+        lines.append(f"        _append(_t{len(self._steps) - 1})")
+        lines.append("    return _results, _failed" if errors == ERRORS_MASK else "    return _results")
+        namespace = dict(self._namespace)
+        exec(compile("\n".join(lines) + "\n", "<pipeline loop>", 'exec'), namespace)
+        loop = self._loops[errors] = namespace['_loop']
+        return loop
+
+    def _columns(self, columns: Dict[str, object]) -> Tuple[list, int]:
+        """The column values in ``self.columns`` order, and the row count."""
+        for name in self.columns:
+            if name not in columns:
+                raise TypeError(f"Missing column: {name}")
+        for name in columns:
+            if name not in self.columns:
+                raise TypeError(f"Unknown column: {name}")
+        values = [columns[name] for name in self.columns]
+        lengths = sorted({len(value) for value in values})
+        if len(lengths) > 1:
+            raise ValueError(f"Column lengths differ: {lengths}")
+        return values, lengths[0] if lengths else 1
+
+    def __call__(self, errors: str = ERRORS_RAISE, **columns):
+        """
+        Evaluate the pipeline over whole columns, one row at a time.
+
+        Args:
+            errors: 'raise', 'nan' or 'mask', as for ``batch.apply_many``
+            **columns: An equally long sequence (list, ``array.array``,
+                NumPy array) for every name in ``columns``
+
+        Returns:
+            A list of results, or a NumPy float64 array when a column is a
+            NumPy array; with ``errors='mask'`` a ``(results, failed)`` tuple
+
+        Raises:
+            TypeError: If a column is missing or unknown
+            ValueError: If the error policy is unknown or column lengths differ
+            ZeroDivisionError: With ``errors='raise'``, for the first row
+                that divides by zero (other row errors are raised the same way)
+        """
+        if errors not in ERROR_POLICIES:
+            raise ValueError(f"Invalid error policy: {errors}. Valid policies are: {', '.join(ERROR_POLICIES)}")
+        values, rows = self._columns(columns)
+        if (np is not None and any(isinstance(value, np.ndarray) for value in values)
+                and all(operation in _NUMPY_UFUNCS for operation, _ in self._steps)):
+            return self._evaluate_numpy(values, rows, errors)
+        return self._loop(errors)(values, rows)
+
+    def _plan_buffers(self) -> List[int]:
+        """
+        The output buffer of every step on the NumPy path.
+
+        A step writes into the buffer of an intermediate it is the last
+        user of, or else into a free or new buffer, so only intermediates
+        alive at the same time take memory.
+        """
+        last_use = {}
+        for i, (_, operands) in enumerate(self._steps):
+            for kind, payload in operands:
+                if kind == _STEP:
+                    last_use[payload] = i
+        assignment: List[int] = []
+        free: List[int] = []
+        for i, (_, operands) in enumerate(self._steps):
+            for payload in {payload for kind, payload in operands if kind == _STEP}:
+                if last_use[payload] == i:
+                    free.append(assignment[payload])
+            assignment.append(free.pop() if free else len(set(assignment)))
+        return assignment
+
+    def _evaluate_numpy(self, values: list, rows: int, errors: str):
+        """One ufunc per step into reused buffers, then fix up the special rows."""
+        inputs = {name: np.asarray(value, dtype=np.float64) for name, value in zip(self.columns, values)}
+        assignment = self._plan_buffers()
+        buffers = [np.empty(rows, dtype=np.float64) for _ in range(max(assignment) + 1)]
+        special = np.zeros(rows, dtype=bool)
+        scratch = np.empty(rows, dtype=bool)
+        for column in inputs.values():
+            np.isfinite(column, out=scratch)
+            special |= ~scratch
+
+        def operand(kind, payload):
+            if kind == _STEP:
+                return buffers[assignment[payload]]
+            if kind == _COLUMN:
+                return inputs[payload]
+            return float(payload)
+
+        with np.errstate(all='ignore'):
+            for i, (operation, (a, b)) in enumerate(self._steps):
+                x, y = operand(*a), operand(*b)
+                # Rows where the ufunc may differ from the scalar function;
+                # divisors first, as out may be the divisor's buffer
+                if operation in _ZERO_DIVISOR_OPERATIONS:
+                    np.equal(y, 0, out=scratch)
+                    special |= scratch
+                out = buffers[assignment[i]]
+                getattr(np, _NUMPY_UFUNCS[operation])(x, y, out=out)
+                np.isfinite(out, out=scratch)
+                np.logical_not(scratch, out=scratch)
+                special |= scratch
+        out = buffers[assignment[-1]]
+
+        failed = np.zeros(rows, dtype=bool)
+        columns = list(inputs.values())
+        for i in np.flatnonzero(special):
+            try:
+                out[i] = self._row(*[float(column[i]) for column in columns])
+            except ELEMENT_ERRORS:
+                if errors == ERRORS_RAISE:
+                    raise
+                out[i] = np.nan
+                failed[i] = True
+        if errors == ERRORS_MASK:
+            return out, failed
+        return out
+
+    def evaluate_stepwise(self, errors: str = ERRORS_RAISE, **columns):
+        """
+        Evaluate step by step with ``apply_many``, materializing every intermediate.
+
+        This is the unfused evaluation that ``measure_memory`` and the
+        benchmark compare against; constant operands are broadcast to full
+        columns. Returns what ``apply_many`` returns for the last step.
+        """
+        values, rows = self._columns(columns)
+        inputs = dict(zip(self.columns, values))
+        results = []
+        for i, (operation, operands) in enumerate(self._steps):
+            xs, ys = [results[payload] if kind == _STEP else inputs[payload] if kind == _COLUMN else [payload] * rows
+                      for kind, payload in operands]
+            # Intermediate rows that fail continue as NaN, as a caller chaining *_many calls would do
+            step_errors = errors if i == len(self._steps) - 1 or errors == ERRORS_RAISE else ERRORS_NAN
+            results.append(apply_many(operation, xs, ys, step_errors, profile=self._profile))
+        return results[-1]
+
+
+def measure_memory(fused: FusedPipeline, **columns) -> Dict[str, int]:
+    """
+    Measure the peak memory of fused and step-by-step evaluation.
+
+    Both evaluations run with ``errors='nan'`` under ``tracemalloc``, which
+    also traces NumPy's buffers.
+
+    Returns:
+        Dict with ``fused_peak`` and ``stepwise_peak``, the peak bytes
+        allocated above what was in use before each run, and ``saved``,
+        their difference
+    """
+    peaks = {}
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    try:
+        for label, evaluate in (('fused_peak', fused), ('stepwise_peak', fused.evaluate_stepwise)):
+            base = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            result = evaluate(ERRORS_NAN, **columns)
+            peaks[label] = tracemalloc.get_traced_memory()[1] - base
+            del result
+    finally:
+        if started:
+            tracemalloc.stop()
+    peaks['saved'] = peaks['stepwise_peak'] - peaks['fused_peak']
+    return peaks
+
+
+__all__ = ['Pipeline', 'FusedPipeline', 'Step', 'measure_memory']
@@ -0,0 +1,403 @@
+"""
+N-ary reductions: sum, product, minimum and maximum of many operands.
+
+Summing a column with a loop of ``add`` calls pays the special-case checks
+per element and rounds after every step. ``sum_many`` instead sums chunks
+of values with ``math.fsum`` (correctly rounded, in C) and keeps a
+Neumaier-compensated total across chunks, so the result is at least as
+accurate as a compensated sum and usually correctly rounded.
+
+Special values follow the scalar ``add``: any NaN gives NaN, and inf plus
+-inf gives NaN. With ``skip_nan=True`` NaN operands are ignored instead.
+
+Two ways of splitting the same input (chunk sizes, or partial sums computed
+in different processes and merged) can round differently in the last
+place. With ``deterministic=True`` the accumulator keeps the exact sum of
+the finite operands as an integer multiple of 2 ** -1074, the smallest
+float step, so partial sums merge exactly and the result is the correctly
+rounded sum however the input was split::
+
+    left = SumAccumulator(deterministic=True)
+    left.update(values[:1000])
+    right = SumAccumulator(deterministic=True)
+    right.update(values[1000:])
+    left.merge(right).result() == sum_many(values, deterministic=True)
+
+Operands are Python ints and floats, ``array.array`` or NumPy arrays;
+they are summed as floats, like the float backend. Ints beyond float
+range count as +-inf, as in ``ResultStats``.
+"""
+import math
+import sys
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional, TextIO
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional
+    np = None
+
+# Values handed to math.fsum at once
+CHUNK_SIZE = 4096
+
+# Finite floats are integer multiples of 2 ** -_SHIFT
+_SHIFT = 1074
+
+
+def _values(values: Iterable[float]) -> Iterable[float]:
+    """Python floats from NumPy arrays, anything else unchanged."""
+    if np is not None and isinstance(values, np.ndarray):
+        return values.ravel().tolist()
+    return values
+
+
+def _float(value: float) -> float:
+    """``float(value)``, or +-inf for an int beyond float range."""
+    try:
+        return float(value)
+    except OverflowError:
+        return math.inf if value > 0 else -math.inf
+
+
+def _scaled(value: float) -> int:
+    """The finite ``value`` times 2 ** 1074, exactly."""
+    numerator, denominator = value.as_integer_ratio()
+    # denominator is a power of two no larger than 2 ** 1074
+    return numerator << (_SHIFT + 1 - denominator.bit_length())
+
+
+def _unscaled(exact: int) -> float:
+    """The correctly rounded float of ``exact * 2 ** -1074``, +-inf if too large."""
+    try:
+        return exact / (1 << _SHIFT)
+    except OverflowError:
+        return math.inf if exact > 0 else -math.inf
+
+
+def _exact_sum(finite: List[float], rounded: Optional[float] = None) -> int:
+    """
+    The exact sum of finite floats, scaled by 2 ** 1074.
+
+    ``rounded`` is ``math.fsum(finite)`` if the caller already has it.
+    """
+    if rounded == 0:
+        return 0  # fsum is correctly rounded, so only an exact zero rounds to 0
+    # fsum rounds the exact sum once; summing again with the rounded parts
+    # negated leaves the exact remainder, which is zero after a few rounds
+    parts: List[float] = [] if rounded is None else [rounded]
+    try:
+        while True:
+            part = math.fsum(finite + [-p for p in parts])
+            if not part:
+                return sum(_scaled(p) for p in parts)
+            parts.append(part)
+    except OverflowError:  # intermediate overflow: sum exactly value by value
+        return sum(_scaled(float(value)) for value in finite)
+
+
+class SumAccumulator:
+    """
+    A running sum that can be fed in pieces and merged with other sums.
+
+    Attributes:
+        count: Number of operands added, including skipped NaNs
+        nans: Number of NaN operands
+    """
+
+    __slots__ = ('skip_nan', 'deterministic', 'count', 'nans', '_positive_inf', '_negative_inf',
+                 '_total', '_compensation', '_exact')
+
+    def __init__(self, skip_nan: bool = False, deterministic: bool = False) -> None:
+        """
+        Create an empty sum.
+
+        Args:
+            skip_nan: Ignore NaN operands instead of returning NaN
+            deterministic: Keep the exact sum, so the result does not depend
+                on how the operands were split and merged
+        """
+        self.skip_nan = skip_nan
+        self.deterministic = deterministic
+        self.count = 0
+        self.nans = 0
+        self._positive_inf = 0
+        self._negative_inf = 0
+        self._total = 0.0
+        self._compensation = 0.0
+        self._exact = 0
+
+    def __repr__(self) -> str:
+        return f"SumAccumulator(count={self.count}, result={self.result()!r})"
+
+    def add(self, value: float) -> None:
+        """Add one operand."""
+        self._add_chunk([value])
+
+    def update(self, values: Iterable[float]) -> "SumAccumulator":
+        """Add every operand of an iterable, array or NumPy array; returns self."""
+        iterator = iter(_values(values))
+        while True:
+            chunk = list(islice(iterator, CHUNK_SIZE))
+            if not chunk:
+                return self
+            self._add_chunk(chunk)
+
+    def merge(self, other: "SumAccumulator") -> "SumAccumulator":
+        """
+        Add another accumulator's operands to this one; returns self.
+
+        Raises:
+            ValueError: If the two accumulators use different modes
+        """
+        if (other.skip_nan, other.deterministic) != (self.skip_nan, self.deterministic):
+            raise ValueError("Cannot merge sums with different skip_nan or deterministic modes")
+        self.count += other.count
+        self.nans += other.nans
+        self._positive_inf += other._positive_inf
+        self._negative_inf += other._negative_inf
+        self._exact += other._exact
+        self._add_float(other._total)
+        self._add_float(other._compensation)
+        return self
+
+    def result(self) -> float:
+        """The sum of the operands so far (0.0 for none)."""
+        if self.nans and not self.skip_nan:
+            return math.nan
+        if self._positive_inf and self._negative_inf:
+            return math.nan
+        if self._positive_inf:
+            return math.inf
+        if self._negative_inf:
+            return -math.inf
+        if self.deterministic:
+            return _unscaled(self._exact)
+        if self._total - self._total != 0:  # the running total overflowed
+            return self._total
+        return self._total + self._compensation
+
+    def _add_float(self, value: float) -> None:
+        """Neumaier step: add ``value`` to the total, keeping the lost low-order bits."""
+        total = self._total + value
+        if abs(self._total) >= abs(value):
+            self._compensation += (self._total - total) + value
+        else:
+            self._compensation += (value - total) + self._total
+        self._total = total
+
+    def _add_chunk(self, chunk: List[float]) -> None:
+        """Add a list of operands."""
+        self.count += len(chunk)
+        try:
+            partial = math.fsum(chunk)
+        except (ValueError, OverflowError):  # inf - inf, or an intermediate overflow
+            partial = math.nan
+        if partial - partial == 0:  # every operand was finite
+            if self.deterministic:
+                self._exact += _exact_sum(chunk, partial)
+            else:
+                self._add_float(partial)
+            return
+        finite = []
+        for value in map(_float, chunk):
+            if value - value == 0:
+                finite.append(value)
+            elif value != value:
+                self.nans += 1
+            elif value > 0:
+                self._positive_inf += 1
+            else:
+                self._negative_inf += 1
+        if self.deterministic:
+            self._exact += _exact_sum(finite)
+        else:
+            try:
+                self._add_float(math.fsum(finite))
+            except OverflowError:
+                self._add_float(_unscaled(_exact_sum(finite)))
+
+
+def sum_many(values: Iterable[float], skip_nan: bool = False, deterministic: bool = False) -> float:
+    """
+    Sum any number of operands with compensated summation.
+
+    Args:
+        values: Operands: an iterable, ``array.array`` or NumPy array
+        skip_nan: Ignore NaN operands instead of returning NaN
+        deterministic: Return the correctly rounded sum, identical for any
+            order or split of the operands
+
+    Returns:
+        The sum as a float; 0.0 for no operands
+    """
+    return SumAccumulator(skip_nan, deterministic).update(values).result()
+
+
+def product_many(values: Iterable[float], skip_nan: bool = False) -> float:
+    """
+    Multiply any number of operands, left to right.
+
+    Special values follow the scalar ``multiply``: NaN propagates and
+    inf * 0 is NaN.
+
+    Args:
+        values: Operands: an iterable, ``array.array`` or NumPy array
+        skip_nan: Ignore NaN operands instead of returning NaN
+
+    Returns:
+        The product as a float; 1.0 for no operands
+    """
+    values = _values(values)
+    if skip_nan:
+        values = [value for value in values if value == value]
+    if not isinstance(values, Iterator):  # a list or array can be walked again
+        try:
+            return float(math.prod(values, start=1.0))
+        except OverflowError:  # an int beyond float range
+            return float(math.prod(map(_float, values), start=1.0))
+    total = 1.0
+    while True:  # a one-pass iterator: multiply chunk by chunk, left to right
+        chunk = list(islice(values, CHUNK_SIZE))
+        if not chunk:
+            return total
+        try:
+            total = math.prod(chunk, start=total)
+        except OverflowError:
+            total = math.prod(map(_float, chunk), start=total)
+
+
+def _extreme(values: Iterable[float], skip_nan: bool, pick, name: str) -> float:
+    """Shared body of ``min_many`` and ``max_many``."""
+    iterator = iter(_values(values))
+    best: Optional[float] = None
+    seen = False
+    while True:
+        chunk = list(islice(iterator, CHUNK_SIZE))
+        if not chunk:
+            break
+        seen = True
+        # Comparisons with NaN are always false, so the builtins cannot see it
+        numbers = [value for value in chunk if value == value]
+        if len(numbers) != len(chunk) and not skip_nan:
+            return math.nan
+        if numbers:
+            candidate = pick(numbers)
+            best = candidate if best is None else pick(best, candidate)
+    if not seen:
+        raise ValueError(f"{name}() of an empty sequence")
+    return math.nan if best is None else best
+
+
+def min_many(values: Iterable[float], skip_nan: bool = False) -> float:
+    """
+    The smallest of any number of operands.
+
+    Args:
+        values: Operands: an iterable, ``array.array`` or NumPy array
+        skip_nan: Ignore NaN operands instead of returning NaN; the result
+            is NaN only if every operand is
+
+    Returns:
+        The minimum
+
+    Raises:
+        ValueError: If there are no operands
+    """
+    return _extreme(values, skip_nan, min, 'min_many')
+
+
+def max_many(values: Iterable[float], skip_nan: bool = False) -> float:
+    """
+    The largest of any number of operands. See ``min_many``.
+
+    Raises:
+        ValueError: If there are no operands
+    """
+    return _extreme(values, skip_nan, max, 'max_many')
+
+
+# Reductions by name, for --reduce
+REDUCTIONS = {
+    'sum': sum_many,
+    'product': product_many,
+    'min': min_many,
+    'max': max_many,
+}
+
+# Binary operations the CLI accepts with more than two operands
+NARY_OPERATIONS = {
+    'add': 'sum',
+    'multiply': 'product',
+}
+
+
+def apply_reduction(name: str, values: Iterable[float], skip_nan: bool = False, deterministic: bool = False) -> float:
+    """
+    Apply the reduction ``name`` ('sum', 'product', 'min' or 'max').
+
+    ``deterministic`` only changes sums; the other reductions do not
+    depend on how the input is split.
+
+    Raises:
+        ValueError: If the reduction is unknown, or min/max get no operands
+    """
+    if name not in REDUCTIONS:
+        raise ValueError(f"Invalid reduction: {name}. Valid reductions are: {', '.join(REDUCTIONS)}")
+    if name == 'sum':
+        return sum_many(values, skip_nan, deterministic)
+    return REDUCTIONS[name](values, skip_nan)
+
+
+def read_numbers(lines: Iterable[str]) -> Iterator[float]:
+    """
+    Parse numbers separated by commas or whitespace, any number per line.
+
+    Raises:
+        ValueError: For text that is not a number, naming its line
+    """
+    for line_number, line in enumerate(lines, 1):
+        for token in line.replace(',', ' ').split():
+            try:
+                yield float(token)
+            except ValueError:
+                raise ValueError(f"Line {line_number}: Invalid number format: '{token}'") from None
+
+
+def run_reduce(source: str, name: str, skip_nan: bool = False, deterministic: bool = False,
+               output: Optional[TextIO] = None) -> int:
+    """
+    Reduce the numbers of a file or stdin, reading it as a stream.
+
+    Args:
+        source: Path of the input file, or '-' for stdin
+        name: 'sum', 'product', 'min' or 'max'
+        skip_nan: Ignore NaN operands
+        deterministic: Sum exactly, see ``SumAccumulator``
+        output: Where the result (or error) is printed, stdout by default
+
+    Returns:
+        0 on success, 1 if the input could not be read or parsed
+    """
+    if output is None:
+        output = sys.stdout
+    try:
+        if source == "-":
+            result = apply_reduction(name, read_numbers(sys.stdin), skip_nan, deterministic)
+        else:
+            with open(source, encoding='utf-8') as stream:
+                result = apply_reduction(name, read_numbers(stream), skip_nan, deterministic)
+    except OSError as e:
+        print(f"Error: Cannot read '{source}': {e}", file=output)
+        return 1
+    except ValueError as e:
+        print(f"Error: {e}", file=output)
+        return 1
+    print(f"Result: {result}", file=output)
+    return 0
+
+
+__all__ = [
+    'SumAccumulator', 'sum_many', 'product_many', 'min_many', 'max_many', 'apply_reduction',
+    'read_numbers', 'run_reduce',
+    'REDUCTIONS', 'NARY_OPERATIONS', 'CHUNK_SIZE',
+]
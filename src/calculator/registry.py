@@ -0,0 +1,142 @@
+"""
+Operation registry for the calculator.
+
+A single table mapping operation names to their functions, built once at
+import. The CLI (``safe_calculate``, ``calculate``, the parser choices and
+the operation validation), the batch modes and the expression compiler
+all look operations up here, so an operation registered once is
+available everywhere.
+
+Third-party packages can add operations through the
+``calculator.operations`` entry point group. Each entry point must load to
+either an ``Operation`` or a plain callable taking two numbers; the entry
+point name is used as the operation name for plain callables::
+
+    [project.entry-points."calculator.operations"]
+    hypot = "mypackage.ops:hypot"
+
+Plugins are loaded the first time the full list of operations is needed
+or an unknown name is looked up, so built-in lookups never pay for them.
+"""
+import warnings
+from collections import namedtuple
+from collections.abc import Callable
+
+from . import add, subtract, multiply, divide, power, power_mod, integer_divide, modulo
+
+ENTRY_POINT_GROUP = "calculator.operations"
+
+
+# collections.namedtuple rather than typing.NamedTuple: importing typing
+# would dominate the CLI's start-up time
+class Operation(namedtuple('Operation', ('name', 'function', 'arity', 'description'), defaults=(2, ""))):
+    """
+    A registered operation.
+
+    Attributes:
+        name: Name used on the command line and in lookups
+        function: The callable implementing the operation
+        arity: Number of operands the function takes
+        description: One-line description for help output
+    """
+    __slots__ = ()
+
+
+OPERATIONS: dict[str, Operation] = {
+    operation.name: operation for operation in (
+        Operation('add', add, 2, "Add two numbers"),
+        Operation('subtract', subtract, 2, "Subtract the second number from the first"),
+        Operation('multiply', multiply, 2, "Multiply two numbers"),
+        Operation('divide', divide, 2, "Divide the first number by the second"),
+        Operation('power', power, 2, "Raise the first number to the power of the second"),
+        Operation('integer_divide', integer_divide, 2, "Floor-divide the first number by the second"),
+        Operation('modulo', modulo, 2, "Remainder of dividing the first number by the second"),
+        Operation('power_mod', power_mod, 3, "Raise the first number to the power of the second, modulo the third"),
+    )
+}
+
+_plugins_loaded = False
+
+
+def register_operation(name: str, function: Callable, arity: int = 2, description: str = "",
+                       replace: bool = False) -> Operation:
+    """
+    Add an operation to the registry.
+
+    Args:
+        name: Operation name
+        function: Callable implementing the operation
+        arity: Number of operands the function takes
+        description: One-line description for help output
+        replace: Allow replacing an existing operation of the same name
+
+    Returns:
+        The registered operation
+
+    Raises:
+        ValueError: If the name is already registered and ``replace`` is False
+        TypeError: If ``function`` is not callable
+    """
+    if not callable(function):
+        raise TypeError(f"Operation '{name}' must be callable. Got {type(function).__name__}")
+    if name in OPERATIONS and not replace:
+        raise ValueError(f"Operation '{name}' is already registered")
+    operation = Operation(name, function, arity, description)
+    OPERATIONS[name] = operation
+    return operation
+
+
+def load_plugins() -> None:
+    """
+    Register operations from the ``calculator.operations`` entry point group.
+
+    Runs once; later calls do nothing. Broken plugins are skipped with a
+    warning instead of breaking the calculator.
+    """
+    global _plugins_loaded
+    if _plugins_loaded:
+        return
+    _plugins_loaded = True
+
+    from importlib.metadata import entry_points
+
+    for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+        if entry_point.name in OPERATIONS:
+            continue  # built-in and earlier operations win
+        try:
+            loaded = entry_point.load()
+            if isinstance(loaded, Operation):
+                register_operation(loaded.name, loaded.function, loaded.arity, loaded.description)
+            else:
+                register_operation(entry_point.name, loaded)
+        except Exception as e:
+            warnings.warn(f"Could not load calculator operation '{entry_point.name}': {e}")
+
+
+def get_operation(name: str) -> Operation | None:
+    """
+    Look up an operation by name (case-sensitive).
+
+    Args:
+        name: Operation name
+
+    Returns:
+        The operation, or None if no operation has that name
+    """
+    operation = OPERATIONS.get(name)
+    if operation is None and not _plugins_loaded:
+        load_plugins()
+        operation = OPERATIONS.get(name)
+    return operation
+
+
+def operation_names() -> list[str]:
+    """Return the names of all operations, including plugins, in registration order."""
+    load_plugins()
+    return list(OPERATIONS)
+
+
+__all__ = [
+    'Operation', 'OPERATIONS', 'ENTRY_POINT_GROUP',
+    'register_operation', 'load_plugins', 'get_operation', 'operation_names',
+]
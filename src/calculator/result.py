@@ -0,0 +1,167 @@
+"""
+Structured calculation results.
+
+``Result`` carries either a value or an error code, so callers that
+evaluate many calculations (batch files, the HTTP server) can tell a
+ZeroDivisionError from an OverflowError without parsing printed text.
+Results are small (``__slots__``) and the error message is only formatted
+when it is read, so a failure costs no string building unless it is
+reported.
+
+Error codes are small integers; ``ERROR_KINDS[code]`` gives the name used
+in batch output and HTTP responses.
+"""
+
+# Error codes
+CODE_OK = 0
+CODE_FORMAT = 1      # the record does not have the expected fields
+CODE_OPERATION = 2   # unknown operation
+CODE_VALUE = 3       # ValueError, e.g. an operand is not a number
+CODE_DIVISION = 4    # ZeroDivisionError
+CODE_TYPE = 5        # TypeError
+CODE_OVERFLOW = 6    # OverflowError
+CODE_UNEXPECTED = 7  # any other exception
+
+# Error kinds, indexed by code
+ERROR_KINDS = ("", "format", "operation", "value", "division", "type", "overflow", "unexpected")
+
+# Exact-type lookup first; subclasses (e.g. decimal.DivisionByZero) fall
+# back to the isinstance checks in error_code
+_CODES_BY_TYPE = {
+    ValueError: CODE_VALUE,
+    ZeroDivisionError: CODE_DIVISION,
+    TypeError: CODE_TYPE,
+    OverflowError: CODE_OVERFLOW,
+}
+
+
+def error_code(error: BaseException) -> int:
+    """
+    Classify an exception raised by a calculation.
+
+    Args:
+        error: The exception
+
+    Returns:
+        One of the ``CODE_*`` error codes (never CODE_OK)
+    """
+    code = _CODES_BY_TYPE.get(type(error))
+    if code is not None:
+        return code
+    if isinstance(error, ValueError):
+        return CODE_VALUE
+    if isinstance(error, ZeroDivisionError):
+        return CODE_DIVISION
+    if isinstance(error, TypeError):
+        return CODE_TYPE
+    if isinstance(error, OverflowError):
+        return CODE_OVERFLOW
+    return CODE_UNEXPECTED
+
+
+class Result:
+    """
+    The outcome of one calculation.
+
+    Attributes:
+        value: The result, or None if the calculation failed
+        code: ``CODE_OK`` or one of the ``CODE_*`` error codes
+    """
+
+    __slots__ = ('value', 'code', '_detail')
+
+    def __init__(self, value: object = None, code: int = CODE_OK, detail: object = None) -> None:
+        """
+        Create a result; prefer ``Result.success`` and ``Result.failure``.
+
+        Args:
+            value: The result value
+            code: Error code
+            detail: The exception or message text for failures
+        """
+        self.value = value
+        self.code = code
+        self._detail = detail
+
+    @classmethod
+    def success(cls, value: object) -> "Result":
+        """Create a successful result."""
+        return cls(value)
+
+    @classmethod
+    def failure(cls, error: BaseException) -> "Result":
+        """Create a failed result from an exception; the message is formatted on demand."""
+        return cls(None, error_code(error), error)
+
+    @property
+    def ok(self) -> bool:
+        """True if the calculation succeeded."""
+        return self.code == CODE_OK
+
+    @property
+    def kind(self) -> str:
+        """Error kind name, empty on success."""
+        return ERROR_KINDS[self.code]
+
+    @property
+    def message(self) -> str:
+        """Error message, empty on success."""
+        detail = self._detail
+        if detail is None:
+            return ""
+        if isinstance(detail, BaseException):
+            detail = self._detail = str(detail)
+        return detail
+
+    def unwrap(self) -> object:
+        """
+        Return the value, raising the original error if the calculation failed.
+
+        Raises:
+            Exception: The exception of a failed calculation, or ValueError
+                for failures without one (e.g. an unknown operation)
+        """
+        if self.code == CODE_OK:
+            return self.value
+        if isinstance(self._detail, BaseException):
+            raise self._detail
+        raise ValueError(self.message)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Result):
+            return NotImplemented
+        return (self.code, self.value, self.message) == (other.code, other.value, other.message)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        if self.code == CODE_OK:
+            return f"Result({self.value!r})"
+        return f"Result(error={self.kind!r}, message={self.message!r})"
+
+    def __reduce__(self):
+        # Exceptions do not always pickle; send the message text across processes
+        return (Result, (self.value, self.code, self.message or None))
+
+
+def error_counts(results) -> dict:
+    """
+    Count failed results by error kind.
+
+    Args:
+        results: Iterable of ``Result``
+
+    Returns:
+        Dict mapping error kind to count, only for kinds that occurred
+    """
+    counts = [0] * len(ERROR_KINDS)
+    for result in results:
+        counts[result.code] += 1
+    return {ERROR_KINDS[code]: count for code, count in enumerate(counts) if code != CODE_OK and count}
+
+
+__all__ = [
+    'Result', 'error_code', 'error_counts', 'ERROR_KINDS',
+    'CODE_OK', 'CODE_FORMAT', 'CODE_OPERATION', 'CODE_VALUE', 'CODE_DIVISION',
+    'CODE_TYPE', 'CODE_OVERFLOW', 'CODE_UNEXPECTED',
+]
@@ -0,0 +1,247 @@
+"""
+Streaming batch evaluation for the calculator CLI (``calculator --batch``).
+
+Records of the form ``op,x,y`` are read one line at a time from a file or
+stdin (comma, tab or whitespace separated; an optional ``op,x,y`` header
+line is skipped), evaluated with the same parsing and error handling as
+``safe_calculate``, and written out immediately. Memory use does not
+depend on the input size.
+
+Every input record produces exactly one output record with the fields
+``line, operation, x, y, result, error, message``. ``error`` is empty on
+success, otherwise one of the ``ERROR_*`` kinds below, so failed rows stay
+machine-parseable instead of being printed as free text.
+"""
+import csv
+import json
+import math
+import sys
+import time
+from typing import Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from .cli import try_calculate
+from .registry import get_operation
+from .result import (
+    CODE_DIVISION, CODE_FORMAT, CODE_OPERATION, CODE_OVERFLOW, CODE_TYPE, CODE_UNEXPECTED, CODE_VALUE,
+    ERROR_KINDS,
+)
+
+# Error kinds, mirroring the messages printed by safe_calculate
+ERROR_FORMAT = ERROR_KINDS[CODE_FORMAT]          # the record does not have three fields
+ERROR_OPERATION = ERROR_KINDS[CODE_OPERATION]    # unknown or non-binary operation
+ERROR_VALUE = ERROR_KINDS[CODE_VALUE]            # operand is not a number
+ERROR_DIVISION = ERROR_KINDS[CODE_DIVISION]      # ZeroDivisionError
+ERROR_TYPE = ERROR_KINDS[CODE_TYPE]              # TypeError
+ERROR_OVERFLOW = ERROR_KINDS[CODE_OVERFLOW]      # OverflowError
+ERROR_UNEXPECTED = ERROR_KINDS[CODE_UNEXPECTED]  # any other exception
+
+OUTPUT_FIELDS = ("line", "operation", "x", "y", "result", "error", "message")
+OUTPUT_FORMATS = ("csv", "jsonl")
+
+Record = Tuple[int, List[str]]
+OutputRecord = Tuple[int, str, str, str, object, str, str]
+
+
+def read_records(lines: Iterable[str]) -> Iterator[Record]:
+    """
+    Split input lines into ``(line number, fields)`` records.
+
+    Blank lines and a leading ``op,x,y`` header are skipped.
+
+    Args:
+        lines: Input lines, e.g. an open file
+
+    Yields:
+        Tuple of the 1-based line number and the stripped fields
+    """
+    for line_number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+        if '\t' in line:
+            fields = line.split('\t')
+        elif ',' in line:
+            fields = line.split(',')
+        else:
+            fields = line.split()
+        fields = [field.strip() for field in fields]
+        if line_number == 1 and fields[0] in ("op", "operation"):
+            continue
+        yield line_number, fields
+
+
+def calculate_row(operation: str, x: str, y: str, backend=None) -> Tuple[object, str, str]:
+    """
+    Evaluate one record without printing.
+
+    Args:
+        operation: Operation name
+        x: First operand as text
+        y: Second operand as text
+        backend: Numeric backend from ``backends.get_backend``, float if omitted
+
+    Returns:
+        Tuple of (result, error kind, message); result is None and error
+        kind is set when the calculation fails
+    """
+    entry = get_operation(operation)
+    if entry is not None and entry.arity != 2:
+        message = f"{operation} takes {entry.arity} operands and is not supported in op,x,y batches"
+        return None, ERROR_OPERATION, message
+    result = try_calculate(operation, x, y, backend=backend)
+    return result.value, result.kind, result.message
+
+
+def json_value(result: object) -> object:
+    """Return a result in a form JSON can represent exactly."""
+    if isinstance(result, float):
+        if not math.isfinite(result):
+            return str(result)  # JSON has no NaN/inf literals
+    elif result is not None and not isinstance(result, int):
+        return str(result)  # Decimal and Fraction keep their exact text
+    return result
+
+
+def evaluate_records(records: Iterable[Record], backend=None) -> Iterator[OutputRecord]:
+    """
+    Evaluate records lazily.
+
+    Args:
+        records: Records from ``read_records``
+        backend: Numeric backend, float if omitted
+
+    Yields:
+        One output record per input record, with fields ``OUTPUT_FIELDS``
+    """
+    for line_number, fields in records:
+        if len(fields) != 3:
+            message = f"Expected 3 fields (op,x,y), got {len(fields)}"
+            yield line_number, fields[0], "", "", None, ERROR_FORMAT, message
+            continue
+        operation, x, y = fields
+        result, error, message = calculate_row(operation, x, y, backend)
+        yield line_number, operation, x, y, result, error, message
+
+
+def write_records(records: Iterable[OutputRecord], output: TextIO, output_format: str = "csv") -> Tuple[int, int]:
+    """
+    Write output records incrementally.
+
+    Args:
+        records: Output records from ``evaluate_records``
+        output: Text stream to write to
+        output_format: 'csv' (with a header row) or 'jsonl'
+
+    Returns:
+        Tuple of (rows written, rows with errors)
+
+    Raises:
+        ValueError: If the output format is not supported
+    """
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Invalid output format: {output_format}. Valid formats are: {', '.join(OUTPUT_FORMATS)}")
+
+    rows = 0
+    errors = 0
+    if output_format == "csv":
+        writer = csv.writer(output, lineterminator='\n')
+        writer.writerow(OUTPUT_FIELDS)
+        for record in records:
+            rows += 1
+            if record[5]:
+                errors += 1
+            writer.writerow(("" if value is None else value) for value in record)
+    else:
+        for record in records:
+            rows += 1
+            if record[5]:
+                errors += 1
+            result = json_value(record[4])
+            output.write(json.dumps(dict(zip(OUTPUT_FIELDS, record[:4] + (result,) + record[5:]))))
+            output.write('\n')
+    return rows, errors
+
+
+class _InputError(Exception):
+    """Reading the batch input failed; wraps the original error."""
+
+
+def _open_input(source: str) -> TextIO:
+    """Open a batch input file as UTF-8 text."""
+    try:
+        return open(source, newline='', encoding='utf-8')
+    except OSError as e:
+        raise _InputError(e) from e
+
+
+def _read_lines(stream: Iterable[str]) -> Iterator[str]:
+    """
+    Yield the lines of ``stream``.
+
+    Read and decoding errors become ``_InputError``, so they are told
+    apart from errors writing the output, which happen in the same loop.
+    """
+    try:
+        yield from stream
+    except (OSError, UnicodeDecodeError) as e:
+        raise _InputError(e) from e
+
+
+def _input_error_message(error: Exception) -> str:
+    if isinstance(error, UnicodeDecodeError):
+        return f"input is not valid {error.encoding} text ({error.reason})"
+    return str(error)
+
+
+def run_batch(source: str, output_format: str = "csv", output: Optional[TextIO] = None,
+              report: Optional[TextIO] = None, backend=None, stats=None) -> int:
+    """
+    Stream a batch file through the calculator.
+
+    Args:
+        source: Path of the input file, or '-' for stdin
+        output_format: 'csv' or 'jsonl'
+        output: Where results are written, stdout by default
+        report: Where the throughput summary is written, stderr by default
+        backend: Numeric backend, float if omitted
+        stats: ``streamstats.ResultStats`` that every result is added to
+
+    Returns:
+        0 if every row succeeded, 1 if any row failed or the input could
+        not be read
+    """
+    if output is None:
+        output = sys.stdout
+    if report is None:
+        report = sys.stderr
+
+    def evaluate(lines):
+        records = evaluate_records(read_records(lines), backend)
+        return records if stats is None else stats.observe(records)
+
+    start = time.perf_counter()
+    try:
+        if source == "-":
+            rows, errors = write_records(evaluate(_read_lines(sys.stdin)), output, output_format)
+        else:
+            with _open_input(source) as stream:
+                rows, errors = write_records(evaluate(_read_lines(stream)), output, output_format)
+        output.flush()
+    except _InputError as e:
+        print(f"Error: Cannot read batch input '{source}': {_input_error_message(e.args[0])}", file=report)
+        return 1
+    except OSError as e:  # EPIPE, a full disk
+        print(f"Error: Cannot write results: {e}", file=report)
+        return 1
+    elapsed = time.perf_counter() - start
+
+    rate = rows / elapsed if elapsed > 0 else 0.0
+    print(f"Processed {rows} rows ({errors} errors) in {elapsed:.3f}s: {rate:,.0f} rows/sec", file=report)
+    return 0 if errors == 0 else 1
+
+
+__all__ = [
+    'read_records', 'calculate_row', 'evaluate_records', 'write_records', 'run_batch',
+    'json_value',
+    'OUTPUT_FIELDS', 'OUTPUT_FORMATS',
+]
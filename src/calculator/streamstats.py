@@ -0,0 +1,442 @@
+"""
+One-pass statistics over calculation results.
+
+``ResultStats`` summarizes a stream of results without keeping them:
+
+- count, failures by error kind, and NaN / +inf / -inf counts;
+- mean and variance of the finite results (Welford's algorithm);
+- exact minimum and maximum;
+- approximate quantiles from a ``QuantileSketch``.
+
+Memory use does not depend on the number of results. Every part can be
+merged, so workers can summarize their own share of a batch and the parent
+merges the summaries::
+
+    stats = ResultStats()
+    for worker_stats in partial_summaries:
+        stats.merge(worker_stats)
+    stats.summary()  # {'count': ..., 'mean': ..., 'quantiles': {'0.5': ...}, ...}
+
+``QuantileSketch`` is a KLL sketch (Karnin, Lang and Liberty, "Optimal
+Quantile Approximation in Streams", 2016). It keeps levels of sorted
+samples. When level ``h`` fills up, every other item moves to level
+``h + 1`` with twice the weight. With the default ``k = 200`` it holds
+about 600 values, and quantile ranks are typically within 1% of the true
+rank. Fewer values than fit in the sketch give exact quantiles.
+"""
+import json
+import math
+import random
+import sys
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from .result import ERROR_KINDS
+
+DEFAULT_QUANTILES = (0.5, 0.9, 0.99)
+
+# Finite results buffered before they are folded into the statistics
+CHUNK_SIZE = 4096
+
+# Level capacities shrink by this factor per level below the top
+_DECAY = 2 / 3
+
+
+class QuantileSketch:
+    """
+    Mergeable approximate quantiles of a stream of floats (KLL sketch).
+
+    Attributes:
+        k: Capacity of the top level; accuracy improves and memory grows with k
+        count: Number of values added
+    """
+
+    __slots__ = ('k', 'count', 'min', 'max', '_levels', '_capacities', '_size', '_max_size', '_random')
+
+    def __init__(self, k: int = 200, seed: Optional[int] = 0) -> None:
+        """
+        Create an empty sketch.
+
+        Args:
+            k: Accuracy parameter, at least 8
+            seed: Seed for choosing which half of a level survives a
+                compaction; the same values in the same order give the same
+                sketch. None seeds from the system.
+
+        Raises:
+            ValueError: If k is less than 8
+        """
+        if k < 8:
+            raise ValueError(f"k must be at least 8, got {k}")
+        self.k = k
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self._levels: List[List[float]] = []
+        self._capacities: List[int] = []
+        self._size = 0
+        self._max_size = 0
+        self._random = random.Random(seed)
+        self._grow()
+
+    def __repr__(self) -> str:
+        return f"QuantileSketch(k={self.k}, count={self.count}, retained={self._size})"
+
+    @property
+    def retained(self) -> int:
+        """Number of values currently stored."""
+        return self._size
+
+    def _grow(self) -> None:
+        """Add a level on top; the capacities of the levels below shrink."""
+        self._levels.append([])
+        height = len(self._levels)
+        self._capacities = [int(self.k * _DECAY ** (height - level - 1)) + 2 for level in range(height)]
+        # The bottom level doubles as the input buffer: compacting it sorts
+        # and halves k values at a time instead of a handful
+        self._capacities[0] = max(self._capacities[0], self.k)
+        self._max_size = sum(self._capacities)
+
+    def add(self, value: float) -> None:
+        """Add one value (NaN is not allowed)."""
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self.count += 1
+        self._levels[0].append(value)
+        self._size += 1
+        if self._size >= self._max_size:
+            self._compress()
+
+    def update(self, values: Iterable[float]) -> "QuantileSketch":
+        """Add every value of an iterable; returns self."""
+        values = values if isinstance(values, list) else list(values)
+        if not values:
+            return self
+        self.min = min(self.min, min(values))
+        self.max = max(self.max, max(values))
+        self.count += len(values)
+        start = 0
+        while start < len(values):
+            # Fill the bottom level up to the next compaction in one step
+            stop = start + max(self._max_size - self._size, 1)
+            piece = values[start:stop]
+            self._levels[0].extend(piece)
+            self._size += len(piece)
+            if self._size >= self._max_size:
+                self._compress()
+            start = stop
+        return self
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        """Add another sketch's values to this one; returns self."""
+        while len(self._levels) < len(other._levels):
+            self._grow()
+        for level, items in zip(self._levels, other._levels):
+            level.extend(items)
+        self.count += other.count
+        self._size += other._size
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        while self._size >= self._max_size:
+            self._compress()
+        return self
+
+    def _compress(self) -> None:
+        """Halve the lowest levels that are over capacity into the levels above them."""
+        for height in range(len(self._levels)):
+            items = self._levels[height]
+            if len(items) >= self._capacities[height]:
+                if height + 1 == len(self._levels):
+                    self._grow()
+                items.sort()
+                # An odd item out stays behind, so weights are preserved exactly
+                keep = [items.pop()] if len(items) % 2 else []
+                promoted = items[self._random.getrandbits(1)::2]
+                self._levels[height + 1].extend(promoted)
+                self._levels[height] = keep
+                self._size -= len(items) - len(promoted)
+                if self._size < self._max_size:
+                    return
+
+    def _weighted(self) -> List[Tuple[float, int]]:
+        """Stored values with their weights, sorted by value."""
+        weighted = [(value, 1 << height) for height, items in enumerate(self._levels) for value in items]
+        weighted.sort()
+        return weighted
+
+    def quantiles(self, fractions: Sequence[float]) -> List[float]:
+        """
+        Approximate quantiles, e.g. ``quantiles([0.5, 0.99])``.
+
+        Fractions 0 and 1 give the exact minimum and maximum. An empty
+        sketch gives NaN.
+
+        Raises:
+            ValueError: If a fraction is outside [0, 1]
+        """
+        for q in fractions:
+            if not 0 <= q <= 1:
+                raise ValueError(f"Quantile must be between 0 and 1, got {q}")
+        if not self.count:
+            return [math.nan] * len(fractions)
+        weighted = self._weighted()
+        results = []
+        for q in fractions:
+            if q == 0:
+                results.append(self.min)
+                continue
+            if q == 1:
+                results.append(self.max)
+                continue
+            rank = q * self.count
+            seen = 0
+            for value, weight in weighted:
+                seen += weight
+                if seen >= rank:
+                    results.append(value)
+                    break
+            else:
+                results.append(self.max)
+        return results
+
+    def quantile(self, q: float) -> float:
+        """Approximate quantile ``q`` (0.5 for the median). See ``quantiles``."""
+        return self.quantiles([q])[0]
+
+
+class ResultStats:
+    """
+    Streaming summary of calculation results.
+
+    Finite results are buffered and folded into the running mean, variance
+    and sketch ``CHUNK_SIZE`` at a time, which is much cheaper than doing
+    it per result.
+
+    Attributes:
+        count: Results observed, failed ones included
+        errors: Failures by error kind (see ``result.ERROR_KINDS``)
+        nan: NaN results
+        positive_inf: +inf results
+        negative_inf: -inf results
+    """
+
+    def __init__(self, quantiles: Sequence[float] = DEFAULT_QUANTILES, k: int = 200,
+                 seed: Optional[int] = 0) -> None:
+        """
+        Create an empty summary.
+
+        Args:
+            quantiles: Fractions reported by ``summary``
+            k: Accuracy parameter of the quantile sketch
+            seed: Seed of the quantile sketch
+        """
+        self.quantile_fractions = tuple(quantiles)
+        self.count = 0
+        self.errors: Dict[str, int] = {}
+        self.nan = 0
+        self.positive_inf = 0
+        self.negative_inf = 0
+        self._sketch = QuantileSketch(k, seed)
+        self._pending: List[float] = []
+        self._finite = 0
+        self._mean = 0.0
+        self._m2 = 0.0  # sum of squared deviations from the mean
+
+    def __repr__(self) -> str:
+        return f"ResultStats(count={self.count}, errors={sum(self.errors.values())})"
+
+    def add(self, value: object) -> None:
+        """Add one successful result: a float, int, Decimal or Fraction."""
+        self.count += 1
+        try:
+            x = float(value)
+        except OverflowError:  # an int or Fraction beyond float range
+            x = math.inf if value > 0 else -math.inf
+        if x - x == 0:
+            self._pending.append(x)
+            if len(self._pending) >= CHUNK_SIZE:
+                self._flush()
+        elif x != x:
+            self.nan += 1
+        elif x > 0:
+            self.positive_inf += 1
+        else:
+            self.negative_inf += 1
+
+    def add_error(self, kind: str) -> None:
+        """Count one failed calculation of error kind ``kind``."""
+        self.count += 1
+        self.errors[kind] = self.errors.get(kind, 0) + 1
+
+    def update(self, values: Iterable[object]) -> "ResultStats":
+        """Add successful results; returns self."""
+        iterator = iter(values)
+        while True:
+            chunk = list(islice(iterator, CHUNK_SIZE))
+            if not chunk:
+                return self
+            try:
+                floats = [float(value) for value in chunk]
+                total = math.fsum(floats)
+            except (OverflowError, ValueError):  # huge ints, inf - inf, or an overflowing sum
+                total = math.nan
+            if total - total != 0:
+                for value in chunk:  # sort out the special values one by one
+                    self.add(value)
+                continue
+            self.count += len(floats)
+            self._pending.extend(floats)
+            if len(self._pending) >= CHUNK_SIZE:
+                self._flush()
+
+    def update_columns(self, results: Iterable[float], codes: Iterable[int]) -> "ResultStats":
+        """Add a columnar result window: result values and their error codes; returns self."""
+        for value, code in zip(results, codes):
+            if code:
+                self.add_error(ERROR_KINDS[code])
+            else:
+                self.add(value)
+        return self
+
+    def observe(self, records: Iterable[tuple]) -> Iterator[tuple]:
+        """
+        Pass streaming batch output records through, adding each result.
+
+        Args:
+            records: Records from ``streaming.evaluate_records``, with the
+                result and error kind at positions 4 and 5
+
+        Yields:
+            The same records, unchanged
+        """
+        for record in records:
+            if record[5]:
+                self.add_error(record[5])
+            else:
+                self.add(record[4])
+            yield record
+
+    def _combine(self, count: int, mean: float, m2: float) -> None:
+        """Chan et al.'s pairwise update of the mean and squared deviations."""
+        if not count:
+            return
+        if not self._finite:
+            self._finite, self._mean, self._m2 = count, mean, m2
+            return
+        total = self._finite + count
+        delta = mean - self._mean
+        self._mean += delta * (count / total)
+        self._m2 += m2 + delta * delta * (self._finite * count / total)
+        self._finite = total
+
+    def _flush(self) -> None:
+        """Fold the buffered finite results into the running statistics."""
+        chunk = self._pending
+        if not chunk:
+            return
+        self._pending = []
+        try:
+            mean = math.fsum(chunk) / len(chunk)
+        except OverflowError:  # the sum is beyond float range, the mean is not
+            mean = math.fsum([x / len(chunk) for x in chunk])
+        try:
+            m2 = math.fsum([(x - mean) * (x - mean) for x in chunk])
+        except OverflowError:
+            m2 = math.inf
+        self._combine(len(chunk), mean, m2)
+        self._sketch.update(chunk)
+
+    def merge(self, other: "ResultStats") -> "ResultStats":
+        """Add another summary's results to this one; returns self."""
+        self._flush()
+        other._flush()
+        self.count += other.count
+        for kind, count in other.errors.items():
+            self.errors[kind] = self.errors.get(kind, 0) + count
+        self.nan += other.nan
+        self.positive_inf += other.positive_inf
+        self.negative_inf += other.negative_inf
+        self._sketch.merge(other._sketch)
+        self._combine(other._finite, other._mean, other._m2)
+        return self
+
+    @property
+    def sketch(self) -> QuantileSketch:
+        """Quantile sketch of the finite results."""
+        self._flush()
+        return self._sketch
+
+    @property
+    def finite(self) -> int:
+        """Number of finite results."""
+        return self._finite + len(self._pending)
+
+    @property
+    def mean(self) -> float:
+        """Mean of the finite results, NaN if there are none."""
+        self._flush()
+        return self._mean if self._finite else math.nan
+
+    @property
+    def variance(self) -> float:
+        """Sample variance of the finite results, NaN for fewer than two."""
+        self._flush()
+        return self._m2 / (self._finite - 1) if self._finite > 1 else math.nan
+
+    def summary(self) -> Dict[str, object]:
+        """
+        The statistics as a dict of plain values.
+
+        ``mean``, ``variance``, ``stdev``, ``min``, ``max`` and the
+        quantiles describe the finite results only and are None when there
+        are none (``variance`` and ``stdev`` need two). A mean or variance
+        beyond float range is the string 'inf', as in JSON batch output.
+        """
+        sketch = self.sketch
+        finite = self._finite
+
+        def value(x: float) -> Union[float, str, None]:
+            if not finite or math.isnan(x):
+                return None
+            return x if x - x == 0 else str(x)  # JSON has no inf literal
+
+        variance = self.variance
+        quantiles = sketch.quantiles(self.quantile_fractions)
+        return {
+            "count": self.count,
+            "ok": self.count - sum(self.errors.values()),
+            "errors": dict(self.errors),
+            "finite": finite,
+            "nan": self.nan,
+            "positive_inf": self.positive_inf,
+            "negative_inf": self.negative_inf,
+            "mean": value(self.mean),
+            "variance": value(variance),
+            "stdev": value(math.sqrt(variance)) if finite > 1 else None,
+            "min": value(sketch.min),
+            "max": value(sketch.max),
+            "quantiles": {f"{q:g}": value(x) for q, x in zip(self.quantile_fractions, quantiles)},
+        }
+
+
+def write_summary(destination: str, stats: ResultStats, stream=None) -> None:
+    """
+    Write ``stats.summary()`` as JSON to a file, or to ``stream`` (stderr by
+    default) for '-'.
+
+    Raises:
+        OSError: If the file cannot be written
+    """
+    text = json.dumps(stats.summary(), indent=2) + "\n"
+    if destination == "-":
+        stream = stream if stream is not None else sys.stderr
+        stream.write(text)
+        stream.flush()
+        return
+    with open(destination, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+
+__all__ = ['ResultStats', 'QuantileSketch', 'write_summary', 'DEFAULT_QUANTILES']
@@ -0,0 +1,261 @@
+"""
+Windowed evaluation of very large columnar job files.
+
+``evaluate_file`` walks a columnar job table (see ``columnar.py``) in
+fixed-size windows of rows. For every window only that slice of each
+input column and of the output columns is memory-mapped, so resident
+memory stays at a few windows' worth of pages however large the files
+are. Results go into a result table that is preallocated at its final size
+and filled in place.
+
+After each window the output pages are flushed to disk and the number of
+completed rows is recorded in a small progress file next to the output
+(``<output>.progress``, replaced atomically). If the process dies, calling
+``evaluate_file(..., resume=True)`` continues from the last completed
+window. The progress file is removed once the whole table is done::
+
+    python -m src.calculator.cli --batch huge.ccol --format binary --output results.ccol --resume
+"""
+import json
+import mmap
+import os
+import sys
+import time
+from typing import Callable, Dict, Optional, TextIO, Tuple
+
+from .columnar import RESULT_COLUMNS, TYPE_UINT8, column_layout, decode_header, encode_header, evaluate_columns
+
+DEFAULT_WINDOW = 1 << 20  # rows per window
+PROGRESS_SUFFIX = ".progress"
+
+# Enough to hold any header written by columnar.encode_header for a job table
+_HEADER_READ_SIZE = 1 << 16
+
+
+def progress_path(output: str) -> str:
+    """Return the progress file used for ``output``."""
+    return output + PROGRESS_SUFFIX
+
+
+def read_layout(path: str) -> Tuple[dict, Dict[str, Tuple[int, str, int]]]:
+    """
+    Read only the header of a columnar file.
+
+    Returns:
+        Tuple of (header, column name to ``(offset, typecode, size)``)
+
+    Raises:
+        ValueError: If the file is not a valid columnar table
+    """
+    with open(path, 'rb') as f:
+        prefix = f.read(_HEADER_READ_SIZE)
+        header, data_offset = decode_header(prefix)
+        size = os.fstat(f.fileno()).st_size
+    layout = column_layout(header["rows"], header["columns"], data_offset)
+    for name, (offset, _, length) in layout.items():
+        if offset + length > size:
+            raise ValueError(f"Columnar file '{path}' is truncated in column '{name}'")
+    return header, layout
+
+
+class _Window:
+    """Maps the byte range of one column window, aligned as mmap requires."""
+
+    def __init__(self, fileno: int, offset: int, length: int, typecode: str, access: int) -> None:
+        start = offset - offset % mmap.ALLOCATIONGRANULARITY
+        self._map = mmap.mmap(fileno, offset - start + length, access=access, offset=start)
+        self._bytes = memoryview(self._map)[offset - start:offset - start + length]
+        self.view = self._bytes.cast(typecode)
+
+    def close(self, flush: bool = False) -> None:
+        self.view.release()
+        self._bytes.release()
+        if flush:
+            self._map.flush()
+        self._map.close()
+
+
+def _preallocate(output: str, rows: int) -> Dict[str, Tuple[int, str, int]]:
+    """Create the result table at its final size (sparse where supported)."""
+    prefix = encode_header(rows, RESULT_COLUMNS)
+    layout = column_layout(rows, RESULT_COLUMNS, len(prefix))
+    end = max(offset + size for offset, _, size in layout.values())
+    with open(output, 'wb') as f:
+        f.write(prefix)
+        f.truncate(end + (-end % 8))
+    return layout
+
+
+def _write_progress(path: str, state: dict) -> None:
+    """Replace the progress file atomically, after its contents are on disk."""
+    temporary = path + ".tmp"
+    with open(temporary, 'w', encoding='utf-8') as f:
+        json.dump(state, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporary, path)
+
+
+def _resume_point(output: str, source: str, rows: int) -> int:
+    """Return the number of rows already completed in ``output``, 0 to start over."""
+    try:
+        with open(progress_path(output), encoding='utf-8') as f:
+            state = json.load(f)
+        header, _ = read_layout(output)
+    except (OSError, ValueError):
+        return 0
+    source_stat = os.stat(source)
+    if (state.get("rows") != rows or header["rows"] != rows
+            or state.get("source_size") != source_stat.st_size
+            or state.get("source_mtime_ns") != source_stat.st_mtime_ns):
+        return 0  # a different job file; the partial output is not reusable
+    return min(max(int(state.get("completed", 0)), 0), rows)
+
+
+def _count_errors(results_file, layout: Dict[str, Tuple[int, str, int]], rows: int, window: int) -> int:
+    """Count the failed rows among the first ``rows`` of a result table, window by window."""
+    offset, typecode, _ = layout['error']
+    errors = 0
+    for first in range(0, rows, window):
+        count = min(window, rows - first)
+        codes = _Window(results_file.fileno(), offset + first, count, typecode, mmap.ACCESS_READ)
+        try:
+            errors += count - codes.view.tobytes().count(0)
+        finally:
+            codes.close()
+    return errors
+
+
+def evaluate_file(source: str, output: str, window: int = DEFAULT_WINDOW, resume: bool = False,
+                  on_window: Optional[Callable[[int, int], None]] = None, stats=None) -> Dict[str, object]:
+    """
+    Evaluate a columnar job file into a columnar result file, window by window.
+
+    Args:
+        source: Columnar job table with op, x and y columns
+        output: Result table to create (or continue, with ``resume``)
+        window: Rows per window
+        resume: Continue from the progress file of an interrupted run, if
+            it matches ``source``; otherwise start over
+        on_window: Called as ``on_window(completed_rows, total_rows)`` after
+            each window is on disk
+        stats: ``streamstats.ResultStats`` that the results are added to;
+            after a resume it covers only the rows evaluated in this run
+
+    Returns:
+        Dict with rows, windows evaluated, errors in those windows,
+        resumed_from (the first row evaluated), previous_errors (failed
+        rows among those completed by earlier runs, 0 without a resume)
+        and seconds
+
+    Raises:
+        ValueError: If the window is not positive or the source is not a
+            job table
+        OSError: If a file cannot be read or written
+    """
+    if window < 1:
+        raise ValueError(f"window must be at least 1, got {window}")
+    header, layout = read_layout(source)
+    missing = [name for name in ('op', 'x', 'y') if name not in layout]
+    if missing:
+        raise ValueError(f"Not a job table, missing column(s): {', '.join(missing)}")
+    if header["byteorder"] != sys.byteorder:
+        raise ValueError("Windowed evaluation needs a job file in native byte order")
+    rows = header["rows"]
+    operations = header["operations"]
+
+    start_row = _resume_point(output, source, rows) if resume else 0
+    if start_row == 0:
+        output_layout = _preallocate(output, rows)
+    else:
+        output_layout = read_layout(output)[1]
+
+    source_stat = os.stat(source)
+    state = {"source": os.path.abspath(source), "source_size": source_stat.st_size,
+             "source_mtime_ns": source_stat.st_mtime_ns, "rows": rows, "completed": start_row}
+    progress = progress_path(output)
+    _write_progress(progress, state)
+
+    started = time.perf_counter()
+    windows = errors = 0
+    with open(source, 'rb') as jobs_file, open(output, 'r+b') as results_file:
+        # the exit status covers the whole table, not only this run's windows
+        previous_errors = _count_errors(results_file, output_layout, start_row, window) if start_row else 0
+        for first in range(start_row, rows, window):
+            count = min(window, rows - first)
+            inputs = []
+            outputs = []
+            try:
+                for name in ('op', 'x', 'y'):
+                    offset, typecode, _ = layout[name]
+                    size = count * _itemsize(typecode)
+                    inputs.append(_Window(jobs_file.fileno(), offset + first * _itemsize(typecode), size,
+                                          typecode, mmap.ACCESS_READ))
+                for name, _ in RESULT_COLUMNS:
+                    offset, typecode, _ = output_layout[name]
+                    size = count * _itemsize(typecode)
+                    outputs.append(_Window(results_file.fileno(), offset + first * _itemsize(typecode), size,
+                                           typecode, mmap.ACCESS_WRITE))
+                ops, xs, ys = (w.view for w in inputs)
+                results, codes = (w.view for w in outputs)
+                evaluate_columns(ops, xs, ys, operations, results, codes)
+                errors += count - codes.tobytes().count(0)
+                if stats is not None:
+                    stats.update_columns(results, codes)
+            finally:
+                for w in inputs:
+                    w.close()
+                for w in outputs:
+                    w.close(flush=True)  # results are on disk before progress says so
+            windows += 1
+            state["completed"] = first + count
+            _write_progress(progress, state)
+            if on_window is not None:
+                on_window(first + count, rows)
+
+    os.remove(progress)
+    return {"rows": rows, "windows": windows, "errors": errors, "resumed_from": start_row,
+            "previous_errors": previous_errors, "seconds": time.perf_counter() - started}
+
+
+def _itemsize(typecode: str) -> int:
+    return 1 if typecode == TYPE_UINT8 else 8
+
+
+def run_windowed(source: str, output: str, window: int = DEFAULT_WINDOW, resume: bool = False,
+                 report: Optional[TextIO] = None, stats=None) -> int:
+    """
+    Evaluate a columnar job file into ``output`` (``calculator --batch ... --output``).
+
+    Args:
+        source: Columnar job file
+        output: Result table path
+        window: Rows per window
+        resume: Continue an interrupted run
+        report: Where the throughput summary is written, stderr by default
+        stats: ``streamstats.ResultStats`` that the results are added to
+
+    Returns:
+        0 if every row of the result table succeeded, including rows
+        completed by an interrupted run that this one resumed; 1 if any
+        failed or a file could not be read or written
+    """
+    if report is None:
+        report = sys.stderr
+    try:
+        run = evaluate_file(source, output, window, resume, stats=stats)
+    except (OSError, ValueError) as e:
+        print(f"Error: Cannot evaluate '{source}' into '{output}': {e}", file=report)
+        return 1
+    evaluated = run["rows"] - run["resumed_from"]
+    seconds = run["seconds"]
+    rate = evaluated / seconds if seconds > 0 else 0.0
+    resumed = ""
+    if run["resumed_from"]:
+        resumed = f" (resumed at row {run['resumed_from']}, {run['previous_errors']} errors before)"
+    print(f"Processed {evaluated} rows{resumed} ({run['errors']} errors) in {run['windows']} windows, "
+          f"{seconds:.3f}s: {rate:,.0f} rows/sec", file=report)
+    return 0 if run["errors"] == 0 and run["previous_errors"] == 0 else 1
+
+
+__all__ = ['evaluate_file', 'run_windowed', 'read_layout', 'progress_path', 'DEFAULT_WINDOW', 'RESULT_COLUMNS']
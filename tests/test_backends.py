@@ -0,0 +1,180 @@
+"""Tests for the float, Decimal and Fraction numeric backends."""
+import math
+from decimal import Decimal
+from fractions import Fraction
+
+import pytest
+
+from src.calculator import add, subtract, multiply, divide, power, integer_divide, modulo
+from src.calculator.backends import Backend, DecimalBackend, calculate, get_backend
+from src.calculator.batch import add_many
+from src.calculator.cli import main, safe_calculate
+
+INF = float('inf')
+NAN = float('nan')
+SPECIAL_PAIRS = [(INF, INF), (INF, -INF), (-INF, 2.0), (3.0, INF), (-3.0, INF), (NAN, 1.0),
+                 (INF, 0.0), (0.5, INF), (2.0, -INF), (1.0, INF), (5.5, -INF)]
+FLOAT_FUNCTIONS = {
+    'add': add, 'subtract': subtract, 'multiply': multiply, 'divide': divide,
+    'power': power, 'integer_divide': integer_divide, 'modulo': modulo,
+}
+
+
+def _outcome(function, x, y):
+    """Result of a call, or the exception type it raised."""
+    try:
+        return function(x, y)
+    except Exception as e:
+        return type(e)
+
+
+def test_decimal_is_exact() -> None:
+    """Test that 0.1 + 0.2 is exactly 0.3 with Decimal."""
+    assert calculate('add', '0.1', '0.2', 'decimal') == Decimal('0.3')
+
+
+def test_decimal_precision() -> None:
+    """Test that the precision controls significant digits."""
+    result = get_backend('decimal', precision=5).calculate('divide', '1', '3')
+    assert result == Decimal('0.33333')
+
+
+@pytest.mark.parametrize("name", list(FLOAT_FUNCTIONS))
+def test_decimal_special_values_match_float(name: str) -> None:
+    """Test that NaN/inf operands follow the float backend's rules."""
+    backend = DecimalBackend()
+    for x, y in SPECIAL_PAIRS:
+        expected = _outcome(FLOAT_FUNCTIONS[name], x, y)
+        got = _outcome(backend.operation(name), Decimal(x), Decimal(y))
+        if isinstance(expected, type):
+            assert got is expected
+        elif isinstance(expected, float) and math.isnan(expected):
+            assert got.is_nan()
+        else:
+            assert got == expected
+            if expected == 0:
+                assert math.copysign(1, float(got)) == math.copysign(1, expected)
+
+
+def test_decimal_large_finite_operand_keeps_magnitude() -> None:
+    """Test that a finite Decimal slightly above 1 still grows to infinity."""
+    result = calculate('power', '1.0000000000000000000001', 'inf', 'decimal')
+    assert result == Decimal('Infinity')
+
+
+def test_decimal_floor_semantics() -> None:
+    """Test that integer_divide and modulo round toward negative infinity."""
+    assert calculate('integer_divide', '-7', '2', 'decimal') == -4
+    assert calculate('modulo', '-7', '2', 'decimal') == Decimal('1')
+
+
+def test_decimal_floor_quotient_beyond_precision(capsys) -> None:
+    """Test integer quotients with more digits than the context precision."""
+    assert calculate('integer_divide', '1e30', '1', 'decimal') == 10 ** 30
+    assert calculate('integer_divide', '-1e30', '7', 'decimal') == -(10 ** 30) // 7
+    assert calculate('modulo', '-1e30', '7', 'decimal') == Decimal((-(10 ** 30)) % 7)
+    assert get_backend('decimal', precision=5).calculate('modulo', '123456789', '0.001') == 0
+    assert main(['--backend', 'decimal', 'integer_divide', '1e30', '1']) == 0
+    assert capsys.readouterr().out == "Result: 1000000000000000000000000000000\n"
+
+
+def test_decimal_division_by_zero() -> None:
+    """Test that dividing by zero raises ZeroDivisionError."""
+    with pytest.raises(ZeroDivisionError):
+        calculate('divide', '1', '0', 'decimal')
+
+
+def test_fraction_is_exact() -> None:
+    """Test exact rational results."""
+    assert calculate('divide', '1', '3', 'fraction') == Fraction(1, 3)
+    assert calculate('power', '2/3', '2', 'fraction') == Fraction(4, 9)
+    assert calculate('modulo', '-7', '2', 'fraction') == Fraction(1)
+
+
+def test_fraction_rejects_special_values() -> None:
+    """Test that NaN and infinity cannot be used with fractions."""
+    with pytest.raises(ValueError):
+        calculate('add', INF, 1, 'fraction')
+    with pytest.raises(ValueError):
+        calculate('add', 'nan', '1', 'fraction')
+
+
+def test_integer_stays_exact() -> None:
+    """Test that int operands give ints, or Fractions where division is inexact."""
+    big = 10 ** 30 + 1
+    assert calculate('multiply', big, big, 'integer') == big * big
+    assert calculate('divide', '6', '3', 'integer') == 2
+    assert type(calculate('divide', '6', '3', 'integer')) is int
+    assert calculate('divide', big * 3, 3, 'integer') == big  # float mode rounds this
+    assert calculate('divide', '1', '3', 'integer') == Fraction(1, 3)
+    assert calculate('power', '2', '100', 'integer') == 2 ** 100
+    assert calculate('power', '2', '-2', 'integer') == Fraction(1, 4)
+    assert calculate('divide', '1/3', '2', 'integer') == Fraction(1, 6)
+    assert calculate('modulo', '-7', '2', 'integer') == 1
+
+
+def test_integer_falls_back_to_float() -> None:
+    """Test that float operands and special values behave as in float mode."""
+    assert calculate('add', '1.5', '2', 'integer') == 3.5
+    assert math.isnan(calculate('subtract', INF, INF, 'integer'))
+    assert calculate('power', '2.0', '2000', 'integer') == INF
+
+
+def test_integer_errors() -> None:
+    """Test integer mode errors where float mode would return inf."""
+    with pytest.raises(OverflowError):
+        calculate('power', '10', '100000000', 'integer')
+    with pytest.raises(ZeroDivisionError):
+        calculate('divide', '1', '0', 'integer')
+    with pytest.raises(ZeroDivisionError):
+        calculate('power', '0', '-1', 'integer')
+
+
+def test_exact_results_stay_printable(capsys, tmp_path) -> None:
+    """Test that results over Python's 4300-digit int-to-text limit are overflow errors."""
+    with pytest.raises(OverflowError):
+        calculate('power', '3', '10000', 'integer')
+    with pytest.raises(OverflowError):
+        calculate('multiply', 10 ** 4000, 10 ** 4000, 'fraction')
+    with pytest.raises(OverflowError):
+        calculate('integer_divide', '1e5000', '1', 'decimal')
+    assert calculate('power', '3', '9000', 'integer') == 3 ** 9000
+    assert main(['--backend', 'integer', 'power', '3', '10000']) == 1
+    assert capsys.readouterr().out.startswith("Overflow Error: Result exceeds")
+    jobs = tmp_path / "jobs.csv"
+    jobs.write_text("power,3,10000\npower,2,3\n")
+    assert main(['--backend', 'integer', '--batch', str(jobs)]) == 1
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[1].startswith("1,power,3,10000,,overflow,")
+    assert lines[2] == "2,power,2,3,8,,"
+
+
+def test_get_backend_errors() -> None:
+    """Test invalid backend selections."""
+    with pytest.raises(ValueError):
+        get_backend('binary')
+    with pytest.raises(ValueError):
+        get_backend('fraction', precision=10)
+    assert get_backend(precision=10).name == 'decimal'
+    with pytest.raises(TypeError):
+        Backend()  # abstract
+
+
+def test_batch_backend() -> None:
+    """Test selecting a backend per batch."""
+    assert add_many(['0.1', '0.2'], ['0.2', '0.1'], backend='decimal') == [Decimal('0.3'), Decimal('0.3')]
+
+
+def test_safe_calculate_backend() -> None:
+    """Test selecting a backend per call through safe_calculate."""
+    assert safe_calculate('add', '1/3', '1/6', backend=get_backend('fraction')) == Fraction(1, 2)
+
+
+def test_cli_precision_flag(capsys) -> None:
+    """Test the --precision and --backend CLI flags."""
+    assert main(['--precision', '10', 'divide', '2', '3']) == 0
+    assert capsys.readouterr().out == "Result: 0.6666666667\n"
+    assert main(['--backend', 'fraction', 'add', '1/3', '1/6']) == 0
+    assert capsys.readouterr().out == "Result: 1/2\n"
+    assert main(['--backend', 'integer', 'divide', '10', '4']) == 0
+    assert capsys.readouterr().out == "Result: 5/2\n"
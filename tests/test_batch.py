@@ -0,0 +1,118 @@
+"""Tests for the element-wise batch operations."""
+import array
+import math
+
+import pytest
+
+from src.calculator import add, subtract, multiply, divide, power, integer_divide, modulo
+from src.calculator.batch import (
+    apply_many, add_many, subtract_many, multiply_many, divide_many,
+    power_many, integer_divide_many, modulo_many,
+)
+
+INF = float('inf')
+NAN = float('nan')
+
+SPECIAL_XS = [1.0, -5.0, INF, -INF, NAN, 0.0, 2.5, INF, 3.0]
+SPECIAL_YS = [2.0, INF, -INF, -INF, 1.0, INF, -0.5, 0.0, 7.0]
+
+
+def _same(a, b) -> bool:
+    """Compare two results, treating NaN as equal to NaN and checking zero signs."""
+    if isinstance(a, float) and math.isnan(a):
+        return isinstance(b, float) and math.isnan(b)
+    if a == 0 and b == 0:
+        return math.copysign(1, a) == math.copysign(1, b)
+    return a == b
+
+
+def _scalar_or_nan(func, x, y):
+    """Scalar reference result, NaN for rows that raise."""
+    try:
+        return func(x, y)
+    except (ArithmeticError, TypeError, ValueError):
+        return NAN
+
+
+@pytest.mark.parametrize("batch_func, scalar_func", [
+    (add_many, add),
+    (subtract_many, subtract),
+    (multiply_many, multiply),
+    (divide_many, divide),
+    (power_many, power),
+    (integer_divide_many, integer_divide),
+    (modulo_many, modulo),
+])
+def test_batch_matches_scalar_semantics(batch_func, scalar_func) -> None:
+    """Test that every batch operation matches its scalar function row by row."""
+    results = batch_func(SPECIAL_XS, SPECIAL_YS, errors='nan')
+    expected = [_scalar_or_nan(scalar_func, x, y) for x, y in zip(SPECIAL_XS, SPECIAL_YS)]
+    assert len(results) == len(expected)
+    for got, want in zip(results, expected):
+        assert _same(float(got), float(want))
+
+
+def test_add_many_basic() -> None:
+    """Test adding two lists of numbers."""
+    assert add_many([1, 2, 3], [4, 5, 6]) == [5, 7, 9]
+
+
+def test_add_many_accepts_array_module() -> None:
+    """Test that array.array operands are accepted."""
+    xs = array.array('d', [1.0, 2.0])
+    ys = array.array('d', [0.5, 0.5])
+    assert [float(v) for v in add_many(xs, ys)] == [1.5, 2.5]
+
+
+def test_divide_many_raises_on_first_zero_divisor() -> None:
+    """Test that the default policy raises ZeroDivisionError."""
+    with pytest.raises(ZeroDivisionError):
+        divide_many([1.0, 2.0], [1.0, 0.0])
+
+
+def test_divide_many_nan_policy() -> None:
+    """Test that the 'nan' policy fills failing rows with NaN."""
+    results = divide_many([1.0, 2.0, 3.0], [1.0, 0.0, 3.0], errors='nan')
+    assert results[0] == 1.0
+    assert math.isnan(results[1])
+    assert results[2] == 1.0
+
+
+def test_divide_many_mask_policy() -> None:
+    """Test that the 'mask' policy returns a failure mask."""
+    results, failed = divide_many([1.0, 2.0], [0.0, 2.0], errors='mask')
+    assert list(failed) == [True, False]
+    assert math.isnan(results[0])
+    assert results[1] == 1.0
+
+
+def test_apply_many_invalid_operation() -> None:
+    """Test that unknown operations are rejected."""
+    with pytest.raises(ValueError):
+        apply_many('sqrt', [1.0], [1.0])
+
+
+def test_apply_many_invalid_policy() -> None:
+    """Test that unknown error policies are rejected."""
+    with pytest.raises(ValueError):
+        add_many([1.0], [1.0], errors='ignore')
+
+
+def test_apply_many_length_mismatch() -> None:
+    """Test that operand sequences must have equal lengths."""
+    with pytest.raises(ValueError):
+        add_many([1.0, 2.0], [1.0])
+
+
+def test_numpy_path_matches_scalar() -> None:
+    """Test that the vectorized NumPy path matches the scalar functions."""
+    np = pytest.importorskip("numpy")
+    xs = np.array(SPECIAL_XS)
+    ys = np.array(SPECIAL_YS)
+    for name, func in [('add', add), ('subtract', subtract), ('multiply', multiply),
+                       ('divide', divide), ('power', power),
+                       ('integer_divide', integer_divide), ('modulo', modulo)]:
+        results = apply_many(name, xs, ys, errors='nan')
+        assert isinstance(results, np.ndarray)
+        for got, x, y in zip(results, SPECIAL_XS, SPECIAL_YS):
+            assert _same(float(got), float(_scalar_or_nan(func, x, y)))
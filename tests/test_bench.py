@@ -0,0 +1,60 @@
+"""Tests for the built-in benchmark suite."""
+import json
+import os
+import tempfile
+
+from src.calculator.bench import Benchmark, compare, default_benchmarks, measure
+from src.calculator.cli import main
+
+
+def _report(p50_ns: float) -> dict:
+    """Build a minimal report with one result."""
+    return {'results': {'operation/add/int': {'p50_ns': p50_ns}}}
+
+
+def test_suite_covers_operations_cli_and_batch() -> None:
+    """Test that the suite includes every operation and input class, the CLI and batch modes."""
+    names = {benchmark.name for benchmark in default_benchmarks()}
+    for operation in ('add', 'subtract', 'multiply', 'divide', 'power', 'integer_divide', 'modulo'):
+        for kind in ('int', 'float', 'special', 'large_int'):
+            assert f"operation/{operation}/{kind}" in names
+    assert not any(name.startswith("operation/power_mod/") for name in names)  # arity 3
+    assert "cli/main" in names
+    assert "batch/streaming" in names
+
+
+def test_measure_reports_statistics() -> None:
+    """Test that measure returns ordered percentiles and a positive rate."""
+    result = measure(Benchmark("noop", lambda: None), repeat=5, sample_time=0.0005)
+    assert result['samples'] == 5
+    assert 0 < result['p50_ns'] <= result['p99_ns']
+    assert result['ops_per_sec'] > 0
+
+
+def test_compare_flags_regressions_above_threshold() -> None:
+    """Test that only slowdowns above the threshold are reported."""
+    assert compare(_report(105.0), _report(100.0), threshold=0.10) == []
+    (regression,) = compare(_report(120.0), _report(100.0), threshold=0.10)
+    assert regression['name'] == 'operation/add/int'
+    assert regression['ratio'] == 1.2
+
+
+def test_compare_ignores_new_benchmarks() -> None:
+    """Test that cases missing from the baseline are skipped."""
+    assert compare(_report(500.0), {'results': {}}) == []
+
+
+def test_bench_subcommand_writes_json_and_compares() -> None:
+    """Test the calculator bench subcommand end to end."""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "baseline.json")
+        assert main(['bench', '--filter', 'operation/add/int', '--repeat', '2', '--output', path]) == 0
+        with open(path) as f:
+            report = json.load(f)
+        assert list(report['results']) == ['operation/add/int']
+
+        report['results']['operation/add/int']['p50_ns'] = 1e-6  # impossibly fast baseline
+        with open(path, 'w') as f:
+            json.dump(report, f)
+        assert main(['bench', '--filter', 'operation/add/int', '--repeat', '2',
+                     '--output', os.path.join(directory, "current.json"), '--baseline', path]) == 1
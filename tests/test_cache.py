@@ -0,0 +1,104 @@
+"""Tests for the opt-in result cache."""
+import math
+
+import pytest
+
+from src.calculator.cache import ResultCache, disable_cache, enable_cache, make_key
+from src.calculator.cli import safe_calculate
+from src.calculator.registry import get_operation
+from src.calculator import power
+
+
+def test_keys_distinguish_equal_values_of_different_types() -> None:
+    """Test that 1, 1.0 and True produce different keys."""
+    keys = {make_key('power', (1, 2)), make_key('power', (1.0, 2)), make_key('power', (True, 2))}
+    assert len(keys) == 3
+
+
+def test_keys_distinguish_signed_zeros() -> None:
+    """Test that 0.0 and -0.0 produce different keys."""
+    assert make_key('divide', (1.0, 0.0)) != make_key('divide', (1.0, -0.0))
+
+
+def test_keys_match_for_nan() -> None:
+    """Test that NaN operands produce equal keys."""
+    assert make_key('add', (float('nan'), 1.0)) == make_key('add', (float('nan'), 1.0))
+
+
+def test_hits_and_misses_are_counted() -> None:
+    """Test the hit and miss counters."""
+    cache = ResultCache()
+    calls = []
+    for _ in range(3):
+        cache.get_or_compute('k', lambda: calls.append(1) or 42)
+    assert len(calls) == 1
+    assert cache.stats()['hits'] == 2
+    assert cache.stats()['misses'] == 1
+
+
+def test_lru_evicts_least_recently_used() -> None:
+    """Test that the LRU policy keeps recently used entries."""
+    cache = ResultCache(max_entries=2)
+    cache.get_or_compute('a', lambda: 1)
+    cache.get_or_compute('b', lambda: 2)
+    cache.get_or_compute('a', lambda: 1)  # 'a' is now most recently used
+    cache.get_or_compute('c', lambda: 3)  # evicts 'b'
+    assert cache.evictions == 1
+    assert cache.get_or_compute('a', lambda: -1) == 1
+    assert cache.get_or_compute('b', lambda: -2) == -2
+
+
+def test_ttl_entries_expire() -> None:
+    """Test that TTL entries are recomputed after they expire."""
+    now = [0.0]
+    cache = ResultCache(policy='ttl', ttl=10, clock=lambda: now[0])
+    cache.get_or_compute('a', lambda: 1)
+    now[0] = 5.0
+    assert cache.get_or_compute('a', lambda: 2) == 1
+    now[0] = 11.0
+    assert cache.get_or_compute('a', lambda: 3) == 3
+    assert cache.expirations == 1
+
+
+def test_max_memory_bounds_entries() -> None:
+    """Test that the memory limit evicts old entries."""
+    cache = ResultCache(max_entries=1000, max_memory=2000)
+    for i in range(100):
+        cache.get_or_compute(make_key('power', (i, 2)), lambda: float(i))
+    assert cache.memory <= 2000
+    assert cache.evictions > 0
+
+
+def test_invalid_options() -> None:
+    """Test that invalid cache options are rejected."""
+    with pytest.raises(ValueError):
+        ResultCache(policy='fifo')
+    with pytest.raises(ValueError):
+        ResultCache(policy='ttl')
+    with pytest.raises(ValueError):
+        ResultCache(max_entries=0)
+
+
+def test_enable_cache_wraps_registry() -> None:
+    """Test that enabling the cache affects registry callers until disabled."""
+    cache = enable_cache(['power'], max_entries=8)
+    try:
+        assert safe_calculate('power', '2', '10') == 1024.0
+        assert safe_calculate('power', '2', '10') == 1024.0
+        assert cache.stats()['hits'] == 1
+        assert math.isnan(get_operation('power').function(float('nan'), 2.0))
+    finally:
+        disable_cache()
+    assert get_operation('power').function is power
+
+
+def test_exceptions_are_not_cached() -> None:
+    """Test that failing calls raise every time and are not stored."""
+    cache = enable_cache(['divide'])
+    try:
+        for _ in range(2):
+            with pytest.raises(ZeroDivisionError):
+                get_operation('divide').function(1, 0)
+        assert len(cache) == 0
+    finally:
+        disable_cache(['divide'])
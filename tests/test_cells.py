@@ -0,0 +1,99 @@
+"""Tests for incremental spreadsheet cells."""
+import math
+
+import pytest
+
+from src.calculator.cells import Sheet
+from src.calculator.result import CODE_DIVISION, CODE_VALUE
+
+
+def _pricing_sheet() -> Sheet:
+    sheet = Sheet()
+    sheet.set('price', 100.0)
+    sheet.set('quantity', 3)
+    sheet.set('shipping', 7.5)
+    sheet.define('net', "price * quantity")
+    sheet.define('gross', "net * 1.2")
+    sheet.define('total', "gross + shipping")
+    sheet.define('per_item', "total / quantity")
+    return sheet
+
+
+def test_lazy_recompute_of_affected_cells_only() -> None:
+    """Test that an update recomputes only its downstream cells, on read."""
+    sheet = _pricing_sheet()
+    assert sheet['per_item'] == pytest.approx(122.5)
+    assert sheet.recomputed == 4
+
+    sheet.set('shipping', 10.0)
+    assert [sheet.is_dirty(name) for name in ('net', 'gross', 'total', 'per_item')] == [
+        False, False, True, True]
+    assert sheet.recomputed == 4  # nothing computed until read
+    assert sheet['total'] == pytest.approx(370.0)
+    assert sheet.recomputed == 5 and sheet.is_dirty('per_item')
+    assert sheet.recalculate() == 1
+    assert sheet.recalculate(everything=True) == 4
+
+    sheet.set('shipping', 10.0)  # unchanged value: nothing dirty
+    assert not sheet.is_dirty('total')
+
+
+def test_redefine_and_replace_formula_with_input() -> None:
+    """Test that dependency edges follow formula changes."""
+    sheet = _pricing_sheet()
+    sheet.recalculate()
+    sheet.define('gross', "net * 1.1 + shipping")
+    assert sheet.dependencies('gross') == ('net', 'shipping')
+    assert sheet.dependents('shipping') == {'gross', 'total'}
+    assert sheet['total'] == pytest.approx(345.0)
+
+    sheet.set('net', 50.0)  # formula cell becomes an input
+    assert sheet.dependents('price') == set()
+    assert sheet['total'] == pytest.approx(70.0)
+    assert len(sheet) == 7
+
+
+def test_cycles_are_rejected() -> None:
+    """Test that a formula closing a loop raises and changes nothing."""
+    sheet = _pricing_sheet()
+    with pytest.raises(ValueError, match="price -> per_item -> total -> gross -> net -> price"):
+        sheet.define('price', "per_item * 2")
+    with pytest.raises(ValueError, match="a -> a"):
+        sheet.define('a', "a + 1")
+    assert sheet['price'] == 100.0
+    assert sheet.dependencies('price') == ()
+
+
+def test_errors_propagate_to_dependents() -> None:
+    """Test that failures are stored and inherited, then cleared by a fix."""
+    sheet = _pricing_sheet()
+    sheet.set('quantity', 0)
+    assert sheet.result('per_item').code == CODE_DIVISION
+    with pytest.raises(ZeroDivisionError):
+        sheet['per_item']
+
+    sheet.define('scaled', "per_item * 2")
+    assert sheet.result('scaled').code == CODE_DIVISION
+    sheet.set('quantity', 2)
+    assert sheet['scaled'] == pytest.approx(2 * (240.0 + 7.5) / 2)
+
+    sheet.define('forward', "later + 1")  # undefined reference
+    assert sheet.result('forward').code == CODE_VALUE
+    sheet.set('later', float('inf'))
+    assert math.isinf(sheet['forward'])
+    sheet.remove('later')
+    assert sheet.result('forward').code == CODE_VALUE
+    with pytest.raises(KeyError):
+        sheet['later']
+
+
+def test_long_chains_do_not_recurse() -> None:
+    """Test recomputing a chain deeper than the recursion limit."""
+    sheet = Sheet()
+    sheet.set('c0', 0)
+    for i in range(1, 5001):
+        sheet.define(f'c{i}', f"c{i - 1} + 1")
+    assert sheet['c5000'] == 5000
+    sheet.set('c0', 10)
+    assert sheet['c5000'] == 5010
+    assert sheet.recomputed == 10000
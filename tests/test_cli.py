@@ -320,4 +320,39 @@ def test_unsupported_operation_case_sensitivity() -> None:
                 main()
             # Verify error message for invalid operation
             assert any('invalid' in str(call).lower() or 'unknown' in str(call).lower() 
-                      for call in mock_print.call_args_list)
\ No newline at end of file
+                      for call in mock_print.call_args_list)
+
+def test_fast_path_matches_parser_path(capsys: pytest.CaptureFixture) -> None:
+    """
+    Test that plain calculations give the same output with and without argparse.
+    
+    The option forces the full parser while leaving the calculation unchanged.
+    """
+    from src.calculator.cli import main
+    for args in (['add', '5', '3'], ['divide', '-7.5', '2'], ['divide', '1', '0'], ['power', '-2', '-.5']):
+        fast_code = main(list(args))
+        fast_output = capsys.readouterr().out
+        parser_code = main(['--backend', 'float', *args])
+        assert (fast_code, fast_output) == (parser_code, capsys.readouterr().out)
+
+
+def test_fast_path_leaves_options_to_the_parser(capsys: pytest.CaptureFixture) -> None:
+    """
+    Test that option-like operands are still handled by argparse.
+    
+    '-inf' is not a negative number to argparse, so it is a parse error.
+    """
+    from src.calculator.cli import main
+    assert main(['add', '-inf', '1']) == 1
+    assert "Result" not in capsys.readouterr().out
+
+
+def test_fast_path_does_not_import_argparse() -> None:
+    """
+    Test that a plain calculation in a fresh process never imports argparse or typing.
+    """
+    import subprocess
+    code = ("import sys; from src.calculator.cli import main; main(['add', '1', '2']); "
+            "print(sorted({'argparse', 'typing'} & set(sys.modules)))")
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout
+    assert output.splitlines() == ["Result: 3.0", "[]"]
@@ -0,0 +1,180 @@
+"""Tests for the binary columnar batch format."""
+import array
+import io
+import math
+import os
+import tempfile
+
+import pytest
+
+from src.calculator.cli import main
+from src.calculator.columnar import (
+    ColumnarTable, columnar_to_csv, csv_to_columnar, encode_records, evaluate_columns,
+    evaluate_table, evaluate_text, is_columnar, read_table, run_columnar, write_table,
+)
+from src.calculator.result import (
+    CODE_DIVISION, CODE_FORMAT, CODE_OK, CODE_OPERATION, CODE_OVERFLOW, CODE_VALUE, ERROR_KINDS,
+)
+from src.calculator.streaming import read_records
+
+JOBS_CSV = "op,x,y\nadd,1,2\ndivide,1,0\npower,2,0.5\nmodulo,inf,2\nhypot,3,4\n"
+
+
+def _jobs_bytes(text: str = JOBS_CSV, operand_type: str = 'd') -> bytes:
+    buffer = io.BytesIO()
+    csv_to_columnar(io.StringIO(text), buffer, operand_type)
+    return buffer.getvalue()
+
+
+def test_round_trip_is_zero_copy() -> None:
+    """Test that columns come back as typed memoryviews over the file data."""
+    data = _jobs_bytes()
+    with read_table(data) as table:
+        assert table.rows == 5
+        assert table.operations == ['add', 'divide', 'power', 'modulo', 'hypot']
+        assert isinstance(table['x'], memoryview) and table['x'].format == 'd'
+        assert list(table['op']) == [0, 1, 2, 3, 4]
+        assert list(table['y']) == [2.0, 0.0, 0.5, 2.0, 4.0]
+        assert table['x'].obj is table['y'].obj  # views of one buffer
+
+
+def test_int64_operands() -> None:
+    """Test int64 operand columns keep exact integers."""
+    with read_table(_jobs_bytes("add,9007199254740993,1\n", 'q')) as table:
+        assert table['x'].format == 'q'
+        assert table['x'][0] == 9007199254740993
+
+
+def test_evaluate_codes_and_results() -> None:
+    """Test per-row results and error codes."""
+    with read_table(_jobs_bytes()) as table:
+        columns = evaluate_table(table)
+    results, errors = columns['result'], columns['error']
+    assert results[0] == 3.0
+    assert results[2] == math.sqrt(2)
+    assert math.isnan(results[3])
+    assert list(errors) == [CODE_OK, CODE_DIVISION, CODE_OK, CODE_OK, CODE_OPERATION]
+
+
+def test_evaluate_window_and_overflow() -> None:
+    """Test evaluating a row range into preallocated outputs, and overflowing rows."""
+    ops = array.array('B', [0, 0, 0])
+    xs = array.array('q', [2**62, 1, 2])
+    ys = array.array('q', [2**62, 1, 3])
+    results = array.array('d', [-1.0] * 3)
+    errors = array.array('B', [9] * 3)
+    evaluate_columns(ops, xs, ys, ['multiply'], results, errors, start=0, stop=2)
+    assert list(errors) == [CODE_OK, CODE_OK, 9]
+    assert results[2] == -1.0
+    evaluate_columns(ops, xs, ys, ['power'], results, errors, start=2)
+    assert (results[2], errors[2]) == (8.0, CODE_OK)
+
+    results, errors = evaluate_columns(array.array('B', [0]), array.array('d', [1e308]),
+                                       array.array('d', [1e-308]), ['integer_divide'])
+    assert errors[0] == CODE_OVERFLOW
+    assert math.isnan(results[0])
+
+
+def test_result_table_to_csv_with_jobs() -> None:
+    """Test decoding opcodes and error codes back to text."""
+    data = _jobs_bytes()
+    buffer = io.BytesIO()
+    with read_table(data) as jobs:
+        write_table(buffer, evaluate_table(jobs))
+        output = io.StringIO()
+        with read_table(buffer.getvalue()) as results:
+            columnar_to_csv(results, output, jobs)
+    lines = output.getvalue().splitlines()
+    assert lines[0] == "operation,x,y,result,error"
+    assert lines[1] == "add,1.0,2.0,3.0,"
+    assert lines[2] == "divide,1.0,0.0,nan,division"
+
+
+def test_invalid_input_is_rejected() -> None:
+    """Test bad files and records raise ValueError."""
+    with pytest.raises(ValueError):
+        read_table(b"not a table")
+    with pytest.raises(ValueError):
+        read_table(_jobs_bytes()[:-8])
+    with pytest.raises(ValueError):
+        encode_records([(1, ['add', 'x', '1'])])
+    with pytest.raises(ValueError, match="Line 2: .*int64"):
+        encode_records([(1, ['add', '1', '2']), (2, ['add', str(1 << 63), '1'])], 'q')
+    errors = array.array('B')
+    encode_records([(1, ['add', str(-(1 << 63) - 1), '1'])], 'q', errors)
+    assert list(errors) == [CODE_VALUE]
+    with pytest.raises(ValueError):
+        write_table(io.BytesIO(), {'a': array.array('d', [1.0]), 'b': array.array('d', [])})
+
+
+def test_memory_mapped_file_and_cli(capsys: pytest.CaptureFixture) -> None:
+    """Test reading a mapped file and evaluating it through calculator --batch."""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "jobs.ccol")
+        with open(path, 'wb') as f:
+            f.write(_jobs_bytes())
+        assert is_columnar(path)
+        table = read_table(path)
+        assert list(table['op'])[:2] == [0, 1]
+        table.close()
+
+        assert main(['--batch', path]) == 1  # two rows fail
+        lines = capsys.readouterr().out.splitlines()
+        assert lines[1] == "1,add,1.0,2.0,3.0,,"
+        assert lines[2] == "2,divide,1.0,0.0,,division,Cannot divide by zero"
+        assert lines[5] == "5,hypot,3.0,4.0,,operation,Unknown operation 'hypot'"
+        assert main(['--backend', 'decimal', '--batch', path]) == 1
+
+
+def test_run_columnar_binary_output() -> None:
+    """Test text input evaluated into a binary result table."""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "jobs.csv")
+        with open(path, 'w') as f:
+            f.write("add,1,2\nmultiply,3,4\n")
+        output = io.BytesIO()
+        assert run_columnar(path, "binary", output, report=io.StringIO()) == 0
+    with read_table(output.getvalue()) as results:
+        assert list(results['result']) == [3.0, 12.0]
+        assert list(results['error']) == [0, 0]
+
+
+def test_text_input_reports_bad_rows_per_row() -> None:
+    """Test that unparsable text rows become error-coded rows, as in the streaming output."""
+    text = "op,x,y\nadd,1,2\nadd,x,1\nadd,1\nfoo,x,2\ndivide,1,0\nmultiply,3,4\n"
+    output = io.BytesIO()
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "jobs.csv")
+        with open(path, 'w') as f:
+            f.write(text)
+        assert run_columnar(path, "binary", output, report=io.StringIO()) == 1
+    with read_table(output.getvalue()) as results:
+        kinds = [ERROR_KINDS[code] for code in results['error']]
+        assert kinds == ["", "value", "format", "operation", "division", ""]
+        assert results['result'][5] == 12.0 and math.isnan(results['result'][1])
+
+    chunks = list(evaluate_text(text.splitlines(), chunk_rows=4))
+    assert [len(errors) for _, errors in chunks] == [4, 2]
+    assert [code for _, errors in chunks for code in errors] == [
+        CODE_OK, CODE_VALUE, CODE_FORMAT, CODE_OPERATION, CODE_DIVISION, CODE_OK]
+    with pytest.raises(ValueError, match="Line 3"):
+        encode_records(read_records(text.splitlines()))
+
+
+def test_table_from_arrays() -> None:
+    """Test wrapping in-memory arrays as a table."""
+    columns, operations = encode_records([(1, ['add', '1', '2'])])
+    table = ColumnarTable(columns, operations)
+    assert table.rows == 1
+    assert list(evaluate_table(table)['result']) == [3.0]
+
+
+def test_converter_reports_int64_overflow_per_line(capsys: pytest.CaptureFixture) -> None:
+    """Test that --int rejects out-of-range operands with the line number instead of a traceback."""
+    from src.calculator.columnar import main as columnar_main
+    with tempfile.TemporaryDirectory() as directory:
+        source = os.path.join(directory, "jobs.csv")
+        with open(source, 'w') as f:
+            f.write(f"add,1,2\nadd,{10 ** 20},1\n")
+        assert columnar_main(['to-columnar', '--int', source, os.path.join(directory, "jobs.ccol")]) == 1
+    assert "Line 2:" in capsys.readouterr().err
@@ -0,0 +1,72 @@
+"""Tests for validated typed columns and the strict column operations."""
+import array
+import math
+
+import pytest
+
+from src.calculator import core
+from src.calculator.batch import apply_many
+from src.calculator.columns import Float64Column, IntColumn, TypedColumn, as_column, strict_many
+from src.calculator.conformance import NUMBERS, outcome
+
+OPERATIONS = ('add', 'subtract', 'multiply', 'divide', 'power', 'integer_divide', 'modulo')
+
+
+def test_construction_validates_once() -> None:
+    """Test that columns reject what the strict operations reject, naming the row."""
+    with pytest.raises(TypeError, match="Row 1: Boolean values are not allowed"):
+        Float64Column([1.0, True])
+    with pytest.raises(TypeError, match="Row 0: Only int and float values allowed. Got complex"):
+        Float64Column([1j])
+    with pytest.raises(TypeError, match="Row 2: Only int values allowed in an IntColumn"):
+        IntColumn([1, 2, 3.0])
+    with pytest.raises(ValueError, match="Row 0: .* is too large for IntColumn"):
+        IntColumn([2 ** 63])
+    assert list(Float64Column(iter([1, 2.5]))) == [1.0, 2.5]
+
+    data = array.array('d', [1.0, 2.0])
+    column = Float64Column(data)
+    assert column.data is data  # typed buffers are used as they are
+    assert Float64Column(memoryview(data)).data.obj is data
+    assert isinstance(as_column([1, 2]), IntColumn)
+    assert isinstance(as_column([1, 2.0]), Float64Column)
+    assert isinstance(as_column([2 ** 70]), Float64Column)
+    with pytest.raises(TypeError):
+        TypedColumn([1.0])  # abstract
+
+
+@pytest.mark.parametrize("operation", OPERATIONS)
+def test_columns_match_core_per_row(operation) -> None:
+    """Test results and errors against the scalar strict operation over special operands."""
+    floats = [v for v in NUMBERS if type(v) is float]
+    ints = [0, 1, -3, 7]
+    for left, right in ((floats, floats), (floats, ints), (ints, floats), (ints, ints)):
+        xs = [a for a in left for b in right]
+        ys = [b for a in left for b in right]
+        results, failed = strict_many(operation, as_column(xs), as_column(ys), errors='mask')
+        function = getattr(core, operation)
+        for x, y, result, row_failed in zip(xs, ys, results, failed):
+            expected = outcome(function, x, y)
+            if expected[0].startswith('!'):
+                assert row_failed and math.isnan(result)
+            else:
+                assert not row_failed and [type(result).__name__, repr(result)] == expected
+
+
+def test_errors_and_batch_integration() -> None:
+    """Test the error policies, the core re-exports and apply_many with the strict profile."""
+    xs = Float64Column([1.5, 2.0, 4.0])
+    ys = IntColumn([2, 0, 3])
+    with pytest.raises(ZeroDivisionError, match="Cannot perform modulo with zero"):
+        strict_many('modulo', xs, ys)
+    assert strict_many('divide', xs, ys, errors='nan')[0] == 0.75
+    assert strict_many('power', [0.0], [-math.inf], errors='mask')[1] == [True]
+    assert strict_many('integer_divide', IntColumn([7]), IntColumn([2])) == [3]
+    with pytest.raises(ValueError):
+        strict_many('add', [1.0], [1.0, 2.0])
+    with pytest.raises(ValueError):
+        strict_many('power_mod', [1.0], [1.0])
+    assert core.strict_many is strict_many and core.Float64Column is Float64Column
+
+    results, failed = apply_many('divide', xs, ys, errors='mask', profile='strict')
+    assert results[2] == 4 / 3 and failed == [False, True, False]
@@ -0,0 +1,165 @@
+"""Tests for the persistent daemon and its client."""
+import io
+import os
+import socket
+import tempfile
+import threading
+
+import pytest
+
+from src.calculator import client
+from src.calculator.daemon import create_server, execute, serve_stream
+
+
+def test_execute_captures_result() -> None:
+    """Test that execute returns the CLI output and exit code."""
+    assert execute(['add', '5', '3']) == (0, "Result: 8.0\n", "")
+
+
+def test_execute_reports_failure() -> None:
+    """Test that a failing command returns exit code 1."""
+    code, out, _ = execute(['divide', '1', '0'])
+    assert code == 1
+    assert "Division Error: Cannot divide by zero" in out
+
+
+def test_execute_help_does_not_exit() -> None:
+    """Test that help output is captured instead of exiting the daemon."""
+    code, out, _ = execute(['--help'])
+    assert code == 0
+    assert "usage: calculator" in out
+
+
+def test_execute_rejects_nested_serve() -> None:
+    """Test that the daemon cannot be asked to start another daemon."""
+    code, _, err = execute(['serve'])
+    assert code == 1
+    assert "serve" in err
+
+
+def test_serve_stream_line_protocol() -> None:
+    """Test the --stdin line protocol."""
+    output = io.StringIO()
+    status = serve_stream(io.StringIO("add 1 2\n\nmultiply 3 4\n"), output)
+    assert status == 0
+    assert output.getvalue() == "Result: 3.0\nResult: 12.0\n"
+
+
+@pytest.mark.skipif(not hasattr(socket, 'AF_UNIX'), reason="requires Unix domain sockets")
+def test_client_round_trip_through_socket() -> None:
+    """Test that the client talks to a running daemon over one connection."""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "calculator.sock")
+        server = create_server(path)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            with client.DaemonClient(path, timeout=5) as connection:
+                assert connection.call(['add', '2', '3']) == (0, "Result: 5.0\n", "")
+                assert connection.call(['power', '2', '10']) == (0, "Result: 1024.0\n", "")
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+def test_client_falls_back_without_daemon(capsys) -> None:
+    """Test that the client runs in-process when no daemon is listening."""
+    with tempfile.TemporaryDirectory() as directory:
+        code = client.main(['subtract', '10', '4'], socket_path=os.path.join(directory, "missing.sock"))
+    assert code == 0
+    assert capsys.readouterr().out == "Result: 6.0\n"
+
+
+def test_parse_request() -> None:
+    """Test JSON list and plain request lines."""
+    from src.calculator.daemon import parse_request
+    assert parse_request(b'["--batch", "my jobs.csv"]\n') == (['--batch', 'my jobs.csv'], None)
+    assert parse_request(b"add 5 3\n") == (['add', '5', '3'], None)
+    assert parse_request(b'{"args": ["add", "5", "3"], "cwd": "/tmp"}\n') == (['add', '5', '3'], "/tmp")
+    for line in (b'["add", 5, 3]\n', b'["add"\n', b'{"cwd": "/tmp"}\n', b'{"args": [], "cwd": 1}\n'):
+        with pytest.raises(ValueError):
+            parse_request(line)
+
+
+def test_reads_stdin() -> None:
+    """Test which commands take their input from stdin."""
+    assert client.reads_stdin(['--batch', '-'])
+    assert client.reads_stdin(['--batch=-', '--format', 'jsonl'])
+    assert client.reads_stdin(['--reduce', 'sum'])
+    assert not client.reads_stdin(['--reduce', 'sum', '--batch', 'numbers.txt'])
+    assert not client.reads_stdin(['--batch', 'jobs.csv'])
+    assert not client.reads_stdin(['add', '1', '2'])
+
+
+def test_stdin_commands_run_in_the_client(monkeypatch, capsys) -> None:
+    """Test that the daemon refuses stdin input and the client runs such commands itself."""
+    code, _, err = execute(['--batch', '-'])
+    assert code == 1 and "stdin" in err
+    monkeypatch.setattr('sys.stdin', io.TextIOWrapper(io.BufferedReader(io.BytesIO(b"add,1,2\n"))))
+    with tempfile.TemporaryDirectory() as directory:
+        # would fall back anyway without a daemon; reads_stdin decides before connecting
+        assert client.main(['--batch', '-'], socket_path=os.path.join(directory, "missing.sock")) == 0
+    assert "1,add,1,2,3.0,," in capsys.readouterr().out
+
+
+@pytest.mark.skipif(not hasattr(socket, 'AF_UNIX'), reason="requires Unix domain sockets")
+def test_relative_paths_resolve_against_the_client_directory() -> None:
+    """Test that the daemon reads and writes relative paths in the client's working directory."""
+    with tempfile.TemporaryDirectory() as directory:
+        with open(os.path.join(directory, "jobs.csv"), 'w') as f:
+            f.write("add,1,2\n")
+        server = create_server(os.path.join(directory, "calculator.sock"))
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        daemon_directory = os.getcwd()
+        try:
+            with client.DaemonClient(server.server_address, timeout=5) as connection:
+                code, _, _ = connection.call(['--batch', 'jobs.csv', '--output', 'out.csv'], cwd=directory)
+        finally:
+            server.shutdown()
+            server.server_close()
+        assert code == 0
+        with open(os.path.join(directory, "out.csv")) as f:
+            assert "1,add,1,2,3.0,," in f.read()
+    assert os.getcwd() == daemon_directory
+
+
+@pytest.mark.skipif(not hasattr(socket, 'AF_UNIX'), reason="requires Unix domain sockets")
+def test_client_keeps_arguments_with_spaces() -> None:
+    """Test that an argument containing whitespace reaches the daemon unchanged."""
+    with tempfile.TemporaryDirectory() as directory:
+        jobs = os.path.join(directory, "my jobs.csv")
+        with open(jobs, 'w') as f:
+            f.write("add,1,2\n")
+        server = create_server(os.path.join(directory, "calculator.sock"))
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            with client.DaemonClient(server.server_address, timeout=5) as connection:
+                code, out, _ = connection.call(['--batch', jobs])
+        finally:
+            server.shutdown()
+            server.server_close()
+    assert code == 0 and "3.0" in out
+
+
+@pytest.mark.skipif(not hasattr(socket, 'AF_UNIX'), reason="requires Unix domain sockets")
+def test_create_server_only_replaces_stale_sockets() -> None:
+    """Test that regular files and live sockets are left alone."""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "calculator.sock")
+        with open(path, 'w') as f:
+            f.write("not a socket")
+        with pytest.raises(OSError, match="already in use"):
+            create_server(path)
+        assert os.path.isfile(path)
+        os.unlink(path)
+
+        live = create_server(path)
+        try:
+            with pytest.raises(OSError, match="already in use"):
+                create_server(path)
+        finally:
+            live.server_close()  # leaves the socket file behind, as a crashed daemon would
+        stale = create_server(path)
+        stale.server_close()
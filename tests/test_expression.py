@@ -0,0 +1,105 @@
+"""Tests for the expression compiler."""
+import math
+
+import pytest
+
+from src.calculator.expression import compile_expression, evaluate, tokenize
+
+
+def test_evaluate_simple_addition() -> None:
+    """Test evaluating a constant expression."""
+    assert evaluate("1 + 2") == 3
+
+
+def test_operator_precedence() -> None:
+    """Test that multiplication binds tighter than addition."""
+    assert evaluate("2 + 3 * 4") == 14
+
+
+def test_parentheses() -> None:
+    """Test that parentheses override precedence."""
+    assert evaluate("(2 + 3) * 4") == 20
+
+
+def test_power_is_right_associative() -> None:
+    """Test that 2 ^ 3 ^ 2 is 2 ^ 9."""
+    assert evaluate("2 ^ 3 ^ 2") == 512.0
+    assert evaluate("2 ** 3") == 8.0
+
+
+def test_power_binds_tighter_than_unary_minus() -> None:
+    """Test that -2 ^ 2 is -(2 ^ 2)."""
+    assert evaluate("-2 ^ 2") == -4.0
+    assert evaluate("2 ^ -1") == 0.5
+
+
+def test_integer_divide_and_modulo() -> None:
+    """Test the // and % operators."""
+    assert evaluate("7 // 2") == 3
+    assert evaluate("7 % 3") == 1
+
+
+def test_variables() -> None:
+    """Test evaluating with variables."""
+    expression = compile_expression("(a + b) * c ^ 2 // d")
+    assert expression.variables == ('a', 'b', 'c', 'd')
+    assert expression(a=1, b=2, c=3, d=4) == 6
+
+
+def test_special_values_use_calculator_semantics() -> None:
+    """Test that inf - inf gives NaN through the subtract operation."""
+    assert math.isnan(evaluate("a - b", a=float('inf'), b=float('inf')))
+    assert math.copysign(1, evaluate("-x", x=0.0)) == -1
+
+
+def test_overflowing_literals_are_infinite() -> None:
+    """Test that a literal beyond float range compiles to inf instead of an undefined name."""
+    assert evaluate('1e999 + x', x=1.0) == math.inf
+    assert evaluate('-1e999 * x', x=2.0) == -math.inf
+    assert math.isnan(evaluate('1e999 - 1e999'))
+
+
+def test_division_by_zero_raises() -> None:
+    """Test that division by zero propagates ZeroDivisionError."""
+    with pytest.raises(ZeroDivisionError):
+        evaluate("x / 0", x=1)
+
+
+def test_missing_variable_raises() -> None:
+    """Test that evaluating without all variables raises TypeError."""
+    with pytest.raises(TypeError):
+        evaluate("a + b", a=1)
+
+
+def test_compiled_expressions_are_cached() -> None:
+    """Test that compiling the same text twice returns the same object."""
+    assert compile_expression("x * y + 1") is compile_expression("x * y + 1")
+
+
+@pytest.mark.parametrize("text", ["", "1 +", "(1 + 2", "1 + 2)", "1 $ 2", "a b", "lambda + 1", "None * 2"])
+def test_invalid_expressions(text: str) -> None:
+    """Test that malformed expressions raise ValueError."""
+    with pytest.raises(ValueError):
+        compile_expression(text)
+
+
+def test_tokenize() -> None:
+    """Test splitting an expression into tokens."""
+    assert tokenize("a//2.5e1") == [('name', 'a'), ('operator', '//'), ('number', '2.5e1')]
+
+
+def test_call_registered_operation_by_name() -> None:
+    """Test calling a registered operation with function syntax."""
+    assert evaluate("power(x, 2) + modulo(7, 3)", x=3) == 10.0
+
+
+def test_call_unknown_operation() -> None:
+    """Test that calling an unknown operation raises ValueError."""
+    with pytest.raises(ValueError):
+        compile_expression("sqrt(4)")
+
+
+def test_call_wrong_argument_count() -> None:
+    """Test that calls must match the operation's arity."""
+    with pytest.raises(ValueError):
+        compile_expression("add(1, 2, 3)")
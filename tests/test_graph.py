@@ -0,0 +1,95 @@
+"""Tests for expression graphs with common-subexpression elimination."""
+import math
+
+import pytest
+
+from src.calculator.expression import evaluate
+from src.calculator.graph import ExpressionGraph
+from src.calculator.registry import OPERATIONS, register_operation
+
+
+def test_identical_subexpressions_are_shared() -> None:
+    """Test that repeated subterms become one node evaluated once per row."""
+    graph = ExpressionGraph()
+    output = graph.parse("power(x, 2) + power(x, 2) * y - x ^ 2")
+    compiled = graph.compile(output)
+    assert compiled.variables == ('x', 'y')
+    assert compiled(x=3.0, y=2.0) == evaluate("power(x, 2) + power(x, 2) * y - x ^ 2", x=3.0, y=2.0)
+    assert compiled.report == {'requested': 6, 'reused': 2, 'folded': 0,
+                               'operations': 4, 'dead': 0, 'eliminated': 2}
+    assert compiled.source.count("_f") == 4  # one call per live operation
+
+
+def test_sharing_across_outputs() -> None:
+    """Test several outputs compiled into one function."""
+    graph = ExpressionGraph()
+    area = graph.parse("power(r, 2) * 3.14159")
+    volume = graph.parse("power(r, 2) * 3.14159 * h")
+    graph.parse("r + 100")  # not an output: dead
+    compiled = graph.compile([area, volume])
+    assert list(compiled.evaluate_rows([{'r': 2.0, 'h': 10.0}, {'r': 1.0, 'h': 1.0}])) == [
+        (12.56636, 125.6636), (3.14159, 3.14159)]
+    assert compiled.report['operations'] == 3
+    assert compiled.report['dead'] == 1
+
+
+def test_constant_folding_keeps_special_value_semantics() -> None:
+    """Test that folded constants match run-time results, including NaN and inf."""
+    graph = ExpressionGraph()
+    inf = graph.apply('power', 10.0, 400)  # overflows to inf
+    nan = graph.apply('subtract', inf, inf)
+    output = graph.apply('add', graph.parse("2 * 3 - x"), nan)
+    compiled = graph.compile(output)
+    assert compiled.report['folded'] == 3 and compiled.report['operations'] == 2
+    assert math.isnan(compiled(x=1.0))
+    assert graph.describe(inf) == "inf"
+    assert math.copysign(1, graph.compile(graph.parse("-x"))(x=0.0)) == -1
+
+    # 1 and 1.0, 0.0 and -0.0 stay distinct constants
+    assert graph.constant(1).index != graph.constant(1.0).index
+    assert graph.constant(0.0).index != graph.constant(-0.0).index
+    assert graph.constant(float('nan')).index == graph.constant(float('nan')).index
+
+
+def test_errors_are_deferred_to_evaluation() -> None:
+    """Test that a constant subtree that raises is not folded."""
+    graph = ExpressionGraph()
+    output = graph.parse("x + 1 / 0")
+    compiled = graph.compile(output)
+    assert compiled.report['folded'] == 0
+    with pytest.raises(ZeroDivisionError):
+        compiled(x=1)
+
+
+def test_plugin_operations_are_shared_but_not_folded() -> None:
+    """Test that registered operations are never folded."""
+    calls = []
+
+    def counted(a, b):
+        calls.append((a, b))
+        return a + b
+
+    register_operation('counted_add', counted)
+    try:
+        graph = ExpressionGraph()
+        output = graph.parse("counted_add(1, 2) * counted_add(1, 2)")
+        assert calls == []
+        assert graph.compile(output)() == 9
+        assert calls == [(1, 2)]
+    finally:
+        del OPERATIONS['counted_add']
+
+
+def test_invalid_graphs_are_rejected() -> None:
+    """Test unknown operations, wrong arity, bad names and foreign nodes."""
+    graph = ExpressionGraph()
+    with pytest.raises(ValueError):
+        graph.apply('nope', 1, 2)
+    with pytest.raises(ValueError):
+        graph.apply('add', 1)
+    with pytest.raises(ValueError):
+        graph.variable('_hidden')
+    with pytest.raises(ValueError):
+        graph.apply('add', ExpressionGraph().variable('x'), 1)
+    with pytest.raises(ValueError):
+        graph.parse("x +")
@@ -0,0 +1,172 @@
+"""Tests for the asyncio HTTP/JSON server."""
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from src.calculator.http_server import (
+    CalculatorService, calculate, create_http_server, is_heavy, parse_request,
+)
+
+
+class RecordingExecutor(ThreadPoolExecutor):
+    """Thread pool that counts the jobs offloaded to it."""
+
+    def __init__(self) -> None:
+        super().__init__(max_workers=2)
+        self.jobs = 0
+
+    def submit(self, *args, **kwargs):
+        self.jobs += 1
+        return super().submit(*args, **kwargs)
+
+
+def _request(method: str, path: str, payload=None, headers: str = "") -> bytes:
+    """Build a raw HTTP/1.1 request."""
+    body = b"" if payload is None else json.dumps(payload).encode()
+    return (f"{method} {path} HTTP/1.1\r\nHost: test\r\nContent-Length: {len(body)}\r\n{headers}\r\n"
+            .encode() + body)
+
+
+async def _read_response(reader: asyncio.StreamReader):
+    """Read one response, returning (status, headers, decoded JSON body)."""
+    head = (await reader.readuntil(b"\r\n\r\n")).decode().split("\r\n")
+    status = int(head[0].split()[1])
+    headers = dict(line.lower().split(": ", 1) for line in head[1:] if line)
+    body = await reader.readexactly(int(headers['content-length']))
+    return status, headers, json.loads(body)
+
+
+def _with_server(scenario, service=None):
+    """Run ``scenario(host, port)`` against a server on a free port."""
+    async def run():
+        server = await create_http_server(port=0, service=service)
+        host, port = server.sockets[0].getsockname()[:2]
+        async with server:
+            return await scenario(host, port)
+    return asyncio.run(run())
+
+
+def test_calculate_returns_results_and_error_kinds() -> None:
+    """Test single calculations without the transport."""
+    assert calculate('add', [5, 3]) == {"result": 8}
+    assert calculate('multiply', ["inf", 2]) == {"result": "inf"}
+    assert calculate('add', ["1/3", "1/6"], backend="fraction") == {"result": "1/2"}
+    assert calculate('divide', [1, 0])["error"] == "division"
+    assert calculate('add', [1])["error"] == "format"
+    assert calculate('nope', [1, 2])["error"] == "operation"
+    assert calculate('add', [True, 2])["error"] == "value"
+
+
+def test_parse_request_validates_fields() -> None:
+    """Test that malformed requests are rejected."""
+    assert parse_request({"operation": "add", "operands": [1, 2]}) == ('add', [1, 2], None, None)
+    for item in ([], {"operands": [1]}, {"operation": "add"}, {"operation": "add", "operands": [], "precision": "5"},
+                 {"operation": "power", "operands": [2, 0.5], "backend": "decimal", "precision": 100_000}):
+        try:
+            parse_request(item)
+        except ValueError:
+            continue
+        raise AssertionError(f"{item!r} was accepted")
+
+
+def test_is_heavy_detects_huge_integer_work() -> None:
+    """Test which requests are sent to the executor."""
+    assert is_heavy('power', [3, 10_000_000])
+    assert is_heavy('multiply', [1 << 100_000, 3])
+    assert not is_heavy('power', [2, 10])
+    assert is_heavy('power', [2.5, 10_000_000])  # 5 ** 10_000_000 / 2 ** 10_000_000 in the fraction backend
+    assert is_heavy('power', [3, 1e7])
+    assert is_heavy('power', [3, "1e7"])
+    assert not is_heavy('power', [3, "x"])
+    assert not is_heavy('add', [1.5, 2])
+    assert is_heavy('power', [2, 0.5], precision=5000)
+    assert not is_heavy('power', [2, 0.5], precision=50)
+
+
+def test_keep_alive_and_pipelining() -> None:
+    """Test that pipelined requests on one connection are answered in order."""
+    async def scenario(host, port):
+        reader, writer = await asyncio.open_connection(host, port)
+        writer.write(
+            _request('POST', '/calculate', {"operation": "add", "operands": [1, 2]})
+            + _request('GET', '/health')
+            + _request('POST', '/calculate', {"operation": "divide", "operands": [1, 0]})
+            + _request('POST', '/batch', {"requests": [{"operation": "power", "operands": [2, 10]},
+                                                       {"operation": "modulo", "operands": [7, 0]}]})
+        )
+        responses = [await _read_response(reader) for _ in range(4)]
+        writer.close()
+        return responses
+
+    responses = _with_server(scenario)
+    assert [status for status, _, _ in responses] == [200, 200, 422, 200]
+    assert all(headers['connection'] == 'keep-alive' for _, headers, _ in responses)
+    assert responses[0][2] == {"result": 3}
+    assert responses[1][2] == {"status": "ok"}
+    assert responses[2][2]["error"] == "division"
+    assert responses[3][2]["results"][0] == {"result": 1024.0}
+    assert responses[3][2]["results"][1]["error"] == "division"
+    assert responses[3][2]["errors"] == {"division": 1}
+
+
+def test_connection_close_and_http_errors() -> None:
+    """Test Connection: close, unknown paths, wrong methods and bad JSON."""
+    async def scenario(host, port):
+        reader, writer = await asyncio.open_connection(host, port)
+        writer.write(_request('GET', '/missing') + _request('GET', '/calculate')
+                     + b"POST /calculate HTTP/1.1\r\nContent-Length: 3\r\nConnection: close\r\n\r\n{x}")
+        responses = [await _read_response(reader) for _ in range(3)]
+        closed = await reader.read() == b""
+        writer.close()
+        return responses, closed
+
+    responses, closed = _with_server(scenario)
+    assert [status for status, _, _ in responses] == [404, 405, 400]
+    assert responses[2][1]['connection'] == 'close'
+    assert closed
+
+
+def test_heavy_requests_are_offloaded() -> None:
+    """Test that huge integer powers run in the executor while light requests stay inline."""
+    executor = RecordingExecutor()
+    service = CalculatorService(executor=executor)
+
+    async def scenario(host, port):
+        reader, writer = await asyncio.open_connection(host, port)
+        writer.write(_request('POST', '/calculate', {"operation": "power", "operands": [3, 200_000]})
+                     + _request('POST', '/calculate', {"operation": "add", "operands": [1, 1]}))
+        responses = [await _read_response(reader) for _ in range(2)]
+        writer.close()
+        return responses
+
+    try:
+        responses = _with_server(scenario, service)
+    finally:
+        executor.shutdown()
+    assert responses[0][2] == {"result": "inf"}
+    assert responses[1][2] == {"result": 2}
+    assert executor.jobs == 1
+
+
+def test_unserialisable_response_gets_json_error() -> None:
+    """Test that a payload json.dumps rejects is answered with a 500 error, not a dropped connection."""
+    class HugeResultService(CalculatorService):
+        async def handle(self, method, path, body):
+            return 200, {"result": 10 ** 5000}  # beyond the int-to-text limit
+
+    async def scenario(host, port):
+        reader, writer = await asyncio.open_connection(host, port)
+        writer.write(_request('POST', '/calculate', {"operation": "power", "operands": [10, 5000]}) * 2)
+        responses = [await _read_response(reader) for _ in range(2)]
+        writer.close()
+        return responses
+
+    responses = _with_server(scenario, HugeResultService())
+    assert [status for status, _, _ in responses] == [500, 500]
+    assert responses[0][2]["error"] == "unexpected"
+
+
+def test_fraction_power_with_float_exponent_is_bounded() -> None:
+    """Test that an exact power too large to print fails fast with an overflow error."""
+    assert calculate('power', [3, 1e7], backend="fraction")["error"] == "overflow"
+    assert calculate('power', [3, "1e7"], backend="fraction")["error"] == "overflow"
@@ -0,0 +1,91 @@
+"""Tests for the arithmetic kernel and its semantics profiles."""
+import importlib.util
+import json
+import math
+import os
+
+import pytest
+
+import src.calculator as calculator
+from src.calculator import __main__ as legacy_cli
+from src.calculator import core, math_operations
+from src.calculator.backends import get_backend
+from src.calculator.batch import apply_many
+from src.calculator.cli import main
+from src.calculator.conformance import NUMBERS, compare, outcome, pairs, record
+from src.calculator.kernel import PROFILES, calculate, get_profile
+from src.calculator.registry import get_operation
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def test_profiles_match_recorded_source_modules() -> None:
+    """Test every profile against the outcomes recorded from the modules it replaced."""
+    with open(os.path.join(HERE, "conformance_golden.json"), encoding='utf-8') as f:
+        golden = json.load(f)
+    assert compare(golden) == []
+    assert record() == golden
+
+
+def test_source_modules_are_aliases() -> None:
+    """Test that the old entry points are the kernel's functions, not copies."""
+    for name, function in PROFILES['ieee'].items():
+        assert getattr(calculator, name) is function
+        assert get_operation(name).function is function
+        assert getattr(core, name) is PROFILES['strict'][name]
+    assert math_operations.multiply is calculator.multiply
+    for name in ('add', 'subtract', 'multiply', 'divide'):
+        assert getattr(legacy_cli, name) is PROFILES['raw'][name]
+
+
+def test_workspace_package_matches_ieee_add() -> None:
+    """Test the separate calculator/ workspace package's add against the ieee profile."""
+    path = os.path.join(HERE, "..", "calculator", "__init__.py")
+    spec = importlib.util.spec_from_file_location("workspace_calculator", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    for a, b in pairs('add', NUMBERS):
+        assert outcome(module.add, a, b) == outcome(calculator.add, a, b)
+
+
+def test_profile_semantics() -> None:
+    """Test calls that tell the three profiles apart."""
+    assert calculate('multiply', -math.inf, 5) == -math.inf
+    assert math.isnan(calculate('subtract', math.inf, math.inf))
+    assert calculate('add', 1, 2) == 3 and type(calculate('add', 1, 2)) is int
+    assert type(calculate('add', 1, 2, 'strict')) is float
+    with pytest.raises(TypeError, match="Boolean values are not allowed"):
+        calculate('add', True, 1, 'strict')
+    with pytest.raises(ZeroDivisionError, match="Raising zero to a negative power"):
+        calculate('power', 0, -1, 'strict')
+    assert isinstance(calculate('power', -8, 0.5, 'raw'), complex)
+    with pytest.raises(ZeroDivisionError, match="Cannot divide by zero"):
+        calculate('divide', 1, 0, 'raw')
+    with pytest.raises(ValueError, match="Invalid profile"):
+        get_profile('fast')
+    with pytest.raises(ValueError, match="Invalid operation"):
+        calculate('power_mod', 2, 3)
+
+
+def test_profile_selection_in_backends_batch_and_cli(capsys) -> None:
+    """Test choosing a profile per backend, per batch and on the command line."""
+    strict = get_backend(profile='strict')
+    assert strict is get_backend('float', profile='strict') and strict.name == "float"
+    assert strict.operation('power') is PROFILES['strict']['power']
+    assert strict.operation('power_mod') is calculator.power_mod  # not in the profile
+    assert get_backend(profile='ieee') is get_backend()
+    with pytest.raises(ValueError):
+        get_backend('decimal', profile='strict')
+    with pytest.raises(ValueError):
+        get_backend(profile='fast')
+
+    results, failed = apply_many('power', [2.0, 0.0], [3.0, -1.0], errors='mask', profile='strict')
+    assert results[0] == 8.0 and math.isnan(results[1]) and list(failed) == [False, True]
+    assert [type(r) for r in apply_many('add', [1, 2], [2, 3], profile='strict')] == [float, float]
+
+    assert main(['--profile', 'strict', 'power', '0', '-1']) == 1
+    assert capsys.readouterr().out.startswith("Division Error: Raising zero to a negative power")
+    assert main(['--profile', 'raw', 'integer_divide', '7', '2']) == 0
+    assert capsys.readouterr().out == "Result: 3.0\n"
+    assert main(['--profile', 'strict', '--backend', 'fraction', 'add', '1', '2']) == 1
+    assert main(['--profile', 'raw', '--reduce', 'sum']) == 1
@@ -0,0 +1,114 @@
+"""Tests for opt-in per-operation metrics."""
+import json
+import os
+import socket
+import tempfile
+import threading
+
+import pytest
+
+from src.calculator import add
+from src.calculator.cli import main, safe_calculate
+from src.calculator.daemon import create_server, execute
+from src.calculator.metrics import (
+    OperationMetrics, disable_metrics, enable_metrics, format_prometheus, write_snapshot,
+)
+from src.calculator.registry import get_operation
+
+
+@pytest.fixture
+def metrics():
+    """Fresh counters on every operation, removed after the test."""
+    counters = enable_metrics(metrics=OperationMetrics())
+    yield counters
+    disable_metrics()
+
+
+def test_disabled_registry_holds_plain_functions(metrics) -> None:
+    """Test that enabling wraps and disabling restores the registered functions."""
+    assert get_operation('add').function.__wrapped__ is add
+    disable_metrics()
+    assert get_operation('add').function is add
+
+
+def test_calls_errors_and_special_values(metrics) -> None:
+    """Test the counters recorded through the registry."""
+    safe_calculate('add', '1', '2')
+    safe_calculate('add', 'inf', '2')
+    safe_calculate('subtract', 'inf', 'inf')
+    safe_calculate('divide', '1', '0')
+    data = metrics.snapshot()['operations']
+    assert data['add']['calls'] == 2
+    assert data['add']['special_operands'] == 1 and data['add']['special_results'] == 1
+    assert data['subtract']['special_results'] == 1
+    assert data['divide']['errors'] == {'ZeroDivisionError': 1}
+    latency = data['add']['latency']
+    assert latency['count'] == 2 and latency['buckets'][-1] == ["+Inf", 2]
+    assert all(a[1] <= b[1] for a, b in zip(latency['buckets'], latency['buckets'][1:]))
+    assert data['modulo']['calls'] == 0
+
+
+def test_prometheus_format(metrics) -> None:
+    """Test the Prometheus text exposition of a snapshot."""
+    safe_calculate('divide', '1', '0')
+    text = format_prometheus(metrics.snapshot())
+    assert '# TYPE calculator_operation_calls_total counter' in text
+    assert 'calculator_operation_calls_total{operation="divide"} 1' in text
+    assert 'calculator_operation_errors_total{operation="divide",error="ZeroDivisionError"} 1' in text
+    assert 'calculator_operation_duration_seconds_bucket{operation="divide",le="+Inf"} 1' in text
+    assert 'calculator_operation_duration_seconds_count{operation="divide"} 1' in text
+    assert text.endswith("\n")
+
+
+def test_batch_metrics_file_and_stats_command(capsys) -> None:
+    """Test --metrics on a batch run and calculator stats --batch."""
+    with tempfile.TemporaryDirectory() as directory:
+        jobs = os.path.join(directory, "jobs.csv")
+        with open(jobs, 'w') as f:
+            f.write("add,1,2\ndivide,1,0\nadd,nan,1\n")
+        path = os.path.join(directory, "metrics.prom")
+        assert main(['--batch', jobs, '--metrics', path]) == 1
+        with open(path) as f:
+            assert 'calculator_operation_calls_total{operation="add"} 2' in f.read()
+        assert get_operation('add').function is add  # disabled again after the run
+        capsys.readouterr()
+
+        assert main(['stats', '--batch', jobs]) == 0
+        data = json.loads(capsys.readouterr().out)
+        assert data['operations']['add']['special_operands'] == 1
+        assert data['operations']['divide']['errors'] == {'ZeroDivisionError': 1}
+
+        output = os.path.join(directory, "stats.json")
+        write_snapshot(output, data)
+        with open(output) as f:
+            assert json.load(f) == data
+
+
+@pytest.mark.skipif(not hasattr(socket, 'AF_UNIX'), reason="requires Unix domain sockets")
+def test_stats_from_running_daemon(metrics, capsys) -> None:
+    """Test calculator stats asking a daemon for its counters."""
+    assert execute(['multiply', '3', '4'])[0] == 0
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "calculator.sock")
+        server = create_server(path)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            assert main(['stats', '--socket', path, '--format', 'prometheus']) == 0
+        finally:
+            server.shutdown()
+            server.server_close()
+        assert 'calculator_operation_calls_total{operation="multiply"} 1' in capsys.readouterr().out
+        assert main(['stats', '--socket', os.path.join(directory, "missing.sock")]) == 1
+
+
+def test_http_metrics_route(metrics) -> None:
+    """Test GET /metrics on the HTTP service."""
+    import asyncio
+    from src.calculator.http_server import CalculatorService
+
+    service = CalculatorService()
+    asyncio.run(service.handle('POST', '/calculate', b'{"operation": "power", "operands": [2, 8]}'))
+    status, payload = asyncio.run(service.handle('GET', '/metrics', b''))
+    assert status == 200 and payload['enabled']
+    assert payload['operations']['power']['calls'] == 1
@@ -0,0 +1,57 @@
+"""Tests for the process-pool parallel evaluator."""
+import math
+
+import pytest
+
+from src.calculator.parallel import ParallelEvaluator, default_chunksize, evaluate_parallel
+
+TASKS = [('add', i, 1) for i in range(20)] + [('power', 2, 10), ('modulo', 7, 3)]
+
+
+def test_results_preserve_input_order() -> None:
+    """Test that results come back in input order across chunks."""
+    results = evaluate_parallel(TASKS, workers=2, chunksize=3)
+    assert results == [i + 1 for i in range(20)] + [1024.0, 1]
+
+
+def test_zero_division_is_raised_without_breaking_pool() -> None:
+    """Test that a failing task raises but the pool keeps working."""
+    with ParallelEvaluator(workers=2, chunksize=2) as evaluator:
+        with pytest.raises(ZeroDivisionError):
+            evaluator.evaluate([('add', 1, 1), ('divide', 1, 0), ('add', 2, 2)])
+        assert evaluator.evaluate([('multiply', 3, 4)]) == [12]
+
+
+def test_nan_policy() -> None:
+    """Test that the 'nan' policy stores NaN for failing tasks."""
+    results = evaluate_parallel([('divide', 1, 0), ('divide', 4, 2)], workers=1, errors='nan')
+    assert math.isnan(results[0])
+    assert results[1] == 2.0
+
+
+def test_mask_policy() -> None:
+    """Test that the 'mask' policy returns a failure mask."""
+    results, failed = evaluate_parallel([('divide', 1, 0), ('add', 1, 2)], workers=1, errors='mask')
+    assert failed == [True, False]
+    assert results[1] == 3
+
+
+def test_return_policy_keeps_exception_objects() -> None:
+    """Test that the 'return' policy returns the exceptions themselves."""
+    results = evaluate_parallel([('modulo', 1, 0), ('unknown', 1, 2)], workers=1, errors='return')
+    assert isinstance(results[0], ZeroDivisionError)
+    assert isinstance(results[1], ValueError)
+
+
+def test_invalid_arguments() -> None:
+    """Test that bad worker counts and policies are rejected."""
+    with pytest.raises(ValueError):
+        ParallelEvaluator(workers=0)
+    with pytest.raises(ValueError):
+        evaluate_parallel([], workers=1, errors='ignore')
+
+
+def test_default_chunksize() -> None:
+    """Test that the default chunk size gives each worker several chunks."""
+    assert default_chunksize(1000, 4) == 63
+    assert default_chunksize(0, 4) == 1
@@ -0,0 +1,102 @@
+"""Tests for fused multi-step pipelines."""
+import array
+import math
+import random
+
+import pytest
+
+from src.calculator import add, divide
+from src.calculator.pipeline import Pipeline, measure_memory
+
+INF = float('inf')
+NAN = float('nan')
+
+
+def _same(a, b) -> bool:
+    return (math.isnan(a) and math.isnan(b)) or (a == b and type(a) is type(b))
+
+
+def test_fused_matches_stepwise_with_special_values() -> None:
+    """Test that fusing keeps every step's special-case semantics."""
+    pipeline = Pipeline()
+    total = pipeline.add('x', 'y')
+    pipeline.power(pipeline.divide(total, 'z'), 2)
+    fused = pipeline.compile()
+    values = [0.0, -0.0, 1.5, -2.0, INF, -INF, NAN, 1e308, 3]
+    xs = [a for a in values for _ in values]
+    ys = [b for _ in values for b in values]
+    zs = [2.0 if z == 0 else z for z in reversed(xs)]  # no zero divisors, so no row raises
+    expected = fused.evaluate_stepwise(x=xs, y=ys, z=zs)
+    assert all(_same(a, b) for a, b in zip(fused(x=xs, y=ys, z=zs), expected))
+    assert _same(fused(x=[INF], y=[-INF], z=[1.0])[0], NAN)
+    assert fused.columns == ('x', 'y', 'z') and fused.report['intermediates'] == 2
+    assert pipeline.describe(total) == "add(x, y)"
+
+
+def test_error_policies_and_profiles() -> None:
+    """Test raise/nan/mask, constants, reused steps and a strict pipeline."""
+    pipeline = Pipeline()
+    total = pipeline.add('x', 'y')
+    pipeline.divide(total, 'z')
+    fused = pipeline.compile()
+    columns = dict(x=[1.0, 2.0], y=[3.0, 4.0], z=array.array('d', [2.0, 0.0]))
+    assert fused('nan', **columns)[0] == 2.0 and math.isnan(fused('nan', **columns)[1])
+    assert fused('mask', **columns)[1] == [False, True]
+    with pytest.raises(ZeroDivisionError, match="Cannot divide by zero"):
+        fused(**columns)
+    with pytest.raises(TypeError, match="Missing column: z"):
+        fused(x=[1.0], y=[1.0])
+    with pytest.raises(ValueError, match="Column lengths differ"):
+        fused(x=[1.0], y=[1.0], z=[1.0, 2.0])
+
+    squared = Pipeline()
+    s = squared.add('x', 1)
+    squared.multiply(s, s)
+    assert squared.compile()(x=[1, 2]) == [4, 9]
+    assert pipeline.compile(total)(x=[1.0], y=[2.0]) == [3.0]  # only live steps
+
+    strict = Pipeline(profile='strict')
+    strict.add('x', 'y')
+    assert strict.compile()(x=[1], y=[2]) == [3.0]
+    with pytest.raises(ValueError):
+        Pipeline(profile='fast')
+    with pytest.raises(ValueError):
+        Pipeline().add('_x', 'y')
+    with pytest.raises(ValueError):
+        Pipeline().step('power_mod', 'x', 'y')
+    with pytest.raises(ValueError):
+        Pipeline().compile()
+
+
+def test_fused_uses_less_memory() -> None:
+    """Test that the fused loop does not materialize the intermediates."""
+    rng = random.Random(2)
+    columns = {name: [rng.uniform(1.0, 2.0) for _ in range(50_000)] for name in 'xyz'}
+    pipeline = Pipeline()
+    total = pipeline.add('x', 'y')
+    pipeline.subtract(pipeline.multiply(pipeline.divide(total, 'z'), total), 'x')
+    fused = pipeline.compile()
+    assert fused(**columns) == [
+        divide(add(x, y), z) * add(x, y) - x for x, y, z in zip(columns['x'], columns['y'], columns['z'])
+    ]
+    memory = measure_memory(fused, **columns)
+    assert memory['stepwise_peak'] > 2 * memory['fused_peak']
+    assert memory['saved'] == memory['stepwise_peak'] - memory['fused_peak']
+
+
+def test_numpy_path_reuses_buffers() -> None:
+    """Test the ufunc path against the generated loop, including fixed-up special rows."""
+    np = pytest.importorskip("numpy")
+    pipeline = Pipeline()
+    total = pipeline.add('x', 'y')
+    pipeline.modulo(pipeline.power(pipeline.divide(total, 'z'), 0.5), 'y')
+    fused = pipeline.compile()
+    assert fused.report['buffers'] == 1
+    values = [0.0, -0.0, 1.5, -2.0, INF, -INF, NAN, 1e308, 3.0]
+    xs = [a for a in values for _ in values]
+    ys = [b for _ in values for b in values]
+    zs = list(reversed(xs))
+    vectorized, failed = fused('mask', x=np.array(xs), y=np.array(ys), z=np.array(zs))
+    scalar, scalar_failed = fused('mask', x=xs, y=ys, z=zs)
+    assert list(failed) == scalar_failed
+    assert all(_same(float(a), float(b)) for a, b in zip(vectorized, scalar))
@@ -0,0 +1,73 @@
+"""Tests for big-exponent power and modular exponentiation."""
+import math
+
+import pytest
+
+from src.calculator import power, power_mod
+from src.calculator.backends import get_backend
+from src.calculator.cli import main, safe_calculate
+from src.calculator.expression import evaluate
+from src.calculator.registry import get_operation
+
+
+@pytest.mark.parametrize("a, b, expected", [
+    (2, 1023, 2.0 ** 1023),
+    (2, 1024, math.inf),
+    (3, 10 ** 12, math.inf),
+    (-3, 10 ** 12, math.inf),
+    (-3, 10 ** 12 + 1, -math.inf),
+    (10 ** 400, 2, math.inf),
+    (3, 700, math.inf),  # overflows after computing, below the estimate
+    (1, 10 ** 18, 1.0),
+    (-1, 10 ** 18 + 1, -1.0),
+    (2, -10 ** 12, 0.0),
+    (2, -10 ** 400, 0.0),
+    (10 ** 400, -1, 0.0),
+    (10 ** 400, 2.0, math.inf),
+    (-(10 ** 400), 3.0, -math.inf),
+    (2.0, 10 ** 400, math.inf),
+    (0.5, -10 ** 400, math.inf),
+])
+def test_power_overflow_is_detected_up_front(a, b, expected) -> None:
+    """Test huge int exponents without materializing a ** b."""
+    assert power(a, b) == expected
+
+
+def test_power_mod() -> None:
+    """Test modular exponentiation results and operand checks."""
+    assert power_mod(4, 13, 497) == 445
+    assert power_mod(2, 10 ** 18, 10 ** 9 + 7) == pow(2, 10 ** 18, 10 ** 9 + 7)
+    assert power_mod(4.0, 13.0, 497.0) == 445
+    assert power_mod(3, -1, 7) == 5  # modular inverse
+    assert power_mod(3, 2, -5) == -1
+    with pytest.raises(ZeroDivisionError):
+        power_mod(2, 3, 0)
+    with pytest.raises(ValueError):
+        power_mod(2.5, 3, 5)
+    with pytest.raises(ValueError):
+        power_mod(float('nan'), 3, 5)
+    with pytest.raises(ValueError):
+        power_mod(2, -1, 4)  # 2 has no inverse modulo 4
+    with pytest.raises(TypeError):
+        power_mod('2', 3, 5)
+
+
+def test_power_mod_everywhere(capsys) -> None:
+    """Test power_mod through the registry, CLI, backends and expressions."""
+    assert get_operation('power_mod').arity == 3
+    assert main(['power_mod', '4', '13', '497']) == 0
+    assert capsys.readouterr().out == "Result: 445\n"
+    assert main(['power_mod', '4', '13']) == 1
+    capsys.readouterr()
+    for name in ('decimal', 'fraction', 'integer'):
+        assert safe_calculate('power_mod', '4', '13', '497', backend=get_backend(name)) == 445
+    assert evaluate("power_mod(x, 65537, 3233)", x=65) == 2790
+
+
+def test_power_mod_operands_beyond_float_precision(capsys) -> None:
+    """Test that integer operand text above 2 ** 53 is not rounded through a float."""
+    operands = ['123456789012345678', '3', '1000000000000000003']
+    assert main(['power_mod', *operands]) == 0
+    assert capsys.readouterr().out == "Result: 919605372562749220\n"
+    assert safe_calculate('power_mod', *operands, backend=get_backend('float')) == 919605372562749220
+    assert safe_calculate('power_mod', '2.0', '3', '7') == 1
@@ -0,0 +1,122 @@
+"""Tests for n-ary reductions and compensated summation."""
+import array
+import io
+import math
+import os
+import random
+import tempfile
+
+import pytest
+
+from src.calculator.cli import main, try_calculate
+from src.calculator.reductions import (
+    SumAccumulator, apply_reduction, max_many, min_many, product_many, read_numbers, run_reduce, sum_many,
+)
+
+INF = float('inf')
+NAN = float('nan')
+
+
+def _values(count: int = 20_000):
+    """Operands spanning many magnitudes, whose naive sum rounds badly."""
+    rng = random.Random(7)
+    return [rng.uniform(-1, 1) * 10 ** rng.randint(-20, 20) for _ in range(count)]
+
+
+def test_sum_is_correctly_rounded() -> None:
+    """Test that sums match math.fsum where a naive loop drifts."""
+    values = _values()
+    assert sum(values) != math.fsum(values)
+    assert sum_many(values) == math.fsum(values)
+    assert sum_many(iter(values), deterministic=True) == math.fsum(values)
+    assert sum_many(array.array('d', values)) == math.fsum(values)
+    assert sum_many([0.1] * 10) == 1.0
+    assert sum_many([]) == 0.0
+
+
+@pytest.mark.parametrize("values, expected", [
+    ([1.0, INF, 2.0], INF),
+    ([-INF, 1.0], -INF),
+    ([INF, -INF], NAN),
+    ([1.0, NAN], NAN),
+    ([1e308, 1e308], INF),
+    ([1e308, 1e308, -1e308], 1e308),
+    ([10**400], INF),
+    ([1.0, -10**400], -INF),
+    ([10**400, -10**400], NAN),
+])
+def test_sum_special_values(values, expected) -> None:
+    """Test that special values follow the scalar add in both modes."""
+    for deterministic in (False, True):
+        result = sum_many(values, deterministic=deterministic)
+        assert math.isnan(result) if math.isnan(expected) else result == expected
+
+
+def test_deterministic_merge_ignores_split() -> None:
+    """Test identical results for any chunking and merge order."""
+    values = _values()
+    expected = sum_many(values, deterministic=True)
+    for size in (1, 7, 1000, 4096, 12_345):
+        parts = [SumAccumulator(deterministic=True).update(values[i:i + size])
+                 for i in range(0, len(values), size)]
+        random.Random(size).shuffle(parts)
+        total = SumAccumulator(deterministic=True)
+        for part in parts:
+            total.merge(part)
+        assert total.result() == expected and total.count == len(values)
+    with pytest.raises(ValueError):
+        SumAccumulator().merge(SumAccumulator(deterministic=True))
+
+
+def test_nan_skipping_product_min_max() -> None:
+    """Test the NaN-skipping variants and the other reductions."""
+    assert sum_many([1.0, NAN, 2.0], skip_nan=True) == 3.0
+    assert product_many([2, 3, 4]) == 24.0
+    assert math.isnan(product_many([INF, 0.0]))
+    assert product_many([2.0, NAN], skip_nan=True) == 2.0
+    assert math.isnan(min_many([3.0, NAN, 1.0]))
+    assert min_many([3.0, NAN, 1.0], skip_nan=True) == 1.0
+    assert max_many(range(10_000)) == 9999
+    assert math.isnan(max_many([NAN], skip_nan=True))
+    with pytest.raises(ValueError):
+        min_many([])
+    with pytest.raises(ValueError):
+        apply_reduction('mean', [1.0])
+
+
+def test_product_of_ints_beyond_float_range() -> None:
+    """Test that ints too large for a float multiply as +-inf, lists and iterators alike."""
+    for operands in ([10**400, 1.0], iter([10**400, 1.0])):
+        assert product_many(operands) == INF
+    assert product_many(iter([-10**400, 2])) == -INF
+    assert math.isnan(product_many([10**400, 0.0]))
+
+
+def test_cli_nary_operations(capsys) -> None:
+    """Test add and multiply with more than two operands."""
+    assert main(['add', '1', '2', '3', '4']) == 0
+    assert capsys.readouterr().out == "Result: 10.0\n"
+    assert main(['multiply', '2', '3', '4']) == 0
+    assert capsys.readouterr().out == "Result: 24.0\n"
+    assert main(['--backend', 'fraction', 'add', '1/3', '1/3', '1/3']) == 0
+    assert capsys.readouterr().out == "Result: 1\n"
+    assert main(['subtract', '1', '2', '3']) == 1
+    assert try_calculate('add', '1', 'x', '2').message == "Invalid number format: 'x'"
+
+
+def test_cli_reduce_stream(capsys) -> None:
+    """Test --reduce over a file of numbers."""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "numbers.txt")
+        with open(path, 'w') as f:
+            f.write("0.1, 0.2\n0.3 nan\n\n-0.6\n")
+        assert main(['--reduce', 'sum', '--batch', path]) == 0
+        assert capsys.readouterr().out == "Result: nan\n"
+        assert main(['--reduce', 'max', '--skip-nan', '--batch', path]) == 0
+        assert capsys.readouterr().out == "Result: 0.3\n"
+        assert main(['--reduce', 'sum', '--backend', 'decimal', '--batch', path]) == 1
+        capsys.readouterr()
+    assert list(read_numbers(["1,2", " 3  4 "])) == [1.0, 2.0, 3.0, 4.0]
+    output = io.StringIO()
+    assert run_reduce(os.path.join(directory, "missing.txt"), 'sum', output=output) == 1
+    assert output.getvalue().startswith("Error: Cannot read")
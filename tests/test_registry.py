@@ -0,0 +1,62 @@
+"""Tests for the operation registry."""
+import pytest
+
+from src.calculator import add
+from src.calculator import registry
+from src.calculator.batch import apply_many
+from src.calculator.cli import calculate, create_parser, main, safe_calculate
+from src.calculator.registry import Operation, get_operation, operation_names, register_operation
+
+
+@pytest.fixture
+def hypot_operation():
+    """Register a temporary 'hypot' operation and remove it afterwards."""
+    operation = register_operation('hypot', lambda x, y: (x * x + y * y) ** 0.5, 2, "Hypotenuse")
+    yield operation
+    del registry.OPERATIONS['hypot']
+
+
+def test_builtin_operations_registered() -> None:
+    """Test that all seven built-in operations are registered in order."""
+    assert operation_names()[:7] == [
+        'add', 'subtract', 'multiply', 'divide', 'power', 'integer_divide', 'modulo',
+    ]
+    assert get_operation('add') == Operation('add', add, 2, "Add two numbers")
+
+
+def test_lookup_is_case_sensitive() -> None:
+    """Test that lookups do not normalize case."""
+    assert get_operation('ADD') is None
+
+
+def test_register_duplicate_rejected() -> None:
+    """Test that existing operations cannot be silently replaced."""
+    with pytest.raises(ValueError):
+        register_operation('add', lambda x, y: 0)
+
+
+def test_register_requires_callable() -> None:
+    """Test that non-callables are rejected."""
+    with pytest.raises(TypeError):
+        register_operation('broken', 42)
+
+
+def test_calculate_supports_all_builtin_operations() -> None:
+    """Test that calculate() knows every registered operation."""
+    assert calculate('power', 2, 3) == 8.0
+    assert calculate('modulo', 7, 3) == 1
+    assert calculate('power_mod', 4, 13, 497) == 445
+    with pytest.raises(ValueError):
+        calculate('power_mod', 4, 13)
+    with pytest.raises(ValueError):
+        calculate('add', 1, 2, 3)
+
+
+def test_registered_operation_available_everywhere(hypot_operation, capsys) -> None:
+    """Test that a new operation reaches the CLI, parser, calculate and batch API."""
+    assert 'hypot' in create_parser().format_help()
+    assert safe_calculate('hypot', '3', '4') == 5.0
+    assert calculate('hypot', 3, 4) == 5.0
+    assert apply_many('hypot', [3], [4]) == [5.0]
+    assert main(['hypot', '3', '4']) == 0
+    assert capsys.readouterr().out == "Result: 5.0\n"
@@ -0,0 +1,80 @@
+"""Tests for structured calculation results."""
+import decimal
+import pickle
+
+import pytest
+
+from src.calculator.cli import safe_calculate, try_calculate
+from src.calculator.result import (
+    CODE_DIVISION, CODE_OK, CODE_OPERATION, CODE_OVERFLOW, CODE_UNEXPECTED, CODE_VALUE,
+    Result, error_code, error_counts,
+)
+
+
+def test_try_calculate_success() -> None:
+    """Test that a successful calculation carries its value."""
+    result = try_calculate('add', '5', '3')
+    assert result.ok
+    assert (result.value, result.code, result.kind, result.message) == (8.0, CODE_OK, "", "")
+
+
+@pytest.mark.parametrize("args, code, kind", [
+    (('divide', '1', '0'), CODE_DIVISION, "division"),
+    (('add', 'x', '1'), CODE_VALUE, "value"),
+    (('nope', '1', '2'), CODE_OPERATION, "operation"),
+])
+def test_try_calculate_failure_kinds(args, code, kind) -> None:
+    """Test that failures are classified without printing."""
+    result = try_calculate(*args)
+    assert not result.ok
+    assert result.value is None
+    assert (result.code, result.kind) == (code, kind)
+    assert result.message
+
+
+def test_try_calculate_does_not_print(capsys: pytest.CaptureFixture) -> None:
+    """Test that only safe_calculate prints."""
+    try_calculate('divide', '1', '0')
+    assert capsys.readouterr().out == ""
+    assert safe_calculate('divide', '1', '0') is None
+    assert capsys.readouterr().out == "Division Error: Cannot divide by zero\n"
+
+
+def test_message_is_built_lazily() -> None:
+    """Test that the exception is kept until the message is read."""
+    error = ZeroDivisionError("Cannot divide by zero")
+    result = Result.failure(error)
+    assert result._detail is error
+    assert result.message == "Cannot divide by zero"
+    assert result._detail == "Cannot divide by zero"
+
+
+def test_error_code_handles_subclasses() -> None:
+    """Test classification of exception subclasses and unknown exceptions."""
+    assert error_code(decimal.DivisionByZero()) == CODE_DIVISION
+    assert error_code(OverflowError()) == CODE_OVERFLOW
+    assert error_code(RuntimeError()) == CODE_UNEXPECTED
+
+
+def test_unwrap_reraises_the_original_error() -> None:
+    """Test that unwrap returns values and re-raises errors."""
+    assert Result(3).unwrap() == 3
+    with pytest.raises(ZeroDivisionError):
+        try_calculate('divide', '1', '0').unwrap()
+    with pytest.raises(ValueError):
+        try_calculate('nope', '1', '2').unwrap()
+
+
+def test_results_pickle_with_their_message() -> None:
+    """Test that results survive a round trip to a worker process."""
+    result = pickle.loads(pickle.dumps(try_calculate('divide', '1', '0')))
+    assert (result.code, result.message) == (CODE_DIVISION, "Cannot divide by zero")
+    assert pickle.loads(pickle.dumps(Result(2.5))) == Result(2.5)
+
+
+def test_error_counts() -> None:
+    """Test aggregation of failures by kind."""
+    results = [try_calculate('divide', '1', '0'), try_calculate('add', '1', '2'),
+               try_calculate('modulo', '1', '0'), try_calculate('add', 'x', '2')]
+    assert error_counts(results) == {"value": 1, "division": 2}
+    assert error_counts([]) == {}
@@ -0,0 +1,81 @@
+"""Tests pinning the NaN/infinity handling of the core operations."""
+import math
+
+import pytest
+
+from src.calculator import add, subtract, multiply, divide, power, integer_divide, modulo
+
+INF = float('inf')
+NAN = float('nan')
+
+
+@pytest.mark.parametrize("function, a, b, expected", [
+    (add, INF, -INF, NAN),
+    (add, 1.0, -INF, -INF),
+    (subtract, INF, INF, NAN),
+    (subtract, 0.0, INF, -INF),
+    (multiply, INF, 0, NAN),
+    (multiply, -2, INF, -INF),
+    (divide, INF, -2.0, -INF),
+    (divide, -3.0, INF, -0.0),
+    (divide, INF, INF, NAN),
+    (power, 1.0, INF, 1.0),
+    (power, 2.0, -INF, 0.0),
+    (power, 0.5, -INF, INF),
+    (power, INF, -1.0, 0.0),
+    (power, 10.0, 400.0, INF),
+    (integer_divide, 5.0, INF, 0),
+    (integer_divide, INF, INF, NAN),
+    (modulo, INF, 3.0, NAN),
+    (modulo, 5.0, INF, 5.0),
+    (add, NAN, 1.0, NAN),
+    (power, NAN, 0.0, NAN),
+])
+def test_special_value_results(function, a, b, expected) -> None:
+    """Test results for NaN and infinite operands."""
+    result = function(a, b)
+    if math.isnan(expected):
+        assert math.isnan(result)
+    else:
+        assert result == expected
+        assert math.copysign(1, result) == math.copysign(1, expected)
+
+
+def test_finite_fast_path_results() -> None:
+    """Test ordinary finite float results."""
+    assert add(0.1, 0.2) == 0.1 + 0.2
+    assert subtract(-0.0, 0.0) == -0.0 and math.copysign(1, subtract(-0.0, 0.0)) == -1
+    assert multiply(1e308, 10.0) == INF
+    assert divide(7.5, 2.5) == 3.0
+    assert power(2.0, 0.5) == math.sqrt(2.0)
+    assert integer_divide(-7.0, 2.0) == -4
+    assert modulo(-7.0, 2.0) == 1.0
+
+
+@pytest.mark.parametrize("a, b, expected", [
+    (10 ** 400, 0.0, 1.0),
+    (0.0, 10 ** 400, 0.0),
+    (1.0, 10 ** 400, 1.0),
+    (0.5, 10 ** 400, 0.0),
+    (10 ** 400, -1.0, 0.0),
+    (-0.0, 10 ** 400 + 1, -0.0),
+    (-(10 ** 400), 3.0, -INF),
+    (10 ** 400, 0.5, 1e200),
+])
+def test_power_with_ints_beyond_float_range(a, b, expected) -> None:
+    """Test that an int too large for a float does not read as an overflowed result."""
+    result = power(a, b)
+    assert result == expected
+    assert math.copysign(1, result) == math.copysign(1, expected)
+
+
+def test_infinite_integer_divide_overflows() -> None:
+    """Test that inf // finite cannot be converted to int."""
+    with pytest.raises(OverflowError):
+        integer_divide(INF, 2.0)
+
+
+def test_non_numeric_operand_with_float_raises_type_error() -> None:
+    """Test that non-numbers are still rejected on the float path."""
+    with pytest.raises(TypeError):
+        multiply(None, 2.0)
@@ -0,0 +1,125 @@
+"""Tests for the streaming batch mode (calculator --batch)."""
+import io
+import json
+import os
+import tempfile
+
+from src.calculator.cli import main
+from src.calculator.streaming import calculate_row, evaluate_records, read_records, run_batch
+
+
+def test_read_records_handles_delimiters_and_header() -> None:
+    """Test comma, tab and whitespace separated records with a header."""
+    lines = ["op,x,y\n", "add,1,2\n", "\n", "divide\t4\t2\n", "power 2 3\n"]
+    assert list(read_records(lines)) == [
+        (2, ['add', '1', '2']),
+        (4, ['divide', '4', '2']),
+        (5, ['power', '2', '3']),
+    ]
+
+
+def test_read_records_is_lazy() -> None:
+    """Test that records are produced without reading the whole input."""
+    def lines():
+        yield "add,1,2\n"
+        raise AssertionError("read too far")
+
+    assert next(read_records(lines())) == (1, ['add', '1', '2'])
+
+
+def test_calculate_row_success() -> None:
+    """Test a successful row."""
+    assert calculate_row('multiply', '3', '4') == (12.0, "", "")
+
+
+def test_calculate_row_errors() -> None:
+    """Test that row errors are reported by kind instead of printed."""
+    assert calculate_row('divide', '1', '0') == (None, "division", "Cannot divide by zero")
+    assert calculate_row('add', 'x', '1')[1] == "value"
+    assert calculate_row('sqrt', '4', '1')[1] == "operation"
+
+
+def test_evaluate_records_wrong_field_count() -> None:
+    """Test that malformed records become format errors."""
+    (record,) = evaluate_records([(1, ['add', '1'])])
+    assert record[5] == "format"
+
+
+def test_evaluate_records_rejects_non_binary_operations() -> None:
+    """Test that op,x,y rows name the arity instead of a Python signature."""
+    (record,) = evaluate_records([(1, ['power_mod', '2', '3'])])
+    assert record[4:] == (
+        None, "operation", "power_mod takes 3 operands and is not supported in op,x,y batches",
+    )
+
+
+def test_run_batch_csv_output() -> None:
+    """Test a full batch run with CSV output."""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "jobs.csv")
+        with open(path, "w") as f:
+            f.write("add,1,2\ndivide,1,0\n")
+        output = io.StringIO()
+        report = io.StringIO()
+        status = run_batch(path, output=output, report=report)
+
+    assert status == 1
+    assert output.getvalue().splitlines() == [
+        "line,operation,x,y,result,error,message",
+        "1,add,1,2,3.0,,",
+        "2,divide,1,0,,division,Cannot divide by zero",
+    ]
+    assert "Processed 2 rows (1 errors)" in report.getvalue()
+    assert "rows/sec" in report.getvalue()
+
+
+def test_run_batch_jsonl_output() -> None:
+    """Test JSON lines output, including a NaN result."""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "jobs.txt")
+        with open(path, "w") as f:
+            f.write("subtract inf inf\n")
+        output = io.StringIO()
+        status = run_batch(path, "jsonl", output=output, report=io.StringIO())
+
+    assert status == 0
+    assert json.loads(output.getvalue())["result"] == "nan"
+
+
+def test_run_batch_missing_file() -> None:
+    """Test that an unreadable input file is reported."""
+    report = io.StringIO()
+    assert run_batch("/nonexistent/jobs.csv", output=io.StringIO(), report=report) == 1
+    assert "Cannot read batch input" in report.getvalue()
+
+
+def test_run_batch_tells_read_and_write_errors_apart() -> None:
+    """Test that non-UTF-8 input and failed writes get their own messages."""
+    class BrokenOutput(io.StringIO):
+        def write(self, text: str) -> int:
+            raise BrokenPipeError(32, "Broken pipe")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "jobs.csv")
+        with open(path, "wb") as f:
+            f.write(b"add,2,3\nadd,\xff,1\n")
+        report = io.StringIO()
+        assert run_batch(path, output=io.StringIO(), report=report) == 1
+        assert "Cannot read batch input" in report.getvalue()
+        assert "not valid utf-8 text" in report.getvalue()
+
+        with open(path, "w") as f:
+            f.write("add,2,3\n")
+        report = io.StringIO()
+        assert run_batch(path, output=BrokenOutput(), report=report) == 1
+        assert report.getvalue() == "Error: Cannot write results: [Errno 32] Broken pipe\n"
+
+
+def test_main_batch_flag(capsys) -> None:
+    """Test that --batch is wired into the CLI."""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "jobs.csv")
+        with open(path, "w") as f:
+            f.write("add,2,3\n")
+        assert main(['--batch', path]) == 0
+    assert "1,add,2,3,5.0,," in capsys.readouterr().out
@@ -0,0 +1,107 @@
+"""Tests for one-pass result statistics and the quantile sketch."""
+import bisect
+import io
+import json
+import math
+import os
+import pickle
+import random
+import statistics
+import tempfile
+
+import pytest
+
+from src.calculator.cli import main
+from src.calculator.columnar import csv_to_columnar
+from src.calculator.streamstats import QuantileSketch, ResultStats
+
+
+def _values(count: int = 50_000):
+    rng = random.Random(11)
+    return [rng.lognormvariate(0, 2) for _ in range(count)]
+
+
+def test_moments_match_statistics_module() -> None:
+    """Test Welford mean/variance, min and max against exact values."""
+    values = _values()
+    stats = ResultStats().update(values)
+    assert stats.mean == pytest.approx(statistics.fmean(values), rel=1e-12)
+    assert stats.variance == pytest.approx(statistics.variance(values), rel=1e-12)
+    summary = stats.summary()
+    assert summary['min'] == min(values) and summary['max'] == max(values)
+    assert summary['count'] == summary['finite'] == len(values)
+
+
+def test_sketch_quantiles_are_close_and_bounded() -> None:
+    """Test quantile rank error and memory of the KLL sketch."""
+    values = _values(200_000)
+    ordered = sorted(values)
+    sketch = QuantileSketch().update(values)
+    assert sketch.retained < 1000
+    for q in (0.1, 0.5, 0.9, 0.99):
+        rank = bisect.bisect_left(ordered, sketch.quantile(q)) / len(ordered)
+        assert abs(rank - q) < 0.02
+    assert sketch.quantiles([0, 1]) == [ordered[0], ordered[-1]]
+    small = QuantileSketch().update([5.0, 1.0, 3.0, 2.0, 4.0])
+    assert small.quantile(0.5) == 3.0  # exact below capacity
+    assert math.isnan(QuantileSketch().quantile(0.5))
+    with pytest.raises(ValueError):
+        small.quantile(1.5)
+
+
+def test_merge_across_workers() -> None:
+    """Test that merged partial summaries match a single pass."""
+    values = _values()
+    whole = ResultStats().update(values)
+    parts = [pickle.loads(pickle.dumps(ResultStats(seed=i).update(values[i::4]))) for i in range(4)]
+    merged = parts[0]
+    for part in parts[1:]:
+        merged.merge(part)
+    assert merged.count == whole.count
+    assert merged.mean == pytest.approx(whole.mean, rel=1e-12)
+    assert merged.variance == pytest.approx(whole.variance, rel=1e-12)
+    assert merged.sketch.count == len(values)
+    ordered = sorted(values)
+    rank = bisect.bisect_left(ordered, merged.sketch.quantile(0.9)) / len(ordered)
+    assert abs(rank - 0.9) < 0.02
+
+
+def test_special_values_and_errors() -> None:
+    """Test NaN/inf counts, error kinds and results beyond float range."""
+    stats = ResultStats()
+    stats.update([1.0, math.nan, math.inf, -math.inf, 10 ** 400, 3])
+    stats.add_error('division')
+    summary = stats.summary()
+    assert summary['count'] == 7 and summary['ok'] == 6
+    assert summary['errors'] == {'division': 1}
+    assert (summary['nan'], summary['positive_inf'], summary['negative_inf']) == (1, 2, 1)
+    assert summary['mean'] == 2.0 and summary['finite'] == 2
+    empty = ResultStats().summary()
+    assert empty['mean'] is None and empty['quantiles'] == {'0.5': None, '0.9': None, '0.99': None}
+
+
+def test_batch_stats_flag(capsys) -> None:
+    """Test --stats on the streaming and columnar batch paths."""
+    with tempfile.TemporaryDirectory() as directory:
+        jobs = os.path.join(directory, "jobs.csv")
+        lines = ["add,1,2", "divide,1,0", "multiply,inf,2", "subtract,5,1"]
+        with open(jobs, 'w') as f:
+            f.write("\n".join(lines) + "\n")
+        summary_path = os.path.join(directory, "summary.json")
+        assert main(['--batch', jobs, '--stats', summary_path]) == 1
+        with open(summary_path) as f:
+            summary = json.load(f)
+        assert summary['count'] == 4 and summary['errors'] == {'division': 1}
+        assert summary['positive_inf'] == 1 and summary['mean'] == 3.5
+
+        capsys.readouterr()
+        assert main(['--batch', jobs, '--stats']) == 1
+        err = capsys.readouterr().err
+        assert err.startswith("Processed 4 rows") and json.loads(err[err.index("{"):]) == summary
+
+        table = os.path.join(directory, "jobs.ccol")
+        csv_to_columnar(io.StringIO("\n".join(lines)), table)
+        assert main(['--batch', table, '--format', 'binary', '--output',
+                     os.path.join(directory, "results.ccol"), '--stats', summary_path]) == 1
+        with open(summary_path) as f:
+            assert json.load(f) == summary
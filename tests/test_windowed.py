@@ -0,0 +1,120 @@
+"""Tests for windowed, resumable evaluation of columnar job files."""
+import io
+import os
+import tempfile
+
+import pytest
+
+from src.calculator.cli import main
+from src.calculator.columnar import csv_to_columnar, evaluate_table, read_table
+from src.calculator.windowed import evaluate_file, progress_path, run_windowed
+
+OPERATIONS = ['add', 'subtract', 'multiply', 'divide', 'power', 'modulo']
+
+
+class Crash(Exception):
+    """Raised from the window callback to simulate the process dying."""
+
+
+def _write_jobs(directory: str, rows: int = 1000) -> str:
+    path = os.path.join(directory, "jobs.ccol")
+    lines = [f"{OPERATIONS[i % len(OPERATIONS)]},{i * 0.5},{i % 7}" for i in range(rows)]
+    csv_to_columnar(io.StringIO("\n".join(lines)), path)
+    return path
+
+
+def _expected(path: str):
+    with read_table(path) as jobs:
+        columns = evaluate_table(jobs)
+    return columns['result'].tobytes(), list(columns['error'])
+
+
+def _actual(path: str):
+    with read_table(path) as results:
+        return results['result'].tobytes(), list(results['error'])
+
+
+def test_windows_match_whole_table_evaluation() -> None:
+    """Test that windowed output equals evaluating the table in memory."""
+    with tempfile.TemporaryDirectory() as directory:
+        jobs = _write_jobs(directory)
+        output = os.path.join(directory, "results.ccol")
+        seen = []
+        stats = evaluate_file(jobs, output, window=96, on_window=lambda done, total: seen.append(done))
+        assert stats["windows"] == 11 and stats["rows"] == 1000 and stats["resumed_from"] == 0
+        assert seen[0] == 96 and seen[-1] == 1000
+        assert stats["errors"] == _expected(jobs)[1].count(4)  # every divide/modulo by 0 row
+        assert _actual(output) == _expected(jobs)
+        assert not os.path.exists(progress_path(output))
+
+
+def test_resume_after_crash() -> None:
+    """Test that an interrupted run continues from its last completed window."""
+    with tempfile.TemporaryDirectory() as directory:
+        jobs = _write_jobs(directory)
+        output = os.path.join(directory, "results.ccol")
+
+        def crash_after_three(done, total):
+            if done >= 300:
+                raise Crash
+
+        with pytest.raises(Crash):
+            evaluate_file(jobs, output, window=100, on_window=crash_after_three)
+        assert os.path.exists(progress_path(output))
+
+        stats = evaluate_file(jobs, output, window=100, resume=True)
+        assert stats["resumed_from"] == 300 and stats["windows"] == 7
+        assert _actual(output) == _expected(jobs)
+
+        # Without a progress file, resume starts over
+        stats = evaluate_file(jobs, output, window=400, resume=True)
+        assert stats["resumed_from"] == 0 and stats["windows"] == 3
+
+
+def test_resumed_run_fails_for_earlier_errors() -> None:
+    """Test that the exit status covers rows completed before the resume."""
+    with tempfile.TemporaryDirectory() as directory:
+        jobs = os.path.join(directory, "jobs.ccol")
+        lines = ["divide,1,0" if i == 5 else f"add,{i},1" for i in range(100)]
+        csv_to_columnar(io.StringIO("\n".join(lines)), jobs)
+        output = os.path.join(directory, "results.ccol")
+
+        def crash_after_first(done, total):
+            raise Crash
+
+        with pytest.raises(Crash):
+            evaluate_file(jobs, output, window=50, on_window=crash_after_first)
+        report = io.StringIO()
+        assert run_windowed(jobs, output, window=50, resume=True, report=report) == 1
+        assert "(resumed at row 50, 1 errors before) (0 errors)" in report.getvalue()
+
+
+def test_invalid_arguments() -> None:
+    """Test bad windows and non-job tables are rejected."""
+    with tempfile.TemporaryDirectory() as directory:
+        jobs = _write_jobs(directory, 10)
+        output = os.path.join(directory, "results.ccol")
+        with pytest.raises(ValueError):
+            evaluate_file(jobs, output, window=0)
+        evaluate_file(jobs, output)
+        with pytest.raises(ValueError):
+            evaluate_file(output, os.path.join(directory, "again.ccol"))
+
+
+def test_cli_output_window_and_resume(capsys: pytest.CaptureFixture) -> None:
+    """Test calculator --batch with --output, --window and --resume."""
+    with tempfile.TemporaryDirectory() as directory:
+        jobs = _write_jobs(directory, 50)
+        output = os.path.join(directory, "results.ccol")
+        assert main(['--batch', jobs, '--format', 'binary', '--output', output, '--window', '8']) == 1
+        assert _actual(output) == _expected(jobs)
+        assert main(['--batch', jobs, '--format', 'binary', '--output', output, '--resume']) == 1
+
+        text = os.path.join(directory, "results.csv")
+        assert main(['--batch', jobs, '--output', text]) == 1
+        with open(text) as f:
+            assert f.readline().startswith("line,operation")
+        assert capsys.readouterr().out == ""
+
+        assert main(['--batch', jobs, '--resume']) == 1
+        assert main(['--batch', jobs, '--format', 'binary', '--output', output, '--window', '0']) == 1